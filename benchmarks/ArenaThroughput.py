@@ -0,0 +1,60 @@
+import os
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+from .Throughput import ROOT_FOLDER, build_library, build_benchmark
+
+
+# measurement -> description, in the order they are printed
+CASES = {
+    "heap_ns":          "heap: create_type + Deserialize(), batch freed",
+    "arena_ns":         "arena: same, batch destroyed + release()",
+    "arena_release_ns": "arena: same, only release()",
+}
+
+
+
+def main():
+    """
+    Measures how fast the library generated from symbol.yaml with '--arena'
+    deserializes batches of the Symbol test vectors of the end to end tests
+    into objects allocated from an arena, which is released after each
+    batch, compared with objects allocated from the heap:
+
+        ------------------------------------------------------------------
+        python3 -m benchmarks.ArenaThroughput --iterations 2000 --repeat 3
+        ------------------------------------------------------------------
+
+    The library is built in release mode (-O3). The times are the fastest
+    of '--repeat' runs, in nanoseconds per test vector, including freeing
+    the batch.
+    """
+
+    parser = argparse.ArgumentParser( prog="python3 -m benchmarks.ArenaThroughput", description="Measures the throughput of deserializing into arena allocated objects on the Symbol test vectors." )
+    parser.add_argument( "--iterations", type=int, default=2000, metavar="N", help="number of batches of all test vectors per run (default: 2000)" )
+    parser.add_argument( "--repeat",     type=int, default=3, metavar="N", help="number of runs, the fastest is kept (default: 3)" )
+    parser.add_argument( "--jobs", "-j", type=int, default=os.cpu_count(), metavar="N", help="number of files compiled at the same time (default: number of CPUs)" )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder     = Path(tmp) / "symbol"
+        build_library( ROOT_FOLDER, folder, [ "--arena" ], args.jobs )
+        executable = build_benchmark( folder, "ArenaThroughput.cpp" )
+        runs       = [ json.loads( subprocess.run( [ str(executable), str(args.iterations) ], check=True, stdout=subprocess.PIPE, text=True ).stdout ) for _ in range( args.repeat ) ]
+
+    bytes_per_payload = runs[0]["bytes"] / runs[0]["payloads"]
+    fastest           = { key: min( run[key] for run in runs ) for key in CASES }
+
+    print( f'\n{runs[0]["payloads"]} Symbol test vectors of {bytes_per_payload:.0f} bytes on average, release build:\n' )
+    print( f'\t{"":<50} {"[ns]":>8} {"[MB/s]":>8} {"speedup":>8}' )
+
+    for key, description in CASES.items():
+        print( f'\t{description:<50} {fastest[key]:>8.1f} {bytes_per_payload / fastest[key] * 1e3:>8.1f} {fastest["heap_ns"] / fastest[key]:>7.1f}x' )
+
+
+
+if __name__ == "__main__":
+    main()
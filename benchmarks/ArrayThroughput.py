@@ -0,0 +1,73 @@
+import os
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+from .Throughput import ROOT_FOLDER, SYMBOL_SCHEMA, extract_generator, build_library, build_benchmark
+
+
+# schema -> preprocessor define selecting its cases in 'cpp/ArrayThroughput.cpp'
+SCHEMAS = {
+    ROOT_FOLDER / "yaml_test_inputs" / "bitcoin.yaml": "CATBUFFER_BITCOIN",
+    SYMBOL_SCHEMA:                                     "CATBUFFER_SYMBOL",
+}
+
+
+
+def main():
+    """
+    Measures how fast the generated code deserializes and serializes
+    structs with large arrays: bitcoin scripts of 4 and 64 KiB ('array
+    uint8'), a Symbol transfer with 255 mosaics (an array of structs with
+    a fixed layout) and a Symbol multisig modification with 510 addresses
+    (an array of an alias):
+
+        ------------------------------------------------------------------
+        python3 -m benchmarks.ArrayThroughput --compare HEAD~1
+        ------------------------------------------------------------------
+
+    The libraries are built in release mode (-O3). Deserializing includes
+    creating the object. The times are the fastest of '--repeat' runs, in
+    nanoseconds per struct.
+    """
+
+    parser = argparse.ArgumentParser( prog="python3 -m benchmarks.ArrayThroughput", description="Measures the throughput of the generated code on structs with large arrays." )
+    parser.add_argument( "--iterations", type=int, default=2000, metavar="N", help="number of times each struct is processed per run (default: 2000)" )
+    parser.add_argument( "--repeat",     type=int, default=3, metavar="N", help="number of runs, the fastest is kept (default: 3)" )
+    parser.add_argument( "--jobs", "-j", type=int, default=os.cpu_count(), metavar="N", help="number of files compiled at the same time (default: number of CPUs)" )
+    parser.add_argument( "--compare",    metavar="REV", help="also measure the code generated by git revision REV" )
+    args = parser.parse_args()
+
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generators = [ ( "", ROOT_FOLDER ) ]
+
+        if args.compare:
+            extract_generator( args.compare, Path(tmp) / "generator_root" )
+            generators.insert( 0, ( args.compare, Path(tmp) / "generator_root" ) )
+
+        for revision, generator_root in generators:
+            for schema, define in SCHEMAS.items():
+                folder     = Path(tmp) / f"{len(rows)}_{schema.stem}"
+                build_library( generator_root, folder, [], args.jobs, schema )
+                executable = build_benchmark( folder, "ArrayThroughput.cpp", [ define ] )
+                runs       = [ json.loads( subprocess.run( [ str(executable), str(args.iterations) ], check=True, stdout=subprocess.PIPE, text=True ).stdout ) for _ in range( args.repeat ) ]
+
+                for index, case in enumerate( runs[0] ):
+                    rows.append( ( case["case"], revision or "current", case["bytes"],
+                                   min( run[index]["deserialize_ns"] for run in runs ),
+                                   min( run[index]["serialize_ns"]   for run in runs ) ) )
+
+    print( f'\nStructs with large arrays, release build:\n' )
+    print( f'\t{"case":<24} {"revision":<10} {"bytes":>7} {"deserialize [ns]":>17} {"serialize [ns]":>15} {"deserialize [MB/s]":>19} {"serialize [MB/s]":>17}' )
+
+    for name, revision, size, deserialize, serialize in sorted( rows, key=lambda row: row[0] ):
+        print( f'\t{name:<24} {revision:<10} {size:>7} {deserialize:>17.1f} {serialize:>15.1f} {size / deserialize * 1e3:>19.1f} {size / serialize * 1e3:>17.1f}' )
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+
+from .SchemaSynthesizer import SchemaSynthesizer
+from .GeneratorScaling import time_ast_to_native, scaling_exponents, report
+
+
+
+def main():
+    """
+    Times 'ast_to_native()' on synthesized schemas of up to 20k types and
+    fails if it does not scale linearly, i.e. if the scaling exponent
+    between the smallest and the largest schema is above '--max-exponent'.
+
+    Command line (from the root of the repository, requires 'catparser'):
+
+        ------------------------------------------------------------
+        python3 -m benchmarks.AstToNativeScaling
+        ------------------------------------------------------------
+
+    By default all versioned structs are put in a single 'struct_type'
+    group, which is the worst case for the factory enums: their number of
+    values grows with the size of the schema.
+    """
+
+    parser = argparse.ArgumentParser( prog="python3 -m benchmarks.AstToNativeScaling", description="Checks that ast_to_native() scales linearly with the size of the schema." )
+    parser.add_argument( "--sizes",        type=int, nargs="+", default=[5000, 10000, 20000], metavar="N", help="number of types of the synthesized schemas" )
+    parser.add_argument( "--groups",       type=int, default=1,    help="number of struct_type groups (default: 1)" )
+    parser.add_argument( "--repeat",       type=int, default=3,    metavar="N", help="time each size N times and keep the fastest (default: 3)" )
+    parser.add_argument( "--max-exponent", type=float, default=1.25, metavar="X", help="fail if a scaling exponent is larger than X (default: 1.25)" )
+    args = parser.parse_args()
+
+    points = []
+
+    for size in sorted( args.sizes ):
+        synthesizer = SchemaSynthesizer( size, groups=args.groups, wide_enums=1, enum_width=64 )
+        seconds     = min( time_ast_to_native( synthesizer ) for _ in range( args.repeat ) )
+        points.append( ( synthesizer.struct_count(), seconds ) )
+
+    print( report( "ast_to_native", points ) )
+
+    # the exponent between the smallest and the largest schema is less noisy than the exponents between neighbouring sizes
+    exponent = scaling_exponents( [ points[0], points[-1] ] )[-1]
+    print( f'Overall scaling exponent: {exponent:.2f}\n' )
+
+    if exponent > args.max_exponent:
+        print( f'Error: ast_to_native scales worse than size^{args.max_exponent}!\n' )
+        exit(1)
+
+
+
+if __name__ == "__main__":
+    main()
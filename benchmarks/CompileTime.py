@@ -0,0 +1,125 @@
+import os
+import sys
+import json
+import time
+import typing
+import argparse
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent
+
+# name -> ( generator options, precompile headers )
+CONFIGURATIONS = {
+    "default":            ( [],                 False ),
+    "--fast-build":       ( [ "--fast-build" ], False ),
+    "--fast-build + PCH": ( [ "--fast-build" ], True  ),
+}
+
+
+
+def launch( log_file: str, command: typing.List[str] ) -> int:
+    """
+    Runs the compiler 'command' and appends its source file, wall and CPU
+    time to 'log_file'. Used as the CMAKE_CXX_COMPILER_LAUNCHER of the
+    measured builds.
+    """
+
+    start  = time.perf_counter()
+    result = subprocess.run( command )
+    usage  = resource.getrusage( resource.RUSAGE_CHILDREN )
+
+    source = command[ command.index( "-c" ) + 1 ] if "-c" in command else command[-1]
+    record = { "file": Path( source ).name, "seconds": time.perf_counter() - start, "cpu_seconds": usage.ru_utime + usage.ru_stime }
+
+    with open( log_file, "a" ) as f:
+        f.write( json.dumps( record ) + "\n" )
+
+    return result.returncode
+
+
+
+def measure_build( schema: str, folder: Path, options: typing.List[str], precompile_headers: bool, jobs: int ) -> typing.Tuple[float, typing.Dict[str, dict]]:
+    """
+    Generates 'schema' with the generator 'options' into 'folder', builds the
+    library with CMake and returns the wall time of the build and the times
+    of each compiled file.
+    """
+
+    log_file = folder / "compile_times.jsonl"
+    launcher = ";".join( [ sys.executable, str( Path(__file__).resolve() ), "--launcher", str(log_file) ] )
+
+    subprocess.run( [ sys.executable, "-m", "generator", schema, str(folder), *options ], cwd=ROOT_FOLDER, check=True, stdout=subprocess.DEVNULL )
+    subprocess.run( [ "cmake", "-S", str(folder), "-B", str( folder / "_build" ), f"-DCMAKE_CXX_COMPILER_LAUNCHER={launcher}",
+                      f"-DCATBUFFER_PRECOMPILE_HEADERS={'ON' if precompile_headers else 'OFF'}" ], check=True, stdout=subprocess.DEVNULL )
+
+    start = time.perf_counter()
+    subprocess.run( [ "cmake", "--build", str( folder / "_build" ), "-j", str(jobs) ], check=True, stdout=subprocess.DEVNULL )
+    seconds = time.perf_counter() - start
+
+    records = [ json.loads( line ) for line in log_file.read_text().splitlines() ]
+
+    return seconds, { record["file"]: record for record in records }
+
+
+
+def main():
+    """
+    Measures the time needed to compile the C++ code generated from a .yaml
+    file, with the default output, with '--fast-build' and with '--fast-build'
+    and precompiled headers ('CATBUFFER_PRECOMPILE_HEADERS'):
+
+        ------------------------------------------------------------------
+        python3 -m benchmarks.CompileTime --schema yaml_test_inputs/symbol.yaml
+        ------------------------------------------------------------------
+
+    Each library is built with the generated CMakeLists.txt. The time of each
+    compiled file is measured by a compiler launcher, so the build time
+    includes the start up of the launcher, while the file times do not. The
+    CPU time is less noisy than the wall time on machines with slow file
+    systems. 'cmake_pch.hxx.cxx' is the compiled precompiled header.
+    """
+
+    if len( sys.argv ) > 2 and sys.argv[1] == "--launcher":
+        sys.exit( launch( sys.argv[2], sys.argv[3:] ) )
+
+    parser = argparse.ArgumentParser( prog="python3 -m benchmarks.CompileTime", description="Measures the compile time of the generated C++ code." )
+    parser.add_argument( "--schema",         default="yaml_test_inputs/symbol.yaml", help="the .yaml input file (default: yaml_test_inputs/symbol.yaml)" )
+    parser.add_argument( "--jobs", "-j",     type=int, default=os.cpu_count(), metavar="N", help="number of files compiled at the same time (default: number of CPUs)" )
+    parser.add_argument( "--top",            type=int, default=10, metavar="N", help="number of slowest files printed (default: 10)" )
+    parser.add_argument( "--generate-print", action="store_true", help="generate the Print() methods and the 'cmd' tool too" )
+    args = parser.parse_args()
+
+    results : typing.Dict[str, typing.Tuple[float, typing.Dict[str, dict]]] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for idx, ( name, ( options, precompile_headers ) ) in enumerate( CONFIGURATIONS.items() ):
+            if args.generate_print:
+                options = options + [ "--generate-print" ]
+
+            results[name] = measure_build( args.schema, Path(tmp) / str(idx), options, precompile_headers, args.jobs )
+
+    print( f'\nCompile times of {args.schema}{" with --generate-print" if args.generate_print else ""} (-j {args.jobs}):\n' )
+    print( f'\t{"configuration":<20} {"files":>6} {"build [s]":>10} {"compile [s]":>12} {"compile cpu [s]":>16}' )
+
+    for name, ( seconds, files ) in results.items():
+        print( f'\t{name:<20} {len(files):>6} {seconds:>10.2f} {sum( f["seconds"] for f in files.values() ):>12.2f} {sum( f["cpu_seconds"] for f in files.values() ):>16.2f}' )
+
+    names   = list( results )
+    default = results[ names[0] ][1]
+    slowest = sorted( default, key=lambda file: default[file]["cpu_seconds"], reverse=True )[:args.top]
+
+    print( '\nSlowest files, compile cpu [s]:\n' )
+    print( f'\t{"file":<48}' + "".join( f' {name:>20}' for name in names ) )
+
+    for file in slowest:
+        records = [ results[name][1].get( file ) for name in names ]
+        print( f'\t{file:<48}' + "".join( f' {record["cpu_seconds"]:>20.3f}' if record else f' {"-":>20}' for record in records ) )
+
+
+
+if __name__ == "__main__":
+    main()
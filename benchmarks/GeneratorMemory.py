@@ -0,0 +1,112 @@
+import sys
+import json
+import typing
+import tarfile
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent
+
+# runs in a fresh interpreter, so that the peak RSS of each run is not inflated by the previous runs
+CHILD_CODE = """
+import io, gc, sys, json, time, resource, tempfile, contextlib
+sys.path[:0] = [ {generator_root!r}, {root!r} ]
+
+from generator.__main__ import generate
+from benchmarks.SchemaSynthesizer import SchemaSynthesizer
+
+def rss_kb():
+    with open( "/proc/self/status" ) as f:
+        return next( int( line.split()[1] ) for line in f if line.startswith( "VmRSS:" ) )
+
+input_data = SchemaSynthesizer( {size} ).yaml_schema()
+gc.collect()
+before = rss_kb()
+
+with tempfile.TemporaryDirectory() as output_folder, contextlib.redirect_stdout( io.StringIO() ):
+    start, start_cpu = time.perf_counter(), time.process_time()
+    generate( input_data, output_folder, {generate_print_methods} )
+    seconds, cpu_seconds = time.perf_counter() - start, time.process_time() - start_cpu
+
+print( json.dumps( {{ "seconds": seconds, "cpu_seconds": cpu_seconds, "before_kb": before, "peak_kb": resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss }} ) )
+"""
+
+
+
+def measure_generate( generator_root: Path, size: int, generate_print_methods: bool ) -> typing.Dict[str, float]:
+    """
+    Runs 'generate()' of the generator in 'generator_root' on a synthesized
+    schema of 'size' structs in a new process, and returns its wall and CPU
+    time, the RSS before generating and the peak RSS of the process.
+    """
+
+    code   = CHILD_CODE.format( generator_root=str(generator_root), root=str(ROOT_FOLDER), size=size, generate_print_methods=generate_print_methods )
+    result = subprocess.run( [ sys.executable, "-c", code ], cwd=ROOT_FOLDER, stdout=subprocess.PIPE, check=True, text=True )
+
+    return json.loads( result.stdout.splitlines()[-1] )
+
+
+
+def extract_generator( revision: str, folder: Path ) -> None:
+    """
+    Extracts the 'generator' folder of git 'revision' into 'folder'.
+    """
+
+    archive = subprocess.run( [ "git", "archive", "--format=tar", revision, "generator" ], cwd=ROOT_FOLDER, stdout=subprocess.PIPE, check=True ).stdout
+
+    with tempfile.TemporaryFile() as f:
+        f.write( archive )
+        f.seek( 0 )
+        with tarfile.open( fileobj=f ) as tar:
+            tar.extractall( folder )
+
+
+
+def main():
+    """
+    Measures the peak RSS and the time of 'generate()' on a synthesized
+    schema (see 'SchemaSynthesizer'), e.g. to compare the memory used by the
+    generated code before it is written to disk with an older revision:
+
+        ------------------------------------------------------------------
+        python3 -m benchmarks.GeneratorMemory --size 10000 --compare HEAD~1
+        ------------------------------------------------------------------
+
+    Each run is done in a new process. The CPU time is less noisy than the
+    wall time on machines with slow file systems. 'before' is the RSS after
+    the schema was synthesized, 'peak' the peak RSS of the whole process, so
+    'peak - before' is roughly the memory used by the generator. With
+    '--compare' the generator of the given git revision is measured too.
+    """
+
+    parser = argparse.ArgumentParser( prog="python3 -m benchmarks.GeneratorMemory", description="Measures the peak memory and time of the generator on a synthesized schema." )
+    parser.add_argument( "--size",           type=int, default=10000, metavar="N", help="number of structs of the synthesized schema (default: 10000)" )
+    parser.add_argument( "--repeat",         type=int, default=3, metavar="N", help="run N times and keep the fastest times and the lowest peak (default: 3)" )
+    parser.add_argument( "--compare",        metavar="REV", help="also measure the generator of git revision REV" )
+    parser.add_argument( "--generate-print", action="store_true", help="generate the Print() methods and the print converters too" )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generators = [ ( "working tree", ROOT_FOLDER ) ]
+
+        if args.compare:
+            extract_generator( args.compare, Path(tmp) )
+            generators.insert( 0, ( args.compare, Path(tmp) ) )
+
+        print( f'\ngenerate() on {args.size} structs{" with --generate-print" if args.generate_print else ""}:\n' )
+        print( f'\t{"generator":<16} {"time [s]":>10} {"cpu [s]":>8} {"before [MB]":>12} {"peak [MB]":>10} {"peak - before [MB]":>19}' )
+
+        for name, generator_root in generators:
+            runs   = [ measure_generate( generator_root, args.size, args.generate_print ) for _ in range( args.repeat ) ]
+            before = min( run["before_kb"] for run in runs ) / 1024
+            peak   = min( run["peak_kb"]   for run in runs ) / 1024
+
+            print( f'\t{name:<16} {min( run["seconds"] for run in runs ):>10.2f} {min( run["cpu_seconds"] for run in runs ):>8.2f} {before:>12.1f} {peak:>10.1f} {peak - before:>19.1f}' )
+
+
+
+if __name__ == "__main__":
+    main()
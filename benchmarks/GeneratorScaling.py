@@ -0,0 +1,155 @@
+import io
+import gc
+import sys
+import json
+import math
+import time
+import typing
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+from generator.__main__ import generate
+from .SchemaSynthesizer import SchemaSynthesizer
+
+
+
+def time_generate( synthesizer: SchemaSynthesizer, jobs: int = 1 ) -> float:
+    """
+    Returns the time 'generate()' takes to generate the C++ code of the
+    synthesized schema into a temporary folder.
+    """
+
+    input_data = synthesizer.yaml_schema()
+
+    with tempfile.TemporaryDirectory() as output_folder, contextlib.redirect_stdout( io.StringIO() ):
+        gc.collect() # do not time the collection of the garbage of previous runs
+        start = time.perf_counter()
+        generate( input_data, output_folder, jobs=jobs )
+        return time.perf_counter() - start
+
+
+
+def time_ast_to_native( synthesizer: SchemaSynthesizer ) -> float:
+    """
+    Returns the time 'ast_to_native()' takes to convert the synthesized schema.
+    """
+
+    from generator.AstToNativeConverter import ast_to_native
+
+    type_descriptors = synthesizer.ast_schema()
+
+    with contextlib.redirect_stdout( io.StringIO() ):
+        gc.collect()
+        start = time.perf_counter()
+        ast_to_native( type_descriptors )
+        return time.perf_counter() - start
+
+
+
+def scaling_exponents( points: typing.List[typing.Tuple[int, float]] ) -> typing.List[typing.Optional[float]]:
+    """
+    Given (size, seconds) points sorted by size, returns the exponent 'e'
+    in 'seconds ~ size^e' between each point and the previous one. An
+    exponent of ~1 means linear scaling, ~2 quadratic scaling.
+    """
+
+    exponents = [ None ]
+
+    for (n0, t0), (n1, t1) in zip( points, points[1:] ):
+        exponents.append( math.log( t1/t0 ) / math.log( n1/n0 ) if n1 != n0 and t0 > 0 and t1 > 0 else None )
+
+    return exponents
+
+
+
+def report( target: str, points: typing.List[typing.Tuple[int, float]] ) -> str:
+
+    output  = f'\n{target}:\n\n'
+    output += f'\t{"structs":>10} {"time [s]":>12} {"per struct [us]":>16} {"exponent":>10}\n'
+
+    for (size, seconds), exponent in zip( points, scaling_exponents( points ) ):
+        exponent_str = f'{exponent:.2f}' if exponent is not None else "-"
+        output += f'\t{size:>10} {seconds:>12.3f} {seconds/size*1e6:>16.1f} {exponent_str:>10}\n'
+
+    return output
+
+
+
+def main():
+    """
+    Times 'generate()' and 'ast_to_native()' on synthesized schemas of
+    increasing size (see 'SchemaSynthesizer') and prints the scaling curves.
+
+    Command line (from the root of the repository):
+
+        ------------------------------------------------------------------
+        python3 -m benchmarks.GeneratorScaling --sizes 10000 20000 50000
+        ------------------------------------------------------------------
+
+    For each size the time, the time per struct and the scaling exponent
+    relative to the previous size is printed, where an exponent of ~1 means
+    linear and ~2 quadratic scaling. With '--max-exponent X' the benchmark
+    fails if any exponent is larger than 'X'.
+    """
+
+    parser = argparse.ArgumentParser( prog="python3 -m benchmarks.GeneratorScaling", description="Times the generator on synthesized schemas of increasing size." )
+    parser.add_argument( "--sizes",        type=int, nargs="+", default=[10000, 20000, 30000, 40000, 50000], metavar="N", help="number of structs of the synthesized schemas" )
+    parser.add_argument( "--targets",      nargs="+", default=["generate", "ast_to_native"], choices=["generate", "ast_to_native"], help="functions to time" )
+    parser.add_argument( "--depth",        type=int, default=6,    help="depth of the inline nesting (default: 6)" )
+    parser.add_argument( "--groups",       type=int, default=32,   help="number of struct_type groups (default: 32)" )
+    parser.add_argument( "--versions",     type=int, default=3,    help="versions of each struct in a group (default: 3)" )
+    parser.add_argument( "--wide-enums",   type=int, default=8,    help="number of wide enums (default: 8)" )
+    parser.add_argument( "--enum-width",   type=int, default=2048, help="number of values of each wide enum (default: 2048)" )
+    parser.add_argument( "--jobs", "-j",   type=int, default=1,    metavar="N", help="'--jobs' passed to generate() (default: 1)" )
+    parser.add_argument( "--repeat",       type=int, default=1,    metavar="N", help="time each size N times and keep the fastest (default: 1)" )
+    parser.add_argument( "--max-exponent", type=float,             metavar="X", help="fail if a scaling exponent is larger than X" )
+    parser.add_argument( "--json",                                 metavar="FILE", help="write the results to FILE in json format" )
+    args = parser.parse_args()
+
+    targets = list( args.targets )
+
+    if "ast_to_native" in targets:
+        try:
+            import catparser
+        except ImportError:
+            print( "Warning: 'catparser' is not installed, skipping ast_to_native()" )
+            targets.remove( "ast_to_native" )
+
+    results = {}
+    failed  = False
+
+    for target in targets:
+        points = []
+
+        for size in sorted( args.sizes ):
+            synthesizer = SchemaSynthesizer( size, args.depth, args.groups, args.versions, args.wide_enums, args.enum_width )
+
+            if "generate" == target:
+                seconds = min( time_generate( synthesizer, args.jobs ) for _ in range( args.repeat ) )
+            else:
+                seconds = min( time_ast_to_native( synthesizer ) for _ in range( args.repeat ) )
+
+            points.append( ( synthesizer.struct_count(), seconds ) )
+            print( f'{target}: {synthesizer.struct_count()} structs in {seconds:.3f}s', file=sys.stderr )
+
+        print( report( target, points ) )
+
+        exponents       = scaling_exponents( points )
+        results[target] = [ { "structs": size, "seconds": seconds, "exponent": exponent } for (size, seconds), exponent in zip( points, exponents ) ]
+
+        if args.max_exponent is not None and any( exponent is not None and exponent > args.max_exponent for exponent in exponents ):
+            print( f'Error: {target} scales worse than size^{args.max_exponent}!\n' )
+            failed = True
+
+    if args.json:
+        Path( args.json ).write_text( json.dumps( results, indent=1 ) )
+
+    if failed:
+        exit(1)
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import math
+import typing
+
+
+
+class SchemaSynthesizer():
+    """
+    Synthesizes large schemas for benchmarking the generator, both in the
+    YAML input format of the generator (list of dicts, as returned by
+    'yaml.safe_load()') and as catparser AST models (as passed to
+    'ast_to_native()').
+
+    The schemas are built from 'families' of structs, similar to the
+    transactions in 'yaml_test_inputs/symbol.yaml':
+
+        ----------------------------------------------------------------
+        Body{f}L0            fields, a wide enum field and an array
+        Body{f}L1            inline Body{f}L0 + fields
+        ...
+        Body{f}L{depth-1}    inline Body{f}L{depth-2} + fields
+
+        Group{g}Kind{k}V1    struct_type Group{g}Type, value KIND_{k} @1
+        ...                  header Group{g}Header + inline Body{f}L{depth-1}
+        Group{g}Kind{k}V{versions}
+        ----------------------------------------------------------------
+
+    Every group 'g' has a type enum 'Group{g}Type', a header struct
+    'Group{g}Header' and a container struct 'Group{g}Container' holding
+    an 'array_sized' of the group. Families are added until the schema
+    has (approximately) 'struct_count' structs.
+    """
+
+    def __init__( self,
+                  struct_count: int,
+                  depth:        int = 6,
+                  groups:       int = 32,
+                  versions:     int = 3,
+                  wide_enums:   int = 8,
+                  enum_width:   int = 2048 ) -> None:
+
+        self.depth      = max( 1, depth )
+        self.groups     = max( 1, groups )
+        self.versions   = max( 1, versions )
+        self.wide_enums = max( 1, wide_enums )
+        self.enum_width = max( 1, enum_width )
+
+        per_family      = self.depth + self.versions
+        self.families   = max( 1, math.ceil( ( struct_count - 2*self.groups ) / per_family ) )
+        self.kinds      = math.ceil( self.families / self.groups ) # kinds (= enum values) per group
+
+
+
+    def struct_count( self ) -> int:
+        return self.families * ( self.depth + self.versions ) + 2*self.groups
+
+
+
+    def yaml_schema( self ) -> typing.List[dict]:
+        """
+        Returns the schema in the YAML input format of the generator.
+        """
+
+        aliases = [ { "name": "Amount",  "type": "alias uint64" },
+                    { "name": "Hash256", "type": "alias array uint8", "size": 32 } ]
+
+        enums   = [ self.__yaml_enum( f'WideEnum{e}', "uint16", [ f'VALUE_{i}' for i in range(self.enum_width) ] ) for e in range(self.wide_enums) ]
+        enums  += [ self.__yaml_enum( f'Group{g}Type',  "uint16", [ f'KIND_{k}' for k in range(self.kinds) ] ) for g in range(self.groups) ]
+
+        structs = []
+
+        for g in range(self.groups):
+            structs.append( { "name": f'Group{g}Header', "type": "struct", "layout": [
+                { "name": "size",    "type": "uint32" },
+                { "name": "version", "type": "uint8" },
+                { "name": "type",    "type": f'Group{g}Type' } ] } )
+
+        for f in range(self.families):
+            g, k = self.__group_and_kind( f )
+
+            for level in range(self.depth):
+                layout = [ { "type": f'inline Body{f}L{level-1}' } ] if level > 0 else self.__yaml_leaf_fields( f )
+                layout.append( { "name": f'amount_{level}', "type": "Amount" } )
+                layout.append( { "name": f'hash_{level}',   "type": "Hash256" } )
+                structs.append( { "name": f'Body{f}L{level}', "type": "struct", "layout": layout, "comments": f'level {level} of family {f}' } )
+
+            for v in range(1, self.versions+1):
+                structs.append( { "name": f'Group{g}Kind{k}V{v}', "type": "struct", "layout": [
+                    { "type": f'struct_type Group{g}Type', "value": f'KIND_{k} @{v}', "header": f'Group{g}Header', "version_field": "version", "type_field": "type" },
+                    { "type": f'inline Group{g}Header' },
+                    { "type": f'inline Body{f}L{self.depth-1}' } ] } )
+
+        for g in range(self.groups):
+            structs.append( { "name": f'Group{g}Container', "type": "struct", "layout": [
+                { "name": "payload_size", "type": "uint32" },
+                { "name": "items", "type": f'array_sized Group{g}Header', "size": "payload_size", "header_type_field": "type", "header_version_field": "version" },
+                { "name": "rest",  "type": f'array_fill Body{g % self.families}L0' } ] } )
+
+        return aliases + enums + structs
+
+
+
+    def ast_schema( self ) -> list:
+        """
+        Returns the same schema as 'yaml_schema()' as catparser AST models,
+        in the form produced by the catparser after the inlines have been
+        expanded ('AstPostProcessor'). Requires the 'catparser' package.
+        """
+
+        from lark import Token
+        from catparser import ast
+
+        def integer( name ):
+            return ast.FixedSizeInteger( Token( "FIXED_SIZE_INTEGER", name ) )
+
+        def user_type( name ):
+            return Token( "USER_TYPE_NAME", name )
+
+        def field( name, field_type, value=None, disposition=None ):
+            tokens = [ name, field_type ] if value is None else [ name, field_type, value ]
+            return ast.StructField( tokens, disposition )
+
+        def attribute( *tokens ):
+            return ast.Attribute( list(tokens) )
+
+        def enum( name, values ):
+            return ast.Enum( [ name, integer("uint16") ] + [ ast.EnumValue( [value, i+1] ) for i, value in enumerate(values) ] )
+
+        def array( element_type, size ):
+            return ast.Array( [ user_type( element_type ), size ] )
+
+        models  = [ ast.Alias( [ "Amount",  integer("uint64") ] ),
+                    ast.Alias( [ "Hash256", ast.FixedSizeBuffer( 32 ) ] ) ]
+
+        models += [ enum( f'WideEnum{e}', [ f'VALUE_{i}' for i in range(self.enum_width) ] ) for e in range(self.wide_enums) ]
+        models += [ enum( f'Group{g}Type',  [ f'KIND_{k}' for k in range(self.kinds) ] ) for g in range(self.groups) ]
+
+        def header_fields():
+            return [ field( "size", integer("uint32") ), field( "version", integer("uint8") ) ]
+
+        for g in range(self.groups):
+            header            = ast.Struct( [ "abstract", f'Group{g}' ] + header_fields() + [ field( "type", user_type( f'Group{g}Type' ) ) ] )
+            header.attributes = [ attribute( "discriminator", "type", "version" ) ]
+            models.append( header )
+
+        for f in range(self.families):
+            g, k   = self.__group_and_kind( f )
+            fields = [ field( "kind",  user_type( f'WideEnum{f % self.wide_enums}' ) ),
+                       field( "count", integer("uint8") ),
+                       field( "items", array( "Amount", "count" ) ) ]
+
+            for level in range(self.depth):
+                # unnamed inlines are expanded by the catparser by copying the fields of the inlined struct
+                fields = fields + [ field( f'amount_{level}', user_type("Amount") ), field( f'hash_{level}', user_type("Hash256") ) ]
+                models.append( ast.Struct( [ None, f'Body{f}L{level}' ] + fields ) )
+
+            for v in range(1, self.versions+1):
+                model = ast.Struct( [ None, f'Group{g}Kind{k}V{v}',
+                                      field( "TRANSACTION_VERSION", integer("uint8"), v, "const" ),
+                                      field( "TRANSACTION_TYPE", user_type( f'Group{g}Type' ), f'KIND_{k}', "const" ) ]
+                                    + header_fields()
+                                    + [ field( "type", user_type( f'Group{g}Type' ) ) ]
+                                    + fields )
+
+                model.factory_type = f'Group{g}'
+                model.attributes   = [ attribute( "discriminator", "type", "version" ),
+                                       attribute( "initializes", "version", "TRANSACTION_VERSION" ),
+                                       attribute( "initializes", "type", "TRANSACTION_TYPE" ) ]
+                models.append( model )
+
+        for g in range(self.groups):
+            models.append( ast.Struct( [ None, f'Group{g}Container',
+                                         field( "payload_size", integer("uint32"), "items", "sizeof" ),
+                                         field( "items", user_type( f'Group{g}' ) ),
+                                         field( "rest",  array( f'Body{g % self.families}L0', "__FILL__" ) ) ] ) )
+
+        return models
+
+
+
+    def __group_and_kind( self, family: int ) -> typing.Tuple[int, int]:
+        return family % self.groups, family // self.groups
+
+
+
+    def __yaml_leaf_fields( self, family: int ) -> typing.List[dict]:
+        return [ { "name": "kind",  "type": f'WideEnum{family % self.wide_enums}' },
+                 { "name": "count", "type": "uint8" },
+                 { "name": "items", "type": "array Amount", "size": "count" } ]
+
+
+
+    @staticmethod
+    def __yaml_enum( name: str, enum_type: str, values: typing.List[str] ) -> dict:
+        return { "name": name, "type": f'enum {enum_type}', "values": [ { "name": value, "value": i+1 } for i, value in enumerate(values) ] }
@@ -0,0 +1,126 @@
+import sys
+import time
+import shutil
+import typing
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent
+
+
+
+def run_generator( args: typing.List[str], importtime: bool = False ) -> typing.Tuple[float, str]:
+    """
+    Runs 'python3 -m generator args' from the root of the repository and
+    returns its wall time and its stderr (the '-X importtime' report).
+    """
+
+    command = [ sys.executable ] + ( [ "-X", "importtime" ] if importtime else [] ) + [ "-m", "generator" ] + args
+
+    start   = time.perf_counter()
+    result  = subprocess.run( command, cwd=ROOT_FOLDER, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True )
+    seconds = time.perf_counter() - start
+
+    return seconds, result.stderr
+
+
+
+def top_level_imports( importtime_report: str ) -> typing.List[typing.Tuple[str, float]]:
+    """
+    Returns the (module, cumulative time [ms]) of the modules imported
+    directly by the generator or the interpreter startup, i.e. the entries
+    of a '-X importtime' report that are not nested in other imports.
+    """
+
+    imports = []
+
+    for line in importtime_report.splitlines():
+        if not line.startswith( "import time:" ) or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split( "|" )
+
+        if not name.startswith( "  " ): # nested imports are indented by two spaces per level
+            imports.append( ( name.strip(), int(cumulative) / 1000 ) )
+
+    return imports
+
+
+
+def main():
+    """
+    Measures the start up time of the generator, which runs in every
+    incremental build, and fails if it is over budget.
+
+    Command line (from the root of the repository):
+
+        ------------------------------------------------------------
+        python3 -m benchmarks.StartupTime --noop-budget-ms 100
+        ------------------------------------------------------------
+
+    Two runs are measured:
+
+        noop   'yaml_test_inputs/symbol.yaml' with '--incremental' into an
+               output folder which is already up to date
+        small  'yaml_test_inputs/bitcoin.yaml' into an empty output folder
+
+    For each run the fastest wall time over '--repeat' runs is compared
+    to its budget, and the slowest imports reported by 'python -X importtime'
+    are printed. The time the interpreter needs to start ('python -c pass')
+    is printed for reference.
+    """
+
+    parser = argparse.ArgumentParser( prog="python3 -m benchmarks.StartupTime", description="Checks that the generator starts up within a fixed time budget." )
+    parser.add_argument( "--noop-budget-ms",  type=float, default=100, metavar="MS", help="budget of an incremental run with nothing to do (default: 100)" )
+    parser.add_argument( "--small-budget-ms", type=float, default=400, metavar="MS", help="budget of a run on a small schema (default: 400)" )
+    parser.add_argument( "--repeat",          type=int, default=5, metavar="N", help="run each case N times and keep the fastest (default: 5)" )
+    parser.add_argument( "--top",             type=int, default=8, metavar="N", help="number of slowest imports printed (default: 8)" )
+    args = parser.parse_args()
+
+    failed = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        noop_folder  = str( Path(tmp) / "noop" )
+        small_folder = str( Path(tmp) / "small" )
+
+        def prepare_small():
+            shutil.rmtree( small_folder, ignore_errors=True )
+
+        cases = [ ( "noop",  [ "yaml_test_inputs/symbol.yaml",  noop_folder, "--incremental" ], lambda: None,  args.noop_budget_ms  ),
+                  ( "small", [ "yaml_test_inputs/bitcoin.yaml", small_folder ],                 prepare_small, args.small_budget_ms ) ]
+
+        run_generator( cases[0][1] ) # make the noop output folder up to date
+
+        start = time.perf_counter()
+        subprocess.run( [ sys.executable, "-c", "pass" ], check=True )
+        print( f'\nInterpreter start up: {( time.perf_counter() - start )*1e3:.0f} ms' )
+
+        for name, generator_args, prepare, budget_ms in cases:
+            times = []
+            for _ in range( args.repeat ):
+                prepare()
+                times.append( run_generator( generator_args )[0] * 1e3 )
+
+            prepare()
+            _, report = run_generator( generator_args, importtime=True )
+            imports   = top_level_imports( report )
+
+            status = "ok" if min(times) <= budget_ms else "OVER BUDGET"
+            failed = failed or min(times) > budget_ms
+
+            print( f'\n{name}: {min(times):.0f} ms (budget {budget_ms:.0f} ms) {status}, imports: {sum( ms for _, ms in imports ):.0f} ms\n' )
+            print( f'\t{"slowest imports":<40} {"cumulative [ms]":>16}' )
+            for module, ms in sorted( imports, key=lambda elem: elem[1], reverse=True )[:args.top]:
+                print( f'\t{module:<40} {ms:>16.1f}' )
+
+    if failed:
+        print( "\nError: generator start up is over budget!\n" )
+        exit(1)
+
+
+
+if __name__ == "__main__":
+    main()
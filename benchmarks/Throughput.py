@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import typing
+import argparse
+import tarfile
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+
+ROOT_FOLDER   = Path(__file__).resolve().parent.parent
+SYMBOL_SCHEMA = ROOT_FOLDER / "yaml_test_inputs" / "symbol.yaml"
+
+# name -> generator options of the measured library layouts
+CONFIGURATIONS = {
+    "per file":     [],
+    "--amalgamate": [ "--amalgamate" ],
+}
+
+
+
+def extract_generator( revision: str, folder: Path ) -> None:
+    """
+    Extracts the generator and the static C++ sources of git 'revision'
+    into 'folder'.
+    """
+
+    archive = subprocess.run( [ "git", "archive", "--format=tar", revision, "generator", "cpp_source", "cpp_build_files" ], cwd=ROOT_FOLDER, stdout=subprocess.PIPE, check=True ).stdout
+
+    with tempfile.TemporaryFile() as f:
+        f.write( archive )
+        f.seek( 0 )
+        with tarfile.open( fileobj=f ) as tar:
+            tar.extractall( folder )
+
+
+
+def build_library( generator_root: Path, folder: Path, options: typing.List[str], jobs: int, schema: Path = SYMBOL_SCHEMA ) -> typing.Tuple[float, float]:
+    """
+    Generates 'schema' with the generator in 'generator_root' and the
+    generator 'options' into 'folder' and builds the library with CMake in
+    release mode. Returns the wall and CPU time of the build.
+    """
+
+    subprocess.run( [ sys.executable, "-m", "generator", str(schema), str(folder), *options ], cwd=generator_root, check=True, stdout=subprocess.DEVNULL )
+    subprocess.run( [ "cmake", "-S", str(folder), "-B", str( folder / "_build" ), "-DCMAKE_BUILD_TYPE=Release" ], check=True, stdout=subprocess.DEVNULL )
+
+    usage = resource.getrusage( resource.RUSAGE_CHILDREN )
+    start = time.perf_counter()
+    subprocess.run( [ "cmake", "--build", str( folder / "_build" ), "-j", str(jobs) ], check=True, stdout=subprocess.DEVNULL )
+    seconds = time.perf_counter() - start
+    after   = resource.getrusage( resource.RUSAGE_CHILDREN )
+
+    return seconds, ( after.ru_utime + after.ru_stime ) - ( usage.ru_utime + usage.ru_stime )
+
+
+
+def build_benchmark( folder: Path, source: str = "Throughput.cpp", defines: typing.Sequence[str] = () ) -> Path:
+    """
+    Builds 'cpp/<source>' with the preprocessor 'defines' against the
+    library built in 'folder'.
+    """
+
+    executable = folder / Path(source).stem.lower()
+    compiler   = os.environ.get( "CXX", "c++" )
+
+    subprocess.run( [ compiler, "-std=c++17", "-O3", "-DNDEBUG", *( f"-D{define}" for define in defines ),
+                      "-I", str( folder / "generated_src" ), "-I", str( folder / "static_src" ), "-I", str( ROOT_FOLDER / "end-to-end-tests" / "src" ),
+                      str( ROOT_FOLDER / "benchmarks" / "cpp" / source ), str( folder / "_build" / "libcatbuffer.a" ), "-o", str(executable) ], check=True )
+
+    return executable
+
+
+
+def main():
+    """
+    Measures the build time of the library generated from symbol.yaml, and
+    how fast it deserializes (with 'Deserialize()' and with
+    'DeserializeUnchecked()'), serializes and sizes the Symbol test vectors
+    of the end to end tests, for each library layout:
+
+        ------------------------------------------------------------------
+        python3 -m benchmarks.Throughput --iterations 2000 --repeat 3
+        ------------------------------------------------------------------
+
+    The libraries are built in release mode (-O3). Deserializing includes
+    creating the object with 'create_type_TransactionType()'. The times are
+    the fastest of '--repeat' runs, in nanoseconds per test vector. With
+    '--compare' the generated code of the given git revision is measured
+    too, e.g. for measuring a change of the generated code:
+
+        ------------------------------------------------------------------
+        python3 -m benchmarks.Throughput --compare HEAD~1 --layout "per file"
+        ------------------------------------------------------------------
+    """
+
+    parser = argparse.ArgumentParser( prog="python3 -m benchmarks.Throughput", description="Measures the throughput of the generated code on the Symbol test vectors." )
+    parser.add_argument( "--iterations", type=int, default=2000, metavar="N", help="number of times all test vectors are processed per run (default: 2000)" )
+    parser.add_argument( "--repeat",     type=int, default=3, metavar="N", help="number of runs, the fastest is kept (default: 3)" )
+    parser.add_argument( "--jobs", "-j", type=int, default=os.cpu_count(), metavar="N", help="number of files compiled at the same time (default: number of CPUs)" )
+    parser.add_argument( "--compare",    metavar="REV", help="also measure the code generated by git revision REV" )
+    parser.add_argument( "--layout",     action="append", choices=CONFIGURATIONS.keys(), help="only measure this library layout, can be given more than once (default: all)" )
+    args = parser.parse_args()
+
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generators = [ ( "", ROOT_FOLDER ) ]
+
+        if args.compare:
+            extract_generator( args.compare, Path(tmp) / "generator_root" )
+            generators.insert( 0, ( f"{args.compare} ", Path(tmp) / "generator_root" ) )
+
+        for prefix, generator_root in generators:
+            for name, options in CONFIGURATIONS.items():
+                if args.layout and name not in args.layout:
+                    continue
+
+                folder              = Path(tmp) / str( len(rows) )
+                seconds, cpu        = build_library( generator_root, folder, options, args.jobs )
+                executable          = build_benchmark( folder )
+                runs                = [ json.loads( subprocess.run( [ str(executable), str(args.iterations) ], check=True, stdout=subprocess.PIPE, text=True ).stdout ) for _ in range( args.repeat ) ]
+
+                rows.append( ( prefix + name, seconds, cpu, runs ) )
+
+    payloads, total_bytes = rows[0][3][0]["payloads"], rows[0][3][0]["bytes"]
+
+    print( f'\nSymbol test vectors ({payloads} test vectors, {total_bytes} bytes), release build (-j {args.jobs}):\n' )
+    print( f'\t{"layout":<24} {"build [s]":>10} {"build cpu [s]":>14} {"deserialize [ns]":>17} {"unchecked [ns]":>15} {"serialize [ns]":>15} {"size [ns]":>10} {"deserialize [MB/s]":>19}' )
+
+    for name, seconds, cpu, runs in rows:
+        deserialize = min( run["deserialize_ns"] for run in runs )
+        unchecked   = f'{min( run["deserialize_unchecked_ns"] for run in runs ):.1f}' if runs[0].get( "has_unchecked" ) else "-"
+        serialize   = min( run["serialize_ns"]   for run in runs )
+        size        = min( run["size_ns"]        for run in runs )
+        throughput  = ( total_bytes / payloads ) / deserialize * 1e3 # bytes per ns -> MB/s
+
+        print( f'\t{name:<24} {seconds:>10.2f} {cpu:>14.2f} {deserialize:>17.1f} {unchecked:>15} {serialize:>15.1f} {size:>10.1f} {throughput:>19.1f}' )
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+from .Throughput import ROOT_FOLDER, build_library, build_benchmark
+
+
+# measurement -> description, in the order they are printed
+CASES = {
+    "deserialize_ns":           "all: create_type + Deserialize()",
+    "aggregate_deserialize_ns": "aggregates: create_type + Deserialize()",
+    "visit_ns":                 "aggregates: Size() of the embedded transactions",
+}
+
+# library -> generator options and preprocessor defines of the benchmark
+LIBRARIES = {
+    "pointers": ( [],              []            ),
+    "variant":  ( [ "--variant" ], [ "VARIANT" ] ),
+}
+
+
+
+def main():
+    """
+    Measures how fast the libraries generated from symbol.yaml with and
+    without '--variant' deserialize the Symbol test vectors of the end to
+    end tests, and how fast they visit the embedded transactions of the
+    aggregates, which are stored in a 'std::variant' with '--variant'
+    instead of behind a 'std::unique_ptr<ICatbuffer>' each:
+
+        --------------------------------------------------------------------
+        python3 -m benchmarks.VariantThroughput --iterations 2000 --repeat 3
+        --------------------------------------------------------------------
+
+    The libraries are built in release mode (-O3). The times are the
+    fastest of '--repeat' runs, in nanoseconds per test vector.
+    """
+
+    parser = argparse.ArgumentParser( prog="python3 -m benchmarks.VariantThroughput", description="Measures the throughput of array_sized elements stored in a std::variant on the Symbol test vectors." )
+    parser.add_argument( "--iterations", type=int, default=2000, metavar="N", help="number of times each test vector is processed per run (default: 2000)" )
+    parser.add_argument( "--repeat",     type=int, default=3, metavar="N", help="number of runs, the fastest is kept (default: 3)" )
+    parser.add_argument( "--jobs", "-j", type=int, default=os.cpu_count(), metavar="N", help="number of files compiled at the same time (default: number of CPUs)" )
+    args = parser.parse_args()
+
+    fastest = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for library, ( options, defines ) in LIBRARIES.items():
+            folder     = Path(tmp) / library
+            build_library( ROOT_FOLDER, folder, options, args.jobs )
+            executable = build_benchmark( folder, "VariantThroughput.cpp", defines )
+            runs       = [ json.loads( subprocess.run( [ str(executable), str(args.iterations) ], check=True, stdout=subprocess.PIPE, text=True ).stdout ) for _ in range( args.repeat ) ]
+
+            fastest[library] = { key: min( run[key] for run in runs ) for key in CASES }
+
+    print( f'\n{runs[0]["payloads"]} Symbol test vectors, {runs[0]["aggregates"]} aggregates with {runs[0]["elements"]} embedded transactions, release build:\n' )
+    print( f'\t{"":<50} {"pointers [ns]":>14} {"variant [ns]":>14} {"speedup":>8}' )
+
+    for key, description in CASES.items():
+        print( f'\t{description:<50} {fastest["pointers"][key]:>14.1f} {fastest["variant"][key]:>14.1f} {fastest["pointers"][key] / fastest["variant"][key]:>7.1f}x' )
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+from .Throughput import ROOT_FOLDER, build_library, build_benchmark
+
+
+# measurement -> description and the measurement its speedup is relative to, in the order they are printed
+CASES = {
+    "deserialize_ns":        ( "owning classes: create_type + Deserialize()", "deserialize_ns"        ),
+    "view_ns":               ( "views: Parse() + read header",                "deserialize_ns"        ),
+    "view_unchecked_ns":     ( "views: ParseUnchecked() + read header",       "deserialize_ns"        ),
+    "header_deserialize_ns": ( "header only: Transaction::Deserialize()",     "header_deserialize_ns" ),
+    "header_view_ns":        ( "header only: TransactionView::Parse()",       "header_deserialize_ns" ),
+}
+
+
+
+def main():
+    """
+    Measures how fast the read-only views generated from symbol.yaml
+    validate the Symbol test vectors of the end to end tests and read the
+    fields of their headers, compared with deserializing them into the
+    owning classes:
+
+        ------------------------------------------------------------------
+        python3 -m benchmarks.ViewThroughput --iterations 2000 --repeat 3
+        ------------------------------------------------------------------
+
+    The library is built in release mode (-O3). The times are the fastest
+    of '--repeat' runs, in nanoseconds per test vector.
+    """
+
+    parser = argparse.ArgumentParser( prog="python3 -m benchmarks.ViewThroughput", description="Measures the throughput of the generated views on the Symbol test vectors." )
+    parser.add_argument( "--iterations", type=int, default=2000, metavar="N", help="number of times each test vector is processed per run (default: 2000)" )
+    parser.add_argument( "--repeat",     type=int, default=3, metavar="N", help="number of runs, the fastest is kept (default: 3)" )
+    parser.add_argument( "--jobs", "-j", type=int, default=os.cpu_count(), metavar="N", help="number of files compiled at the same time (default: number of CPUs)" )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder     = Path(tmp) / "symbol"
+        build_library( ROOT_FOLDER, folder, [], args.jobs )
+        executable = build_benchmark( folder, "ViewThroughput.cpp" )
+        runs       = [ json.loads( subprocess.run( [ str(executable), str(args.iterations) ], check=True, stdout=subprocess.PIPE, text=True ).stdout ) for _ in range( args.repeat ) ]
+
+    bytes_per_payload = runs[0]["bytes"] / runs[0]["payloads"]
+    fastest           = { key: min( run[key] for run in runs ) for key in CASES }
+
+    print( f'\n{runs[0]["payloads"]} Symbol test vectors of {bytes_per_payload:.0f} bytes on average, release build:\n' )
+    print( f'\t{"":<45} {"[ns]":>8} {"[MB/s]":>8} {"speedup":>8}' )
+
+    for key, ( description, baseline ) in CASES.items():
+        print( f'\t{description:<45} {fastest[key]:>8.1f} {bytes_per_payload / fastest[key] * 1e3:>8.1f} {fastest[baseline] / fastest[key]:>7.1f}x' )
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+// Measures how fast batches of the Symbol test vectors of the end to end
+// tests are deserialized into objects allocated from the heap, compared with
+// objects allocated from an arena which is released after each batch.
+// Built and run by 'python3 -m benchmarks.ArenaThroughput'.
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <memory>
+#include <memory_resource>
+#include <string>
+#include <vector>
+
+#include "converters.h"
+#include "Transaction.h"
+
+
+struct Payload
+{
+  std::vector<uint8_t> bytes;
+  TransactionType      type;
+  uint8_t              version;
+};
+
+
+static std::vector<uint8_t> HexToBytes( const std::string& hex )
+{
+  std::vector<uint8_t> bytes;
+
+  for( size_t i = 0; i < hex.length(); i += 2 )
+  {
+    bytes.push_back( (uint8_t) strtol( hex.substr( i, 2 ).c_str(), NULL, 16 ) );
+  }
+
+  return bytes;
+}
+
+
+// Returns the nanoseconds per payload of 'iterations' batches of all payloads,
+// each deserialized by 'deserialize' and freed at once by 'free_batch'
+template<typename D, typename F>
+static double Measure( std::vector<Payload>& payloads, const size_t iterations, D deserialize, F free_batch )
+{
+  const auto start = std::chrono::steady_clock::now();
+
+  for( size_t i=0; i<iterations; ++i )
+  {
+    for( Payload& payload : payloads )
+    {
+      if( !deserialize( payload ) )
+      {
+        printf( "Error: test vector of type 0x%X failed!\n", (uint32_t) payload.type );
+        exit( 1 );
+      }
+    }
+
+    free_batch();
+  }
+
+  const std::chrono::duration<double, std::nano> elapsed = std::chrono::steady_clock::now() - start;
+
+  return elapsed.count() / ( iterations * payloads.size() );
+}
+
+
+int main( int argc, char* argv[] )
+{
+  const size_t iterations = argc > 1 ? strtoul( argv[1], NULL, 10 ) : 2000;
+
+  #include "payloads.h"
+
+  std::vector<Payload> inputs;
+  size_t               total_bytes = 0;
+
+  for( const std::string& hex : payloads )
+  {
+    Payload payload;
+    payload.bytes = HexToBytes( hex );
+
+    Transaction header;
+    RawBuffer   buffer( payload.bytes.data(), payload.bytes.size() );
+
+    if( !header.Deserialize( buffer ) )
+    {
+      printf( "Error: Was not able to deserialize header!\n" );
+      return 1;
+    }
+
+    payload.type    = header.mType;
+    payload.version = header.mEntityBody.mVersion;
+
+    total_bytes += payload.bytes.size();
+    inputs.push_back( std::move( payload ) );
+  }
+
+  // the objects of a batch are kept until the whole batch was deserialized
+  std::vector<std::unique_ptr<ICatbuffer>> heap_objects;
+  std::vector<ArenaPtr>                    arena_objects;
+  heap_objects.reserve( inputs.size() );
+  arena_objects.reserve( inputs.size() );
+
+  const double heap_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    RawBuffer                   buffer( payload.bytes.data(), payload.bytes.size() );
+    std::unique_ptr<ICatbuffer> object = create_type_TransactionType( payload.type, payload.version );
+    const bool                  succ   = object->Deserialize( buffer );
+
+    heap_objects.push_back( std::move( object ) );
+    return succ;
+  }, [&]() { heap_objects.clear(); } );
+
+  // the arena starts with a buffer which is large enough for a batch, and is rewound to it by 'release()'
+  std::vector<std::byte>              memory( 64 * total_bytes );
+  std::pmr::monotonic_buffer_resource arena( memory.data(), memory.size() );
+
+  const double arena_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    RawBuffer  buffer( payload.bytes.data(), payload.bytes.size() );
+    ArenaPtr   object = create_type_TransactionType( payload.type, payload.version, &arena );
+    const bool succ   = object->Deserialize( buffer );
+
+    arena_objects.push_back( std::move( object ) );
+    return succ;
+  }, [&]() { arena_objects.clear(); arena.release(); } );
+
+  // the objects only hold memory of the arena, so they needn't be destroyed before it is released
+  const double arena_release_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    RawBuffer  buffer( payload.bytes.data(), payload.bytes.size() );
+    ArenaPtr   object = create_type_TransactionType( payload.type, payload.version, &arena );
+    const bool succ   = object->Deserialize( buffer );
+
+    object.release();
+    return succ;
+  }, [&]() { arena.release(); } );
+
+  printf( "{\"payloads\": %zu, \"bytes\": %zu, \"heap_ns\": %f, \"arena_ns\": %f, \"arena_release_ns\": %f}\n",
+          inputs.size(), total_bytes, heap_ns, arena_ns, arena_release_ns );
+
+  return 0;
+}
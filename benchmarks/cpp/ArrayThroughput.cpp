@@ -0,0 +1,154 @@
+// Measures how fast the generated code deserializes and serializes structs
+// with large arrays: multi kilobyte bitcoin scripts (-DCATBUFFER_BITCOIN),
+// and Symbol transfers with many mosaics and multisig modifications with
+// many addresses (-DCATBUFFER_SYMBOL).
+// Built and run by 'python3 -m benchmarks.ArrayThroughput'.
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <memory>
+#include <vector>
+
+#if defined(CATBUFFER_BITCOIN)
+#include "Script.h"
+#elif defined(CATBUFFER_SYMBOL)
+#include "TransferTransactionBody.h"
+#include "MultisigAccountModificationTransactionBody.h"
+#endif
+
+
+struct Case
+{
+  const char*                   name;
+  std::vector<uint8_t>          bytes;   // serialized struct
+  std::unique_ptr<ICatbuffer>   object;  // the serialized struct, for measuring 'Serialize()'
+  std::unique_ptr<ICatbuffer> (*create)();
+};
+
+
+template<typename T>
+static Case MakeCase( const char* name, const T& object )
+{
+  Case test_case;
+  test_case.name   = name;
+  test_case.object = std::unique_ptr<ICatbuffer>( new T( object ) );
+  test_case.create = []{ return std::unique_ptr<ICatbuffer>( new T() ); };
+  test_case.bytes.resize( test_case.object->Size() );
+
+  RawBuffer buffer( test_case.bytes.data(), test_case.bytes.size() );
+  if( !test_case.object->Serialize( buffer ) )
+  {
+    printf( "Error: Was not able to serialize '%s'!\n", name );
+    exit( 1 );
+  }
+
+  return test_case;
+}
+
+
+// Returns the nanoseconds per call of 'iterations' calls of 'f'
+template<typename F>
+static double Measure( const Case& test_case, const size_t iterations, F f )
+{
+  const auto start = std::chrono::steady_clock::now();
+
+  for( size_t i=0; i<iterations; ++i )
+  {
+    if( !f() )
+    {
+      printf( "Error: '%s' failed!\n", test_case.name );
+      exit( 1 );
+    }
+  }
+
+  const std::chrono::duration<double, std::nano> elapsed = std::chrono::steady_clock::now() - start;
+
+  return elapsed.count() / iterations;
+}
+
+
+static std::vector<Case> MakeCases()
+{
+  std::vector<Case> cases;
+
+#if defined(CATBUFFER_BITCOIN)
+  for( const size_t size : { 4*1024, 64*1024 } )
+  {
+    Script script;
+    script.mScript.resize( size );
+    script.mScriptSize = size;
+
+    for( size_t i=0; i<size; ++i ){ script.mScript[i] = uint8_t( i*31 ); }
+
+    cases.push_back( MakeCase( size == 4*1024 ? "script 4 KiB" : "script 64 KiB", script ) );
+  }
+
+#elif defined(CATBUFFER_SYMBOL)
+  TransferTransactionBody transfer;
+  memset( transfer.mRecipient_address.data, 1, sizeof(transfer.mRecipient_address.data) );
+  transfer.mMosaics.resize( 255 );
+  transfer.mMosaics_count = 255;
+  transfer.mMessage_size  = 0;
+
+  for( size_t i=0; i<transfer.mMosaics.size(); ++i )
+  {
+    transfer.mMosaics[i].mMosaic_id = i;
+    transfer.mMosaics[i].mAmount    = i*1000;
+  }
+
+  cases.push_back( MakeCase( "transfer 255 mosaics", transfer ) );
+
+  MultisigAccountModificationTransactionBody multisig;
+  multisig.mMin_removal_delta       = 1;
+  multisig.mMin_approval_delta      = 1;
+  multisig.mAddress_additions.resize( 255 );
+  multisig.mAddress_deletions.resize( 255 );
+  multisig.mAddress_additions_count = 255;
+  multisig.mAddress_deletions_count = 255;
+
+  for( size_t i=0; i<255; ++i )
+  {
+    memset( multisig.mAddress_additions[i].data, int(i),       sizeof(UnresolvedAddress) );
+    memset( multisig.mAddress_deletions[i].data, int(255 - i), sizeof(UnresolvedAddress) );
+  }
+
+  cases.push_back( MakeCase( "multisig 510 addresses", multisig ) );
+#endif
+
+  return cases;
+}
+
+
+int main( int argc, char* argv[] )
+{
+  const size_t      iterations = argc > 1 ? strtoul( argv[1], NULL, 10 ) : 2000;
+  std::vector<Case> cases      = MakeCases();
+
+  printf( "[" );
+
+  for( size_t i=0; i<cases.size(); ++i )
+  {
+    Case&                test_case = cases[i];
+    std::vector<uint8_t> output( test_case.bytes.size() );
+
+    // a new object per call, since deserializing appends to the arrays of an object
+    const double deserialize_ns = Measure( test_case, iterations, [&]() {
+      RawBuffer buffer( test_case.bytes.data(), test_case.bytes.size() );
+      std::unique_ptr<ICatbuffer> object = test_case.create();
+      return object->Deserialize( buffer ) && buffer.RemainingSize() == 0;
+    });
+
+    const double serialize_ns = Measure( test_case, iterations, [&]() {
+      RawBuffer buffer( output.data(), output.size() );
+      return test_case.object->Serialize( buffer );
+    });
+
+    printf( "%s{\"case\": \"%s\", \"bytes\": %zu, \"deserialize_ns\": %f, \"serialize_ns\": %f}", i ? ", " : "", test_case.name, test_case.bytes.size(), deserialize_ns, serialize_ns );
+  }
+
+  printf( "]\n" );
+
+  return 0;
+}
@@ -0,0 +1,156 @@
+// Measures how fast the library generated from symbol.yaml deserializes,
+// serializes and sizes the Symbol test vectors of the end to end tests.
+// Built and run by 'python3 -m benchmarks.Throughput'.
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <memory>
+#include <string>
+#include <type_traits>
+#include <vector>
+
+#if __has_include("catbuffer.h")
+#include "catbuffer.h"
+#else
+#include "converters.h"
+#include "Transaction.h"
+#endif
+
+
+struct Payload
+{
+  std::vector<uint8_t>        bytes;
+  TransactionType             type;
+  uint8_t                     version;
+  std::unique_ptr<ICatbuffer> object;  // deserialized once, for measuring 'Serialize()' and 'Size()'
+};
+
+
+static std::vector<uint8_t> HexToBytes( const std::string& hex )
+{
+  std::vector<uint8_t> bytes;
+
+  for( size_t i = 0; i < hex.length(); i += 2 )
+  {
+    bytes.push_back( (uint8_t) strtol( hex.substr( i, 2 ).c_str(), NULL, 16 ) );
+  }
+
+  return bytes;
+}
+
+
+// 'DeserializeUnchecked()' of libraries generated by older revisions is measured as 'Deserialize()'
+template<typename T, typename = void>
+struct HasDeserializeUnchecked : std::false_type {};
+
+template<typename T>
+struct HasDeserializeUnchecked<T, std::void_t<decltype( std::declval<T&>().DeserializeUnchecked( std::declval<RawBuffer&>() ) )>> : std::true_type {};
+
+template<typename T>
+static bool DeserializeUnchecked( T& object, RawBuffer& buffer )
+{
+  if constexpr( HasDeserializeUnchecked<T>::value )
+  {
+    return object.DeserializeUnchecked( buffer );
+  }
+  else
+  {
+    return object.Deserialize( buffer );
+  }
+}
+
+
+// Returns the nanoseconds per payload of 'iterations' runs of 'f' over all payloads
+template<typename F>
+static double Measure( std::vector<Payload>& payloads, const size_t iterations, F f )
+{
+  const auto start = std::chrono::steady_clock::now();
+
+  for( size_t i=0; i<iterations; ++i )
+  {
+    for( Payload& payload : payloads )
+    {
+      if( !f( payload ) )
+      {
+        printf( "Error: test vector of type 0x%X failed!\n", (uint32_t) payload.type );
+        exit( 1 );
+      }
+    }
+  }
+
+  const std::chrono::duration<double, std::nano> elapsed = std::chrono::steady_clock::now() - start;
+
+  return elapsed.count() / ( iterations * payloads.size() );
+}
+
+
+int main( int argc, char* argv[] )
+{
+  const size_t iterations = argc > 1 ? strtoul( argv[1], NULL, 10 ) : 2000;
+
+  #include "payloads.h"
+
+  std::vector<Payload> inputs;
+  size_t               total_bytes = 0;
+
+  for( const std::string& hex : payloads )
+  {
+    Payload payload;
+    payload.bytes = HexToBytes( hex );
+
+    RawBuffer   header_buffer( payload.bytes.data(), payload.bytes.size() );
+    Transaction header;
+
+    if( !header.Deserialize( header_buffer ) )
+    {
+      printf( "Error: Was not able to deserialize header!\n" );
+      return 1;
+    }
+
+    payload.type    = header.mType;
+    payload.version = header.mEntityBody.mVersion;
+    payload.object  = create_type_TransactionType( payload.type, payload.version );
+
+    RawBuffer buffer( payload.bytes.data(), payload.bytes.size() );
+    if( nullptr == payload.object || !payload.object->Deserialize( buffer ) )
+    {
+      printf( "Error: Was not able to deserialize test vector!\n" );
+      return 1;
+    }
+
+    total_bytes += payload.bytes.size();
+    inputs.push_back( std::move( payload ) );
+  }
+
+  std::vector<uint8_t> output( total_bytes );
+  size_t               checksum = 0;
+
+  // a new object per payload, since deserializing appends to the arrays of an object
+  const double deserialize_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    RawBuffer buffer( payload.bytes.data(), payload.bytes.size() );
+    std::unique_ptr<ICatbuffer> object = create_type_TransactionType( payload.type, payload.version );
+    return object->Deserialize( buffer );
+  });
+
+  const double deserialize_unchecked_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    RawBuffer buffer( payload.bytes.data(), payload.bytes.size() );
+    std::unique_ptr<ICatbuffer> object = create_type_TransactionType( payload.type, payload.version );
+    return DeserializeUnchecked( *object, buffer );
+  });
+
+  const double serialize_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    RawBuffer buffer( output.data(), payload.bytes.size() );
+    return payload.object->Serialize( buffer );
+  });
+
+  const double size_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    checksum += payload.object->Size();
+    return true;
+  });
+
+  printf( "{\"payloads\": %zu, \"bytes\": %zu, \"deserialize_ns\": %f, \"deserialize_unchecked_ns\": %f, \"has_unchecked\": %s, \"serialize_ns\": %f, \"size_ns\": %f, \"checksum\": %zu}\n",
+          inputs.size(), total_bytes, deserialize_ns, deserialize_unchecked_ns, HasDeserializeUnchecked<ICatbuffer>::value ? "true" : "false", serialize_ns, size_ns, checksum );
+
+  return 0;
+}
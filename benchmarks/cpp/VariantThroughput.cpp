@@ -0,0 +1,146 @@
+// Measures how fast the Symbol test vectors of the end to end tests are
+// deserialized, and how fast the embedded transactions of the aggregates are
+// visited, with the library built with or without '--variant' (-DVARIANT).
+// Built and run by 'python3 -m benchmarks.VariantThroughput'.
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "converters.h"
+#include "Transaction.h"
+#include "AggregateCompleteTransaction.h"
+#include "AggregateBondedTransaction.h"
+
+
+struct Payload
+{
+  std::vector<uint8_t> bytes;
+  TransactionType      type;
+  uint8_t              version;
+};
+
+
+static std::vector<uint8_t> HexToBytes( const std::string& hex )
+{
+  std::vector<uint8_t> bytes;
+
+  for( size_t i = 0; i < hex.length(); i += 2 )
+  {
+    bytes.push_back( (uint8_t) strtol( hex.substr( i, 2 ).c_str(), NULL, 16 ) );
+  }
+
+  return bytes;
+}
+
+
+// Returns the aggregate body of 'object', or nullptr if it isn't an aggregate
+static AggregateTransactionBody* Body( ICatbuffer* object )
+{
+  if( auto* complete = dynamic_cast<AggregateCompleteTransaction*>( object ) ){ return &complete->mAggregateTransactionBody; }
+  if( auto* bonded   = dynamic_cast<AggregateBondedTransaction*>( object ) ){ return &bonded->mAggregateTransactionBody; }
+  return nullptr;
+}
+
+
+// the elements are the same in both builds, only their storage differs
+#ifdef VARIANT
+static size_t ElementSize( EmbeddedTransactionVariant& element ){ return VariantSize( element ); }
+#else
+static size_t ElementSize( std::unique_ptr<ICatbuffer>& element ){ return element->Size(); }
+#endif
+
+
+// Returns the nanoseconds per payload of 'iterations' runs of 'f' over all payloads
+template<typename F>
+static double Measure( std::vector<Payload>& payloads, const size_t iterations, F f )
+{
+  const auto start = std::chrono::steady_clock::now();
+
+  for( size_t i=0; i<iterations; ++i )
+  {
+    for( Payload& payload : payloads )
+    {
+      if( !f( payload ) )
+      {
+        printf( "Error: test vector of type 0x%X failed!\n", (uint32_t) payload.type );
+        exit( 1 );
+      }
+    }
+  }
+
+  const std::chrono::duration<double, std::nano> elapsed = std::chrono::steady_clock::now() - start;
+
+  return elapsed.count() / ( iterations * payloads.size() );
+}
+
+
+int main( int argc, char* argv[] )
+{
+  const size_t iterations = argc > 1 ? strtoul( argv[1], NULL, 10 ) : 2000;
+
+  #include "payloads.h"
+
+  std::vector<Payload>                     inputs;
+  std::vector<Payload>                     aggregate_inputs;
+  std::vector<std::unique_ptr<ICatbuffer>> aggregates;
+  size_t                                   elements = 0;
+
+  for( const std::string& hex : payloads )
+  {
+    Payload payload;
+    payload.bytes = HexToBytes( hex );
+
+    Transaction header;
+    RawBuffer   buffer( payload.bytes.data(), payload.bytes.size() );
+
+    if( !header.Deserialize( buffer ) )
+    {
+      printf( "Error: Was not able to deserialize header!\n" );
+      return 1;
+    }
+
+    payload.type    = header.mType;
+    payload.version = header.mEntityBody.mVersion;
+
+    // the aggregates with embedded transactions are measured on their own too
+    std::unique_ptr<ICatbuffer> object = create_type_TransactionType( payload.type, payload.version );
+    RawBuffer                   object_buffer( payload.bytes.data(), payload.bytes.size() );
+
+    if( object->Deserialize( object_buffer ) && Body( object.get() ) && !Body( object.get() )->mTransactions.empty() )
+    {
+      elements += Body( object.get() )->mTransactions.size();
+      aggregates.push_back( std::move( object ) );
+      aggregate_inputs.push_back( payload );
+    }
+
+    inputs.push_back( std::move( payload ) );
+  }
+
+  const auto deserialize = [&]( Payload& payload ) {
+    RawBuffer                   buffer( payload.bytes.data(), payload.bytes.size() );
+    std::unique_ptr<ICatbuffer> object = create_type_TransactionType( payload.type, payload.version );
+    return object->Deserialize( buffer );
+  };
+
+  const double deserialize_ns           = Measure( inputs,           iterations, deserialize );
+  const double aggregate_deserialize_ns = Measure( aggregate_inputs, iterations, deserialize );
+
+  // visits the embedded transactions of the aggregates which were deserialized once
+  size_t       checksum = 0;
+  size_t       next     = 0;
+  const double visit_ns = Measure( aggregate_inputs, iterations, [&]( Payload& ) {
+    for( auto& element : Body( aggregates[next].get() )->mTransactions ){ checksum += ElementSize( element ); }
+
+    next = ( next + 1 ) % aggregates.size();
+    return true;
+  });
+
+  printf( "{\"payloads\": %zu, \"aggregates\": %zu, \"elements\": %zu, \"deserialize_ns\": %f, \"aggregate_deserialize_ns\": %f, \"visit_ns\": %f, \"checksum\": %zu}\n",
+          inputs.size(), aggregates.size(), elements, deserialize_ns, aggregate_deserialize_ns, visit_ns, checksum );
+
+  return 0;
+}
@@ -0,0 +1,156 @@
+// Measures how fast the views generated from symbol.yaml validate and read
+// the Symbol test vectors of the end to end tests, compared with the
+// owning classes.
+// Built and run by 'python3 -m benchmarks.ViewThroughput'.
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "converters.h"
+#include "views.h"
+#include "Transaction.h"
+#include "TransactionView.h"
+
+
+struct Payload
+{
+  std::vector<uint8_t> bytes;
+  TransactionType      type;
+  uint8_t              version;
+};
+
+
+static std::vector<uint8_t> HexToBytes( const std::string& hex )
+{
+  std::vector<uint8_t> bytes;
+
+  for( size_t i = 0; i < hex.length(); i += 2 )
+  {
+    bytes.push_back( (uint8_t) strtol( hex.substr( i, 2 ).c_str(), NULL, 16 ) );
+  }
+
+  return bytes;
+}
+
+
+// Reads the fields of a transaction header which are typically needed, e.g. for sorting by fee
+static uint64_t ReadHeader( const TransactionView& header )
+{
+  return header.GetFee() + header.GetDeadline() + (uint16_t) header.GetType() + header.GetEntityBody().GetSigner_public_key().data[0];
+}
+
+
+// Returns the nanoseconds per payload of 'iterations' runs of 'f' over all payloads
+template<typename F>
+static double Measure( std::vector<Payload>& payloads, const size_t iterations, F f )
+{
+  const auto start = std::chrono::steady_clock::now();
+
+  for( size_t i=0; i<iterations; ++i )
+  {
+    for( Payload& payload : payloads )
+    {
+      if( !f( payload ) )
+      {
+        printf( "Error: test vector of type 0x%X failed!\n", (uint32_t) payload.type );
+        exit( 1 );
+      }
+    }
+  }
+
+  const std::chrono::duration<double, std::nano> elapsed = std::chrono::steady_clock::now() - start;
+
+  return elapsed.count() / ( iterations * payloads.size() );
+}
+
+
+int main( int argc, char* argv[] )
+{
+  const size_t iterations = argc > 1 ? strtoul( argv[1], NULL, 10 ) : 2000;
+
+  #include "payloads.h"
+
+  std::vector<Payload> inputs;
+  size_t               total_bytes = 0;
+
+  for( const std::string& hex : payloads )
+  {
+    Payload payload;
+    payload.bytes = HexToBytes( hex );
+
+    TransactionView header;
+    RawBuffer       buffer( payload.bytes.data(), payload.bytes.size() );
+
+    if( !header.Parse( buffer ) )
+    {
+      printf( "Error: Was not able to parse header!\n" );
+      return 1;
+    }
+
+    payload.type    = header.GetType();
+    payload.version = header.GetEntityBody().GetVersion();
+
+    total_bytes += payload.bytes.size();
+    inputs.push_back( std::move( payload ) );
+  }
+
+  uint64_t checksum = 0;
+
+  // the owning classes copy every field, so reading them afterwards costs nothing
+  const double deserialize_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    RawBuffer                   buffer( payload.bytes.data(), payload.bytes.size() );
+    std::unique_ptr<ICatbuffer> object = create_type_TransactionType( payload.type, payload.version );
+    return object->Deserialize( buffer );
+  });
+
+  // the views validate the whole transaction, and read the fields of its header
+  const double view_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    const uint8_t* ptr = payload.bytes.data();
+    const uint8_t* end = ptr + payload.bytes.size();
+
+    if( !parse_view_TransactionType( payload.type, payload.version, ptr, end ) ){ return false; }
+
+    checksum += ReadHeader( ViewAt<TransactionView>( payload.bytes.data(), end ) );
+    return true;
+  });
+
+  const double view_unchecked_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    const uint8_t* ptr = payload.bytes.data();
+    const uint8_t* end = ptr + payload.bytes.size();
+
+    parse_view_unchecked_TransactionType( payload.type, payload.version, ptr, end );
+
+    checksum += ReadHeader( ViewAt<TransactionView>( payload.bytes.data(), end ) );
+    return true;
+  });
+
+  // only the header
+  const double header_deserialize_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    RawBuffer   buffer( payload.bytes.data(), payload.bytes.size() );
+    Transaction header;
+
+    if( !header.Deserialize( buffer ) ){ return false; }
+
+    checksum += header.mFee + header.mDeadline + (uint16_t) header.mType + header.mEntityBody.mSigner_public_key.data[0];
+    return true;
+  });
+
+  const double header_view_ns = Measure( inputs, iterations, [&]( Payload& payload ) {
+    RawBuffer       buffer( payload.bytes.data(), payload.bytes.size() );
+    TransactionView header;
+
+    if( !header.Parse( buffer ) ){ return false; }
+
+    checksum += ReadHeader( header );
+    return true;
+  });
+
+  printf( "{\"payloads\": %zu, \"bytes\": %zu, \"deserialize_ns\": %f, \"view_ns\": %f, \"view_unchecked_ns\": %f, \"header_deserialize_ns\": %f, \"header_view_ns\": %f, \"checksum\": %llu}\n",
+          inputs.size(), total_bytes, deserialize_ns, view_ns, view_unchecked_ns, header_deserialize_ns, header_view_ns, (unsigned long long) checksum );
+
+  return 0;
+}
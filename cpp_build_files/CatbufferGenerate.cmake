@@ -0,0 +1,119 @@
+# Runs the catbuffer generator as part of a CMake build.
+#
+# Usage:
+#
+#   include(path/to/CatBuffer/cpp_build_files/CatbufferGenerate.cmake)
+#
+#   catbuffer_generate( TARGET     catbuffer_symbol
+#                       SCHEMA     ${PROJECT_SOURCE_DIR}/symbol.yaml
+#                       OUTPUT_DIR ${PROJECT_BINARY_DIR}/catbuffer_symbol
+#                       [GENERATE_PRINT] [FAST_BUILD] [PRECOMPILE_HEADERS] [AMALGAMATE] [ARENA] )
+#
+#   target_link_libraries(my_app PRIVATE catbuffer_symbol)
+#
+# This creates a static library 'TARGET' from the generated sources. The
+# generator is run with '--incremental', '--depfile' and '--stamp', so that
+# it only runs when the schema or the generator changed, and so that only
+# the generated files with changed content are recompiled.
+#
+# FAST_BUILD runs the generator with '--fast-build', so that the generated
+# files only include the headers they need. PRECOMPILE_HEADERS precompiles
+# the headers included by all generated files (requires CMake 3.16).
+# AMALGAMATE runs the generator with '--amalgamate', so that the library
+# is compiled from a single catbuffer.cpp. ARENA runs the generator with
+# '--arena', so that the generated classes can allocate from a
+# std::pmr::memory_resource (see cpp_source/Arena.h). VARIANT runs the
+# generator with '--variant', so that the elements of 'array_sized' fields
+# are stored in a std::variant (see cpp_source/Variant.h).
+
+cmake_minimum_required(VERSION 3.12)
+
+find_package(Python3 COMPONENTS Interpreter REQUIRED)
+
+set(CATBUFFER_ROOT_DIR ${CMAKE_CURRENT_LIST_DIR}/..)
+
+
+function(catbuffer_generate)
+  cmake_parse_arguments(CB "GENERATE_PRINT;FAST_BUILD;PRECOMPILE_HEADERS;AMALGAMATE;ARENA;VARIANT" "TARGET;SCHEMA;OUTPUT_DIR" "" ${ARGN})
+
+  get_filename_component(CB_SCHEMA     ${CB_SCHEMA}     ABSOLUTE)
+  get_filename_component(CB_OUTPUT_DIR ${CB_OUTPUT_DIR} ABSOLUTE)
+
+  set(CB_STAMP   ${CB_OUTPUT_DIR}/catbuffer.stamp)
+  set(CB_DEPFILE ${CB_OUTPUT_DIR}/catbuffer.d)
+  set(CB_COMMAND ${Python3_EXECUTABLE} -m generator ${CB_SCHEMA} ${CB_OUTPUT_DIR}
+                 --incremental --depfile ${CB_DEPFILE} --stamp ${CB_STAMP})
+
+  if(CB_GENERATE_PRINT)
+    list(APPEND CB_COMMAND --generate-print)
+  endif()
+
+  if(CB_FAST_BUILD)
+    list(APPEND CB_COMMAND --fast-build)
+  endif()
+
+  if(CB_AMALGAMATE)
+    list(APPEND CB_COMMAND --amalgamate)
+  endif()
+
+  if(CB_ARENA)
+    list(APPEND CB_COMMAND --arena)
+  endif()
+
+  if(CB_VARIANT)
+    list(APPEND CB_COMMAND --variant)
+  endif()
+
+  # The sources of the library have to be known at configure time, so generate them once if needed
+  if(NOT EXISTS ${CB_STAMP})
+    execute_process(COMMAND ${CB_COMMAND} WORKING_DIRECTORY ${CATBUFFER_ROOT_DIR} OUTPUT_QUIET RESULT_VARIABLE CB_RESULT)
+    if(NOT CB_RESULT EQUAL 0)
+      message(FATAL_ERROR "catbuffer: generating ${CB_SCHEMA} failed")
+    endif()
+  endif()
+
+  # Structs added to or removed from the schema are picked up by re-globbing at build time
+  file(GLOB CB_GEN_SRC_FILES    CONFIGURE_DEPENDS ${CB_OUTPUT_DIR}/generated_src/*.cpp)
+  file(GLOB CB_STATIC_SRC_FILES CONFIGURE_DEPENDS ${CB_OUTPUT_DIR}/static_src/*.cpp)
+  list(FILTER CB_STATIC_SRC_FILES EXCLUDE REGEX ".*/cmd\\.cpp$")
+
+  # Dependencies are also listed explicitly for generators without DEPFILE support (Makefiles before CMake 3.20)
+  file(GLOB CB_GENERATOR_FILES ${CATBUFFER_ROOT_DIR}/generator/*.py ${CATBUFFER_ROOT_DIR}/cpp_source/*)
+
+  set(CB_DEPFILE_ARGS "")
+  if(CMAKE_GENERATOR MATCHES "Ninja" OR NOT CMAKE_VERSION VERSION_LESS 3.20)
+    set(CB_DEPFILE_ARGS DEPFILE ${CB_DEPFILE})
+  endif()
+
+  add_custom_command(
+    OUTPUT            ${CB_STAMP}
+    BYPRODUCTS        ${CB_GEN_SRC_FILES}
+    COMMAND           ${CB_COMMAND}
+    DEPENDS           ${CB_SCHEMA} ${CB_GENERATOR_FILES}
+    ${CB_DEPFILE_ARGS}
+    WORKING_DIRECTORY ${CATBUFFER_ROOT_DIR}
+    COMMENT           "Generating catbuffer sources for ${CB_SCHEMA}"
+    VERBATIM)
+
+  add_custom_target(${CB_TARGET}_generate DEPENDS ${CB_STAMP})
+
+  add_library(${CB_TARGET} STATIC ${CB_GEN_SRC_FILES} ${CB_STATIC_SRC_FILES})
+  add_dependencies(${CB_TARGET} ${CB_TARGET}_generate)
+  target_include_directories(${CB_TARGET} PUBLIC ${CB_OUTPUT_DIR}/generated_src ${CB_OUTPUT_DIR}/static_src)
+  target_compile_features(${CB_TARGET} PUBLIC cxx_std_17)
+
+  # a single amalgamated source gains nothing from precompiled headers
+  if(CB_PRECOMPILE_HEADERS AND NOT CB_AMALGAMATE AND COMMAND target_precompile_headers)
+    set(CB_PCH_HEADERS <cstdint> <memory> <vector>)
+    if(CB_GENERATE_PRINT)
+      list(APPEND CB_PCH_HEADERS <iostream> <iomanip> <string>)
+    endif()
+
+    target_precompile_headers(${CB_TARGET} PRIVATE ${CB_PCH_HEADERS} ${CB_OUTPUT_DIR}/static_src/ICatbuffer.h ${CB_OUTPUT_DIR}/generated_src/types.h)
+  endif()
+
+  if(CB_GENERATE_PRINT)
+    add_executable(${CB_TARGET}_cmd ${CB_OUTPUT_DIR}/static_src/cmd.cpp)
+    target_link_libraries(${CB_TARGET}_cmd PUBLIC ${CB_TARGET})
+  endif()
+endfunction()
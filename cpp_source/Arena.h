@@ -0,0 +1,87 @@
+#pragma once
+#include <cstddef>
+#include <memory>
+#include <memory_resource>
+#include <new>
+#include "ICatbuffer.h"
+
+
+
+/**
+ * Helpers of the classes generated with '--arena', which allocate their
+ * memory from a caller-supplied arena (a 'std::pmr::memory_resource')
+ * instead of the heap.
+ *
+ * An object constructed with an arena allocates its arrays and the arrays
+ * of its nested objects from it, and the elements of its 'array_sized'
+ * fields are created in it by the factories of 'converters.h', so that
+ * deserializing a whole object graph doesn't call 'new' or 'malloc':
+ *
+ *    ------------------------------------------------------------
+ *    std::pmr::monotonic_buffer_resource arena( 1 << 20 );
+ *
+ *    for( ... each transaction of the batch ... )
+ *    {
+ *      ArenaPtr transaction = create_type_TransactionType( type, version, &arena );
+ *      if( !transaction || !transaction->Deserialize( buffer ) ){ ... }
+ *      ...
+ *    }
+ *
+ *    // after the objects were destroyed, all their memory is freed at once
+ *    arena.release();
+ *    ------------------------------------------------------------
+ *
+ * The arena must outlive the objects. Copies of an object allocate from
+ * the default resource, while moves keep the arena of the moved arrays.
+ */
+
+
+
+/**
+ * Destroys an object created by 'MakeArenaObject()' and returns its
+ * memory to the arena it was allocated from.
+ */
+class ArenaDeleter
+{
+public:
+
+  ArenaDeleter() = default;
+
+  ArenaDeleter( std::pmr::memory_resource* arena, const size_t size, const size_t alignment ) : mArena( arena ), mSize( size ), mAlignment( alignment ) { }
+
+
+  void operator()( ICatbuffer* object ) const
+  {
+    void* memory = dynamic_cast<void*>( object ); // start of the most derived object
+
+    object->~ICatbuffer();
+    mArena->deallocate( memory, mSize, mAlignment );
+  }
+
+
+private:
+
+  std::pmr::memory_resource* mArena     = nullptr;
+  size_t                     mSize      = 0;
+  size_t                     mAlignment = 0;
+};
+
+
+/**
+ * Owning pointer of an object allocated from an arena, e.g. the elements
+ * of the 'array_sized' fields.
+ */
+using ArenaPtr = std::unique_ptr<ICatbuffer, ArenaDeleter>;
+
+
+/**
+ * Creates an object of the generated class 'T' in 'arena', which also
+ * allocates its arrays from 'arena'.
+ */
+template<typename T>
+inline ArenaPtr MakeArenaObject( std::pmr::memory_resource* arena )
+{
+  void* memory = arena->allocate( sizeof(T), alignof(T) );
+
+  return ArenaPtr( new (memory) T( arena ), ArenaDeleter( arena, sizeof(T), alignof(T) ) );
+}
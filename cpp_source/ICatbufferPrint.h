@@ -20,6 +20,18 @@ public:
   virtual bool Deserialize( RawBuffer& buffer ) = 0;
 
 
+  /**
+   * Like 'Deserialize()', but without checking that the buffer contains
+   * enough data for the fixed size fields. Only use it for buffers which
+   * are known to be valid, e.g. which were already deserialized once with
+   * 'Deserialize()' or were written by 'Serialize()'.
+   *
+   * @param[in] buffer  The raw data which will be deserialized, known to be valid
+   * @return            False if a reserved field or an element type is invalid
+   */
+  virtual bool DeserializeUnchecked( RawBuffer& buffer ) = 0;
+
+
   /**
    * Takes the transaction fields and deserializes them into a raw buffer
    *
@@ -1,5 +1,6 @@
 #pragma once
 #include <cstdint>
+#include <limits>
 #include <stddef.h>
 
 
@@ -74,6 +75,34 @@ class RawBuffer
   uint8_t* GetOffsetPtrAndMove( size_t n );
 
 
+  /**
+   * Returns pointer to the end of the buffer, i.e. one past its last byte.
+   * Together with 'GetOffsetPtr()' it forms a cursor that can be moved
+   * without updating the offset for every field:
+   *
+   *    ------------------------------------------------------------
+   *    uint8_t*       ptr = buffer.GetOffsetPtr();
+   *    uint8_t* const end = buffer.GetEndPtr();
+   *
+   *    if( size_t(end - ptr) < sizeof(uint32_t) ){ return false; }
+   *    value = *( (uint32_t*) ptr ); ptr += sizeof(uint32_t);
+   *
+   *    buffer.SetOffsetPtr( ptr );
+   *    ------------------------------------------------------------
+   */
+  uint8_t* GetEndPtr( ) const;
+
+
+  /**
+   * Sets offset to the position of 'ptr' within buffer, e.g. a cursor
+   * obtained with 'GetOffsetPtr()' and moved at most to 'GetEndPtr()'.
+   *
+   * @param[in] ptr
+   *   Pointer within buffer, from 'GetOffsetPtr()' to 'GetEndPtr()'.
+   */
+  void SetOffsetPtr( uint8_t* ptr );
+
+
   /**
    * The total size of the buffer.
    */
@@ -92,8 +121,153 @@ class RawBuffer
   size_t GetOffset() const;
 
 
+  /**
+   * Limits the memory that 'Deserialize()' may allocate for the arrays of
+   * the structs read from this buffer, including nested structs and the
+   * elements of 'array_sized' fields, to 'bytes'. Deserializing fails if
+   * the budget is exceeded. By default the budget is unlimited:
+   *
+   *    ------------------------------------------------------------
+   *    RawBuffer buffer( data, size );
+   *    buffer.SetAllocationBudget( 16*size );
+   *
+   *    if( !transaction.Deserialize( buffer ) ){ ... }
+   *    ------------------------------------------------------------
+   *
+   * @param[in] bytes
+   *   Number of bytes that may be allocated.
+   */
+  void SetAllocationBudget( const size_t bytes );
+
+
+  /**
+   * Takes the memory of 'n' elements of 'size' bytes from the allocation
+   * budget, before they are allocated.
+   *
+   * @return
+   *   False, without taking anything, if the remaining budget is smaller
+   *   than 'n*size' bytes.
+   */
+  bool Allocate( const size_t n, const size_t size );
+
+
+  /**
+   * The number of bytes that may still be allocated.
+   */
+  size_t RemainingAllocationBudget() const;
+
+
  private:
         uint8_t* mPtr;    ///< Pointer to start of byte buffer
   const size_t   mSize;   ///< Size of all of byte buffer
         size_t   mOffset; ///< Offset in buffer relative to 'mPtr'
+        size_t   mBudget; ///< Bytes that may still be allocated while deserializing
 };
+
+
+
+// the methods are defined inline, so that the compiler can inline them in
+// the generated 'Deserialize()' and 'Serialize()' methods
+
+inline RawBuffer::RawBuffer( uint8_t* ptr, const size_t size )
+  : mPtr    ( ptr    ),
+    mSize   ( size   ),
+    mOffset ( 0      ),
+    mBudget ( std::numeric_limits<size_t>::max() )
+{
+
+}
+
+
+inline bool RawBuffer::CanRead( const size_t n ) const
+{
+  return ( (mSize - mOffset) >= n );
+}
+
+
+inline bool RawBuffer::MoveOffset( const size_t offset)
+{
+  if( offset > mSize - mOffset ) // exceed buffer size, 'mOffset' never exceeds 'mSize'
+  {
+    return false;
+  }
+
+  mOffset += offset;
+
+  return true;
+}
+
+
+inline uint8_t* RawBuffer::GetOffsetPtr( ) const
+{
+  return (mPtr + mOffset);
+}
+
+
+inline uint8_t* RawBuffer::GetOffsetPtrAndMove( const size_t n )
+{
+  if( n > mSize - mOffset )
+  {
+    return nullptr;
+  }
+
+  uint8_t* out = mPtr + mOffset;
+  mOffset += n;
+
+  return out;
+}
+
+
+inline uint8_t* RawBuffer::GetEndPtr( ) const
+{
+  return (mPtr + mSize);
+}
+
+
+inline void RawBuffer::SetOffsetPtr( uint8_t* ptr )
+{
+  mOffset = ptr - mPtr;
+}
+
+
+inline size_t RawBuffer::TotalSize() const
+{
+  return mSize;
+}
+
+
+inline size_t RawBuffer::RemainingSize() const
+{
+  return mSize - mOffset;
+}
+
+
+inline size_t RawBuffer::GetOffset() const
+{
+  return mOffset;
+}
+
+
+inline void RawBuffer::SetAllocationBudget( const size_t bytes )
+{
+  mBudget = bytes;
+}
+
+
+inline bool RawBuffer::Allocate( const size_t n, const size_t size )
+{
+  if( n > mBudget / size ) // 'n*size' could overflow
+  {
+    return false;
+  }
+
+  mBudget -= n*size;
+
+  return true;
+}
+
+
+inline size_t RawBuffer::RemainingAllocationBudget() const
+{
+  return mBudget;
+}
@@ -0,0 +1,90 @@
+#pragma once
+#include <type_traits>
+#include <variant>
+#include "ICatbuffer.h"
+
+
+
+/**
+ * Helpers of the classes generated with '--variant', which store the
+ * elements of their 'array_sized' fields in place, in a 'std::variant' of
+ * the structs which can follow the header of the field, e.g. a
+ * 'std::vector<EmbeddedTransactionVariant>' (see the generated header
+ * 'EmbeddedTransactionVariant.h').
+ *
+ * The elements are contiguous in their array and keep their concrete type,
+ * so they are accessed with 'std::get_if' or 'std::visit' instead of a
+ * 'dynamic_cast', and the helpers below call the methods of the held struct
+ * directly instead of through the 'ICatbuffer' interface:
+ *
+ *    ------------------------------------------------------------
+ *    for( EmbeddedTransactionVariant& element : body.mTransactions )
+ *    {
+ *      if( auto* transfer = std::get_if<EmbeddedTransferTransaction>( &element ) ){ ... }
+ *
+ *      size += VariantSize( element );
+ *    }
+ *    ------------------------------------------------------------
+ */
+
+
+
+/**
+ * Same as 'ICatbuffer::Deserialize()' of the struct held by 'element'.
+ */
+template<typename V>
+inline bool VariantDeserialize( V& element, RawBuffer& buffer )
+{
+  return std::visit( [&]( auto& object ){ using T = std::decay_t<decltype(object)>; return object.T::Deserialize( buffer ); }, element );
+}
+
+
+/**
+ * Same as 'ICatbuffer::DeserializeUnchecked()' of the struct held by 'element'.
+ */
+template<typename V>
+inline bool VariantDeserializeUnchecked( V& element, RawBuffer& buffer )
+{
+  return std::visit( [&]( auto& object ){ using T = std::decay_t<decltype(object)>; return object.T::DeserializeUnchecked( buffer ); }, element );
+}
+
+
+/**
+ * Same as 'ICatbuffer::Serialize()' of the struct held by 'element'.
+ */
+template<typename V>
+inline bool VariantSerialize( V& element, RawBuffer& buffer )
+{
+  return std::visit( [&]( auto& object ){ using T = std::decay_t<decltype(object)>; return object.T::Serialize( buffer ); }, element );
+}
+
+
+/**
+ * Same as 'ICatbuffer::Size()' of the struct held by 'element'.
+ */
+template<typename V>
+inline size_t VariantSize( V& element )
+{
+  return std::visit( []( auto& object ){ using T = std::decay_t<decltype(object)>; return object.T::Size(); }, element );
+}
+
+
+/**
+ * Same as 'ICatbuffer::Print()' of the struct held by 'element', only
+ * available if the print methods were generated.
+ */
+template<typename V>
+inline void VariantPrint( V& element, const size_t level )
+{
+  std::visit( [&]( auto& object ){ using T = std::decay_t<decltype(object)>; object.T::Print( level ); }, element );
+}
+
+
+/**
+ * Returns the struct held by 'element' through its 'ICatbuffer' interface.
+ */
+template<typename V>
+inline ICatbuffer& VariantObject( V& element )
+{
+  return std::visit( []( auto& object ) -> ICatbuffer& { return object; }, element );
+}
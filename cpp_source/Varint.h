@@ -5,8 +5,119 @@
 #include "RawBuffer.h"
 
 
-bool writeVarint( const uint64_t var, RawBuffer& buffer );
+inline bool writeVarint( const uint64_t var, RawBuffer& buffer )
+{
+    void* ptr;
 
-std::tuple<uint64_t, bool> readVarint( RawBuffer& buffer );
+    if( var < 0xFD )
+    {
+        ptr = buffer.GetOffsetPtrAndMove(1); if(!ptr){ return false; }
+        *((uint8_t*) ptr) = var;
+    }
+    else if( var < 0xFFFF )
+    { 
+        ptr = buffer.GetOffsetPtrAndMove(1); if(!ptr){ return false; }
+        *((uint8_t*) ptr) = 0xFD;
 
-size_t sizeVarint( const uint64_t var );
+        ptr = buffer.GetOffsetPtrAndMove(2); if(!ptr){ return false; }
+        *((uint16_t*) ptr) = var;
+    }
+    else if( var < 0xFFFF'FFFF )
+    {
+        ptr = buffer.GetOffsetPtrAndMove(1); if(!ptr){ return false; }
+        *((uint8_t*) ptr) = 0xFE;
+
+        ptr = buffer.GetOffsetPtrAndMove(4); if(!ptr){ return false; }
+        *((uint32_t*) ptr) = var;
+    }
+    else
+    {
+        ptr = buffer.GetOffsetPtrAndMove(1); if(!ptr){ return false; }
+        *((uint8_t*) ptr) = 0xFF;
+
+        ptr = buffer.GetOffsetPtrAndMove(8); if(!ptr){ return false; }
+        *((uint64_t*) ptr) = var;
+    }
+
+    return true;
+}
+
+inline std::tuple<uint64_t, bool> readVarint( RawBuffer& buffer )
+{
+    uint64_t result { 0 };
+
+    void* ptr { buffer.GetOffsetPtrAndMove(1) };
+    if( !ptr )
+    {
+        return {0, false};
+    }
+
+    uint8_t  prefix { *((uint8_t*) ptr) };
+
+    switch ( prefix )
+    {
+        case 0xFD: 
+        {
+            ptr    = buffer.GetOffsetPtrAndMove(2); if( !ptr ){ return {0, false}; }
+            result = *((uint16_t*) ptr); 
+            break; 
+        }
+        case 0xFE: 
+        { 
+            ptr    = buffer.GetOffsetPtrAndMove(4); if( !ptr ){ return {0, false}; }
+            result = *((uint32_t*) ptr); 
+            break; 
+        }
+        case 0xFF: 
+        { 
+            ptr    = buffer.GetOffsetPtrAndMove(8); if( !ptr ){ return {0, false}; }
+            result = *((uint64_t*) ptr); 
+            break; 
+        }
+        default:   
+        {
+            result = prefix;
+            break;
+        }
+    }
+
+    return {result, true};
+}
+
+
+inline size_t sizeVarint( const uint64_t var )
+{
+    if     ( var < 0xFD        ) { return 1; }
+    else if( var < 0xFFFF      ) { return 3; }
+    else if( var < 0xFFFF'FFFF ) { return 5; }
+    else                         { return 9; }
+}
+
+
+// Reads a varint at 'ptr' without reading past 'end' and moves 'ptr' past it, used by the generated views
+inline bool readVarint( const uint8_t*& ptr, const uint8_t* const end, uint64_t& value )
+{
+    if( ptr == end )
+    {
+        return false;
+    }
+
+    const uint8_t prefix { *ptr };
+    const size_t  size   { size_t( 0xFD == prefix ? 2 : 0xFE == prefix ? 4 : 0xFF == prefix ? 8 : 0 ) };
+
+    if( size_t(end - ptr) - 1 < size )
+    {
+        return false;
+    }
+
+    switch ( size )
+    {
+        case 2:  { value = *((const uint16_t*) (ptr+1)); break; }
+        case 4:  { value = *((const uint32_t*) (ptr+1)); break; }
+        case 8:  { value = *((const uint64_t*) (ptr+1)); break; }
+        default: { value = prefix;                       break; }
+    }
+
+    ptr += 1 + size;
+    return true;
+}
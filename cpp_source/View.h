@@ -0,0 +1,270 @@
+#pragma once
+#include <cstdint>
+#include <cstring>
+#include <iterator>
+#include <stddef.h>
+#include "RawBuffer.h"
+
+
+
+/**
+ * Helpers of the read-only views, which are generated next to each class,
+ * e.g. 'TransferTransactionBodyView' in 'TransferTransactionBodyView.h'.
+ *
+ * A view points to the bytes of a serialized struct instead of copying
+ * them. 'Parse()' validates the struct like 'Deserialize()' does, but
+ * only remembers where the fields are, and the 'Get...()' accessors read
+ * the fields from the bytes when they are called. Views, their arrays and
+ * the iterators of the arrays never allocate memory, and the bytes must
+ * outlive them:
+ *
+ *    ------------------------------------------------------------
+ *    RawBuffer                   buffer( data, size );
+ *    TransferTransactionBodyView transfer;
+ *
+ *    if( !transfer.Parse( buffer ) ){ ... }
+ *
+ *    for( const UnresolvedMosaicView& mosaic : transfer.GetMosaics() )
+ *    {
+ *      total += mosaic.GetAmount();
+ *    }
+ *    ------------------------------------------------------------
+ *
+ * Each view has the methods:
+ *
+ *    bool Parse         ( RawBuffer& buffer );                            // validates the struct at the offset of 'buffer' and moves the offset past it
+ *    bool Parse         ( const uint8_t*& ptr, const uint8_t* end );      // same for the struct at 'ptr', 'ptr' is only valid if true is returned
+ *    void ParseUnchecked( const uint8_t*& ptr, const uint8_t* end );      // same for a struct which was validated before, without any checks
+ *
+ *    const uint8_t* Data() const;  // the serialized struct
+ *    size_t         Size() const;  // its size in bytes
+ */
+
+
+
+/**
+ * Reads a field of type 'T' (builtin, enum or alias) at 'ptr', which needs
+ * not be aligned.
+ */
+template<typename T>
+inline T ReadField( const uint8_t* ptr )
+{
+  T value;
+  memcpy( &value, ptr, sizeof(T) );
+  return value;
+}
+
+
+/**
+ * Returns the view 'V' of the struct at 'ptr', which was validated before.
+ * 'end' is the end of the bytes the struct was validated in.
+ */
+template<typename V>
+inline V ViewAt( const uint8_t* ptr, const uint8_t* const end )
+{
+  V view;
+  view.ParseUnchecked( ptr, end );
+  return view;
+}
+
+
+/**
+ * Validates the struct of 'view' at the offset of 'buffer', and moves the
+ * offset past it if it is valid.
+ */
+template<typename V>
+inline bool ParseView( V& view, RawBuffer& buffer )
+{
+  const uint8_t* ptr = buffer.GetOffsetPtr();
+
+  if( !view.Parse( ptr, buffer.GetEndPtr() ) )
+  {
+    return false;
+  }
+
+  buffer.SetOffsetPtr( const_cast<uint8_t*>( ptr ) );
+  return true;
+}
+
+
+
+/**
+ * An array of builtin, enum or alias elements of type 'T', which are read
+ * when they are accessed.
+ */
+template<typename T>
+class ArrayView
+{
+ public:
+  class Iterator
+  {
+   public:
+    using iterator_category = std::input_iterator_tag;
+    using value_type        = T;
+    using difference_type   = ptrdiff_t;
+    using pointer           = void;
+    using reference         = T;
+
+    explicit Iterator( const uint8_t* ptr ) : mPtr( ptr ) {}
+
+    T         operator* ( ) const { return ReadField<T>( mPtr ); }
+    Iterator& operator++( ) { mPtr += sizeof(T); return *this; }
+    Iterator  operator++( int ) { Iterator it = *this; mPtr += sizeof(T); return it; }
+    bool      operator==( const Iterator& other ) const { return mPtr == other.mPtr; }
+    bool      operator!=( const Iterator& other ) const { return mPtr != other.mPtr; }
+
+   private:
+    const uint8_t* mPtr;
+  };
+
+  ArrayView( ) = default;
+  ArrayView( const uint8_t* begin, const uint8_t* end ) : mBegin( begin ), mEnd( end ) {}
+
+  size_t         size      ( ) const { return size_t(mEnd - mBegin) / sizeof(T); }
+  bool           empty     ( ) const { return mBegin == mEnd; }
+  const uint8_t* data      ( ) const { return mBegin; }
+  T              operator[]( const size_t i ) const { return ReadField<T>( mBegin + i*sizeof(T) ); }
+  Iterator       begin     ( ) const { return Iterator( mBegin ); }
+  Iterator       end       ( ) const { return Iterator( mEnd ); }
+
+ private:
+  const uint8_t* mBegin = nullptr;
+  const uint8_t* mEnd   = nullptr;
+};
+
+
+
+/**
+ * An array of structs, whose elements are viewed by 'V' one after the
+ * other. The number of elements is given by the count field of the array
+ * (if any), since the elements can have different sizes.
+ */
+template<typename V>
+class StructArrayView
+{
+ public:
+  class Iterator
+  {
+   public:
+    using iterator_category = std::input_iterator_tag;
+    using value_type        = V;
+    using difference_type   = ptrdiff_t;
+    using pointer           = const V*;
+    using reference         = const V&;
+
+    Iterator( const uint8_t* ptr, const uint8_t* end ) : mPtr( ptr ), mNext( ptr ), mEnd( end ) { Load(); }
+
+    const V&  operator* ( ) const { return mView; }
+    const V*  operator->( ) const { return &mView; }
+    Iterator& operator++( ) { mPtr = mNext; Load(); return *this; }
+    bool      operator==( const Iterator& other ) const { return mPtr == other.mPtr; }
+    bool      operator!=( const Iterator& other ) const { return mPtr != other.mPtr; }
+
+   private:
+    void Load( ) { if( mPtr != mEnd ){ mView.ParseUnchecked( mNext, mEnd ); } } // moves 'mNext' past the element at 'mPtr'
+
+    const uint8_t* mPtr;
+    const uint8_t* mNext;
+    const uint8_t* mEnd;
+    V              mView;
+  };
+
+  StructArrayView( ) = default;
+  StructArrayView( const uint8_t* begin, const uint8_t* end ) : mBegin( begin ), mEnd( end ) {}
+
+  bool           empty( ) const { return mBegin == mEnd; }
+  const uint8_t* data ( ) const { return mBegin; }
+  size_t         bytes( ) const { return size_t(mEnd - mBegin); }
+  Iterator       begin( ) const { return Iterator( mBegin, mEnd ); }
+  Iterator       end  ( ) const { return Iterator( mEnd,   mEnd ); }
+
+ private:
+  const uint8_t* mBegin = nullptr;
+  const uint8_t* mEnd   = nullptr;
+};
+
+
+
+/**
+ * An element of an 'array_sized' field: the view 'H' of its header, which
+ * tells the type of the element, and the element itself, which is viewed
+ * with the view of its type:
+ *
+ *    ------------------------------------------------------------
+ *    for( const auto& element : aggregate.GetTransactions() )
+ *    {
+ *      if( element.Header().GetType() == EmbeddedTransferTransactionView::TRANSACTION_TYPE )
+ *      {
+ *        EmbeddedTransferTransactionView transfer = element.As<EmbeddedTransferTransactionView>();
+ *      }
+ *    }
+ *    ------------------------------------------------------------
+ */
+template<typename H>
+class SizedElementView
+{
+ public:
+  SizedElementView( ) = default;
+  SizedElementView( const uint8_t* data, const uint8_t* end ) : mHeader( ViewAt<H>( data, end ) ), mData( data ), mEnd( end ) {}
+
+  const H&       Header( ) const { return mHeader; }
+  const uint8_t* Data  ( ) const { return mData; }
+
+  template<typename V>
+  V              As    ( ) const { return ViewAt<V>( mData, mEnd ); }
+
+ private:
+  H              mHeader;
+  const uint8_t* mData = nullptr;
+  const uint8_t* mEnd  = nullptr;
+};
+
+
+
+/**
+ * The elements of an 'array_sized' field, with headers viewed by 'H'.
+ * 'Next' returns the start of the element after the one at its first
+ * argument, including the padding of the array.
+ */
+template<typename H, const uint8_t* (*Next)( const uint8_t*, const uint8_t* )>
+class SizedArrayView
+{
+ public:
+  class Iterator
+  {
+   public:
+    using iterator_category = std::input_iterator_tag;
+    using value_type        = SizedElementView<H>;
+    using difference_type   = ptrdiff_t;
+    using pointer           = const SizedElementView<H>*;
+    using reference         = const SizedElementView<H>&;
+
+    Iterator( const uint8_t* ptr, const uint8_t* end ) : mPtr( ptr ), mEnd( end ) { Load(); }
+
+    const SizedElementView<H>& operator* ( ) const { return mElement; }
+    const SizedElementView<H>* operator->( ) const { return &mElement; }
+    Iterator&                  operator++( ) { mPtr = Next( mPtr, mEnd ); Load(); return *this; }
+    bool                       operator==( const Iterator& other ) const { return mPtr == other.mPtr; }
+    bool                       operator!=( const Iterator& other ) const { return mPtr != other.mPtr; }
+
+   private:
+    void Load( ) { if( mPtr != mEnd ){ mElement = SizedElementView<H>( mPtr, mEnd ); } }
+
+    const uint8_t*      mPtr;
+    const uint8_t*      mEnd;
+    SizedElementView<H> mElement;
+  };
+
+  SizedArrayView( ) = default;
+  SizedArrayView( const uint8_t* begin, const uint8_t* end ) : mBegin( begin ), mEnd( end ) {}
+
+  bool           empty( ) const { return mBegin == mEnd; }
+  const uint8_t* data ( ) const { return mBegin; }
+  size_t         bytes( ) const { return size_t(mEnd - mBegin); }
+  Iterator       begin( ) const { return Iterator( mBegin, mEnd ); }
+  Iterator       end  ( ) const { return Iterator( mEnd,   mEnd ); }
+
+ private:
+  const uint8_t* mBegin = nullptr;
+  const uint8_t* mEnd   = nullptr;
+};
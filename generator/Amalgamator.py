@@ -0,0 +1,159 @@
+import typing
+from pathlib import Path
+
+from .FileWriter import FileWriter
+
+
+
+class Amalgamator():
+    """
+    Merges the generated files and the static C++ sources into a single
+    header 'catbuffer.h' and a single source 'catbuffer.cpp' ('--amalgamate'):
+
+        ---------------------------------------------------------
+        header, source = Amalgamator.amalgamate( { "RawBuffer.h": "...", "types.h": "...", "Transaction.h": "...", "Transaction.cpp": "..." } )
+        ---------------------------------------------------------
+
+    The headers are written in the order of their "..." includes, so that
+    each header comes after the headers it includes, and the <...> includes
+    of all files are moved to the top. Since all classes are defined in one
+    translation unit, the compiler can inline the calls between them, e.g.
+    the 'Deserialize()' of an inline field.
+    """
+
+    HEADER_NAME = "catbuffer.h"
+    SOURCE_NAME = "catbuffer.cpp"
+    BANNER      = "// Amalgamated catbuffer library, generated by 'python3 -m generator --amalgamate'"
+
+
+
+    @staticmethod
+    def amalgamate( files: typing.Dict[str, str] ) -> typing.Tuple[str, str]:
+        """
+        Returns the amalgamated header and source of 'files' (file name ->
+        content). Sources are written in the order of 'files'.
+        """
+
+        parsed = { name: Amalgamator.__parse( content, set( files ) ) for name, content in files.items() }
+
+        # each header after the headers it includes (depth first, without recursion since nesting can be deep)
+        header_names : typing.List[str] = []
+        visited      : typing.Set[str]  = set()
+
+        for root in ( name for name in files if name.endswith( ".h" ) ):
+            stack = [ ( root, iter( parsed[root][1] ) ) ] if root not in visited else []
+            visited.add( root )
+
+            while stack:
+                name, includes = stack[-1]
+                include        = next( includes, None )
+
+                if include is None:
+                    header_names.append( name )
+                    stack.pop()
+
+                elif include not in visited and include.endswith( ".h" ):
+                    visited.add( include )
+                    stack.append( ( include, iter( parsed[include][1] ) ) )
+
+        source_names = [ name for name in files if name.endswith( ".cpp" ) ]
+
+        header_system = sorted( set().union( *( parsed[name][0] for name in header_names ) ) )
+        source_system = sorted( set().union( *( parsed[name][0] for name in source_names ) ) - set( header_system ) )
+
+        header = [ Amalgamator.BANNER, "#pragma once", "" ] + header_system
+        source = [ Amalgamator.BANNER, f'#include "{Amalgamator.HEADER_NAME}"', "" ] + source_system
+
+        for lines, names in [ ( header, header_names ), ( source, source_names ) ]:
+            for name in names:
+                lines += [ "", "", f"// {name}", "" ] + parsed[name][2]
+
+        return "\n".join( header ) + "\n", "\n".join( source ) + "\n"
+
+
+
+    @staticmethod
+    def write_files( parts_folder: str, static_files: typing.Dict[str, Path], gen_output_folder: str ) -> None:
+        """
+        Amalgamates the static files 'static_files' (file name -> static
+        source) and the files generated in 'parts_folder', and writes the
+        result to 'gen_output_folder'. The files are only written if their
+        content changed.
+        """
+
+        files  = { name: src.read_text() for name, src in static_files.items() }
+        parts  = sorted( path for path in Path( parts_folder ).iterdir() if path.suffix in ( ".h", ".cpp" ) )
+        files.update( ( path.name, path.read_text() ) for path in parts if not path.name.startswith( "converters" ) )
+        files.update( ( path.name, path.read_text() ) for path in parts if path.name.startswith( "converters" ) )
+
+        header, source = Amalgamator.amalgamate( files )
+
+        FileWriter.write_if_changed( str( Path( gen_output_folder ) / Amalgamator.HEADER_NAME ), header.encode() )
+        FileWriter.write_if_changed( str( Path( gen_output_folder ) / Amalgamator.SOURCE_NAME ), source.encode() )
+
+
+
+    @staticmethod
+    def remove_stale_files( gen_output_folder: str, amalgamate: bool ) -> None:
+        """
+        Removes the files of the other layout, which would otherwise be
+        compiled too: the files generated per struct if 'amalgamate', or
+        the amalgamated files if not.
+        """
+
+        for path in Path( gen_output_folder ).iterdir():
+            if path.name.startswith( "." ) or not path.is_file():
+                continue
+
+            is_amalgamated = path.name in ( Amalgamator.HEADER_NAME, Amalgamator.SOURCE_NAME ) and Amalgamator.__is_amalgamated( path )
+
+            if amalgamate != is_amalgamated:
+                path.unlink()
+
+
+
+    @staticmethod
+    def __is_amalgamated( path: Path ) -> bool:
+        # a struct could be named 'catbuffer', so check that the file was written by 'write_files()'
+        with open( path, "r" ) as f:
+            return f.readline().rstrip( "\n" ) == Amalgamator.BANNER
+
+
+
+    @staticmethod
+    def __parse( content: str, file_names: typing.Set[str] ) -> typing.Tuple[typing.Set[str], typing.List[str], typing.List[str]]:
+        """
+        Returns the <...> includes, the "..." includes of 'file_names' and the
+        remaining lines of 'content', without leading and trailing empty lines.
+        """
+
+        system_includes : typing.Set[str]  = set()
+        includes        : typing.List[str] = []
+        lines           : typing.List[str] = []
+
+        for line in content.splitlines():
+            stripped = line.strip()
+
+            if stripped == "#pragma once":
+                continue
+
+            if stripped.startswith( "#include" ):
+                target = stripped[ len("#include"): ].strip()
+
+                if target.startswith( "<" ):
+                    system_includes.add( f"#include {target}" )
+                    continue
+
+                if Path( target.strip( '"' ) ).name in file_names:
+                    includes.append( Path( target.strip( '"' ) ).name )
+                    continue
+
+            lines.append( line.rstrip() )
+
+        while lines and not lines[0]:
+            lines.pop( 0 )
+
+        while lines and not lines[-1]:
+            lines.pop()
+
+        return system_includes, includes, lines
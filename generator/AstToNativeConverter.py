@@ -1,88 +1,108 @@
-import lark
 import sys
 
-from catparser import ast
-
 
 
 def ast_to_native( type_descriptors ):
     """
-    Takes type descriptors directly from the catbuffer schema and converts 
+    Takes type descriptors directly from the catbuffer schema and converts
     it to input for the C++ generator. The output of this function
-    can be passed directly to 'convert()' in '__main__.py' to 
+    can be passed directly to 'convert()' in '__main__.py' to
     generate C++ code.
+
+    The type descriptors are sorted by kind in a single pass, and lookups
+    of enum values, factory enum values and struct fields by name go
+    through dicts and sets, so that the conversion scales linearly with
+    the size of the schema.
     """
 
+    # lark and catparser are only needed (and installed) when converting a catbuffer schema,
+    # so they are not imported when the generator is started with a .yaml file
+    import lark
+    from catparser import ast
+
     print("\n\nConvert from AST to native generator format ----------------")
 
-    aliases       = list()
-    structs       = list()
-    abstracts     = set()
-    enums         = dict()  
-    factory_enums = dict()  
-    enum_to_type  = dict()  # stores the types of enums (uint16, unit32, etc)
+    aliases             = list()
+    structs             = list()
+    abstracts           = set()
+    enums               = dict()
+    enum_values         = dict()  # enum name -> { value name -> value }
+    factory_enums       = dict()
+    factory_enum_values = dict()  # factory enum name -> names of the values added to it
+    enum_to_type        = dict()  # stores the types of enums (uint16, unit32, etc)
+
+    enum_models  = list()         # (idx, model) of each kind of type descriptor, in schema order
+    alias_models = list()
+    other_models = list()
+
+    for idx, model in enumerate( type_descriptors ):
+        if isinstance( model, ast.Enum ):
+            enum_models.append( (idx, model) )
+        elif isinstance( model, ast.Alias ):
+            alias_models.append( (idx, model) )
+        else:
+            other_models.append( (idx, model) )
 
 
     # Enum conversion -----------------------------------------------
     print("\n  - Convert enums types:")
-    for idx, model in enumerate( type_descriptors ):
+    for idx, model in enum_models:
 
-        if isinstance( model, ast.Enum ):
-            print( "\t"+str(idx)+": "+str(type(model))+" -> "+model.name )
+        print( "\t"+str(idx)+": "+str(type(model))+" -> "+model.name )
 
-            # enum header
-            enum         = dict()
-            enum["name"] = model.name
-            enum["type"] = "enum " + model.base.short_name.value
-            values       = list()
+        # enum header
+        enum         = dict()
+        enum["name"] = model.name
+        enum["type"] = "enum " + model.base.short_name.value
+        values       = list()
 
-            if model.comment:
-                enum["comment"] = model.comment.parsed
+        if model.comment:
+            enum["comment"] = model.comment.parsed
 
-            # store type for later use
-            enum_to_type[model.name] = model.base.short_name.value
+        # store type for later use
+        enum_to_type[model.name] = model.base.short_name.value
 
-            # save enum values
-            for value in model.values:
-                tmp = dict()
-                tmp["name"]  = value.name
-                tmp["value"] = value.value
-                if value.comment:
-                    tmp["comment"] = value.comment.parsed
+        # save enum values
+        for value in model.values:
+            tmp = dict()
+            tmp["name"]  = value.name
+            tmp["value"] = value.value
+            if value.comment:
+                tmp["comment"] = value.comment.parsed
 
-                values.append(tmp)
+            values.append(tmp)
 
-            enum["values"] = values
+        enum["values"] = values
 
-            enums[model.name] = enum
+        enums[model.name]       = enum
+        enum_values[model.name] = { value["name"]: value["value"] for value in values }
 
 
     # Alias conversion -----------------------------------------------
     print("\n  - Convert alias types:")
-    for idx, model in enumerate(type_descriptors):
+    for idx, model in alias_models:
 
-        if isinstance(model, ast.Alias ):
-            print( "\t"+str(idx)+": "+str(type(model))+" -> "+model.name )
+        print( "\t"+str(idx)+": "+str(type(model))+" -> "+model.name )
 
-            if( isinstance(model.linked_type, ast.FixedSizeBuffer) ):
-                alias = { "name": model.name, 
-                          "size": model.linked_type.size, 
-                          "type": "alias " + "array uint8" }
+        if( isinstance(model.linked_type, ast.FixedSizeBuffer) ):
+            alias = { "name": model.name,
+                      "size": model.linked_type.size,
+                      "type": "alias " + "array uint8" }
 
-            elif( isinstance(model.linked_type, ast.FixedSizeInteger) ):
-                alias = { "name": model.name, 
-                          "type": f"alias {model.linked_type.short_name}" }
+        elif( isinstance(model.linked_type, ast.FixedSizeInteger) ):
+            alias = { "name": model.name,
+                      "type": f"alias {model.linked_type.short_name}" }
 
-            else:
-                print( "Error: Unknown alias linked_type in AST model!" )
-                exit(1)
+        else:
+            print( "Error: Unknown alias linked_type in AST model!" )
+            exit(1)
 
-            aliases.append(alias)
+        aliases.append(alias)
 
 
     # Struct conversion -----------------------------------------------
     print("\n  - Convert struct types:")
-    for idx, model in enumerate(type_descriptors):
+    for idx, model in other_models:
 
         if isinstance(model, ast.Struct):
             print( "\t"+str(idx) + ": " + str(type(model)) + " -> " + model.name )
@@ -102,7 +122,7 @@ def ast_to_native( type_descriptors ):
 
                 # builtin field type ---------------------------------------------------------
                 if isinstance(field.field_type, ast.FixedSizeInteger):
-                   
+
                     if field.disposition == None:
                         disposition = ""
                     elif field.disposition in ["const", "reserved"]:
@@ -177,23 +197,25 @@ def ast_to_native( type_descriptors ):
             # if struct is not abstract, set its type and version
             if model.disposition != "abstract" and model.discriminator:
 
-                discriminator = dict()
+                discriminator  = dict()
+                name_to_field  = { field.name: field for field in model.fields }
+                struct_version = None
 
                 for init in model.initializers:
-                    if init.target_property_name == "type":                        
-                        for field in model.fields: # find variable in fields which gives struct its type
-                            if field.name == init.value:
-                                discriminator_enum          = field.field_type.value
-                                discriminator["type"]       = f'struct_type {model.factory_type+"Group"}'
-                                discriminator["value"]      = field.value
-                                discriminator["type_field"] = "type"
-                                discriminator["header"]     = model.factory_type
-                                
-                    elif init.target_property_name == "version": # find variable in fields which gives struct its version
-                        for field in model.fields:
-                            if field.name == init.value:
-                                struct_version = field.value
-                                discriminator["version_field"] = "version"
+                    field = name_to_field.get( init.value ) # variable in fields which gives struct its type or version
+                    if field is None:
+                        continue
+
+                    if init.target_property_name == "type":
+                        discriminator_enum          = field.field_type.value
+                        discriminator["type"]       = f'struct_type {model.factory_type+"Group"}'
+                        discriminator["value"]      = field.value
+                        discriminator["type_field"] = "type"
+                        discriminator["header"]     = model.factory_type
+
+                    elif init.target_property_name == "version":
+                        struct_version = field.value
+                        discriminator["version_field"] = "version"
 
                 if "value" in discriminator:
                     discriminator["value"] = discriminator["value"] + f' @{struct_version}'
@@ -205,24 +227,17 @@ def ast_to_native( type_descriptors ):
                         fac_enum["type"]   = "enum " + enum_to_type[discriminator_enum]
                         fac_enum["values"] = []
                         factory_enums[ model.factory_type+"Group" ] = fac_enum
+                        factory_enum_values[ model.factory_type+"Group" ] = set()
 
                     tmp_enum = dict()
                     tmp_enum["name"] = discriminator["value"].split()[0]
 
-                    for enum in enums[discriminator_enum]["values"]:
-                        if enum["name"] == tmp_enum["name"]:
-                            tmp_enum["value"] = enum["value"]
-
+                    if tmp_enum["name"] in enum_values[discriminator_enum]:
+                        tmp_enum["value"] = enum_values[discriminator_enum][tmp_enum["name"]]
 
-                    # check that enum was not added before (this can happen if there are more than one version of a struct)
-                    unique = True
-                    for enum in factory_enums[ model.factory_type+"Group" ]["values"]:
-                        if enum["name"] == tmp_enum["name"]:
-                            unique = False
-                            break
-
-                    # add enum if unique
-                    if unique:
+                    # add enum if not added before (this can happen if there are more than one version of a struct)
+                    if tmp_enum["name"] not in factory_enum_values[ model.factory_type+"Group" ]:
+                        factory_enum_values[ model.factory_type+"Group" ].add( tmp_enum["name"] )
                         factory_enums[ model.factory_type+"Group" ]["values"].append(tmp_enum)
 
                 else:
@@ -231,7 +246,7 @@ def ast_to_native( type_descriptors ):
 
                 layout.append(discriminator)
 
-            
+
             if model.disposition == "abstract":
                 abstracts.add(model.name)
                 for field in layout:
@@ -244,15 +259,12 @@ def ast_to_native( type_descriptors ):
             struct["name"]   = model.name
             struct["type"]   = "struct"
             struct["layout"] = layout
-            
+
             if model.comment:
                 struct["comment"] = model.comment.parsed
 
             structs.append(struct)
 
-
-        elif isinstance( model, ast.Enum ) or isinstance(model, ast.Alias ):
-            continue
         else:
             print( "Error: Unknown type" )
             exit(1)
@@ -264,4 +276,4 @@ def ast_to_native( type_descriptors ):
     print("\n\tConversion done!\n\n")
 
     return (aliases + list(enums.values()) + structs)
-    
+
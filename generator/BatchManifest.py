@@ -0,0 +1,126 @@
+import typing
+from pathlib import Path
+from dataclasses import dataclass
+
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    schema         : str                    # the .yaml input file
+    output         : str                    # the output folder
+    generate_print : bool = False
+    incremental    : bool = False
+    schema_cache   : bool = True
+    depfile        : typing.Optional[str] = None
+    stamp          : typing.Optional[str] = None
+    roots          : typing.Optional[typing.Tuple[str, ...]] = None
+    fast_build     : bool = False
+    amalgamate     : bool = False
+    arena          : bool = False
+    variant        : bool = False
+
+
+
+class BatchManifest():
+    """
+    Reads the jobs of a batch run ('python3 -m generator --batch manifest.yaml')
+    from a .yaml manifest. Each job generates the C++ code of one schema into
+    one output folder, with the same options as the command line:
+
+        ---------------------------------------------------------
+        - schema: yaml_test_inputs/symbol.yaml
+          output: build/symbol
+        - schema: yaml_test_inputs/symbol.yaml
+          output: build/symbol_print
+          generate_print: true
+          incremental: true
+          depfile: build/symbol_print.d
+        - schema: yaml_test_inputs/symbol.yaml
+          output: build/transfer
+          roots: [ TransferTransaction ]
+          fast_build: true
+        ---------------------------------------------------------
+
+    Relative paths are relative to the folder of the manifest. Errors in the
+    manifest are printed and exit the generator, like errors in schemas.
+    """
+
+    REQUIRED_KEYS = ( "schema", "output" )
+    OPTIONAL_KEYS = { "generate_print": bool, "incremental": bool, "schema_cache": bool, "depfile": str, "stamp": str, "roots": list, "fast_build": bool, "amalgamate": bool, "arena": bool, "variant": bool }
+
+
+
+    @staticmethod
+    def load( manifest_file_name: str ) -> typing.List[BatchJob]:
+        """
+        Returns the jobs of the manifest 'manifest_file_name'.
+        """
+
+        from .SchemaCache import SchemaCache
+
+        if not Path( manifest_file_name ).is_file():
+            print(f"Error: Batch manifest '{manifest_file_name}' not found!\n")
+            exit(1)
+
+        return BatchManifest.parse( SchemaCache.parse_yaml( manifest_file_name ), Path( manifest_file_name ).parent )
+
+
+
+    @staticmethod
+    def parse( entries: typing.Any, base_folder: Path = Path(".") ) -> typing.List[BatchJob]:
+        """
+        Returns the jobs of the already parsed manifest 'entries'.
+        """
+
+        if not isinstance( entries, list ) or not entries:
+            print("Error: Batch manifest must be a non-empty list of jobs!\n")
+            exit(1)
+
+        jobs    : typing.List[BatchJob] = []
+        outputs : typing.Dict[Path, int] = {} # output folder -> index of the job generating it
+
+        for idx, entry in enumerate(entries):
+            if not isinstance( entry, dict ):
+                print(f"Error: Job {idx} of batch manifest is not a dictionary!\n")
+                exit(1)
+
+            for key in BatchManifest.REQUIRED_KEYS:
+                if not isinstance( entry.get(key), str ) or not entry[key]:
+                    print(f"Error: Missing '{key}' key for job {idx} of batch manifest!\n")
+                    exit(1)
+
+            for key, value in entry.items():
+                if key in BatchManifest.REQUIRED_KEYS:
+                    continue
+
+                if key not in BatchManifest.OPTIONAL_KEYS:
+                    print(f"Error: Unknown key '{key}' in job {idx} of batch manifest!\n")
+                    exit(1)
+
+                if not isinstance( value, BatchManifest.OPTIONAL_KEYS[key] ):
+                    print(f"Error: Key '{key}' in job {idx} of batch manifest must be of type '{BatchManifest.OPTIONAL_KEYS[key].__name__}'!\n")
+                    exit(1)
+
+            if "roots" in entry and not all( isinstance( root, str ) for root in entry["roots"] ):
+                print(f"Error: Key 'roots' in job {idx} of batch manifest must be a list of type names!\n")
+                exit(1)
+
+            # paths are relative to the manifest, roots are kept as a tuple so that jobs are hashable
+            values = { key: str( base_folder / entry[key] ) for key in ( "schema", "output", "depfile", "stamp" ) if key in entry }
+
+            if "roots" in entry:
+                values["roots"] = tuple( entry["roots"] )
+
+            output = Path( values["output"] ).resolve()
+            if output in outputs:
+                print(f"Error: Jobs {outputs[output]} and {idx} of batch manifest generate the same output folder '{entry['output']}'!\n")
+                exit(1)
+
+            if not Path( values["schema"] ).is_file():
+                print(f"Error: File '{values['schema']}' of job {idx} of batch manifest not found!\n")
+                exit(1)
+
+            outputs[output] = idx
+            jobs.append( BatchJob( **{ **entry, **values } ) )
+
+        return jobs
@@ -0,0 +1,104 @@
+import typing
+import contextlib
+
+
+
+class CodeEmitter():
+    """
+    Collects generated code as a list of fragments, which are only joined
+    (or written) at the end, instead of appending to a string, which copies
+    the whole string on every append and gets slow for large files like
+    'converters.cpp'.
+
+    Lines written with 'line()' are indented by the prefixes of the
+    enclosing 'indented()' blocks, while 'write()' writes code as is:
+
+        ---------------------------------------------------------
+        code = CodeEmitter()
+        code.line( "bool Transfer::Deserialize( RawBuffer& buffer )" )
+        code.line( "{" )
+        with code.indented():
+            code.line( "return true;" )
+        code.line( "}" )
+
+        code.getvalue()  # 'bool Transfer::Deserialize( RawBuffer& buffer )\n{\n\treturn true;\n}\n'
+        ---------------------------------------------------------
+
+    If a 'stream' is given (e.g. a file opened with 'FileWriter.open()'),
+    fragments are written straight to it instead of being collected, so
+    that the code of a file never has to be held in memory as a whole.
+    """
+
+    def __init__( self, stream: typing.Optional[typing.TextIO] = None ) -> None:
+        self.__fragments : typing.List[str] = []
+        self.__indent                       = ""
+        self.__write                        = stream.write if stream is not None else self.__fragments.append
+
+
+
+    def write( self, *fragments: str ) -> None:
+        """
+        Writes 'fragments' as they are, without indentation.
+        """
+
+        for fragment in fragments:
+            self.__write( fragment )
+
+
+
+    def line( self, code: str = "" ) -> None:
+        """
+        Writes 'code' as a line, indented by the current indentation.
+        """
+
+        self.__write( f'{self.__indent}{code}\n' if code else "\n" )
+
+
+
+    @contextlib.contextmanager
+    def indented( self, prefix: str = "\t" ):
+        """
+        Indents the lines written by 'line()' within the block by 'prefix'.
+        """
+
+        outer_indent  = self.__indent
+        self.__indent = outer_indent + prefix
+
+        try:
+            yield self
+        finally:
+            self.__indent = outer_indent
+
+
+
+    def write_to( self, stream: typing.TextIO ) -> None:
+        """
+        Writes the collected fragments to 'stream'.
+        """
+
+        stream.writelines( self.__fragments )
+
+
+
+    def getvalue( self ) -> str:
+        """
+        Returns the collected code as a string.
+        """
+
+        return "".join( self.__fragments )
+
+
+
+    def __getstate__( self ) -> dict:
+        # only emitters collecting fragments can be sent to other processes, not streaming ones
+        if self.__write != self.__fragments.append:
+            raise TypeError( "a streaming CodeEmitter can't be pickled" )
+
+        return { "fragments": self.__fragments, "indent": self.__indent }
+
+
+
+    def __setstate__( self, state: dict ) -> None:
+        self.__fragments = state["fragments"]
+        self.__indent    = state["indent"]
+        self.__write     = self.__fragments.append
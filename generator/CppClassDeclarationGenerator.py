@@ -1,9 +1,13 @@
 import typing
 
-from .YamlFieldChecker      import YamlFieldChecker, YamlFieldCheckResult
+from .YamlFieldChecker      import YamlFieldCheckResult
 from .YamlDependencyChecker import YamlDependencyChecker, YamlDependencyCheckerResult
-from .CppFieldGenerator     import CppFieldGenerator, TypeConverter
+from .CppFieldGenerator     import CppFieldGenerator
 from .CppTypesGenerator     import CppTypesGenerator
+from .SchemaBuilder         import SchemaBuilder
+from .Schema                import StructDef
+from .CodeEmitter           import CodeEmitter
+from .FileWriter            import FileWriter
 
 
 
@@ -12,6 +16,52 @@ class CppClassDeclarationGenerator():
     Takes a 'dict' defining class fields/members, user defined types/enums
     and generates a C++ class declaration header. The generated classes all 
     inherit from ICatbuffer. 
+
+    The fields are checked and converted to a read-only 'StructDef' once
+    (see 'SchemaBuilder'), which is stored in 'struct' and used by the
+    other generators of the class.
+
+    If all serialized fields of the class are builtins, enums or aliases,
+    without conditions, and are laid out in memory like in a serialized
+    buffer, they are declared in a base struct named 'layout_struct'
+    instead, which is checked with 'static_assert's and copied with a
+    single memcpy:
+
+        ---------------------------------------------------------
+        struct MosaicLayout
+        {
+            MosaicId mMosaic_id;
+            Amount mAmount;
+        };
+
+        static_assert( offsetof(MosaicLayout, mAmount) == 8, "..." );
+        static_assert( sizeof(MosaicLayout) == 16, "..." );
+
+        class Mosaic : public ICatbuffer, public MosaicLayout
+        ---------------------------------------------------------
+
+    With 'arena' (see '--arena') the arrays are 'std::pmr::vector's, and the
+    class gets a constructor which allocates them, and the arrays of the
+    nested objects, from a 'std::pmr::memory_resource' (see 'Arena.h'):
+
+        ---------------------------------------------------------
+        explicit Transaction( std::pmr::memory_resource* arena ) : mInputs( arena ), mOutputs( arena ) { };
+        ---------------------------------------------------------
+
+    The destructor is then not declared, so that the implicit move
+    constructor moves the arrays together with their arena when the
+    objects are moved, e.g. when an array of them grows.
+
+    With 'variant' (see '--variant') the elements of the 'array_sized'
+    fields are stored in place, in a 'std::variant' of the structs which
+    can follow their header (see 'CppConvertersGenerator'):
+
+        ---------------------------------------------------------
+        std::vector<EmbeddedTransactionVariant> mTransactions;
+        ---------------------------------------------------------
+
+    The destructor is then not declared either, so that the elements are
+    moved instead of copied when the array grows.
     
     A C++ generated file can be written by calling 'write_file()'.
     """
@@ -22,7 +72,10 @@ class CppClassDeclarationGenerator():
               user_types:      CppTypesGenerator,
               class_decls:     typing.Dict[str, "CppClassDeclarationGenerator"],
               comment:         str = "",
-              prettyprinter:   bool = False
+              prettyprinter:   bool = False,
+              fast_build:      bool = False,
+              arena:           bool = False,
+              variant:         bool = False
               ) -> typing.Tuple[YamlFieldCheckResult, str]:
         """
         Parameters
@@ -31,8 +84,8 @@ class CppClassDeclarationGenerator():
             The name of the class which will be used for the header
             class declaration.
 
-        field : dict
-            The class member fields
+        fields : list
+            The class member fields, as defined in the .yaml file (not modified)
 
         types : CppTypesGenerator
             The generator which was used to process user defined types.
@@ -44,25 +97,33 @@ class CppClassDeclarationGenerator():
         prettyprinter: bool, optional
             Set to true for pretty printing functionality
 
-        returns : bool
-            True if class correctly initialized using input parameters
+        fast_build: bool, optional
+            Set to true for only including the headers needed by the
+            declaration, to reduce compile times ('--fast-build')
+
+        arena: bool, optional
+            Set to true for allocating the arrays and the 'array_sized'
+            elements from an arena ('--arena')
+
+        variant: bool, optional
+            Set to true for storing the 'array_sized' elements in place,
+            in a 'std::variant' ('--variant')
+
+        returns : (YamlFieldCheckResult, str)
+            YamlFieldCheckResult.OK if class correctly initialized using input
+            parameters, otherwise the failed check and an error message
         """
 
         self.class_name                                             = class_name
-        self.fields                                                 = fields
         self.comment                                                = comment
-        self.member_vars : typing.Dict[str, typing.Tuple[int, str]] = {}                      # Dict of variable name to type (tupple gives index of variable and type)
-
-        #TODO: re-think this naming convention! confusing with enum and struct header
-        self.group_type                                             = ""                      # The enum group that the class belongs to (if any)
-        self.group_id                                               = ""                      # The id of the class, within the above group
-        self.group_version                                          = ""                      # The version of the group
-        self.group_header                                           = ""
-
-        self.header_version_field                                   = ""
-        self.header_type_field                                      = ""
+        self.struct : StructDef                                     = None                    # The read-only definition of the class, shared with the other generators
 
         self.size_to_arrays : typing.Dict[str, typing.List[str]]    = {}                      # For each variable used as an array size, stores the list of arrays which depend on that variable 
+        self.fast_build                                             = fast_build              # Also used by the class definition
+        self.arena                                                  = arena                   # Also used by the class definition and the converters
+        self.variant                                                = variant                 # Also used by the class definition and the converters
+        self.definition_includes : typing.Set[str]                  = set()                   # With 'fast_build', includes only needed by the class definition
+        self.layout_struct                                          = ""                      # Name of the base struct with the serialized fields, if the class has a fixed layout
 
         self.__user_types                                           = user_types
         self.__name_to_class                                        = class_decls
@@ -70,36 +131,58 @@ class CppClassDeclarationGenerator():
         self.__lib_includes : typing.Set[str]                       = set()                   # Set of all C++ library includes
         self.__includes : typing.Set[str]                           = set()                   # Set of all normal includes
                 
-        self.__include_code_output                                  = ""                      # Generated C++ include code goes here
         self.__header_code_output                                   = ""                      # Generated C++ class declaration code goes here
-                    
-        self.__dependency_checks : typing.List[dict]                = list()
 
         self.__prettyprinter                                        = prettyprinter
 
+        result, result_str, self.struct = SchemaBuilder.struct( class_name, fields, user_types, class_decls, comment )
+        if result != YamlFieldCheckResult.OK:
+            return result, result_str
+
         #TODO: Disabled for now due to incompatibility with NEM conditional arrays, enable later on.
         #      Perhaps add command line option for generating size fields or not.
         #self.__find_array_size_fields() 
 
-        return self.__generate_header()
+        layout = self.__find_fixed_layout()
+        if layout:
+            self.layout_struct = f'{class_name}Layout'
+
+        self.__generate_header( layout )
+
+        return YamlFieldCheckResult.OK, ""
 
 
 
     def write_file( self, file_path: str ) -> None:
-        self.__generate_includes()
+        with FileWriter.open( file_path ) as f:
+            self.__generate_includes( CodeEmitter( f ) )
+            f.write( self.__header_code_output )
 
-        f = open( file_path, "w" )
-        f.write(self.__include_code_output)
-        f.write(self.__header_code_output)
+
+    def bind( self, user_types: CppTypesGenerator, class_decls: typing.Dict[str, "CppClassDeclarationGenerator"] ) -> None:
+        """
+        Sets the user defined types and class declarations used by this
+        declaration, e.g. after the declaration was sent between processes.
+        """
+
+        self.__user_types    = user_types
+        self.__name_to_class = class_decls
+
+
+    def __getstate__( self ) -> dict:
+        # Don't pickle the types and class declarations shared by all
+        # declarations, they are set again by calling 'bind()'.
+        state = self.__dict__.copy()
+        state.pop( "_CppClassDeclarationGenerator__user_types",    None )
+        state.pop( "_CppClassDeclarationGenerator__name_to_class", None )
+        return state
 
 
     # should be called when all structs/classes have been processed.
     def check_dependency(self) -> typing.Tuple["YamlDependencyCheckerResult", str]:
         
-        for field in self.__dependency_checks:
-            disposition = field["disposition"]
-
-            if "array_sized" == disposition:
+        for field in self.struct.fields:
+            if "array_sized" == field.disposition:
                 result, result_str = YamlDependencyChecker.array_sized( self.class_name, field, self.__name_to_class )
                 if YamlDependencyCheckerResult.OK != result:
                     return result, result_str
@@ -116,20 +199,16 @@ class CppClassDeclarationGenerator():
         having a size field.
         """
 
-        for field in self.fields:
+        for field in self.struct.fields:
 
-            if "type" not in field:
+            if "array" != field.disposition:
                 continue
 
-            type = field["type"].split()
-            if "array" != type[0]:
+            if( field.size is None or not field.name ):
                 continue
 
-            if( "size" not in field or "name" not in field ):
-                continue
-
-            size_var   = field["size"]
-            array_name = field["name"]
+            size_var   = field.size
+            array_name = field.name
 
             if size_var not in self.size_to_arrays:
                 self.size_to_arrays[ size_var ] = []
@@ -137,191 +216,230 @@ class CppClassDeclarationGenerator():
             self.size_to_arrays[ size_var ].append( array_name )
 
 
-    def __generate_header( self ) -> bool:
+    def __find_fixed_layout( self ) -> typing.List[typing.Tuple[str, str, str, int]]:
+        """
+        Returns the type, name, comments and offset of each serialized field
+        if the fields have a fixed size and each field is aligned in a
+        serialized buffer (offset divisible by the alignment of its type),
+        so that a struct of the fields has no padding. Returns an empty list
+        otherwise.
+        """
+
+        layout    = []
+        offset    = 0
+        alignment = 1
+
+        if f'{self.class_name}Layout' in self.__name_to_class or f'{self.class_name}Layout' in self.__user_types.name_to_alias:
+            return [] # the name of the layout struct is taken
+
+        for field in self.struct.fields:
+            if field.disposition in ( "const", "struct_type" ):
+                continue # not serialized
+
+            if field.disposition or field.condition is not None or field.name in self.size_to_arrays:
+                return []
+
+            size_and_alignment = self.__user_types.size_and_alignment( field.type )
+            if size_and_alignment is None or offset % size_and_alignment[1]:
+                return []
+
+            layout.append( ( field.type, field.name, field.comments, offset ) )
+            offset    += size_and_alignment[0]
+            alignment  = max( alignment, size_and_alignment[1] )
+
+        if offset % alignment:
+            return [] # tail padding
+
+        return layout
+
+
+
+    def __generate_layout_struct( self, code: CodeEmitter, layout: typing.List[typing.Tuple[str, str, str, int]] ) -> None:
+        size = layout[-1][3] + self.__user_types.size_and_alignment( layout[-1][0] )[0]
+
+        code.write( f'\n\n// The serialized fields of \'{self.class_name}\', laid out like in a serialized buffer\n' )
+        code.write( f'struct {self.layout_struct}\n{{\n' )
+
+        for field_type, name, comments, _ in layout:
+            code.write( CppFieldGenerator.gen_normal_field( field_type, name, comments ) )
+
+        code.write( "};\n\n" )
+
+        for _, name, _, offset in layout:
+            code.write( f'static_assert( offsetof({self.layout_struct}, {CppFieldGenerator.convert_to_field_name(name)}) == {offset}, "{self.layout_struct} differs from the serialized layout" );\n' )
+
+        code.write( f'static_assert( sizeof({self.layout_struct}) == {size}, "{self.layout_struct} differs from the serialized layout" );\n' )
+
+        self.__lib_includes.add("#include <cstddef>")
+
+
+
+    def __generate_arena_constructor( self, code: CodeEmitter ) -> None:
+        """
+        Generates the constructor which passes the arena to the arrays and
+        to the nested objects, in the order of their declaration.
+        """
+
+        members = []
+
+        for field in self.struct.fields:
+            if field.disposition in ( "array", "array_sized", "array_fill" ):
+                members.append( CppFieldGenerator.convert_to_field_name( field.name ) )
+
+            elif field.disposition in ( "", "inline" ) and field.type in self.__name_to_class:
+                members.append( CppFieldGenerator.convert_to_field_name( field.name or field.type ) )
+
+        if members:
+            initializers = ", ".join( f'{member}( arena )' for member in members )
+            code.write( f'\texplicit {self.class_name}( std::pmr::memory_resource* arena ) : {initializers} {{ }}; // allocates the arrays from \'arena\' (see Arena.h)\n\n\n' )
+        else:
+            code.write( f'\texplicit {self.class_name}( std::pmr::memory_resource* ){{ }}; // nothing to allocate\n\n\n' )
+
+        self.__lib_includes.add("#include <memory_resource>")
+
+
+
+    def __variant_of( self, header_type: str ) -> str:
+        """
+        Returns the name of the 'std::variant' storing the elements of the
+        'array_sized' fields with the header 'header_type', if 'variant'.
+        """
+
+        return CppFieldGenerator.variant_name( header_type ) if self.variant else ""
+
+
+
+    def __generate_header( self, layout: typing.List[typing.Tuple[str, str, str, int]] ) -> None:
         """ 
         Goes through fields of types: 'const', 'inline', 'reserved', 
         'array', 'array sized', 'array fill' and 'condition' and 
-        generates corresponding C++ class member declarations.
+        generates corresponding C++ class member declarations. The
+        fields have already been checked by 'SchemaBuilder.struct()'.
 
         Generated class declaration inherits from 'ICatBuffer' 
         and inherited methods are added as 'override'.
         """
 
-        self.__header_code_output  = f'\n\nclass {self.class_name} : public ICatbuffer\n{{\npublic:\n' # class definition
-        self.__header_code_output += f'\t{self.class_name}(){{ }};\n'      # constructor
-        self.__header_code_output += f'\t~{self.class_name}(){{ }};\n\n\n' # destructor
-        self.__header_code_output += inherited_methods
+        code = CodeEmitter()
+
+        if layout:
+            self.__generate_layout_struct( code, layout )
+            code.write( f'\n\nclass {self.class_name} : public ICatbuffer, public {self.layout_struct}\n{{\npublic:\n' ) # class definition
+        else:
+            code.write( f'\n\nclass {self.class_name} : public ICatbuffer\n{{\npublic:\n' ) # class definition
+
+        code.write( f'\t{self.class_name}(){{ }};\n' )      # constructor
+
+        if self.arena:
+            self.__generate_arena_constructor( code )
+        elif self.variant:
+            code.write( '\n\n' ) # no destructor, so that the elements in the variants are moved when their array grows
+        else:
+            code.write( f'\t~{self.class_name}(){{ }};\n\n\n' ) # destructor
+
+        code.write( inherited_methods )
+
+        if layout:
+            code.write( f'\n\tstatic constexpr size_t FixedSize( ) {{ return sizeof({self.layout_struct}); }} // size of the serialized fields\n' )
 
         if self.__prettyprinter:
-            self.__header_code_output += "\tvoid   Print      ( const size_t level ) override;\n"
+            code.write( "\tvoid   Print      ( const size_t level ) override;\n" )
 
-        self.__header_code_output += '\n\npublic:\n'
+        code.write( '\n\npublic:\n' )
 
-        for idx, field in enumerate(self.fields):
-            comments = field["comments"] if "comments" in field else ""
+        for field in self.struct.fields:
+            comments    = field.comments
+            field_type  = field.type
+            name        = field.name
+            disposition = field.disposition
 
-            result, result_str = YamlFieldChecker.check_type(self.class_name, field)
-            if result != YamlFieldCheckResult.OK:
-                return result, result_str
+            if( "const" == disposition ):
+                code.write( CppFieldGenerator.gen_const_field( field_type, name, field.value, comments ) )
 
-            types = field["type"].split()
-            
-            if len(types) > 1:
-                field["disposition"] = types[0]
-                field_type           = TypeConverter.convert(types[1])
-            else:
-                field_type           = TypeConverter.convert(types[0])
-
-            field["type"] = field_type
-
-            if field_type not in CppFieldGenerator.builtin_types and \
-               field_type not in self.__user_types.name_to_enum and \
-               field_type not in self.__user_types.name_to_alias and \
-               field_type not in self.__name_to_class and \
-               field_type != "varint":
-                return YamlFieldCheckResult.TYPE_UNKNOWN, f"\n\nError: Type '{field_type}' in struct '{self.class_name}' not defined or incomplete!\n\n"
-
-            name = field["name"] if "name" in field else ""
-
-            # check if name already declared
-            if name in self.member_vars:
-                return YamlFieldCheckResult.NAME_REDEFINED, f"\n\nError: Same field name '{name}' declared multiple times in struct '{self.class_name}'!\n\n"
-            elif name: # save as member var
-                self.member_vars[name] = (idx, field_type)
-
-
-            if "disposition" in field:
-
-                disposition = field["disposition"]
-                if( "const" == disposition ):
-                    # check fields
-                    result, result_str = YamlFieldChecker.const( self.class_name, field, self.__user_types.name_to_enum )
-                    if YamlFieldCheckResult.OK != result:
-                        return result, result_str
-
-                    #generate
-                    self.__header_code_output += CppFieldGenerator.gen_const_field( field_type, name, field["value"], comments )
-
-                elif( "struct_type" == disposition ):
-                    self.group_type    = field_type
-                    self.group_id      = field["value"].split()[0]
-                    self.group_version = field["value"].split()[1][1:]
-                    self.group_header  = field["header"]
-
-                    self.header_type_field    = field["type_field"]
-                    self.header_version_field = field["version_field"] if "version_field" in field else "" 
-
-                    self.__header_code_output += CppFieldGenerator.gen_const_field( field_type, "TRANSACTION_TYPE",    self.group_id,      comments )
-                    self.__header_code_output += CppFieldGenerator.gen_const_field( "uint8_t",  "TRANSACTION_VERSION", self.group_version, comments )
-
-                elif( "inline" == disposition ):
-                    # check fields
-                    result, result_str = YamlFieldChecker.inline(self.class_name, field, self.__name_to_class)
-                    if YamlFieldCheckResult.OK != result:
-                        return result, result_str
-
-                    # generate 
-                    self.__header_code_output += CppFieldGenerator.gen_inline_field( field_type, comments )
-
-                elif( "reserved" == disposition ):
-                    # check fields
-                    result, result_str = YamlFieldChecker.reserved(self.class_name, field)
-                    if YamlFieldCheckResult.OK != result:
-                        return result, result_str
-
-                    # generate
-                    #self.__header_code_output += CppFieldGenerator.gen_reserved_field( field_type, field["name"], field["size"], comments )
-
-                elif( "array" == disposition ):
-                    # check fields
-                    result, result_str = YamlFieldChecker.array(self.class_name, field, idx, self.member_vars)
-                    if YamlFieldCheckResult.OK != result:
-                        return result, result_str
-
-                    # generate
-                    self.__header_code_output += CppFieldGenerator.gen_array_field( field_type, name, comments )
-                    self.__lib_includes.add("#include <vector>")
-
-                elif( "array_sized" == disposition ):
-                    # check fields
-                    result, result_str = YamlFieldChecker.array_sized(self.class_name, field)
-                    if YamlFieldCheckResult.OK != result:
-                        return result, result_str
-
-                    # add to list of dependency checks
-                    self.__dependency_checks.append(field) # check again later when all classes are declared
-
-                    # generate
-                    self.__header_code_output += CppFieldGenerator.gen_array_sized_field( name, comments )
-                    self.__lib_includes.add("#include <vector>")
-                    self.__lib_includes.add("#include <memory>")
+            elif( "struct_type" == disposition ):
+                code.write( CppFieldGenerator.gen_const_field( field_type, "TRANSACTION_TYPE",    self.struct.group_id,      comments ) )
+                code.write( CppFieldGenerator.gen_const_field( "uint8_t",  "TRANSACTION_VERSION", self.struct.group_version, comments ) )
 
-                elif( "array_fill" == disposition ):
-                    # check fields
-                    result, result_str = YamlFieldChecker.array_fill(self.class_name, field, self.__name_to_class)
-                    if YamlFieldCheckResult.OK != result:
-                        return result, result_str
+            elif( "inline" == disposition ):
+                code.write( CppFieldGenerator.gen_inline_field( field_type, comments ) )
 
-                    # generate
-                    self.__header_code_output += CppFieldGenerator.gen_array_fill_field( field_type, name, comments )
-                    self.__lib_includes.add("#include <vector>")
+            elif( "reserved" == disposition ):
+                pass
+                #code.write( CppFieldGenerator.gen_reserved_field( field_type, field.name, field.size, comments ) )
 
+            elif( "array" == disposition ):
+                code.write( CppFieldGenerator.gen_array_field( field_type, name, comments, self.arena ) )
+                self.__lib_includes.add("#include <vector>")
+
+            elif( "array_sized" == disposition ):
+                code.write( CppFieldGenerator.gen_array_sized_field( name, comments, self.arena, self.__variant_of( field_type ) ) )
+                self.__lib_includes.add("#include <vector>")
+
+                if self.variant:
+                    self.__includes.add(f'#include "{CppFieldGenerator.variant_name( field_type )}.h"')
                 else:
-                    return YamlFieldCheckResult.DISPOSITION_INVALID, f"\n\nERROR: Invalid disposition '{disposition}' in struct '{self.class_name}'!\n\n"
+                    self.__lib_includes.add("#include <memory>")
 
-            else:
-                # check name exists
-                if not name:
-                    return YamlFieldCheckResult.NAME_MISSING, "\n\nError: Missing 'name' key for field in struct '{self.class_name}'!\n\n"
+                if self.arena:
+                    self.__includes.add('#include "Arena.h"')
+
+            elif( "array_fill" == disposition ):
+                code.write( CppFieldGenerator.gen_array_fill_field( field_type, name, comments, self.arena ) )
+                self.__lib_includes.add("#include <vector>")
 
+            else:
                 # don't generate field if var is the size of an array (in that case the vector 'size()' variable is used instead)
                 if name in self.size_to_arrays:
                     continue
 
-                # check that condition variable is a class member variable
-                if "condition" in field:
-                    result, result_str = YamlFieldChecker.condition(self.class_name, field, self.member_vars, self.__user_types)
-                    if YamlFieldCheckResult.OK != result:
-                        return result, result_str
+                if layout:
+                    continue # declared by the layout struct
 
-                # generate code
-                self.__header_code_output += CppFieldGenerator.gen_normal_field( field_type, name, comments )
+                code.write( CppFieldGenerator.gen_normal_field( field_type, name, comments ) )
 
 
             # Add include
             if field_type in self.__name_to_class:
-                self.__includes.add(f'#include "{field_type}.h"')
+                # The elements of an 'array_sized' field are stored as 'ICatbuffer' pointers, so
+                # the header type is only needed when deserializing the field (with 'variant' the
+                # elements are stored in place, and their header includes the header type)
+                if self.fast_build and "array_sized" == disposition and not self.variant:
+                    self.definition_includes.add(f'#include "{field_type}.h"')
+                else:
+                    self.__includes.add(f'#include "{field_type}.h"')
 
-        self.__header_code_output += "\n};"
+        code.write( "\n};" )
+        self.__header_code_output = code.getvalue() # kept as a single string until all structs are generated
 
-        return YamlFieldCheckResult.OK, ""
 
 
+    def __generate_includes( self, code: CodeEmitter ):
 
-    def __generate_includes( self ):
+        code.line( '#pragma once' )
 
-        self.__include_code_output = f'#pragma once\n'
+        for include in sorted(self.__lib_includes):
+            code.line( include )
 
-        for include in self.__lib_includes:
-            self.__include_code_output += (include + "\n")
+        code.line()
+        code.line( '#include "types.h"' )
+        code.line( '#include "ICatbuffer.h"' )
+        code.line()
 
-        self.__include_code_output += '\n'
-        self.__include_code_output += '#include "types.h"\n'
-        self.__include_code_output += '#include "ICatbuffer.h"\n\n'
-
-        if self.__prettyprinter:
-            self.__include_code_output += '#include "IPrettyPrinter.h"\n\n'
+        if self.__prettyprinter and not self.fast_build:
+            code.line( '#include "IPrettyPrinter.h"' ) # already included by 'ICatbuffer.h'
+            code.line()
 
 
-        for include in self.__includes:
-            self.__include_code_output += (include + "\n")
+        for include in sorted(self.__includes):
+            code.line( include )
 
-        self.__include_code_output += '\n'
+        code.line()
 
 
 
 inherited_methods = """\t
 \t// ICatbuffer inherited methods
-\tbool   Deserialize( RawBuffer& buffer  ) override;
-\tbool   Serialize  ( RawBuffer& buffer  ) override;
-\tsize_t Size       (                    ) override;\n"""
+\tbool   Deserialize         ( RawBuffer& buffer  ) override;
+\tbool   DeserializeUnchecked( RawBuffer& buffer  ) override;
+\tbool   Serialize           ( RawBuffer& buffer  ) override;
+\tsize_t Size                (                    ) override;\n"""
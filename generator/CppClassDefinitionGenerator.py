@@ -7,6 +7,9 @@ from .CppPrintOutputGenerator import CppPrintOutputGenerator
 from .CppSerializationGenerator import CppSerializationGenerator
 from .CppDeserializationGenerator import CppDeserializationGenerator
 from .CppSizeGenerator import CppSizeGenerator
+from .Schema import FieldDef
+from .CodeEmitter import CodeEmitter
+from .FileWriter import FileWriter
 
 
 
@@ -50,15 +53,24 @@ class CppClassDefinitionGenerator():
         self.__types                       = types
 
         self.__includes                    = set()
-        self.__include_code_output         = ""
+        self.__include_code_output         = CodeEmitter()
         self.__include_varint              = False
 
         self.__prettyprinter               = prettyprinter
 
-        self.__deserializer                = CppDeserializationGenerator( types, class_decl.class_name, class_decl.size_to_arrays )
-        self.__serializer                  = CppSerializationGenerator( types, class_decl.class_name, class_decl.size_to_arrays )
-        self.__size_generator              = CppSizeGenerator( types, class_decl.class_name )
-        self.__print_generator             = CppPrintOutputGenerator( types, class_decl.class_name, class_decl.size_to_arrays )
+        # layout structs of the field types with a fixed layout, which are copied with a single memcpy
+        self.__layouts                     = { field.type: class_name_to_class_decl[field.type].layout_struct for field in class_decl.struct.fields
+                                               if field.type in class_name_to_class_decl and class_name_to_class_decl[field.type].layout_struct }
+
+        # minimum serialized size of the element types of the struct arrays, for checking their counts (also used by the view)
+        self.min_sizes                     = { field.type: self.__min_size( field.type ) for field in class_decl.struct.fields
+                                               if field.disposition == "array" and field.type in class_name_to_class_decl }
+
+        self.__deserializer                = CppDeserializationGenerator( types, class_decl.class_name, class_decl.size_to_arrays, layouts=self.__layouts, min_sizes=self.min_sizes, arena=class_decl.arena, variant=class_decl.variant )
+        self.__unchecked_deserializer      = CppDeserializationGenerator( types, class_decl.class_name, class_decl.size_to_arrays, checked=False, layouts=self.__layouts, arena=class_decl.arena, variant=class_decl.variant )
+        self.__serializer                  = CppSerializationGenerator( types, class_decl.class_name, class_decl.size_to_arrays, layouts=self.__layouts, arena=class_decl.arena, variant=class_decl.variant )
+        self.__size_generator              = CppSizeGenerator( types, class_decl.class_name, self.__layouts )
+        self.__print_generator             = CppPrintOutputGenerator( types, class_decl.class_name, class_decl.size_to_arrays, variant=class_decl.variant )
 
         self.__generate_implementation()
 
@@ -67,14 +79,15 @@ class CppClassDefinitionGenerator():
     def write_file( self, file_path: str ):
         self.__generate_includes()
 
-        with open( file_path, "w" ) as f:
-            f.write( self.__include_code_output )
-            f.write( self.__deserializer.generate() )
-            f.write( self.__serializer.generate() )
-            f.write( self.__size_generator.generate() )
+        with FileWriter.open( file_path ) as f:
+            self.__include_code_output.write_to( f )
+            self.__deserializer.write_to( f )
+            self.__unchecked_deserializer.write_to( f )
+            self.__serializer.write_to( f )
+            self.__size_generator.write_to( f )
 
             if self.__prettyprinter:
-                f.write( self.__print_generator.generate() )
+                self.__print_generator.write_to( f )
       
 
 
@@ -88,24 +101,28 @@ class CppClassDefinitionGenerator():
         """
 
         class_name   = self.__class_decl.class_name
-        fields       = self.__class_decl.fields
+        fields       = self.__class_decl.struct.fields
+        layout       = self.__class_decl.layout_struct
 
         self.__includes.add( f'#include "{class_name}.h"' )
 
+        if layout or self.__layouts:
+            self.__includes.add( "#include <cstring>" ) # memcpy
+
         for field in fields:
-            var_type   = field["type"]
-            name       = field["name"]  if "name"  in field else var_type
-            size       = field["size"]  if "size"  in field else ""
-            print_hint = field["print"] if "print" in field else ""
+            var_type   = field.type
+            name       = field.name or var_type
+            size       = field.size if field.size is not None else ""
+            print_hint = field.print_hint
 
             if var_type == "varint":
                 self.__include_varint = True
 
 
-            if "disposition" in field:
+            if field.disposition:
 
-                condition   = self.__gen_condition_from_field(field) if "condition" in field else ""
-                disposition = field["disposition"]
+                condition   = self.__gen_condition_from_field(field) if field.condition is not None else ""
+                disposition = field.disposition
 
                 if "const" == disposition:
                     continue # const fields don't need serialization/deserialization
@@ -115,65 +132,84 @@ class CppClassDefinitionGenerator():
 
                 elif "array" == disposition:
                     size_var_type = ""
-                    if size in self.__class_decl.member_vars:
-                        _, size_var_type = self.__class_decl.member_vars[size]
+                    if size in self.__class_decl.struct.member_vars:
+                        _, size_var_type = self.__class_decl.struct.member_vars[size]
 
                     self.__deserializer.array_field( var_type, name, size, size_var_type, condition )
+                    self.__unchecked_deserializer.array_field( var_type, name, size, size_var_type, condition )
                     self.__serializer.array_field( var_type, name )
                     self.__size_generator.array_field( var_type, name )
                     self.__print_generator.array_field( var_type, name, print_hint )
 
+                    if var_type not in self.__class_name_to_class_decl:
+                        self.__includes.add( "#include <algorithm>" ) # std::copy of builtin, enum and alias elements
+
                 elif "inline" == disposition:
                     self.__deserializer.inline_field( name )
+                    self.__unchecked_deserializer.inline_field( name )
                     self.__serializer.inline_field( name )
                     self.__size_generator.inline_field( name )
                     self.__print_generator.inline_field( name )
 
                 elif "reserved" == disposition:
-                    reserved_value = field["value"]
+                    reserved_value = field.value
                     self.__deserializer.reserved_field( var_type, name, reserved_value )
+                    self.__unchecked_deserializer.reserved_field( var_type, name, reserved_value )
                     self.__serializer.reserved_field( var_type, name, reserved_value )
                     self.__size_generator.reserved_field( var_type, name )
                     self.__print_generator.reserved_field( var_type, name, reserved_value)
 
                 elif "array_sized" == disposition:
-                    header_type          = field["type"]
-                    header_type_field    = field["header_type_field"]
-                    header_version_field = field["header_version_field"]
+                    header_type          = field.type
+                    header_type_field    = field.header_type_field
+                    header_version_field = field.header_version_field
                     enum_type            = self.__get_var_type( header_type_field, header_type )
-                    align                = field["align"] if "align" in field else ""
+                    align                = field.align
 
                     self.__deserializer.array_sized_field( name, size, header_type, header_type_field, header_version_field, enum_type, align )
-                    self.__serializer.array_sized_field( name, align )
+                    self.__unchecked_deserializer.array_sized_field( name, size, header_type, header_type_field, header_version_field, enum_type, align )
+                    self.__serializer.array_sized_field( name, header_type, align )
                     self.__size_generator.array_sized_field( name, size )
                     self.__print_generator.array_sized_field( header_type, name, size )
 
-                    self.__includes.add(f'#include "converters.h"')
+                    if not self.__class_decl.variant:
+                        self.__includes.add(f'#include "converters.h"') # the factories of the variants are in the header of the class
 
                 elif "array_fill" == disposition: #TODO: check that only added once and at the end!!
                     self.__deserializer.array_fill_field( var_type, name )
+                    self.__unchecked_deserializer.array_fill_field( var_type, name )
                     self.__serializer.array_fill_field( var_type, name )
                     self.__size_generator.array_fill_field( var_type, name )
                     self.__print_generator.array_fill_field( var_type, name )
                 else:
-                    print_hint(f'Unknown disposition: { disposition }\n')
+                    print(f'Unknown disposition: { disposition }\n')
                     exit(1)
             else:
 
-                if "condition" in field:
+                if field.condition is not None:
                     condition = self.__gen_condition_from_field(field)
 
-                    self.__deserializer.condition_field( name, var_type, field["condition"], condition )
+                    self.__deserializer.condition_field( name, var_type, field.condition, condition )
+                    self.__unchecked_deserializer.condition_field( name, var_type, field.condition, condition )
                     self.__serializer.condition_field( name, var_type, condition )
                     self.__size_generator.condition( name, var_type, condition )
                     self.__print_generator.condition( name, var_type, condition )
 
                 else:
-                    self.__deserializer.normal_field( var_type, name )
-                    self.__serializer.normal_field( var_type, name )
-                    self.__size_generator.normal_field( var_type, name )
+                    if not layout: # otherwise all fields are copied at once, see below
+                        self.__deserializer.normal_field( var_type, name )
+                        self.__unchecked_deserializer.normal_field( var_type, name )
+                        self.__serializer.normal_field( var_type, name )
+                        self.__size_generator.normal_field( var_type, name )
+
                     self.__print_generator.normal_field( var_type, name, print_hint )
 
+        if layout:
+            self.__deserializer.fixed_layout_struct( layout )
+            self.__unchecked_deserializer.fixed_layout_struct( layout )
+            self.__serializer.fixed_layout_struct( layout )
+            self.__size_generator.fixed_layout_struct()
+
 
 
     def __get_var_type( self, var_name: str, class_name: str ) -> str:
@@ -187,50 +223,106 @@ class CppClassDefinitionGenerator():
             print(f'Error: {class_name} not found in classes\n')
             exit(1)
 
-        for elem in self.__class_name_to_class_decl[class_name].fields:
-            if "name" not in elem:
-                continue
+        member_vars = self.__class_name_to_class_decl[class_name].struct.member_vars
 
-            if elem["name"] == var_name:
-                return elem["type"]
+        if var_name in member_vars:
+            _, var_type = member_vars[var_name]
+            return var_type
 
         print(f'Error: Variable "{var_name}" not found in class "{class_name}"\n')
         exit(1)
 
 
-    def __generate_includes( self ) -> str:
-        self.__includes.add( "#include <iostream>" )
-        self.__includes.add( "#include <iomanip>"  )
-        self.__includes.add( "#include <limits>"   )
+    def __generate_includes( self ) -> None:
+        if not self.__class_decl.fast_build:
+            self.__includes.add( "#include <iostream>" )
+            self.__includes.add( "#include <iomanip>"  )
+            self.__includes.add( "#include <limits>"   )
+
+        elif self.__prettyprinter:
+            # only the Print() method uses the streams, which are the most expensive headers to compile
+            self.__includes.add( "#include <iostream>" )
+            self.__includes.add( "#include <iomanip>"  )
+            self.__includes.add( "#include <string>"   )
+
+        self.__includes.update( self.__class_decl.definition_includes )
 
         if self.__include_varint:
             self.__includes.add( "#include <tuple>"    )
             self.__includes.add( '#include "Varint.h"' )
 
-        for include in self.__includes:
-            self.__include_code_output += (include + "\n")
+        self.__include_code_output = CodeEmitter()
+
+        for include in sorted(self.__includes):
+            self.__include_code_output.line( include )
+
+        self.__include_code_output.line()
+
+
+    def __min_size( self, class_name: str ) -> int:
+        """
+        Returns the minimum size in bytes of the serialized struct
+        'class_name', i.e. with empty arrays of variable size and without
+        the fields of conditions. The nested structs are visited without
+        recursion, since nesting can be deep.
+        """
+
+        sizes : typing.Dict[str, int] = {}
+        stack = [ class_name ]
+
+        while stack:
+            fields = self.__class_name_to_class_decl[ stack[-1] ].struct.fields
+            nested = [ field.type for field in fields if field.type in self.__class_name_to_class_decl and field.type not in sizes and field.type not in stack
+                       and field.condition is None and ( field.disposition in ( "", "inline" ) or ( field.disposition == "array" and str(field.size).isdigit() ) ) ]
+
+            if nested:
+                stack += nested
+                continue
+
+            sizes[ stack.pop() ] = sum( self.__field_min_size( field, sizes ) for field in fields )
+
+        return sizes[class_name]
+
+
+
+    def __field_min_size( self, field: FieldDef, sizes: typing.Dict[str, int] ) -> int:
+        """ Returns the minimum size in bytes of 'field', with the minimum sizes of the nested structs in 'sizes'. """
+
+        if field.condition is not None or field.disposition in ( "const", "struct_type", "array_sized", "array_fill" ):
+            return 0
+
+        if "varint" == field.type:
+            element = 1
+        elif field.type in self.__class_name_to_class_decl:
+            element = sizes.get( field.type, 0 ) # 0 if the struct contains itself
+        else:
+            element = ( self.__types.size_and_alignment( field.type ) or ( 0, 0 ) )[0]
+
+        if "array" == field.disposition:
+            return element * int(field.size) if str(field.size).isdigit() else 0
+
+        return element
 
-        self.__include_code_output += '\n'
 
 
-    def __gen_condition_from_field( self, field: dict ) -> str:
+    def __gen_condition_from_field( self, field: FieldDef ) -> str:
         op = ""
 
-        if( "not equals" == field["condition_operation"] ):
+        if( "not equals" == field.condition_operation ):
             op = "!="
-        elif( "equals" == field["condition_operation"] ):
+        elif( "equals" == field.condition_operation ):
             op = "=="
         else:
-            print(f'Error: unknown condition operator "{field["condition_operation"]}"')
+            print(f'Error: unknown condition operator "{field.condition_operation}"')
 
-        condition_value = field["condition_value"]
+        condition_value = field.condition_value
 
         # if condition variable is an enum change to enum value 
-        _, cond_type = self.__class_decl.member_vars[ field["condition"] ]
+        _, cond_type = self.__class_decl.struct.member_vars[ field.condition ]
         if cond_type in self.__types.name_to_enum:
             condition_value = f'{cond_type}::{condition_value}'
 
-        return f'{CppFieldGenerator.convert_to_field_name(field["condition"])} {op} {condition_value}'
+        return f'{CppFieldGenerator.convert_to_field_name(field.condition)} {op} {condition_value}'
 
 
 
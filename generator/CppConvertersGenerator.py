@@ -1,9 +1,13 @@
 import typing
 import string
+from pathlib import Path
 
 from .CppClassDeclarationGenerator import CppClassDeclarationGenerator
 from .CppTypesGenerator import CppTypesGenerator
 from .CppFieldGenerator import CppFieldGenerator
+from .CppViewGenerator import CppViewGenerator
+from .FileWriter import FileWriter
+from .CodeEmitter import CodeEmitter
 
 
 
@@ -11,7 +15,7 @@ class CppConvertersGenerator():
     """
     Generates functions which convert a type enumerator, RawBuffer or buffer
     name, to an ICatbuffer class. The link between an enumerator and a class 
-    is done via the 'group_type' and 'group_id' variables in 'CppClassDeclarationGenerator'.
+    is done via the 'group_type' and 'group_id' of the 'StructDef' of each class.
 
     For example, given a struct defined as below:
 
@@ -45,257 +49,585 @@ class CppConvertersGenerator():
     then a 'MosaicDefinition' object is returned as an ICatbuffer pointer, which can be
     used to serialize and deserialize raw binary data containing the MosaicDefinition fields.
 
-    All converters are declared in 'converters.h' and implemented in 'converters.cpp'.
+    All converters are declared in 'converters.h' and implemented in one file
+    per group and version (see 'write_file()').
+
+    The elements of 'array_sized' fields are parsed by the read-only views
+    (see 'CppViewGenerator') without creating an object, with functions
+    declared in 'views.h', which call the view of the class instead:
+
+        -------------------------------------------------------------------------------------------------------------
+        bool parse_view_TransactionType( TransactionType type, size_t version, const uint8_t*& ptr, const uint8_t* const end )
+        -------------------------------------------------------------------------------------------------------------
+
+    With 'arena' (see '--arena') each factory has an overload which creates
+    the object in a 'std::pmr::memory_resource' (see 'Arena.h'):
+
+        -------------------------------------------------------------------------------------------------------------
+        ArenaPtr create_type_TransactionType( TransactionType type, size_t version, std::pmr::memory_resource* arena )
+        -------------------------------------------------------------------------------------------------------------
+
+    With 'variant' (see '--variant') a header '{header}Variant.h' is written
+    for each header of 'array_sized' fields, with the 'std::variant' of the
+    structs of the group of the elements, which stores the elements in place,
+    and a factory which appends an element holding the struct of a type to an array:
+
+        -------------------------------------------------------------------------------------------------------------
+        using EmbeddedTransactionVariant = std::variant<EmbeddedAccountKeyLinkTransaction, ...>;
+
+        EmbeddedTransactionVariant* create_variant_TransactionTypeEmbedded( TransactionTypeEmbedded type, size_t version, std::vector<EmbeddedTransactionVariant>& elements )
+        -------------------------------------------------------------------------------------------------------------
     """
 
     def __init__( self,
                   class_declarations:     typing.Dict[str, CppClassDeclarationGenerator],
                   types_generator:        CppTypesGenerator,
-                  generate_print_methods: bool = False) -> None:
+                  generate_print_methods: bool = False,
+                  arena:                  bool = False,
+                  variant:                bool = False ) -> None:
 
-        self.__includes: typing.Set[str] = set()
-        self.__include_code_output       = ""
-        self.__declaration_code_output   = ""
-        self.__definition_code_output    = ""
-        self.__generate_print_methods    = generate_print_methods
+        self.__class_declarations     = class_declarations
+        self.__generate_print_methods = generate_print_methods
+        self.__arena                  = arena
+        self.__variant                = variant
 
         # used for going from group_type group_version and group_id, to class name 
-        # ( eg. class_name = type_to_versions_to_enum_to_classes[ decl.group_type ][decl.group_version][decl.group_id] )
+        # ( eg. class_name = type_to_versions_to_enum_to_classes[ struct.group_type ][struct.group_version][struct.group_id] )
         self.type_to_versions_to_enum_to_classes = { key: dict() for key in types_generator.name_to_enum.keys() } 
 
 
         # Go through class declarations and build 'type_to_versions_to_enum_to_classes' dict
         for class_name, decl in class_declarations.items():
+            group_type    = decl.struct.group_type
+            group_id      = decl.struct.group_id
+            group_version = decl.struct.group_version
 
             #TODO: this is just temporary, both group_type and group_version should always be defined 
-            if decl.group_version and not decl.group_type:
-                lookup_str      = class_name.rstrip(string.digits) # remove version number from end of class name
-                ref_decl        = class_declarations[lookup_str]   # get class declaration
-                decl.group_type = ref_decl.group_type              # copy its type
-                decl.group_id   = ref_decl.group_id                # copy its id
+            if group_version and not group_type:
+                lookup_str = class_name.rstrip(string.digits)              # remove version number from end of class name
+                ref_struct = class_declarations[lookup_str].struct         # get class definition
+                group_type = ref_struct.group_type                         # use its type
+                group_id   = ref_struct.group_id                           # use its id
 
-            if not decl.group_type: # not all classes belong to an enum group
+            if not group_type: # not all classes belong to an enum group
                 continue
             
-            if decl.group_type not in self.type_to_versions_to_enum_to_classes:
-                print(f'Error: Const type "{decl.group_type}" not defined as an enum!\n')
+            if group_type not in self.type_to_versions_to_enum_to_classes:
+                print(f'Error: Const type "{group_type}" not defined as an enum!\n')
                 exit(1)
 
-            versions_to_enum_to_classes = self.type_to_versions_to_enum_to_classes[ decl.group_type ]
+            versions_to_enum_to_classes = self.type_to_versions_to_enum_to_classes[ group_type ]
 
-            if decl.group_version not in versions_to_enum_to_classes:
-                versions_to_enum_to_classes[ decl.group_version ] = {}
+            if group_version not in versions_to_enum_to_classes:
+                versions_to_enum_to_classes[ group_version ] = {}
 
-            enum_to_classes = versions_to_enum_to_classes[ decl.group_version ]
-            if decl.group_id in versions_to_enum_to_classes[ decl.group_version ]:
-                print(f'Error: Same enum "{decl.group_type}"::"{decl.group_id}" used for multiple classes: "{class_name}" and "{enum_to_classes[decl.group_id]}"!\n')
+            enum_to_classes = versions_to_enum_to_classes[ group_version ]
+            if group_id in versions_to_enum_to_classes[ group_version ]:
+                print(f'Error: Same enum "{group_type}"::"{group_id}" used for multiple classes: "{class_name}" and "{enum_to_classes[group_id]}"!\n')
                 exit(1)
 
-            self.type_to_versions_to_enum_to_classes[decl.group_type][decl.group_version][decl.group_id] = class_name
+            self.type_to_versions_to_enum_to_classes[group_type][group_version][group_id] = class_name
 
-        # generate code output
-        self.__generate_declarations()
-        self.__generate_enum_type_to_class_methods()
 
-        if generate_print_methods:
-            self.__generate_string_to_class_method( class_declarations )
-            self.__generate_rawbuffer_to_class_methods( class_declarations )
-            self.__generate_enum_group_to_class_methods()
+    def __generate_enum_type_to_class_method( self, code: CodeEmitter, enum_class: str, version: str ):
 
-        self.__generate_includes()
+        code.write( f'std::unique_ptr<ICatbuffer> create_type_{enum_class}_v{version}( {enum_class} type )\n{{\n\t' )
+        code.write( f'switch( type )\n\t{{\n' )
 
+        for enum_type, class_name in self.type_to_versions_to_enum_to_classes[enum_class][version].items():
+            code.write( f'\t\tcase {enum_class}::{enum_type} : {{ return std::unique_ptr<ICatbuffer>( new {class_name}() ); }}\n' )
 
-    def __generate_enum_type_to_class_methods( self ):
+        code.write( f'\n\t\tdefault: {{ return nullptr; }}\n\t}}\n}}\n\n' )
 
-        for enum_class, versions_to_enum_to_classes in self.type_to_versions_to_enum_to_classes.items():
-            if not versions_to_enum_to_classes:
-                continue
 
-            version_to_function_code  = f'std::unique_ptr<ICatbuffer> create_type_{enum_class}( {enum_class} type, size_t version )\n{{\n\t'
-            version_to_function_code += f'switch( version )\n\t{{\n'
+    def __generate_enum_type_to_arena_class_method( self, code: CodeEmitter, enum_class: str, version: str ):
 
-            for version, enum_to_classes in versions_to_enum_to_classes.items():
+        code.write( f'ArenaPtr create_type_{enum_class}_v{version}( {enum_class} type, std::pmr::memory_resource* arena )\n{{\n\t' )
+        code.write( f'switch( type )\n\t{{\n' )
 
-                version_to_function_code      += f'\t\tcase {version} : {{ return create_type_{enum_class}_v{version}( type ); }}\n'
-                self.__definition_code_output += f'std::unique_ptr<ICatbuffer> create_type_{enum_class}_v{version}( {enum_class} type )\n{{\n\t'
-                self.__definition_code_output += f'switch( type )\n\t{{\n'
+        for enum_type, class_name in self.type_to_versions_to_enum_to_classes[enum_class][version].items():
+            code.write( f'\t\tcase {enum_class}::{enum_type} : {{ return MakeArenaObject<{class_name}>( arena ); }}\n' )
 
-                for enum_type, class_name in enum_to_classes.items():
-                    self.__includes.add(f'#include "{class_name}.h"')
-                    self.__definition_code_output += f'\t\tcase {enum_class}::{enum_type} : {{ return std::unique_ptr<ICatbuffer>( new {class_name}() ); }}\n'
+        code.write( f'\n\t\tdefault: {{ return nullptr; }}\n\t}}\n}}\n\n' )
+
+
+    def __generate_version_to_arena_class_method( self, code: CodeEmitter, enum_class: str ):
+
+        versions = self.type_to_versions_to_enum_to_classes[enum_class].keys()
+
+        code.write( f'// Defined in the converters_{enum_class}_v*.cpp files\n' )
+        for version in versions:
+            code.write( f'ArenaPtr create_type_{enum_class}_v{version}( {enum_class} type, std::pmr::memory_resource* arena );\n' )
+
+        code.write( f'\n\n' )
+        code.write( f'ArenaPtr create_type_{enum_class}( {enum_class} type, size_t version, std::pmr::memory_resource* arena )\n{{\n\t' )
+        code.write( f'switch( version )\n\t{{\n' )
+
+        for version in versions:
+            code.write( f'\t\tcase {version} : {{ return create_type_{enum_class}_v{version}( type, arena ); }}\n' )
 
-                self.__definition_code_output += f'\n\t\tdefault: {{ return nullptr; }}\n\t}}\n}}\n\n'
+        code.write( f'\n\t\tdefault: {{ return nullptr; }}\n\t}}\n}}\n\n' )
 
-            version_to_function_code += f'\n\t\tdefault: {{ return nullptr; }}\n\t}}\n}}\n\n'
-            self.__definition_code_output += version_to_function_code
 
+    def __generate_version_to_class_method( self, code: CodeEmitter, enum_class: str ):
 
-    def __generate_declarations( self ):
+        versions = self.type_to_versions_to_enum_to_classes[enum_class].keys()
+
+        # the methods of each version are defined in their own file
+        code.write( f'// Defined in the converters_{enum_class}_v*.cpp files\n' )
+        for version in versions:
+            code.write( f'std::unique_ptr<ICatbuffer> create_type_{enum_class}_v{version}( {enum_class} type );\n' )
+
+        code.write( f'\n\n' )
+        code.write( f'std::unique_ptr<ICatbuffer> create_type_{enum_class}( {enum_class} type, size_t version )\n{{\n\t' )
+        code.write( f'switch( version )\n\t{{\n' )
+
+        for version in versions:
+            code.write( f'\t\tcase {version} : {{ return create_type_{enum_class}_v{version}( type ); }}\n' )
+
+        code.write( f'\n\t\tdefault: {{ return nullptr; }}\n\t}}\n}}\n\n' )
+
+
+    def __generate_declarations( self, code: CodeEmitter ):
 
         for enum_class, version_to_types in self.type_to_versions_to_enum_to_classes.items():
 
             if not version_to_types:
                 continue
 
-            self.__declaration_code_output += f'/**\n'
-            self.__declaration_code_output += f" * Function to create an instance of a class belonging to the class group '{enum_class}'.\n"
-            self.__declaration_code_output += f' * \n'
-            self.__declaration_code_output += f" * @param[in] type     The class with enum-type 'type', which should be instantiated.\n"
-            self.__declaration_code_output += f" * @param[in] version  The the version of the class which should be instantiated.\n"
-            self.__declaration_code_output += f" * @return             nullptr if 'type' and 'version' does not correspond to a class, otherwise pointer to instantiated class.\n"
-            self.__declaration_code_output += f' */\n'
-            self.__declaration_code_output += f'std::unique_ptr<ICatbuffer> create_type_{enum_class}( {enum_class} type, size_t version );\n\n\n'
+            code.write( f'/**\n' )
+            code.write( f" * Function to create an instance of a class belonging to the class group '{enum_class}'.\n" )
+            code.write( f' * \n' )
+            code.write( f" * @param[in] type     The class with enum-type 'type', which should be instantiated.\n" )
+            code.write( f" * @param[in] version  The the version of the class which should be instantiated.\n" )
+            code.write( f" * @return             nullptr if 'type' and 'version' does not correspond to a class, otherwise pointer to instantiated class.\n" )
+            code.write( f' */\n' )
+            code.write( f'std::unique_ptr<ICatbuffer> create_type_{enum_class}( {enum_class} type, size_t version );\n\n\n' )
+
+            if self.__arena:
+                code.write( f'/**\n' )
+                code.write( f" * Same as above, but creates the instance in 'arena', which must outlive it (see Arena.h).\n" )
+                code.write( f' */\n' )
+                code.write( f'ArenaPtr create_type_{enum_class}( {enum_class} type, size_t version, std::pmr::memory_resource* arena );\n\n\n' )
 
         if self.__generate_print_methods:
-            self.__declaration_code_output += f'/**\n'
-            self.__declaration_code_output += f" * Function to convert a RawBuffer to an instance of a class belonging to the class group 'group_name'.\n"
-            self.__declaration_code_output += f" * The type of buffer is auto detected by looking at type and version fields in the buffer header.\n"
-            self.__declaration_code_output += f' * \n'
-            self.__declaration_code_output += f" * @param[in] inputBuf    The buffer which will be deserialized to create class instance.\n"
-            self.__declaration_code_output += f" * @param[in] group_name  The name of the group which the buffer belongs to.\n"
-            self.__declaration_code_output += f" * @return                nullptr if buffer does not correspond to a class, otherwise pointer to instantiated class.\n"
-            self.__declaration_code_output += f' */\n'
-            self.__declaration_code_output += f'std::unique_ptr<ICatbuffer> create_type( RawBuffer& inputBuf, std::string group_name );\n\n\n'
+            code.write( f'/**\n' )
+            code.write( f" * Function to convert a RawBuffer to an instance of a class belonging to the class group 'group_name'.\n" )
+            code.write( f" * The type of buffer is auto detected by looking at type and version fields in the buffer header.\n" )
+            code.write( f' * \n' )
+            code.write( f" * @param[in] inputBuf    The buffer which will be deserialized to create class instance.\n" )
+            code.write( f" * @param[in] group_name  The name of the group which the buffer belongs to.\n" )
+            code.write( f" * @return                nullptr if buffer does not correspond to a class, otherwise pointer to instantiated class.\n" )
+            code.write( f' */\n' )
+            code.write( f'std::unique_ptr<ICatbuffer> create_type( RawBuffer& inputBuf, std::string group_name );\n\n\n' )
             
-            self.__declaration_code_output += f'/**\n'
-            self.__declaration_code_output += f" * Function to convert a buffer name to a class instance.\n"
-            self.__declaration_code_output += f' * \n'
-            self.__declaration_code_output += f" * @param[in] buffer_name  The name of the buffer which should be instantiated.\n"
-            self.__declaration_code_output += f" * @return                 nullptr if name does not correspond to a class, otherwise pointer to instantiated class.\n"
-            self.__declaration_code_output += f' */\n'
-            self.__declaration_code_output += f'std::unique_ptr<ICatbuffer> create_type( std::string buffer_name );\n\n\n'
+            code.write( f'/**\n' )
+            code.write( f" * Function to convert a buffer name to a class instance.\n" )
+            code.write( f' * \n' )
+            code.write( f" * @param[in] buffer_name  The name of the buffer which should be instantiated.\n" )
+            code.write( f" * @return                 nullptr if name does not correspond to a class, otherwise pointer to instantiated class.\n" )
+            code.write( f' */\n' )
+            code.write( f'std::unique_ptr<ICatbuffer> create_type( std::string buffer_name );\n\n\n' )
+
+
+    def __generate_view_declarations( self, code: CodeEmitter ):
+
+        for enum_class in self.__group_names():
+            code.write( f'/**\n' )
+            code.write( f" * Function to validate a serialized struct belonging to the class group '{enum_class}', with the view of its class.\n" )
+            code.write( f' * \n' )
+            code.write( f" * @param[in]     type     The enum-type of the class of the struct.\n" )
+            code.write( f" * @param[in]     version  The the version of the class of the struct.\n" )
+            code.write( f" * @param[in,out] ptr      The start of the struct, which is moved past it.\n" )
+            code.write( f" * @param[in]     end      The end of the buffer containing the struct.\n" )
+            code.write( f" * @return                 false if 'type' and 'version' does not correspond to a class, or if the struct is not valid.\n" )
+            code.write( f' */\n' )
+            code.write( f'bool parse_view_{enum_class}( {enum_class} type, size_t version, const uint8_t*& ptr, const uint8_t* const end );\n\n' )
+
+            code.write( f"// Same as 'parse_view_{enum_class}()' for a struct which was validated before, without any checks\n" )
+            code.write( f'bool parse_view_unchecked_{enum_class}( {enum_class} type, size_t version, const uint8_t*& ptr, const uint8_t* const end );\n\n\n' )
+
+
+    def __generate_view_parsers( self, code: CodeEmitter, enum_class: str ):
+
+        for method, parse in [ ( f'parse_view_{enum_class}',           "return view.Parse( ptr, end );" ),
+                               ( f'parse_view_unchecked_{enum_class}', "view.ParseUnchecked( ptr, end ); return true;" ) ]:
+
+            code.write( f'bool {method}( {enum_class} type, size_t version, const uint8_t*& ptr, const uint8_t* const end )\n{{\n\t' )
+            code.write( f'switch( version )\n\t{{\n' )
 
+            for version, enum_to_classes in self.type_to_versions_to_enum_to_classes[enum_class].items():
+                code.write( f'\t\tcase {version} :\n\t\t{{\n\t\t\tswitch( type )\n\t\t\t{{\n' )
+
+                for enum_type, class_name in enum_to_classes.items():
+                    code.write( f'\t\t\t\tcase {enum_class}::{enum_type} : {{ {CppViewGenerator.view_name( class_name )} view; {parse} }}\n' )
+
+                code.write( f'\n\t\t\t\tdefault: {{ return false; }}\n\t\t\t}}\n\t\t}}\n' )
+
+            code.write( f'\n\t\tdefault: {{ return false; }}\n\t}}\n}}\n\n' )
+
+
+    def __variant_headers( self ) -> typing.Dict[str, str]:
+        """
+        Returns the headers of the 'array_sized' fields of all classes, and
+        the group of the structs which follow each header (the type of its
+        'header_type_field').
+        """
+
+        header_to_group : typing.Dict[str, str] = {}
+
+        for decl in self.__class_declarations.values():
+            for field in decl.struct.fields:
+                if "array_sized" == field.disposition:
+                    _, header_to_group[field.type] = self.__class_declarations[field.type].struct.member_vars[field.header_type_field]
+
+        return header_to_group
+
+
+    def __group_classes( self, group_name: str ) -> typing.List[str]:
+        return [ class_name for enum_to_classes in self.type_to_versions_to_enum_to_classes.get( group_name, {} ).values() for class_name in enum_to_classes.values() ]
+
+
+    def __check_variants( self, header_to_group: typing.Dict[str, str] ):
+        """
+        Checks that the structs of each variant can be stored in place,
+        i.e. that the group has structs and that they don't contain, even
+        through other structs or variants, an element of their own variant.
+        """
+
+        for header, group_name in header_to_group.items():
+            pending = self.__group_classes( group_name )
+            visited = set()
+
+            if not pending:
+                print(f'Error: The group "{group_name}" of the array_sized header "{header}" has no structs, which are needed for \'--variant\'!\n')
+                exit(1)
+
+            while pending:
+                class_name = pending.pop()
+                if class_name in visited:
+                    continue
+
+                visited.add( class_name )
+
+                for field in self.__class_declarations[class_name].struct.fields:
+                    if "array_sized" == field.disposition:
+                        if header == field.type:
+                            print(f'Error: The struct "{class_name}" contains elements of the array_sized header "{header}" of its own group "{group_name}", which can\'t be stored in place with \'--variant\'!\n')
+                            exit(1)
+
+                        pending.extend( self.__group_classes( header_to_group[field.type] ) )
+
+                    elif field.type in self.__class_declarations:
+                        pending.append( field.type )
+
+
+    def __generate_variant_factory( self, code: CodeEmitter, group_name: str, variant: str, arena: bool ):
+
+        if arena:
+            code.write( f'inline {variant}* create_variant_{group_name}( {group_name} type, size_t version, std::pmr::vector<{variant}>& elements )\n{{\n\t' )
+        else:
+            code.write( f'inline {variant}* create_variant_{group_name}( {group_name} type, size_t version, std::vector<{variant}>& elements )\n{{\n\t' )
 
-    def __generate_includes( self ):
+        code.write( f'switch( version )\n\t{{\n' )
 
-        for include in self.__includes:
-            self.__include_code_output += (include + "\n")
+        for version, enum_to_classes in self.type_to_versions_to_enum_to_classes[group_name].items():
+            code.write( f'\t\tcase {version} :\n\t\t{{\n\t\t\tswitch( type )\n\t\t\t{{\n' )
 
-        self.__include_code_output += '\n'
+            for enum_type, class_name in enum_to_classes.items():
+                if arena:
+                    code.write( f'\t\t\t\tcase {group_name}::{enum_type} : {{ return &elements.emplace_back( std::in_place_type<{class_name}>, elements.get_allocator().resource() ); }}\n' )
+                else:
+                    code.write( f'\t\t\t\tcase {group_name}::{enum_type} : {{ return &elements.emplace_back( std::in_place_type<{class_name}> ); }}\n' )
 
+            code.write( f'\n\t\t\t\tdefault: {{ return nullptr; }}\n\t\t\t}}\n\t\t}}\n' )
 
-    def __generate_string_to_class_method( self, class_declarations: typing.Dict[str, CppClassDeclarationGenerator] ):
+        code.write( f'\n\t\tdefault: {{ return nullptr; }}\n\t}}\n}}\n\n' )
+
+
+    def __generate_variant( self, code: CodeEmitter, header: str, group_name: str ):
+
+        variant     = CppFieldGenerator.variant_name( header )
+        class_names = self.__group_classes( group_name )
+
+        code.write( "#pragma once\n\n" )
+        code.write( "#include <variant>\n" )
+        code.write( "#include <vector>\n" )
+
+        if self.__arena:
+            code.write( "#include <memory_resource>\n" )
+
+        code.write( '#include "types.h"\n' )
+        code.write( '#include "Variant.h"\n\n' )
+
+        self.__generate_includes( code, class_names )
+
+        code.write( f'\n/**\n' )
+        code.write( f" * Element of the 'array_sized' fields with the header '{header}', which stores a struct of the class group '{group_name}' in place (see Variant.h).\n" )
+        code.write( f' */\n' )
+        code.write( f'using {variant} = std::variant<\n\t' + ",\n\t".join( class_names ) + '>;\n\n\n' )
+
+        code.write( f'/**\n' )
+        code.write( f" * Function to create an instance of a class belonging to the class group '{group_name}' at the end of 'elements',\n" )
+        code.write( f" * without moving or copying it.\n" )
+        code.write( f' * \n' )
+        code.write( f" * @param[in]     type      The class with enum-type 'type', which should be instantiated.\n" )
+        code.write( f" * @param[in]     version   The version of the class which should be instantiated.\n" )
+        code.write( f" * @param[in,out] elements  The array to which the instance is appended.\n" )
+        code.write( f" * @return                  nullptr if 'type' and 'version' does not correspond to a class, otherwise the appended element.\n" )
+        code.write( f' */\n' )
+        self.__generate_variant_factory( code, group_name, variant, False )
+
+        if self.__arena:
+            code.write( f'\n/**\n' )
+            code.write( f" * Same as above, but allocates the arrays of the instance from the arena of 'elements' (see Arena.h).\n" )
+            code.write( f' */\n' )
+            self.__generate_variant_factory( code, group_name, variant, True )
+
+
+    def __generate_includes( self, code: CodeEmitter, class_names: typing.Iterable[str] ):
+
+        for class_name in sorted(class_names):
+            code.line( f'#include "{class_name}.h"' )
+
+        code.line()
+
+
+    def __generate_string_to_class_method( self, code: CodeEmitter, class_declarations: typing.Dict[str, CppClassDeclarationGenerator] ):
 
         if 0 == len(class_declarations):
             return
 
 
-        self.__definition_code_output += f'std::unique_ptr<ICatbuffer> create_type( std::string buffer_name )\n{{\n'
+        code.write( f'std::unique_ptr<ICatbuffer> create_type( std::string buffer_name )\n{{\n' )
 
         class_names = list(class_declarations.keys())
         first_class = class_names[0]
         
-        self.__definition_code_output += f'\tif("{first_class}" == buffer_name){{ return std::unique_ptr<ICatbuffer>( new {first_class}() ); }}\n'
-        self.__includes.add(f'#include "{first_class}.h"')
+        code.write( f'\tif("{first_class}" == buffer_name){{ return std::unique_ptr<ICatbuffer>( new {first_class}() ); }}\n' )
         for class_name in class_names[1:]:
-            self.__definition_code_output += f'\telse if("{class_name}" == buffer_name){{ return std::unique_ptr<ICatbuffer>( new {class_name}() ); }}\n'
-            self.__includes.add(f'#include "{class_name}.h"')
+            code.write( f'\telse if("{class_name}" == buffer_name){{ return std::unique_ptr<ICatbuffer>( new {class_name}() ); }}\n' )
 
-        self.__definition_code_output += "\telse { return nullptr; }\n"
-        self.__definition_code_output += "}\n\n"
+        code.write( "\telse { return nullptr; }\n" )
+        code.write( "}\n\n" )
 
 
-    def __generate_enum_group_to_class_methods( self ):
-        group_names = []
+    def __group_names( self ) -> typing.List[str]:
+        return [ enum_class for enum_class, versions_to_enum_to_classes in self.type_to_versions_to_enum_to_classes.items() if versions_to_enum_to_classes ]
 
-        for enum_class, versions_to_enum_to_classes in self.type_to_versions_to_enum_to_classes.items():
-            if not versions_to_enum_to_classes:
-                continue
 
-            group_names.append(enum_class)
+    def __generate_enum_group_to_class_methods( self, code: CodeEmitter ):
+        group_names = self.__group_names()
 
-        self.__definition_code_output += f'std::unique_ptr<ICatbuffer> create_type( RawBuffer& inputBuf, std::string group_name )\n{{\n'
+        code.write( f'std::unique_ptr<ICatbuffer> create_type( RawBuffer& inputBuf, std::string group_name )\n{{\n' )
         if len(group_names) > 0:
-            self.__definition_code_output += f'\tif( "{group_names[0]}" == group_name ){{ return create_type_{group_names[0]}( inputBuf ); }}\n'
+            code.write( f'\tif( "{group_names[0]}" == group_name ){{ return create_type_{group_names[0]}( inputBuf ); }}\n' )
 
             for group_name in group_names[1:]:
-                self.__definition_code_output += f'\telse if( "{group_name}" == group_name ){{ return create_type_{group_name}( inputBuf ); }}\n'
+                code.write( f'\telse if( "{group_name}" == group_name ){{ return create_type_{group_name}( inputBuf ); }}\n' )
 
-            self.__definition_code_output += f'\telse\n\t{{\n'
-            self.__definition_code_output += f'\t\tprintf( "Error: %s is not a valid buffer type!\\n", group_name.c_str() );\n'
-            self.__definition_code_output += f'\t\texit(1);\n\t}}\n}}\n\n'
+            code.write( f'\telse\n\t{{\n' )
+            code.write( f'\t\tprintf( "Error: %s is not a valid buffer type!\\n", group_name.c_str() );\n' )
+            code.write( f'\t\texit(1);\n\t}}\n}}\n\n' )
         else:
-            self.__definition_code_output += f'\t(void) inputBuf;\n'
-            self.__definition_code_output += f'\tprintf( "Error: Buffer type %s was not defined in the schemas!\\n", group_name.c_str() );\n'
-            self.__definition_code_output += f'\texit(1);\n\n}}\n\n'
+            code.write( f'\t(void) inputBuf;\n' )
+            code.write( f'\tprintf( "Error: Buffer type %s was not defined in the schemas!\\n", group_name.c_str() );\n' )
+            code.write( f'\texit(1);\n\n}}\n\n' )
 
 
-    def __generate_rawbuffer_to_class_methods( self, class_decls ):
-        group_names = []
-
-        for enum_class, versions_to_enum_to_classes in self.type_to_versions_to_enum_to_classes.items():
-            if not versions_to_enum_to_classes:
-                continue
+    def __group_header( self, group_name: str ) -> typing.Tuple[str, str]:
+        """
+        Returns the header class of the structs of group 'group_name', and the
+        C++ expression for the version in the header (or "1" if the header
+        has no version field).
+        """
 
-            group_names.append(enum_class)
-
-        for group_name in group_names:
-
-            class_name    = list(self.type_to_versions_to_enum_to_classes[group_name]["1"].values())[0]
-            header_class  = class_decls[class_name].group_header
-            version_field = class_decls[class_name].header_version_field
-            version_field = "header."+CppFieldGenerator.convert_to_field_name(version_field) if version_field else "1"
-
-            self.__definition_code_output += f'std::unique_ptr<ICatbuffer> create_type_{group_name}( RawBuffer& inputBuf )\n'
-            self.__definition_code_output += f'{{\n'
-            self.__definition_code_output += f'  // Get header\n'
-            self.__definition_code_output += f'  RawBuffer headerBuf = inputBuf;\n'
-            self.__definition_code_output += f'  {header_class} header;\n'
-            self.__definition_code_output += f'  bool succ = header.Deserialize( headerBuf );\n'
-            self.__definition_code_output += f'\n'
-            self.__definition_code_output += f'  if( !succ )\n'
-            self.__definition_code_output += f'  {{\n'
-            self.__definition_code_output += f'    header.Print(0);\n'
-            self.__definition_code_output += f'    printf( "Error: Was not able to deserialize header! Error occurred at byte: %lu\\n", headerBuf.GetOffset() );\n'
-            self.__definition_code_output += f'    return nullptr;\n'
-            self.__definition_code_output += f'  }}\n'
-            self.__definition_code_output += f'\n'
-            self.__definition_code_output += f'  // Deserialize all of payload\n'
-            self.__definition_code_output += f'  printf( "\\nDetected buffer of type 0x%X (%d) \\n\\n", (uint32_t) header.mType, (uint32_t) header.mType );\n'
-            self.__definition_code_output += f'  std::unique_ptr<ICatbuffer> cat = create_type_{group_name}( header.mType, {version_field} );\n'
-            self.__definition_code_output += f'  if( nullptr == cat )\n'
-            self.__definition_code_output += f'  {{\n'
-            self.__definition_code_output += f'    printf( "Error: Combination of type=%u and version=%u do not correspond to any buffer!\\n", (uint32_t) header.mType, {version_field} );\n'
-            self.__definition_code_output += f'    return nullptr;\n'
-            self.__definition_code_output += f'  }}\n'
-            self.__definition_code_output += f'  succ = cat->Deserialize( inputBuf );\n'
-            self.__definition_code_output += f'\n'
-            self.__definition_code_output += f'  if( !succ )\n'
-            self.__definition_code_output += f'  {{\n'
-            self.__definition_code_output += f'    header.Print(0);\n'
-            self.__definition_code_output += f'    printf( "Error: Was not able to deserialize header! Error occurred at byte: %lu\\n", headerBuf.GetOffset() );\n'
-            self.__definition_code_output += f'    return nullptr;\n'
-            self.__definition_code_output += f'  }}\n'
-            self.__definition_code_output += f'\n'
-            self.__definition_code_output += f'  return cat;\n'
-            self.__definition_code_output += f'}}\n\n\n'
-
-            self.__declaration_code_output += f'/**\n'
-            self.__declaration_code_output += f" * Function to convert a RawBuffer to an instance of a class belonging '{group_name}'.\n"
-            self.__declaration_code_output += f" * The type of buffer is auto detected by looking at type and version fields in the buffer header.\n"
-            self.__declaration_code_output += f' * \n'
-            self.__declaration_code_output += f" * @param[in] inputBuf    The buffer which will be deserialized to create class instance.\n"
-            self.__declaration_code_output += f" * @return                nullptr if buffer does not correspond to a class belonging to '{group_name}', otherwise pointer to instantiated class.\n"
-            self.__declaration_code_output += f' */\n'
-            self.__declaration_code_output += f'std::unique_ptr<ICatbuffer> create_type_{group_name}( RawBuffer& inputBuf );\n\n\n'
+        versions_to_enum_to_classes = self.type_to_versions_to_enum_to_classes[group_name]
+        enum_to_classes             = versions_to_enum_to_classes.get( "1" ) or next( iter( versions_to_enum_to_classes.values() ) ) # version 1 may have been removed by '--roots'
+
+        class_name    = list(enum_to_classes.values())[0]
+        header_class  = self.__class_declarations[class_name].struct.group_header
+        version_field = self.__class_declarations[class_name].struct.header_version_field
+        version_field = "header."+CppFieldGenerator.convert_to_field_name(version_field) if version_field else "1"
+
+        return header_class, version_field
+
+
+    def __generate_rawbuffer_to_class_method( self, code: CodeEmitter, group_name: str ):
+
+        header_class, version_field = self.__group_header( group_name )
+
+        code.write( f'std::unique_ptr<ICatbuffer> create_type_{group_name}( RawBuffer& inputBuf )\n' )
+        code.write( f'{{\n' )
+        code.write( f'  // Get header\n' )
+        code.write( f'  RawBuffer headerBuf = inputBuf;\n' )
+        code.write( f'  {header_class} header;\n' )
+        code.write( f'  bool succ = header.Deserialize( headerBuf );\n' )
+        code.write( f'\n' )
+        code.write( f'  if( !succ )\n' )
+        code.write( f'  {{\n' )
+        code.write( f'    header.Print(0);\n' )
+        code.write( f'    printf( "Error: Was not able to deserialize header! Error occurred at byte: %lu\\n", headerBuf.GetOffset() );\n' )
+        code.write( f'    return nullptr;\n' )
+        code.write( f'  }}\n' )
+        code.write( f'\n' )
+        code.write( f'  // Deserialize all of payload\n' )
+        code.write( f'  printf( "\\nDetected buffer of type 0x%X (%d) \\n\\n", (uint32_t) header.mType, (uint32_t) header.mType );\n' )
+        code.write( f'  std::unique_ptr<ICatbuffer> cat = create_type_{group_name}( header.mType, {version_field} );\n' )
+        code.write( f'  if( nullptr == cat )\n' )
+        code.write( f'  {{\n' )
+        code.write( f'    printf( "Error: Combination of type=%u and version=%u do not correspond to any buffer!\\n", (uint32_t) header.mType, {version_field} );\n' )
+        code.write( f'    return nullptr;\n' )
+        code.write( f'  }}\n' )
+        code.write( f'  succ = cat->Deserialize( inputBuf );\n' )
+        code.write( f'\n' )
+        code.write( f'  if( !succ )\n' )
+        code.write( f'  {{\n' )
+        code.write( f'    header.Print(0);\n' )
+        code.write( f'    printf( "Error: Was not able to deserialize header! Error occurred at byte: %lu\\n", headerBuf.GetOffset() );\n' )
+        code.write( f'    return nullptr;\n' )
+        code.write( f'  }}\n' )
+        code.write( f'\n' )
+        code.write( f'  return cat;\n' )
+        code.write( f'}}\n\n\n' )
+
+
+    def __generate_rawbuffer_to_class_declarations( self, code: CodeEmitter ):
+
+        for group_name in self.__group_names():
+            code.write( f'/**\n' )
+            code.write( f" * Function to convert a RawBuffer to an instance of a class belonging '{group_name}'.\n" )
+            code.write( f" * The type of buffer is auto detected by looking at type and version fields in the buffer header.\n" )
+            code.write( f' * \n' )
+            code.write( f" * @param[in] inputBuf    The buffer which will be deserialized to create class instance.\n" )
+            code.write( f" * @return                nullptr if buffer does not correspond to a class belonging to '{group_name}', otherwise pointer to instantiated class.\n" )
+            code.write( f' */\n' )
+            code.write( f'std::unique_ptr<ICatbuffer> create_type_{group_name}( RawBuffer& inputBuf );\n\n\n' )
 
 
     def write_file( self, file_path: str ):
         """
-        Writes generated code to converters.h/.cpp
+        Writes generated code to converters.h and to the translation units below,
+        so that they compile in parallel and only the files of the groups which
+        changed are rewritten (and recompiled):
+
+            converters_{group}_v{version}.cpp  'create_type_{group}_v{version}()', includes only the classes of the version
+            converters_{group}.cpp             'create_type_{group}()', selecting the version
+            converters.cpp                     the converters of buffer names and group names to classes (only with print methods)
+            views.h, views_{group}.cpp         'parse_view_{group}()', includes the views of the classes of the group
+            {header}Variant.h                  the variant of the elements of the 'array_sized' fields with the header (only with 'variant')
+
+        The code is written to the files while it is generated, and files of
+        groups which no longer exist are removed.
         """
 
-        f = open(file_path+f'/converters.h', "w")
-        f.write("#pragma once\n\n")
-        f.write("#include <memory>\n")
-        f.write('#include "ICatbuffer.h"\n')
-        f.write('#include "types.h"\n\n')
-        f.write(self.__declaration_code_output)
-        f.close()
-
-        f = open(file_path+f'/converters.cpp', "w")
-        f.write("#include <stdio.h>\n")
-        f.write('#include "converters.h"\n\n')
-        f.write(self.__include_code_output)
-        f.write(self.__definition_code_output)
-        f.close()
+        file_names : typing.Set[str] = { "converters.h", "converters.cpp", "views.h" }
+
+        with FileWriter.open(file_path+f'/converters.h') as f:
+            code = CodeEmitter( f )
+            code.write( "#pragma once\n\n" )
+            code.write( "#include <memory>\n" )
+
+            if self.__generate_print_methods:
+                code.write( "#include <string>\n" )
+
+            code.write( '#include "ICatbuffer.h"\n' )
+            code.write( '#include "types.h"\n' )
+
+            if self.__arena:
+                code.write( '#include "Arena.h"\n' )
+
+            code.write( '\n' )
+
+            self.__generate_declarations( code )
+
+            if self.__generate_print_methods:
+                self.__generate_rawbuffer_to_class_declarations( code )
+
+        for group_name in self.__group_names():
+            for version, enum_to_classes in self.type_to_versions_to_enum_to_classes[group_name].items():
+                file_names.add( f'converters_{group_name}_v{version}.cpp' )
+
+                with FileWriter.open(file_path+f'/converters_{group_name}_v{version}.cpp') as f:
+                    code = CodeEmitter( f )
+                    code.write( '#include "converters.h"\n\n' )
+
+                    self.__generate_includes( code, enum_to_classes.values() )
+                    self.__generate_enum_type_to_class_method( code, group_name, version )
+
+                    if self.__arena:
+                        self.__generate_enum_type_to_arena_class_method( code, group_name, version )
+
+            file_names.add( f'converters_{group_name}.cpp' )
+
+            with FileWriter.open(file_path+f'/converters_{group_name}.cpp') as f:
+                code = CodeEmitter( f )
+
+                if self.__generate_print_methods:
+                    code.write( "#include <stdio.h>\n" )
+
+                code.write( '#include "converters.h"\n\n' )
+
+                if self.__generate_print_methods:
+                    self.__generate_includes( code, [ self.__group_header( group_name )[0] ] )
+
+                self.__generate_version_to_class_method( code, group_name )
+
+                if self.__arena:
+                    self.__generate_version_to_arena_class_method( code, group_name )
+
+                if self.__generate_print_methods:
+                    self.__generate_rawbuffer_to_class_method( code, group_name )
+
+        with FileWriter.open(file_path+f'/views.h') as f:
+            code = CodeEmitter( f )
+            code.write( "#pragma once\n\n" )
+            code.write( "#include <cstdint>\n" )
+            code.write( "#include <stddef.h>\n" )
+            code.write( '#include "types.h"\n\n' )
+
+            self.__generate_view_declarations( code )
+
+        for group_name in self.__group_names():
+            file_names.add( f'views_{group_name}.cpp' )
+
+            with FileWriter.open(file_path+f'/views_{group_name}.cpp') as f:
+                code = CodeEmitter( f )
+                code.write( '#include "views.h"\n\n' )
+
+                view_names = { CppViewGenerator.view_name( class_name ) for enum_to_classes in self.type_to_versions_to_enum_to_classes[group_name].values() for class_name in enum_to_classes.values() }
+
+                self.__generate_includes( code, view_names )
+                self.__generate_view_parsers( code, group_name )
+
+        with FileWriter.open(file_path+f'/converters.cpp') as f:
+            code = CodeEmitter( f )
+
+            if self.__generate_print_methods:
+                code.write( "#include <stdio.h>\n" )
+
+            code.write( '#include "converters.h"\n\n' )
+
+            if self.__generate_print_methods:
+                self.__generate_includes( code, self.__class_declarations.keys() )
+                self.__generate_string_to_class_method( code, self.__class_declarations )
+                self.__generate_enum_group_to_class_methods( code )
+
+        if self.__variant:
+            header_to_group = self.__variant_headers()
+            self.__check_variants( header_to_group )
+
+            for header, group_name in header_to_group.items():
+                file_names.add( f'{CppFieldGenerator.variant_name( header )}.h' )
+
+                with FileWriter.open(file_path+f'/{CppFieldGenerator.variant_name( header )}.h') as f:
+                    self.__generate_variant( CodeEmitter( f ), header, group_name )
+
+        self.__remove_stale_files( file_path, file_names )
+
+
+    def __remove_stale_files( self, file_path: str, file_names: typing.Set[str] ):
+
+        for path in [ *Path( file_path ).glob( "converters_*.cpp" ), *Path( file_path ).glob( "views_*.cpp" ), *Path( file_path ).glob( "*Variant.h" ) ]:
+            if path.name not in file_names and path.stem not in self.__class_declarations: # don't remove a struct named 'converters_...'
+                path.unlink()
@@ -2,6 +2,7 @@ import typing
 
 from .CppFieldGenerator import CppFieldGenerator
 from .CppTypesGenerator import CppTypesGenerator
+from .CodeEmitter import CodeEmitter
 
 
 class CppDeserializationGenerator():
@@ -9,51 +10,216 @@ class CppDeserializationGenerator():
     Contains methods that can generate C++ deserialization
     code for the different field types like: inline,
     array sized, condition, etc.
+
+    Fixed size fields are read with a local cursor 'ptr', which is only
+    written back to the buffer before the fields that need it (nested
+    structs, varints, arrays of objects) and at the end of the method.
+    Consecutive fixed size fields form a run, whose size is known at compile
+    time, so the cursor is checked against the end of the buffer only once
+    per run:
+
+        ---------------------------------------------------------
+        uint8_t*       ptr = buffer.GetOffsetPtr();
+        uint8_t* const end = buffer.GetEndPtr();
+
+        if( size_t(end - ptr) < sizeof(uint32_t) + sizeof(uint8_t) ){ return false; }
+        mSize = *( (uint32_t*) ptr ); ptr += sizeof(uint32_t);
+        mType = *( (uint8_t*) ptr ); ptr += sizeof(uint8_t);
+
+        buffer.SetOffsetPtr( ptr );
+        succ = mHeader.Deserialize( buffer ); if(!succ){ return false; }
+        ptr = buffer.GetOffsetPtr();
+        ---------------------------------------------------------
+
+    Structs with a fixed layout (see 'CppClassDeclarationGenerator') are
+    fixed size fields too, which are copied with a single memcpy. Their
+    layout struct is given by 'layouts' (struct name -> layout struct).
+
+    Array counts are read from the buffer, so before an array is allocated
+    its count is checked against the remaining size of the buffer, divided
+    by the minimum size of an element ('min_sizes': struct name -> minimum
+    serialized size), and the memory of the elements is taken from the
+    allocation budget of the buffer (see 'RawBuffer::Allocate()'):
+
+        ---------------------------------------------------------
+        if( buffer.RemainingSize() / 41 < mNumInputs ){ return false; }
+        if( !buffer.Allocate( mNumInputs, sizeof(Input) ) ){ return false; }
+        mInputs.resize(mNumInputs);
+        ---------------------------------------------------------
+
+    If 'checked' is false, the method 'DeserializeUnchecked()' is generated
+    instead, which reads buffers that are known to be valid without the
+    bounds checks of the fixed size fields and the array counts, and
+    without an allocation budget.
+
+    With 'arena' (see '--arena') the elements of the arrays are constructed
+    with the arena of their array, and the elements of 'array_sized'
+    fields are created in it:
+
+        ---------------------------------------------------------
+        mInputs.emplace_back( mInputs.get_allocator().resource() );
+        ArenaPtr catbuf = create_type_TransactionType( type, header.mVersion, mTransactions.get_allocator().resource() );
+        ---------------------------------------------------------
+
+    With 'variant' (see '--variant') the elements of 'array_sized' fields
+    are created in place, and deserialized without a virtual call:
+
+        ---------------------------------------------------------
+        EmbeddedTransactionVariant* catbuf = create_variant_TransactionTypeEmbedded( type, header.mVersion, mTransactions );
+        succ = VariantDeserialize( *catbuf, buffer ); if(!succ){ return false; }
+        ---------------------------------------------------------
     """
 
 
 
-    def __init__( self, types: CppTypesGenerator, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]] ) -> None:
+    def __init__( self, types: CppTypesGenerator, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]], checked: bool = True,
+                  layouts: typing.Optional[typing.Dict[str, str]] = None, min_sizes: typing.Optional[typing.Dict[str, int]] = None, arena: bool = False,
+                  variant: bool = False ) -> None:
         self.__name_to_enum   = types.name_to_enum
         self.__name_to_alias  = types.name_to_alias
         self.__size_to_arrays = size_to_arrays
+        self.__layouts        = layouts or {}
+        self.__min_sizes      = min_sizes or {}
         self.__class_name     = class_name
+        self.__checked        = checked
+        self.__method         = "Deserialize" if checked else "DeserializeUnchecked"
+        self.__arena          = arena
+        self.__variant        = variant
 
         self.__add_succ_var   = False
         self.__add_ptr_var    = False
+        self.__add_end_var    = False
+        self.__cursor_valid   = True  # the cursor 'ptr' is at the buffer offset or ahead of it
+        self.__buffer_valid   = True  # the buffer offset is at the cursor 'ptr' or ahead of it
+        self.__in_block       = ""    # indentation of the body of a loop or condition while generating it
+
+        self.__run_types      : typing.List[str] = [] # types of the fixed size fields of the current run
+        self.__run_lines      : typing.List[str] = [] # code of the current run, written after its bounds check
+
+        self.__code           = CodeEmitter()
+
+
+
+    def __write( self, code: str ) -> None:
+        self.__end_run()
+        self.__code.write( code )
+
+
+
+    def __end_run( self ) -> None:
+        """ Writes the bounds check of the current run of fixed size fields, followed by their code. """
+        if not self.__run_types:
+            return
+
+        if self.__checked:
+            self.__add_end_var = True
+            self.__code.write( f'\tif( size_t(end - ptr) < { " + ".join( f"sizeof({t})" for t in self.__run_types ) } ){{ return false; }}\n' )
+
+        for line in self.__run_lines:
+            self.__code.write( line )
+
+        self.__code.write( "\n" )
+
+        self.__run_types = []
+        self.__run_lines = []
+
+
+
+    def __write_to_run( self, code: str ) -> None:
+        """ Adds 'code' to the current run, e.g. the check of a reserved value. """
+        if self.__run_types:
+            self.__run_lines.append( code )
+        else:
+            self.__write( code )
+
+
 
-        self.__code_output    = ""
+    def __is_fixed_size( self, var_type: str ) -> bool:
+        return var_type in self.__name_to_alias or var_type in self.__name_to_enum or var_type in CppFieldGenerator.builtin_types or var_type in self.__layouts
+
+
+
+    def __fixed_size_field( self, size_type: str, load: str ) -> None:
+        """ Writes 'load' of a fixed size field, as part of the current run if not in a loop or condition. """
+        if not self.__in_block:
+            self.__run_types.append( size_type )
+            self.__run_lines.append( load )
+
+        elif self.__checked:
+            self.__add_end_var = True
+            self.__write( f'\tif( size_t(end - ptr) < sizeof({size_type}) ){{ return false; }}\n' + self.__in_block + load + "\n" )
+
+        else:
+            self.__write( load + "\n" )
+
+
+
+    def __use_cursor( self ) -> None:
+        """ Continues reading with the cursor 'ptr' from the buffer offset. """
+        self.__add_ptr_var = True
+
+        if not self.__cursor_valid:
+            self.__write( '\tptr = buffer.GetOffsetPtr();\n' )
+
+        self.__cursor_valid = True
+        self.__buffer_valid = False
+
+
+
+    def __use_buffer( self ) -> None:
+        """ Writes the cursor 'ptr' back to the buffer, before the buffer is read. """
+        if not self.__buffer_valid:
+            self.__write( '\tbuffer.SetOffsetPtr( ptr );\n' )
+
+        self.__cursor_valid = False
+        self.__buffer_valid = True
+
+
+
+    def __use( self, var_type: str ) -> None:
+        """
+        Selects the cursor or the buffer for reading 'var_type', which must be
+        done before a loop or condition, so that the selection is the same on
+        all paths through it.
+        """
+        if self.__is_fixed_size( var_type ):
+            self.__use_cursor()
+        else:
+            self.__use_buffer()
 
 
 
     def normal_field( self, var_type: str, var_name: str, reserved: bool = False ) -> str:
         member_name = CppFieldGenerator.convert_to_field_name(var_name)
 
-        if var_type in self.__name_to_alias or var_type in self.__name_to_enum or var_type in CppFieldGenerator.builtin_types:
-            self.__add_ptr_var = True
-            self.__code_output += f'\tptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }}\n'
+        self.__use( var_type )
 
+        if var_type in self.__layouts:
+            layout = self.__layouts[var_type]
+            self.__fixed_size_field( layout, f'\tmemcpy( static_cast<{layout}*>( &{member_name} ), ptr, sizeof({layout}) ); ptr += sizeof({layout});\n' )
+
+        elif self.__is_fixed_size( var_type ):
             if var_name in self.__size_to_arrays or reserved:
-                self.__code_output += f'\t{var_type} tmp{member_name[1:]} = *( ({var_type}*) ptr );\n\n'
+                self.__fixed_size_field( var_type, f'\t{var_type} tmp{member_name[1:]} = *( ({var_type}*) ptr ); ptr += sizeof({var_type});\n' )
             else:
-                self.__code_output += f'\t{member_name} = *( ({var_type}*) ptr );\n\n'
+                self.__fixed_size_field( var_type, f'\t{member_name} = *( ({var_type}*) ptr ); ptr += sizeof({var_type});\n' )
 
         elif var_type == "varint":
             self.__add_succ_var = True
-            self.__code_output += f'\tstd::tie({member_name}, succ) = readVarint(buffer); if(!succ){{ return false; }}\n'
+            self.__write( f'\tstd::tie({member_name}, succ) = readVarint(buffer); if(!succ){{ return false; }}\n' )
 
         else:
             self.__add_succ_var = True
-            self.__code_output += f'\tsucc = {member_name}.Deserialize( buffer ); if(!succ){{ return false; }}\n'
+            self.__write( f'\tsucc = {member_name}.{self.__method}( buffer ); if(!succ){{ return false; }}\n' )
 
 
-    def __insert_condition_pre( self, condition: str, code_output: str ) -> typing.Tuple[str, str] :
+    def __insert_condition_pre( self, condition: str ) -> typing.Tuple[str, str] :
         if condition:
             return "\t", f'\tif( {condition} )\n\t{{\n'
 
         return "", ""
 
-    def __insert_condition_post( self, condition: str, code_output: str ) -> str:
+    def __insert_condition_post( self, condition: str ) -> str:
         if condition:
             return "\t}\n\n"
         return ""
@@ -73,24 +239,76 @@ class CppDeserializationGenerator():
 
 
 
-        tab, condition_output_pre = self.__insert_condition_pre( condition, self.__code_output )
+        tab, condition_output_pre = self.__insert_condition_pre( condition )
+
+        self.__use( var_type )
+        self.__write( condition_output_pre )
+
+        if self.__is_fixed_size( var_type ):
+            self.__fixed_size_array( var_type, name, size_var, tab )
+            self.__write( self.__insert_condition_post( condition ) )
+            return
+
+        if self.__checked:
+            if self.__min_sizes.get( var_type ):
+                self.__write( f'{tab}\tif( buffer.RemainingSize() / {self.__min_sizes[var_type]} < {size_var} ){{ return false; }}\n' )
+
+            self.__write( f'{tab}\tif( !buffer.Allocate( {size_var}, sizeof({var_type}) ) ){{ return false; }}\n' )
 
-        self.__code_output += condition_output_pre
-        self.__code_output += f'{tab}\t{name}.resize({size_var});\n'
-        self.__code_output += f'{tab}\t{name}.shrink_to_fit();\n\n'
-        self.__code_output += f'{tab}\tfor( size_t i=0; i<{size_var}; ++i )\n'
-        self.__code_output += f'{tab}\t{{\n'
+        # with an arena the structs are constructed with the arena of the array, instead of by 'resize()'
+        arena_structs = self.__arena and var_type != "varint"
+
+        if arena_structs:
+            self.__write( f'{tab}\t{name}.clear();\n' )
+            self.__write( f'{tab}\t{name}.reserve({size_var});\n\n' )
+        else:
+            self.__write( f'{tab}\t{name}.resize({size_var});\n\n' )
+
+        self.__write( f'{tab}\tfor( size_t i=0; i<{size_var}; ++i )\n' )
+        self.__write( f'{tab}\t{{\n' )
+
+        if arena_structs:
+            self.__write( f'{tab}\t\t{name}.emplace_back( {name}.get_allocator().resource() );\n' )
 
         arr_name_with_idx = var_name+"[i]"
-        self.__code_output += f'{tab}\t'
+        self.__write( f'{tab}\t' )
 
+        self.__in_block = f'{tab}\t'
         self.normal_field(var_type, arr_name_with_idx)
+        self.__in_block = ""
+
+        self.__write( f'{tab}\t}}\n\n' )
+        self.__write( self.__insert_condition_post( condition ) )
 
-        self.__code_output += f'{tab}\t}}\n\n'
-        self.__code_output += self.__insert_condition_post( condition, self.__code_output)
 
 
 
+    def __fixed_size_array( self, var_type: str, name: str, size_var: str, tab: str ) -> None:
+        """
+        Reads the 'size_var' elements of an array of fixed size elements
+        after a single bounds check: builtins, enums and aliases with a
+        single bulk copy, structs with a fixed layout with a memcpy each.
+        The cursor is not written back, since 'Allocate()' only changes
+        the allocation budget of the buffer.
+        """
+
+        size_type = self.__layouts.get( var_type, var_type )
+
+        if self.__checked:
+            self.__add_end_var = True
+            self.__write( f'{tab}\tif( size_t(end - ptr) / sizeof({size_type}) < {size_var} ){{ return false; }}\n' )
+            self.__write( f'{tab}\tif( !buffer.Allocate( {size_var}, sizeof({var_type}) ) ){{ return false; }}\n' )
+
+        if var_type in self.__layouts:
+            self.__write( f'{tab}\t{name}.resize({size_var});\n\n' )
+            self.__write( f'{tab}\tfor( size_t i=0; i<{size_var}; ++i )\n' )
+            self.__write( f'{tab}\t{{\n' )
+            self.__write( f'{tab}\t\tmemcpy( static_cast<{size_type}*>( &{name}[i] ), ptr, sizeof({size_type}) ); ptr += sizeof({size_type});\n' )
+            self.__write( f'{tab}\t}}\n\n' )
+        else:
+            self.__write( f'{tab}\t{name}.assign( ({var_type}*) ptr, ({var_type}*) ptr + {size_var} ); ptr += {size_var} * sizeof({var_type});\n\n' )
+
+
 
     def inline_field( self, var_name: str ):
         self.normal_field(var_name, var_name)
@@ -106,10 +324,10 @@ class CppDeserializationGenerator():
         if len(tmp) > 1:
             var_field = CppFieldGenerator.convert_to_field_name(tmp[1])
             value = f'{var_field}.Size()'
-            self.__code_output += f'(void) tmp{member_name[1:]};'
+            self.__write_to_run( f'\t(void) tmp{member_name[1:]};\n' )
 
         if len(tmp) == 1:
-            self.__code_output += f'\tif( {value} != tmp{member_name[1:]} ){{ return false; }}\n'
+            self.__write_to_run( f'\tif( {value} != tmp{member_name[1:]} ){{ return false; }}\n' )
 
 
 
@@ -121,42 +339,87 @@ class CppDeserializationGenerator():
         array_size           = CppFieldGenerator.convert_to_field_name( array_size )
         header_type_field    = CppFieldGenerator.convert_to_field_name( header_type_field )
         header_version_field = CppFieldGenerator.convert_to_field_name( header_version_field )
+        variant              = CppFieldGenerator.variant_name( header_type ) if self.__variant else ""
+        element              = CppFieldGenerator.array_sized_element( self.__arena, variant )
+
+        self.__use_buffer()
+        self.__write( f'\tfor( size_t read_size = 0; read_size < {array_size}; )\n\t{{\n' )
+        self.__write( "\t\t// Deserialize header\n" )
+        self.__write( f'\t\t{ header_type } header;\n' )
+        self.__write( f'\t\tRawBuffer tmp = buffer;\n' )
+        self.__write( f'\t\tsucc = header.{self.__method}(tmp); if(!succ){{ return false; }}\n\n' )
+
+        if self.__checked and variant:
+            # the element is stored in place, in the memory of the array
+            self.__write( f'\t\tif( !buffer.Allocate( 1, sizeof({element}) ) ){{ return false; }}\n\n' )
+        elif self.__checked:
+            # the size of the element type is only known by the factory, but the header is part of it
+            self.__write( f'\t\tif( !buffer.Allocate( 1, sizeof({element}) + sizeof(header) ) ){{ return false; }}\n\n' )
+
+        self.__write( "\t\t// Get element type and create type\n" )
+        self.__write( f'\t\t{ enum_type } type = header.{ header_type_field };\n' )
+
+        if variant:
+            self.__variant_array_sized_element( array_name, header_version_field, enum_type, element )
+        elif self.__arena:
+            self.__write( f'\t\t{element} catbuf = create_type_{ enum_type }( type, header.{header_version_field}, { array_name }.get_allocator().resource() );\n' )
+        else:
+            self.__write( f'\t\t{element} catbuf = create_type_{ enum_type }( type, header.{header_version_field} );\n' )
 
-        self.__code_output += f'\tfor( size_t read_size = 0; read_size < {array_size}; )\n\t{{\n'
-        self.__code_output += "\t\t// Deserialize header\n"
-        self.__code_output += f'\t\t{ header_type } header;\n'
-        self.__code_output += f'\t\tRawBuffer tmp = buffer;\n'
-        self.__code_output += f'\t\tsucc = header.Deserialize(tmp); if(!succ){{ return false; }}\n\n'
-
-        self.__code_output += "\t\t// Get element type and create type\n"
-        self.__code_output += f'\t\t{ enum_type } type = header.{ header_type_field };\n'
-        self.__code_output += f'\t\tstd::unique_ptr<ICatbuffer> catbuf = create_type_{ enum_type }( type, header.{header_version_field} );\n'
-        self.__code_output += f'\t\tif( nullptr == catbuf ){{ return false; }}\n\n'
+        if not variant:
+            self.__write( f'\t\tif( nullptr == catbuf ){{ return false; }}\n\n' )
 
-        self.__code_output += "\t\t// Deserialize element and save it\n"
-        self.__code_output += f'\t\tconst size_t rsize = buffer.RemainingSize();\n'
-        self.__code_output += f'\t\tsucc = catbuf->Deserialize( buffer ); if(!succ){{ return false; }}\n'
-        self.__code_output += f'\t\tread_size += (rsize-buffer.RemainingSize());\n'
-        self.__code_output += f'\t\t{ array_name }.push_back( std::move(catbuf) );\n\n'
+            self.__write( "\t\t// Deserialize element and save it\n" )
+            self.__write( f'\t\tconst size_t rsize = buffer.RemainingSize();\n' )
+            self.__write( f'\t\tsucc = catbuf->{self.__method}( buffer ); if(!succ){{ return false; }}\n' )
+            self.__write( f'\t\tread_size += (rsize-buffer.RemainingSize());\n' )
+            self.__write( f'\t\t{ array_name }.push_back( std::move(catbuf) );\n\n' )
 
         if align:
-            self.__code_output += "\t\t// Read optional padding\n"
-            self.__code_output += f'\t\tconst size_t padding = ({align} - uintptr_t(buffer.GetOffsetPtr())%{align}) % {align};\n'
-            self.__code_output += f'\t\tsucc = buffer.MoveOffset(padding); if(!succ){{ return false; }}\n'
-            self.__code_output += f'\t\tread_size += padding;\n'
-        self.__code_output += f'\t}}\n\n'
+            self.__write( "\t\t// Read optional padding\n" )
+            self.__write( f'\t\tconst size_t padding = ({align} - uintptr_t(buffer.GetOffsetPtr())%{align}) % {align};\n' )
+            self.__write( f'\t\tsucc = buffer.MoveOffset(padding); if(!succ){{ return false; }}\n' )
+            self.__write( f'\t\tread_size += padding;\n' )
+        self.__write( f'\t}}\n\n' )
 
         self.__add_succ_var = True
 
 
 
+    def __variant_array_sized_element( self, array_name: str, header_version_field: str, enum_type: str, element: str ):
+        """
+        Appends the element of an 'array_sized' field in place, holding the
+        alternative of its 'std::variant' selected by the header (with the
+        arena of the array, if any), and deserializes it (see 'Variant.h').
+        """
+
+        self.__write( f'\t\t{element}* catbuf = create_variant_{ enum_type }( type, header.{header_version_field}, { array_name } );\n' )
+        self.__write( f'\t\tif( nullptr == catbuf ){{ return false; }}\n\n' )
+
+        self.__write( "\t\t// Deserialize element\n" )
+        self.__write( f'\t\tconst size_t rsize = buffer.RemainingSize();\n' )
+        self.__write( f'\t\tsucc = Variant{self.__method}( *catbuf, buffer ); if(!succ){{ return false; }}\n' )
+        self.__write( f'\t\tread_size += (rsize-buffer.RemainingSize());\n\n' )
+
+
+
     def array_fill_field( self, array_type: str, array_name: str ):
         array_name = CppFieldGenerator.convert_to_field_name( array_name )
 
-        self.__code_output += f'\twhile( buffer.RemainingSize() )\n\t{{\n\t\t'
-        self.__code_output += f'{ array_type } fill;\n\t\t'
-        self.__code_output += f'succ = fill.Deserialize( buffer ); if(!succ){{ return false; }}\n\t\t'
-        self.__code_output += f'{ array_name }.push_back( fill );\n\t}}\n\n'
+        self.__use_buffer()
+        self.__write( f'\twhile( buffer.RemainingSize() )\n\t{{\n\t\t' )
+
+        if self.__checked:
+            self.__write( f'if( !buffer.Allocate( 1, sizeof({ array_type }) ) ){{ return false; }}\n\t\t' )
+
+        if self.__arena:
+            self.__write( f'{ array_type } fill( { array_name }.get_allocator().resource() );\n\t\t' )
+            self.__write( f'succ = fill.{self.__method}( buffer ); if(!succ){{ return false; }}\n\t\t' )
+            self.__write( f'{ array_name }.push_back( std::move(fill) );\n\t}}\n\n' )
+        else:
+            self.__write( f'{ array_type } fill;\n\t\t' )
+            self.__write( f'succ = fill.{self.__method}( buffer ); if(!succ){{ return false; }}\n\t\t' )
+            self.__write( f'{ array_name }.push_back( fill );\n\t}}\n\n' )
 
         self.__add_succ_var = True
 
@@ -166,32 +429,67 @@ class CppDeserializationGenerator():
 
         if condition_var != var_name:
             name = var_name
-            self.__code_output += f'\n\tif( {condition} )\n\t{{\n\t'
+            self.__use( var_type )
+            self.__write( f'\n\tif( {condition} )\n\t{{\n\t' )
 
+            self.__in_block = "\t"
             self.normal_field( var_type, name )
+            self.__in_block = ""
 
-            self.__code_output += "\t}\n\n"
+            self.__write( "\t}\n\n" )
         else:
             member_name = CppFieldGenerator.convert_to_field_name(var_name)
-            self.__code_output += f'\n\tif( buffer.RemainingSize() < sizeof({var_type}) ) {{ return false; }}\n'
-            self.__code_output += f'\tptr = buffer.GetOffsetPtr();\n'
-            self.__code_output += f'\t{member_name} = *( ({var_type}*) ptr );\n'
-            self.__code_output += f'\tif( {condition} )\n\t{{\n\t'
-            self.__code_output += f'\tbuffer.MoveOffset( sizeof({var_type}) );\n'
-            self.__code_output += "\t}\n\n"
+            self.__use_cursor()
+            self.__write( "\n" )
+
+            if self.__checked:
+                self.__add_end_var = True
+                self.__write( f'\tif( size_t(end - ptr) < sizeof({var_type}) ){{ return false; }}\n' )
+
+            self.__write( f'\t{member_name} = *( ({var_type}*) ptr );\n' )
+            self.__write( f'\tif( {condition} )\n\t{{\n\t' )
+            self.__write( f'\tptr += sizeof({var_type});\n' )
+            self.__write( "\t}\n\n" )
+
+
+
+    def fixed_layout_struct( self, layout: str ):
+        """
+        Copies all fields of a struct with a fixed layout, which are
+        declared by its base struct 'layout', with a single memcpy.
+        """
+        self.__use_cursor()
+        self.__fixed_size_field( layout, f'\tmemcpy( static_cast<{layout}*>( this ), ptr, sizeof({layout}) ); ptr += sizeof({layout});\n' )
+
+
+
+    def write_to( self, stream: typing.TextIO ) -> None:
+        """
+        Writes the generated 'Deserialize()' or 'DeserializeUnchecked()'
+        method to 'stream'.
+        """
+
+        self.__end_run()
+
+        code = CodeEmitter( stream )
+        code.line( f'bool {self.__class_name}::{self.__method}( RawBuffer& buffer )' )
+        code.line( "{" )
+
+        with code.indented():
+            if self.__add_ptr_var:
+                code.line( "uint8_t* ptr = buffer.GetOffsetPtr();" )
 
+            if self.__add_end_var:
+                code.line( "uint8_t* const end = buffer.GetEndPtr();" )
 
+            if self.__add_succ_var:
+                code.line( "bool succ;" )
 
-    def generate( self ) -> str:
-        output = f'bool {self.__class_name}::Deserialize( RawBuffer& buffer )\n{{\n'
+            self.__code.write_to( stream )
 
-        if self.__add_ptr_var:
-            output += "\tvoid* ptr;\n"
+            if not self.__buffer_valid:
+                code.line( "buffer.SetOffsetPtr( ptr );" )
 
-        if self.__add_succ_var:
-            output += "\tbool succ;\n"
+            code.line( "return true;" )
 
-        output += self.__code_output
-        output += "\treturn true;\n"
-        output += "}\n\n\n"
-        return output
+        code.write( "}\n\n\n" )
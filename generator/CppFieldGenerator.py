@@ -133,7 +133,7 @@ class CppFieldGenerator():
 
 
     @staticmethod
-    def gen_array_field( type: str, name: str, comments: str = "") -> str:
+    def gen_array_field( type: str, name: str, comments: str = "", arena: bool = False ) -> str:
         """
         Takes a field dict like the one below:
 
@@ -150,16 +150,19 @@ class CppFieldGenerator():
             ---------------------------------------------------------------------------
             std::vector<UnresolvedAddress> mAddress_additions; // cosignatory addresses
             ---------------------------------------------------------------------------
+
+        or to a 'std::pmr::vector' with 'arena' (see '--arena').
         """
         
         name    = CppFieldGenerator.convert_to_field_name( name )
-        output  = f'\tstd::vector<{type}> {name};'
+        vector  = "std::pmr::vector" if arena else "std::vector"
+        output  = f'\t{vector}<{type}> {name};'
         output += f' // {comments}\n' if comments else "\n"
         return output
 
 
     @staticmethod
-    def gen_array_sized_field( name: str, comment: str ):
+    def gen_array_sized_field( name: str, comment: str, arena: bool = False, variant: str = "" ):
         """
         An 'array_sized' field is an array where the number of elements is not known, but where the total array size in bytes is known
         
@@ -178,13 +181,42 @@ class CppFieldGenerator():
             -------------------------------------------------------------------------------
             std::vector<std::unique_ptr<ICatbuffer>> mTransactions; // sub-transaction data
             -------------------------------------------------------------------------------
+
+        or to a 'std::pmr::vector<ArenaPtr>' with 'arena' (see '--arena'), or
+        to a 'std::vector<EmbeddedTransactionVariant>' with the 'variant' of the
+        header (see '--variant').
+        """
+
+        return CppFieldGenerator.gen_array_field( CppFieldGenerator.array_sized_element( arena, variant ), name, comment, arena )
+
+
+    @staticmethod
+    def array_sized_element( arena: bool = False, variant: str = "" ) -> str:
+        """
+        Returns the type of the elements of 'array_sized' fields, which are
+        allocated from an arena with 'arena' (see 'Arena.h'), or stored in
+        place in a 'std::variant' named 'variant' (see 'Variant.h').
+        """
+
+        if variant:
+            return variant
+
+        return "ArenaPtr" if arena else "std::unique_ptr<ICatbuffer>"
+
+
+    @staticmethod
+    def variant_name( header_type: str ) -> str:
+        """
+        Returns the name of the 'std::variant' of the structs which can
+        follow the header 'header_type' of an 'array_sized' field, e.g.
+        'EmbeddedTransactionVariant' (see '--variant').
         """
 
-        return CppFieldGenerator.gen_array_field("std::unique_ptr<ICatbuffer>", name, comment)
+        return f'{header_type}Variant'
 
 
     @staticmethod
-    def gen_array_fill_field( type: str, name: str, comments: str = "" ) -> str:
+    def gen_array_fill_field( type: str, name: str, comments: str = "", arena: bool = False ) -> str:
         """
         Takes a field dict like the one below:
 
@@ -203,4 +235,4 @@ class CppFieldGenerator():
             -------------------------------------------------------------------------------------------------------------
         """
 
-        return CppFieldGenerator.gen_array_field( type, name, comments )
\ No newline at end of file
+        return CppFieldGenerator.gen_array_field( type, name, comments, arena )
\ No newline at end of file
@@ -2,24 +2,27 @@ import typing
 
 from .CppFieldGenerator import CppFieldGenerator
 from .CppTypesGenerator import CppTypesGenerator
+from .CodeEmitter import CodeEmitter
 
 
 class CppPrintOutputGenerator():
     """
     Generates a 'Print()' C++ method to pretty print deserialized raw byte buffer inputs.
     Fields are added for printing by calling 'xyz_field()' methods and when done the C++ 
-    print method is generated by calling the 'generate()' method.
+    print method is written by calling the 'write_to()' method.
     """
 
-    def __init__( self, types: CppTypesGenerator, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]] ) -> None:
+    def __init__( self, types: CppTypesGenerator, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]], variant: bool = False ) -> None:
         self.__name_to_enum   = types.name_to_enum
         self.__name_to_alias  = types.name_to_alias
         self.__size_to_arrays = size_to_arrays
+        self.__variant        = variant # the elements of 'array_sized' fields are 'std::variant's (see '--variant')
 
-        self.__code_output   = f'void {class_name}::Print( size_t level )\n{{\n'
-        self.__code_output  += f"\tstd::string tabs( level, '\\t' );\n"
-        self.__code_output  += f'\tstd::cout << tabs << "{class_name} (" << Size() <<" bytes)\\n";\n'
-        self.__code_output  += f'\tstd::cout << tabs << "{{\\n";\n\n'
+        self.__code           = CodeEmitter()
+        self.__code.write( f'void {class_name}::Print( size_t level )\n{{\n' )
+        self.__code.write( f"\tstd::string tabs( level, '\\t' );\n" )
+        self.__code.write( f'\tstd::cout << tabs << "{class_name} (" << Size() <<" bytes)\\n";\n' )
+        self.__code.write( f'\tstd::cout << tabs << "{{\\n";\n\n' )
 
 
     def normal_field( self, var_type: str, var_name: str, print_hint: str = "", extra_tab: bool = False ):
@@ -32,86 +35,86 @@ class CppPrintOutputGenerator():
             typedef = self.__name_to_alias[var_type]
 
             if typedef.size == 1:
-                self.__code_output += f'{ct}\tstd::cout << tabs << {ptab} "\\t{var_type} {member_name}: " << +(static_cast<{typedef.type}>({member_name})) << " (" << sizeof({member_name}) <<" bytes)\\n";\n'
+                self.__code.write( f'{ct}\tstd::cout << tabs << {ptab} "\\t{var_type} {member_name}: " << +(static_cast<{typedef.type}>({member_name})) << " (" << sizeof({member_name}) <<" bytes)\\n";\n' )
             else:
                 print_mod, separator = get_print_mod(typedef.hint)
 
-                self.__code_output += f'{ct}\n\t{{\n'
-                self.__code_output += f'{ct}\tstd::ios_base::fmtflags flags( std::cout.flags() );\n'
-                self.__code_output += f'{ct}\tstd::cout << tabs << {ptab} "\\t{typedef.type} " << "{member_name}[ " << {typedef.size} << " ] = ";\n'
-                self.__code_output += f'{ct}\tfor( size_t j=0; j<{typedef.size}; ++j )\n'
-                self.__code_output += f'{ct}\t{{\n'
-                self.__code_output += f'{ct}\t\tstd::cout << {print_mod}{member_name}.data[j] {separator};\n'
-                self.__code_output += f'{ct}\t}}\n'
-                self.__code_output += f'{ct}\tstd::cout.flags( flags );\n\t}}\n'
-                self.__code_output += f'{ct}\tstd::cout <<  " (" << sizeof({member_name}) <<" bytes)\\n";\n'
+                self.__code.write( f'{ct}\n\t{{\n' )
+                self.__code.write( f'{ct}\tstd::ios_base::fmtflags flags( std::cout.flags() );\n' )
+                self.__code.write( f'{ct}\tstd::cout << tabs << {ptab} "\\t{typedef.type} " << "{member_name}[ " << {typedef.size} << " ] = ";\n' )
+                self.__code.write( f'{ct}\tfor( size_t j=0; j<{typedef.size}; ++j )\n' )
+                self.__code.write( f'{ct}\t{{\n' )
+                self.__code.write( f'{ct}\t\tstd::cout << {print_mod}{member_name}.data[j] {separator};\n' )
+                self.__code.write( f'{ct}\t}}\n' )
+                self.__code.write( f'{ct}\tstd::cout.flags( flags );\n\t}}\n' )
+                self.__code.write( f'{ct}\tstd::cout <<  " (" << sizeof({member_name}) <<" bytes)\\n";\n' )
 
         elif var_type in self.__name_to_enum:
             enum_type = self.__name_to_enum[var_type].type
-            self.__code_output += f'{ct}\tstd::cout << tabs << {ptab} "\\t{var_type} {member_name}: " << +static_cast<{enum_type}>({member_name}) << " (" << sizeof({member_name}) <<" bytes)\\n";\n'
+            self.__code.write( f'{ct}\tstd::cout << tabs << {ptab} "\\t{var_type} {member_name}: " << +static_cast<{enum_type}>({member_name}) << " (" << sizeof({member_name}) <<" bytes)\\n";\n' )
 
         elif var_type in CppFieldGenerator.builtin_types:
 
             if var_name in self.__size_to_arrays: # if variable is an array size, use the vector '.size()' method
                 array_name = self.__size_to_arrays[var_name][0]
                 array_name = CppFieldGenerator.convert_to_field_name(array_name)
-                self.__code_output += f'{ct}\tstd::cout << tabs << {ptab} "\\t{var_type} {member_name}: " << {array_name}.size() << " (" << sizeof({var_type}) <<" bytes)\\n";\n'
+                self.__code.write( f'{ct}\tstd::cout << tabs << {ptab} "\\t{var_type} {member_name}: " << {array_name}.size() << " (" << sizeof({var_type}) <<" bytes)\\n";\n' )
             else:
                 print_mod, separator = get_print_mod(print_hint)
-                self.__code_output += f'{ct}\n\t{{\n'
-                self.__code_output += f'{ct}\tstd::ios_base::fmtflags flags( std::cout.flags() );\n'
+                self.__code.write( f'{ct}\n\t{{\n' )
+                self.__code.write( f'{ct}\tstd::ios_base::fmtflags flags( std::cout.flags() );\n' )
 
                 if print_hint: # if a hint is given, print array content on a single line as hex, asci, etc, without type information
-                    self.__code_output += f'{ct}\tstd::cout << {print_mod}{member_name} {separator};\n'
+                    self.__code.write( f'{ct}\tstd::cout << {print_mod}{member_name} {separator};\n' )
                 else:
-                    self.__code_output += f'{ct}\tstd::cout << tabs << {ptab} "\\t{var_type} {member_name}: " << {print_mod}{member_name} << " (" << sizeof({member_name}) <<" bytes)\\n";\n'
+                    self.__code.write( f'{ct}\tstd::cout << tabs << {ptab} "\\t{var_type} {member_name}: " << {print_mod}{member_name} << " (" << sizeof({member_name}) <<" bytes)\\n";\n' )
 
-                self.__code_output += f'{ct}\tstd::cout.flags( flags );\n\t}}\n'
+                self.__code.write( f'{ct}\tstd::cout.flags( flags );\n\t}}\n' )
 
         elif var_type == "varint":
-            self.__code_output += f'{ct}\tstd::cout << tabs << {ptab} "\\t{var_type} {member_name}: " << {member_name} << " (" << sizeVarint({member_name}) << " bytes)\\n";\n'
+            self.__code.write( f'{ct}\tstd::cout << tabs << {ptab} "\\t{var_type} {member_name}: " << {member_name} << " (" << sizeVarint({member_name}) << " bytes)\\n";\n' )
 
         else:
             level = '2' if extra_tab else '1'
-            self.__code_output += f'{ct}\tstd::cout << "\\n";\n'
-            self.__code_output += f'{ct}\t{member_name}.Print( level+{level} );\n'
-            self.__code_output += f'{ct}\tstd::cout << "\\n";\n'
+            self.__code.write( f'{ct}\tstd::cout << "\\n";\n' )
+            self.__code.write( f'{ct}\t{member_name}.Print( level+{level} );\n' )
+            self.__code.write( f'{ct}\tstd::cout << "\\n";\n' )
 
 
 
     def array_field( self, array_type: str, array_name: str, print_hint: str = "" ):
         arr_member_name = CppFieldGenerator.convert_to_field_name( array_name )
 
-        self.__code_output += f'\n'
-        self.__code_output += f'\tstd::cout << tabs << "\\t{array_type} " << "{arr_member_name}[" << {arr_member_name}.size() << "] = ";\n' 
+        self.__code.write( f'\n' )
+        self.__code.write( f'\tstd::cout << tabs << "\\t{array_type} " << "{arr_member_name}[" << {arr_member_name}.size() << "] = ";\n' )
         if not print_hint:
-            self.__code_output += f'\tstd::cout << "\\n" << tabs << "\t";\n'
+            self.__code.write( f'\tstd::cout << "\\n" << tabs << "\t";\n' )
 
-        self.__code_output += f'\tstd::cout << "[";\n'
+        self.__code.write( f'\tstd::cout << "[";\n' )
 
         if not print_hint:
-            self.__code_output += f'\tstd::cout << "\\n";\n'
-        self.__code_output += f'\tfor( size_t i=0; i<{arr_member_name}.size(); ++i )\n'
-        self.__code_output += f'\t{{\n'
+            self.__code.write( f'\tstd::cout << "\\n";\n' )
+        self.__code.write( f'\tfor( size_t i=0; i<{arr_member_name}.size(); ++i )\n' )
+        self.__code.write( f'\t{{\n' )
         if not print_hint:
-            self.__code_output += f'\t\tstd::cout << tabs << "\\t[" << i << "]";\n' #  std::cout << tabs << "\t[" << i << "]\n";
+            self.__code.write( f'\t\tstd::cout << tabs << "\\t[" << i << "]";\n' ) #  std::cout << tabs << "\t[" << i << "]\n";
 
         self.normal_field(array_type, array_name+'[i]', print_hint, True)
 
-        self.__code_output += f'\t}}\n'
+        self.__code.write( f'\t}}\n' )
 
         if not print_hint:
-            self.__code_output += f'\tstd::cout << tabs << "\t";\n'
+            self.__code.write( f'\tstd::cout << tabs << "\t";\n' )
 
-        self.__code_output += f'\tstd::cout << "] (" << sizeof({array_type}) * {arr_member_name}.size() <<" bytes)\\n";\n'
+        self.__code.write( f'\tstd::cout << "] (" << sizeof({array_type}) * {arr_member_name}.size() <<" bytes)\\n";\n' )
 
         if not print_hint:
-            self.__code_output += f'\tstd::cout << "\\n";\n'
+            self.__code.write( f'\tstd::cout << "\\n";\n' )
 
 
     def inline_field( self, var_name: str ):
         var_name = CppFieldGenerator.convert_to_field_name(var_name)
-        self.__code_output += f'\t{var_name}.Print( level+1 );\n'
+        self.__code.write( f'\t{var_name}.Print( level+1 );\n' )
 
 
 
@@ -122,7 +125,7 @@ class CppPrintOutputGenerator():
             var_field = CppFieldGenerator.convert_to_field_name(tmp[1])
             var_value = f'{var_field}.Size()'
 
-        self.__code_output += f'\tstd::cout << tabs << "\\t{var_type} {var_name}: " << {var_value} << " (" << sizeof({var_type}) <<" bytes)\\n";\n'
+        self.__code.write( f'\tstd::cout << tabs << "\\t{var_type} {var_name}: " << {var_value} << " (" << sizeof({var_type}) <<" bytes)\\n";\n' )
 
 
 
@@ -130,12 +133,15 @@ class CppPrintOutputGenerator():
         array_name = CppFieldGenerator.convert_to_field_name(array_name)
         array_size = CppFieldGenerator.convert_to_field_name(array_size)
 
-        self.__code_output += f'\tstd::cout << tabs << "\\t{array_type} " << "{array_name}[ " << {array_name}.size() << " ] =\\n";\n' 
-        self.__code_output += f'\tstd::cout << tabs << "\\t[\\n";\n'
-        self.__code_output += f'\tfor( size_t i=0; i<{array_name}.size(); ++i )\n'
-        self.__code_output += f'\t{{\n'
-        self.__code_output += f'\t\t{array_name}[i]->Print( level+1 );'
-        self.__code_output += f'\t}}\n'
+        self.__code.write( f'\tstd::cout << tabs << "\\t{array_type} " << "{array_name}[ " << {array_name}.size() << " ] =\\n";\n' )
+        self.__code.write( f'\tstd::cout << tabs << "\\t[\\n";\n' )
+        self.__code.write( f'\tfor( size_t i=0; i<{array_name}.size(); ++i )\n' )
+        self.__code.write( f'\t{{\n' )
+        if self.__variant:
+            self.__code.write( f'\t\tVariantPrint( {array_name}[i], level+1 );' )
+        else:
+            self.__code.write( f'\t\t{array_name}[i]->Print( level+1 );' )
+        self.__code.write( f'\t}}\n' )
 
 
 
@@ -145,16 +151,21 @@ class CppPrintOutputGenerator():
 
 
     def condition( self, var_name: str, var_type: str, condition: str ):
-        self.__code_output += f'\n\tif( {condition} )\n\t{{\n\t'
+        self.__code.write( f'\n\tif( {condition} )\n\t{{\n\t' )
         self.normal_field( var_type, var_name )
-        self.__code_output += "\t}\n\n"
+        self.__code.write( "\t}\n\n" )
+
+
 
+    def write_to( self, stream: typing.TextIO ) -> None:
+        """
+        Writes the generated 'Print()' method to 'stream'.
+        """
 
+        self.__code.write_to( stream )
 
-    def generate( self ) -> str:
-        self.__code_output  += '\n\tstd::cout << tabs << "}\\n";\n'
-        self.__code_output  += "}\n"
-        return self.__code_output
+        stream.write( '\n\tstd::cout << tabs << "}\\n";\n' )
+        stream.write( "}\n" )
 
 
 
@@ -2,6 +2,7 @@ import typing
 
 from .CppFieldGenerator import CppFieldGenerator
 from .CppTypesGenerator import CppTypesGenerator
+from .CodeEmitter import CodeEmitter
 
 
 class CppSerializationGenerator():
@@ -9,64 +10,187 @@ class CppSerializationGenerator():
     Contains methods that can generate C++ serialization
     code for the different field types like: inline,
     array sized, condition, etc.
+
+    Like the deserialization, fixed size fields are written with a local
+    cursor 'ptr', which is written back to the buffer before the fields
+    that need it and at the end of the method, and the buffer is checked
+    only once per run of consecutive fixed size fields. Structs with a fixed
+    layout are copied with a single memcpy. With 'arena' (see '--arena')
+    the elements of 'array_sized' fields are 'ArenaPtr's, and with
+    'variant' (see '--variant') they are serialized by 'VariantSerialize()'
+    without a virtual call.
     """
 
 
 
-    def __init__( self, types: CppTypesGenerator, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]] ) -> None:
+    def __init__( self, types: CppTypesGenerator, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]], layouts: typing.Optional[typing.Dict[str, str]] = None, arena: bool = False, variant: bool = False ) -> None:
         self.__name_to_enum   = types.name_to_enum
         self.__name_to_alias  = types.name_to_alias
         self.__size_to_arrays = size_to_arrays
+        self.__layouts        = layouts or {}
         self.__class_name     = class_name
+        self.__arena          = arena
+        self.__variant        = variant
 
         self.__add_succ_var   = False
         self.__add_ptr_var    = False
+        self.__add_end_var    = False
+        self.__cursor_valid   = True  # the cursor 'ptr' is at the buffer offset or ahead of it
+        self.__buffer_valid   = True  # the buffer offset is at the cursor 'ptr' or ahead of it
+        self.__in_block       = ""    # indentation of the body of a loop or condition while generating it
+
+        self.__run_types      : typing.List[str] = [] # types of the fixed size fields of the current run
+        self.__run_lines      : typing.List[str] = [] # code of the current run, written after its bounds check
+
+        self.__code           = CodeEmitter()
+
+
+
+    def __write( self, code: str ) -> None:
+        self.__end_run()
+        self.__code.write( code )
+
+
+
+    def __end_run( self ) -> None:
+        """ Writes the bounds check of the current run of fixed size fields, followed by their code. """
+        if not self.__run_types:
+            return
+
+        self.__add_end_var = True
+        self.__code.write( f'\tif( size_t(end - ptr) < { " + ".join( f"sizeof({t})" for t in self.__run_types ) } ){{ return false; }}\n' )
+
+        for line in self.__run_lines:
+            self.__code.write( line )
+
+        self.__code.write( "\n" )
+
+        self.__run_types = []
+        self.__run_lines = []
+
+
+
+    def __store( self, var_type: str, store: str ) -> None:
+        """ Writes 'store' of a fixed size field, as part of the current run if not in a loop or condition. """
+        if self.__in_block:
+            self.__add_end_var = True
+            self.__write( f'\tif( size_t(end - ptr) < sizeof({var_type}) ){{ return false; }}\n' + self.__in_block + store + "\n" )
+        else:
+            self.__run_types.append( var_type )
+            self.__run_lines.append( store )
+
+
+
+    def __is_fixed_size( self, var_type: str ) -> bool:
+        return var_type in self.__name_to_alias or var_type in self.__name_to_enum or var_type in CppFieldGenerator.builtin_types or var_type in self.__layouts
+
+
+
+    def __use_cursor( self ) -> None:
+        """ Continues writing with the cursor 'ptr' from the buffer offset. """
+        self.__add_ptr_var = True
+
+        if not self.__cursor_valid:
+            self.__write( '\tptr = buffer.GetOffsetPtr();\n' )
+
+        self.__cursor_valid = True
+        self.__buffer_valid = False
+
+
+
+    def __use_buffer( self ) -> None:
+        """ Writes the cursor 'ptr' back to the buffer, before the buffer is written. """
+        if not self.__buffer_valid:
+            self.__write( '\tbuffer.SetOffsetPtr( ptr );\n' )
+
+        self.__cursor_valid = False
+        self.__buffer_valid = True
 
-        self.__code_output    = ""
+
+
+    def __use( self, var_type: str ) -> None:
+        """ Selects the cursor or the buffer for writing 'var_type', before a loop or condition. """
+        if self.__is_fixed_size( var_type ):
+            self.__use_cursor()
+        else:
+            self.__use_buffer()
 
 
 
     def normal_field( self, var_type: str, var_name: str ) -> str:
         member_name = CppFieldGenerator.convert_to_field_name(var_name)
 
-        if var_type in self.__name_to_alias or \
-           var_type in self.__name_to_enum or \
-           var_type in CppFieldGenerator.builtin_types:
-            self.__add_ptr_var = True
-            self.__code_output += f'\tptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }}\n'
+        self.__use( var_type )
+
+        if var_type in self.__layouts:
+            layout = self.__layouts[var_type]
+            self.__store( layout, f'\tmemcpy( ptr, static_cast<{layout}*>( &{member_name} ), sizeof({layout}) ); ptr += sizeof({layout});\n' )
 
+        elif self.__is_fixed_size( var_type ):
             if var_name in self.__size_to_arrays:
                 array_name = self.__size_to_arrays[var_name][0]
                 array_name = CppFieldGenerator.convert_to_field_name(array_name)
 
-                self.__code_output += f'\t*( ({var_type}*) ptr ) = {array_name}.size();\n\n'
+                self.__store( var_type, f'\t*( ({var_type}*) ptr ) = {array_name}.size(); ptr += sizeof({var_type});\n' )
             else:
-                self.__code_output += f'\t*( ({var_type}*) ptr ) = {member_name};\n\n'
+                self.__store( var_type, f'\t*( ({var_type}*) ptr ) = {member_name}; ptr += sizeof({var_type});\n' )
 
         elif var_type == "varint":
+            self.__add_succ_var = True
+
             if var_name in self.__size_to_arrays:
                 array_name = self.__size_to_arrays[var_name][0]
                 array_name = CppFieldGenerator.convert_to_field_name(array_name)
-                self.__code_output += f'\twriteVarint( {array_name}.size(), buffer );\n\n'
+                self.__write( f'\tsucc = writeVarint( {array_name}.size(), buffer ); if(!succ){{ return false; }}\n\n' )
             else:
-                self.__code_output += f'\twriteVarint( {member_name}, buffer );\n\n'
+                self.__write( f'\tsucc = writeVarint( {member_name}, buffer ); if(!succ){{ return false; }}\n\n' )
         else:
             self.__add_succ_var = True
-            self.__code_output += f'\tsucc = {member_name}.Serialize( buffer ); if( !succ ){{ return false; }}\n'
+            self.__write( f'\tsucc = {member_name}.Serialize( buffer ); if( !succ ){{ return false; }}\n' )
 
 
 
     def array_field( self, var_type: str, var_name: str ) -> str:
         member_var = CppFieldGenerator.convert_to_field_name(var_name)
 
-        self.__code_output += f'\n\tfor( size_t i=0; i<{member_var}.size(); ++i )\n'
-        self.__code_output += f'\t{{\n'
+        self.__use( var_type )
+
+        if self.__is_fixed_size( var_type ):
+            self.__fixed_size_array( var_type, member_var )
+            return
+
+        self.__write( f'\n\tfor( size_t i=0; i<{member_var}.size(); ++i )\n' )
+        self.__write( f'\t{{\n' )
 
         arr_name_with_idx = var_name+"[i]"
-        self.__code_output += "\t"
+        self.__write( "\t" )
+        self.__in_block = "\t"
         self.normal_field( var_type, arr_name_with_idx )
+        self.__in_block = ""
 
-        self.__code_output += f'\t}}\n\n'
+        self.__write( f'\t}}\n\n' )
+
+
+
+    def __fixed_size_array( self, var_type: str, member_var: str ) -> None:
+        """
+        Writes an array of fixed size elements after a single bounds check:
+        builtins, enums and aliases with a single bulk copy, structs with a
+        fixed layout with a memcpy each.
+        """
+
+        size_type          = self.__layouts.get( var_type, var_type )
+        self.__add_end_var = True
+
+        self.__write( f'\n\tif( size_t(end - ptr) / sizeof({size_type}) < {member_var}.size() ){{ return false; }}\n' )
+
+        if var_type in self.__layouts:
+            self.__write( f'\tfor( size_t i=0; i<{member_var}.size(); ++i )\n' )
+            self.__write( f'\t{{\n' )
+            self.__write( f'\t\tmemcpy( ptr, static_cast<{size_type}*>( &{member_var}[i] ), sizeof({size_type}) ); ptr += sizeof({size_type});\n' )
+            self.__write( f'\t}}\n\n' )
+        else:
+            self.__write( f'\tstd::copy( {member_var}.begin(), {member_var}.end(), ({var_type}*) ptr ); ptr += {member_var}.size() * sizeof({var_type});\n\n' )
 
 
 
@@ -77,7 +201,8 @@ class CppSerializationGenerator():
 
     def reserved_field( self, var_type: str, var_name: str, value: str ):
         member_var = CppFieldGenerator.convert_to_field_name(var_name)
-        self.__code_output += f'\tptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }}\n'
+
+        self.__use_cursor()
 
         tmp = str(value).split()
 
@@ -86,54 +211,90 @@ class CppSerializationGenerator():
             var_field = CppFieldGenerator.convert_to_field_name(tmp[1])
             value = f'{var_field}.Size()'
 
-        self.__code_output += f'\t*( ({var_type}*) ptr ) = {value}; // {var_type} {member_var}\n\n'
-        self.__add_ptr_var  = True
+        self.__store( var_type, f'\t*( ({var_type}*) ptr ) = {value}; ptr += sizeof({var_type}); // {var_type} {member_var}\n' )
 
 
 
-    def array_sized_field( self, array_name: str, align: str = "" ):
+    def array_sized_field( self, array_name: str, header_type: str, align: str = "" ):
         array_name = CppFieldGenerator.convert_to_field_name(array_name)
 
-        self.__code_output += f'\n\tfor( const std::unique_ptr<ICatbuffer>& catbuf : {array_name} )\n\t{{\n'
-        self.__code_output += f'  succ = catbuf->Serialize( buffer ); if(!succ){{ return false; }}\n'
+        self.__use_buffer()
+
+        if self.__variant:
+            self.__write( f'\n\tfor( {CppFieldGenerator.variant_name( header_type )}& catbuf : {array_name} )\n\t{{\n' )
+            self.__write( f'  succ = VariantSerialize( catbuf, buffer ); if(!succ){{ return false; }}\n' )
+        else:
+            self.__write( f'\n\tfor( const {CppFieldGenerator.array_sized_element( self.__arena )}& catbuf : {array_name} )\n\t{{\n' )
+            self.__write( f'  succ = catbuf->Serialize( buffer ); if(!succ){{ return false; }}\n' )
 
         if align:
-            self.__code_output += f'  size_t padding = ( {align} - uintptr_t(buffer.GetOffsetPtr())%{align} ) % {align};\n'
-            self.__code_output += f'  for( size_t i=0; i<padding; ++i )\n'
-            self.__code_output += f'  {{\n'
-            self.__code_output += f'    ptr = buffer.GetOffsetPtrAndMove(1); if(!ptr){{ return false; }}\n'
-            self.__code_output += f'    *( (uint8_t*) ptr ) = 0;\n'
-            self.__code_output += f'  }}\n'
+            self.__write( f'  size_t padding = ( {align} - uintptr_t(buffer.GetOffsetPtr())%{align} ) % {align};\n' )
+            self.__write( f'  for( size_t i=0; i<padding; ++i )\n' )
+            self.__write( f'  {{\n' )
+            self.__write( f'    ptr = buffer.GetOffsetPtrAndMove(1); if(!ptr){{ return false; }}\n' )
+            self.__write( f'    *( (uint8_t*) ptr ) = 0;\n' )
+            self.__write( f'  }}\n' )
             
-        self.__code_output += f' }}\n\n'
+        self.__write( f' }}\n\n' )
 
-        self.__add_ptr_var = True
+        self.__add_ptr_var  = True
+        self.__add_succ_var = True
 
 
     def array_fill_field( self, array_type: str, array_name: str ) -> str:
-         self.__code_output += f'\tfor( {array_type}& fill : {CppFieldGenerator.convert_to_field_name(array_name)} )\n\t{{\n\t\t'
-         self.__code_output += f'succ = fill.Serialize( buffer ); if(!succ){{ return false; }}\n\t}}\n\n'
+         self.__use_buffer()
+         self.__write( f'\tfor( {array_type}& fill : {CppFieldGenerator.convert_to_field_name(array_name)} )\n\t{{\n\t\t' )
+         self.__write( f'succ = fill.Serialize( buffer ); if(!succ){{ return false; }}\n\t}}\n\n' )
 
          self.__add_succ_var = True
 
 
 
     def condition_field( self, var_name: str, var_type: str, condition: str ):
-        self.__code_output += f'\n\tif( {condition} )\n\t{{\n\t'
+        self.__use( var_type )
+        self.__write( f'\n\tif( {condition} )\n\t{{\n\t' )
+        self.__in_block = "\t"
         self.normal_field( var_type, var_name )
-        self.__code_output += "\t}\n\n"
+        self.__in_block = ""
+        self.__write( "\t}\n\n" )
+
+
+    def fixed_layout_struct( self, layout: str ):
+        """
+        Copies all fields of a struct with a fixed layout, which are
+        declared by its base struct 'layout', with a single memcpy.
+        """
+        self.__use_cursor()
+        self.__store( layout, f'\tmemcpy( ptr, static_cast<{layout}*>( this ), sizeof({layout}) ); ptr += sizeof({layout});\n' )
+
+
+
+    def write_to( self, stream: typing.TextIO ) -> None:
+        """
+        Writes the generated 'Serialize()' method to 'stream'.
+        """
+
+        self.__end_run()
+
+        code = CodeEmitter( stream )
+        code.line( f'bool {self.__class_name}::Serialize( RawBuffer& buffer )' )
+        code.line( "{" )
+
+        with code.indented():
+            if self.__add_ptr_var:
+                code.line( "uint8_t* ptr = buffer.GetOffsetPtr();" )
+
+            if self.__add_end_var:
+                code.line( "uint8_t* const end = buffer.GetEndPtr();" )
 
+            if self.__add_succ_var:
+                code.line( "bool succ;" )
 
-    def generate( self ) -> str:
-        output = f'bool {self.__class_name}::Serialize( RawBuffer& buffer )\n{{\n'
+            self.__code.write_to( stream )
 
-        if self.__add_ptr_var:
-            output += "\tvoid* ptr;\n"
+            if not self.__buffer_valid:
+                code.line( "buffer.SetOffsetPtr( ptr );" )
 
-        if self.__add_succ_var:
-            output += "\tbool succ;\n"
+            code.line( "return true;" )
 
-        output += self.__code_output
-        output += "\treturn true;\n"
-        output += "}\n\n\n"
-        return output
+        code.write( "}\n\n\n" )
@@ -1,16 +1,22 @@
+import typing
+
 from .CppFieldGenerator import CppFieldGenerator
 from .CppTypesGenerator import CppTypesGenerator
+from .CodeEmitter import CodeEmitter
 
 
 
 class CppSizeGenerator():
 
 
-    def __init__( self, types: CppTypesGenerator, class_name: str ) -> None:
+    def __init__( self, types: CppTypesGenerator, class_name: str, layouts: typing.Optional[typing.Dict[str, str]] = None ) -> None:
         self.__name_to_enum  = types.name_to_enum
         self.__name_to_alias = types.name_to_alias
+        self.__layouts       = layouts or {} # structs with a fixed layout, whose size is known at compile time
+        self.__class_name    = class_name
+        self.__fixed_layout  = False
 
-        self.__code_output  = f'size_t {class_name}::Size( )\n{{\n\tsize_t size=0;\n'
+        self.__code          = CodeEmitter()
 
 
     def normal_field( self, var_type: str, var_name: str ) -> str:
@@ -19,11 +25,13 @@ class CppSizeGenerator():
         if var_type in self.__name_to_alias or \
            var_type in self.__name_to_enum or \
            var_type in CppFieldGenerator.builtin_types:
-            self.__code_output += f'\tsize += sizeof({var_type}); //< {var_name}\n'
+            self.__code.write( f'\tsize += sizeof({var_type}); //< {var_name}\n' )
         elif var_type == "varint":
-            self.__code_output += f'\tsize += sizeVarint( {var_name} ); \n'
+            self.__code.write( f'\tsize += sizeVarint( {var_name} ); \n' )
+        elif var_type in self.__layouts:
+            self.__code.write( f'\tsize += {var_type}::FixedSize(); //< {var_name}\n' )
         else:
-            self.__code_output += f'\tsize += {var_name}.Size();\n'
+            self.__code.write( f'\tsize += {var_name}.Size();\n' )
 
 
 
@@ -33,24 +41,25 @@ class CppSizeGenerator():
         arr_name = CppFieldGenerator.convert_to_field_name( arr_name )
 
         if arr_type in self.__name_to_enum or arr_type in self.__name_to_alias or arr_type in CppFieldGenerator.builtin_types:
-            self.__code_output += f'\tsize += sizeof({arr_type})*{arr_name}.size(); //< {arr_name}\n'
+            self.__code.write( f'\tsize += sizeof({arr_type})*{arr_name}.size(); //< {arr_name}\n' )
+        elif arr_type in self.__layouts:
+            self.__code.write( f'\tsize += {arr_type}::FixedSize()*{arr_name}.size(); //< {arr_name}\n' )
         else:            
-            self.__code_output += f'\tfor(size_t i=0; i < {arr_name}.size(); ++i )'
-            self.__code_output += f'\t{{'
-            self.__code_output += f'\t\tsize += {arr_name}[i].Size();'
-            self.__code_output += f'\t}}'
+            self.__code.write( f'\tfor(size_t i=0; i < {arr_name}.size(); ++i )' )
+            self.__code.write( f'\t{{' )
+            self.__code.write( f'\t\tsize += {arr_name}[i].Size();' )
+            self.__code.write( f'\t}}' )
 
 
 
 
     def inline_field( self, var_name: str ):
-        var_name = CppFieldGenerator.convert_to_field_name(var_name)
-        self.__code_output += f'\tsize += {var_name}.Size();\n'
+        self.normal_field( var_name, var_name )
 
 
 
     def reserved_field( self, var_type: str, var_name: str ):
-        self.__code_output += f'\tsize += sizeof({var_type}); //< {var_name}\n'
+        self.__code.write( f'\tsize += sizeof({var_type}); //< {var_name}\n' )
 
 
 
@@ -58,25 +67,45 @@ class CppSizeGenerator():
         array_name = CppFieldGenerator.convert_to_field_name(array_name)
         array_size = CppFieldGenerator.convert_to_field_name(array_size)
 
-        self.__code_output += f'\tsize += {array_size}; //< {array_name}\n'
+        self.__code.write( f'\tsize += {array_size}; //< {array_name}\n' )
 
 
 
     def array_fill_field( self, array_type: str, array_name: str ):
         array_name = CppFieldGenerator.convert_to_field_name( array_name )
-        self.__code_output += f'\tsize += {array_name}.size() * sizeof({array_type});\n'
+
+        if array_type in self.__layouts:
+            self.__code.write( f'\tsize += {array_name}.size() * {array_type}::FixedSize();\n' )
+        else:
+            self.__code.write( f'\tsize += {array_name}.size() * sizeof({array_type});\n' )
 
 
 
     def condition( self, var_name: str, var_type: str, condition: str ):
-        self.__code_output += f'\n\tif( {condition} )\n\t{{\n\t'
+        self.__code.write( f'\n\tif( {condition} )\n\t{{\n\t' )
         self.normal_field( var_type, var_name )
-        self.__code_output += "\t}\n\n"
+        self.__code.write( "\t}\n\n" )
+
 
 
+    def fixed_layout_struct( self ):
+        """ The size of a struct with a fixed layout is known at compile time. """
+        self.__fixed_layout = True
 
-    def generate( self ) -> str:
-        self.__code_output += "\treturn size;\n"
-        self.__code_output += "}\n\n\n"
 
-        return self.__code_output
+
+    def write_to( self, stream: typing.TextIO ) -> None:
+        """
+        Writes the generated 'Size()' method to 'stream'.
+        """
+
+        stream.write( f'size_t {self.__class_name}::Size( )\n{{\n' )
+
+        if self.__fixed_layout:
+            stream.write( "\treturn FixedSize();\n" )
+        else:
+            stream.write( "\tsize_t size=0;\n" )
+            self.__code.write_to( stream )
+            stream.write( "\treturn size;\n" )
+
+        stream.write( "}\n\n\n" )
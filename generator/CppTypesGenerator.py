@@ -1,24 +1,15 @@
 import typing
-from dataclasses import dataclass
 
-from .CppFieldGenerator import TypeConverter
+from .Schema import EnumDef, AliasDef
+from .CppFieldGenerator import CppFieldGenerator
+from .CodeEmitter import CodeEmitter
+from .FileWriter import FileWriter
 
 
-@dataclass
-class EnumDef:
-    type   : str
-    values : set
-
-@dataclass
-class AliasDef: # aka type alias
-    type : str 
-    size : int      # if > 1 then the typedef is a struct with an array of type 'type' and size 'size' 
-    hint : str = "" # hint on how alias should be printed by Print() method (hex, ascii, etc)
-
 class CppTypesGenerator():
     """
-    Takes dict defining enums and alias types and generates C++
-    declaration code.
+    Takes enum and alias type definitions (see 'SchemaBuilder') and
+    generates C++ declaration code.
 
     Enums are added by calling 'add_enum_type()' and aliases are added 
     by calling 'add_alias()'. When all enums and aliases have been 
@@ -29,21 +20,22 @@ class CppTypesGenerator():
         self.name_to_enum  : typing.Dict[str, EnumDef]  = {}  # enum  name to enum  fields
         self.name_to_alias : typing.Dict[str, AliasDef] = {}  # alias name to alias fields
 
-        self.enums_code_output = ""  # cpp generated enum code goes here
-        self.types_code_output = ""  # cpp generated type code goes here
+        self.enums_code_output = CodeEmitter()  # cpp generated enum code goes here
+        self.types_code_output = CodeEmitter()  # cpp generated type code goes here
 
 
-    def add_enum_type( self, enum: dict ) -> None:
+    def add_enum_type( self, enum: EnumDef ) -> None:
         """
-        Takes a dict that defines an enum and converts it to cpp code. 
+        Takes the definition of an enum and converts it to cpp code. 
         This method can be called as many times as necessary to add 
         multiple enums.
 
         Parameters
         ----------
-        enum : dict
-            A dictionary which defines the enum name, values, type and
-            comments. An example input is shown below in yaml format:
+        enum : EnumDef
+            The definition of the enum name, values, type and comments,
+            as built by 'SchemaBuilder.enum()'. An example input is shown
+            below in yaml format:
 
                 ---------------------------------------------------------
                 - name: TransactionType
@@ -76,39 +68,41 @@ class CppTypesGenerator():
                 ---------------------------------------------------------
         """
 
-        enum_name = enum["name"]
-        enum_type = TypeConverter.convert( enum["type"].split()[1] )
+        enum_name = enum.name
 
         if enum_name in self.name_to_enum:
             print(f"Error: Same enum name, '{enum_name}', defined multiple times!\n")
 
-        self.name_to_enum[enum_name] = EnumDef( enum_type, set() )
+        self.name_to_enum[enum_name] = enum
+
+        code = self.enums_code_output
 
-        if "comments" in enum:
-            self.enums_code_output += f'/**\n * {enum["comments"]}\n */\n'
+        if enum.comments is not None:
+            code.write( f'/**\n * {enum.comments}\n */\n' )
 
-        self.enums_code_output += f'enum class {enum_name} : {enum_type}\n{{\n'
+        code.line( f'enum class {enum_name} : {enum.type}' )
+        code.line( "{" )
 
-        for value in enum["values"]:
-            self.enums_code_output += f'\t{value["name"]} = {value["value"]},'
-            self.enums_code_output += f'//< {value["comments"]}\n' if "comments" in value else "\n"
-            self.name_to_enum[enum_name].values.add(value["name"])
+        with code.indented():
+            for value in enum.values:
+                code.line( f'{value.name} = {value.value},//< {value.comments}' if value.comments is not None else f'{value.name} = {value.value},' )
 
-        self.enums_code_output += "};\n\n\n"
+        code.write( "};\n\n\n" )
 
 
 
-    def add_alias_type( self, alias: dict ) -> None:
+    def add_alias_type( self, alias: AliasDef ) -> None:
         """
-        Takes a dict that defines an alias type and converts it to cpp code. 
+        Takes the definition of an alias type and converts it to cpp code. 
         This method can be called as many times as necessary to add
         multiple alias types. 
 
         Parameters
         ----------
-        user_type : dict
-            A dictionary which defines the alias name, values, type and
-            comments. An example input is shown below in yaml format:
+        alias : AliasDef
+            The definition of the alias name, size, type and comments,
+            as built by 'SchemaBuilder.alias()'. An example input is shown
+            below in yaml format:
 
                 ---------------------------------------------------------
                 - name: Hash256
@@ -124,24 +118,49 @@ class CppTypesGenerator():
                 ---------------------------------------------------------
         """        
 
-        alias_name = alias["name"]
+        alias_name = alias.name
 
         if alias_name in self.name_to_alias:
             print(f"Error: Same type name, '{alias_name}', defined multiple times!\n")
 
-        alias_types = alias["type"].split()
-
-        if( alias_types[1] != "array"):
-            alias_type = TypeConverter.convert( alias_types[1] )
-            self.types_code_output += f'using {alias_name} = {alias_type};'
-            self.name_to_alias[alias_name] = AliasDef( alias_type , 1 )
+        if not alias.array:
+            declaration = f'using {alias_name} = {alias.type};'
         else:
-            alias_type = TypeConverter.convert( alias_types[2] )
-            print_hint = alias["print"] if "print" in alias else ""
-            self.types_code_output += f'using {alias_name} = struct {alias_name} {{ {alias_type} data[{alias["size"]}]; }};' 
-            self.name_to_alias[alias_name] = AliasDef( alias_type, alias["size"], print_hint  )
+            declaration = f'using {alias_name} = struct {alias_name} {{ {alias.type} data[{alias.size}]; }};' 
+
+        self.name_to_alias[alias_name] = alias
+
+        self.types_code_output.line( f'{declaration}//< {alias.comments}' if alias.comments is not None else declaration )
+
+
+
+    def size_and_alignment( self, type_name: str ) -> typing.Optional[typing.Tuple[int, int]]:
+        """
+        Returns the size and the natural alignment in bytes of the builtin,
+        enum or alias type 'type_name', e.g. (32, 1) for an alias
+        'array uint8' of size 32, or None for any other type. The actual
+        alignment on a platform can be smaller (e.g. of 'uint64_t' on 32 bit
+        x86), but not larger.
+        """
+
+        if type_name in self.name_to_enum:
+            type_name = self.name_to_enum[type_name].type
+
+        elif type_name in self.name_to_alias:
+            alias   = self.name_to_alias[type_name]
+            element = self.size_and_alignment( alias.type )
+
+            if element is None or not alias.array:
+                return element
 
-        self.types_code_output += f'//< {alias["comments"]}\n' if "comments" in alias else "\n"
+            return element[0] * int(alias.size), element[1]
+
+        if type_name not in CppFieldGenerator.builtin_types:
+            return None
+
+        size = int( type_name.strip( "uint_t" ) ) // 8 # e.g. 'uint16_t' -> 2
+
+        return size, size
 
 
 
@@ -151,12 +170,10 @@ class CppTypesGenerator():
         Enums are written first, followed by the user defined types.
         """
 
-        f = open( file_path, "a" )
-        f.write("#pragma once\n\n")
-        f.write("#include <cstdint>\n")
-        f.write("#include <cstdlib>\n\n")
-
-        f.write( self.enums_code_output )
-        f.write( self.types_code_output)
+        with FileWriter.open( file_path ) as f:
+            f.write("#pragma once\n\n")
+            f.write("#include <cstdint>\n")
+            f.write("#include <cstdlib>\n\n")
 
-        f.close()
+            self.enums_code_output.write_to( f )
+            self.types_code_output.write_to( f )
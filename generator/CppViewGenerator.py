@@ -0,0 +1,649 @@
+import re
+import typing
+
+from .CppClassDeclarationGenerator import CppClassDeclarationGenerator
+from .CppFieldGenerator import CppFieldGenerator
+from .CppTypesGenerator import CppTypesGenerator
+from .Schema import FieldDef
+from .CodeEmitter import CodeEmitter
+from .FileWriter import FileWriter
+
+
+
+class CppViewGenerator():
+    """
+    Generates the read-only view of a class, e.g. 'TransferTransactionBodyView'
+    in 'TransferTransactionBodyView.h', which reads the fields from the
+    serialized struct instead of copying them (see 'cpp_source/View.h').
+
+    A view points to the start ('mBegin') and the end ('mEnd') of the struct.
+    Fields are read at constant offsets from the start, up to the first field
+    of variable size (an array, a varint, a condition, ...). The position of
+    the field after it is only known once the struct is parsed, so it is
+    stored in the view, and the fields after it are read at constant offsets
+    from it:
+
+        ---------------------------------------------------------
+        uint16_t GetMessage_size( ) const { return ReadField<uint16_t>( mBegin + 24 ); }
+        ArrayView<uint8_t> GetMessage( ) const { return ArrayView<uint8_t>( mMessage, mEnd ); }
+
+        private:
+        const uint8_t* mBegin = nullptr;
+        const uint8_t* mEnd = nullptr;
+        const uint8_t* mMessage = nullptr;
+        ---------------------------------------------------------
+
+    'Parse()' validates the struct like 'Deserialize()', with a single bounds
+    check per run of fixed size fields, while 'ParseUnchecked()' only finds
+    the positions of a struct which was validated before. The elements of
+    'array_sized' fields are parsed by the 'parse_view_{group}()' functions
+    generated by 'CppConvertersGenerator'.
+
+    The view header can be written by calling 'write_file()'.
+    """
+
+    def __init__( self,
+                  class_decl:               CppClassDeclarationGenerator,
+                  class_name_to_class_decl: typing.Dict[str, CppClassDeclarationGenerator],
+                  types:                    CppTypesGenerator,
+                  min_sizes:                typing.Optional[typing.Dict[str, int]] = None ) -> None:
+        """
+        Parameters
+        ----------
+        class_decl : CppClassDeclarationGenerator
+            The class declaration whose view is generated
+
+        class_name_to_class_decl: typing.Dict[str, CppClassDeclarationGenerator]
+            All class declarations, for the sizes of the nested structs
+
+        types : CppTypesGenerator
+            All user defined types, for the sizes of the fields
+
+        min_sizes : typing.Dict[str, int], optional
+            Minimum serialized size of the element types of the struct
+            arrays, for checking their counts (see 'CppClassDefinitionGenerator')
+        """
+
+        self.__class_decl               = class_decl
+        self.__class_name_to_class_decl = class_name_to_class_decl
+        self.__types                    = types
+        self.__min_sizes                = min_sizes or {}
+
+        self.view_name                  = CppViewGenerator.view_name( class_decl.class_name )
+
+        if self.view_name in class_name_to_class_decl:
+            print(f'Error: The view of struct "{class_decl.class_name}" can\'t be generated, since a struct named "{self.view_name}" exists!\n')
+            exit(1)
+
+        self.__includes : typing.Set[str]  = { '#include "View.h"', '#include "types.h"' }
+        self.__infos                       = self.__struct_infos()
+        self.__fields                      = self.__place_fields()
+
+        self.__code                        = CodeEmitter() # body of the 'Parse()' method being generated
+        self.__run_size                    = 0             # size of the current run of fixed size fields
+        self.__run_checks : typing.List[str] = []          # checks of the reserved fields of the current run
+        self.__joined_run                  = False         # whether the last field was added to the current run
+
+
+
+    @staticmethod
+    def view_name( class_name: str ) -> str:
+        return f'{class_name}View'
+
+
+
+    def write_file( self, file_path: str ) -> None:
+        declaration = self.__generate_declaration()
+        parse       = self.__generate_parse( checked=True )
+        unchecked   = self.__generate_parse( checked=False )
+        next_code   = self.__generate_next_functions()
+
+        with FileWriter.open( file_path ) as f:
+            code = CodeEmitter( f )
+            code.line( "#pragma once" )
+            code.line()
+
+            for include in sorted( self.__includes ):
+                code.line( include )
+
+            code.write( "\n\n", declaration, parse, unchecked, next_code )
+
+
+
+    # field positions
+    # /////////////////////////////////////////////////////////////////
+    def __struct_infos( self ) -> typing.Dict[str, typing.Tuple[typing.Optional[int], bool]]:
+        """
+        Returns the serialized size (None if it varies) of this struct and of
+        the structs nested in it, and whether they have fields which are
+        validated by 'Parse()'. The nested structs are visited without
+        recursion, since nesting can be deep.
+        """
+
+        infos : typing.Dict[str, typing.Tuple[typing.Optional[int], bool]] = {}
+        stack = [ self.__class_decl.class_name ]
+
+        while stack:
+            fields = self.__class_name_to_class_decl[ stack[-1] ].struct.fields
+            nested = [ field.type for field in fields if field.type in self.__class_name_to_class_decl and field.type not in infos and field.type not in stack ]
+
+            if nested:
+                stack += nested
+                continue
+
+            field_infos = [ self.__field_info( field, infos ) for field in fields ]
+            sizes       = [ size for size, _ in field_infos ]
+
+            infos[ stack.pop() ] = ( sum( sizes ) if None not in sizes else None, any( validated for _, validated in field_infos ) )
+
+        return infos
+
+
+
+    def __field_info( self, field: FieldDef, infos: typing.Dict[str, typing.Tuple[typing.Optional[int], bool]], present: bool = False ) -> typing.Tuple[typing.Optional[int], bool]:
+        """
+        Returns the serialized size of 'field' (None if it varies) and whether
+        it is validated by 'Parse()'. If 'present' the field is assumed to be
+        present, even if it has a condition.
+        """
+
+        if field.disposition in ( "const", "struct_type" ):
+            return 0, False
+
+        if ( field.condition is not None and not present ) or field.disposition in ( "array_sized", "array_fill" ) or "varint" == field.type:
+            return None, True
+
+        if field.type in self.__class_name_to_class_decl:
+            size, validated = infos.get( field.type, ( None, True ) ) # unknown if the struct contains itself
+        else:
+            size, validated = self.__types.size_and_alignment( field.type )[0], "reserved" == field.disposition
+
+        if "array" == field.disposition:
+            if size is None or not str(field.size).isdigit():
+                return None, True
+
+            return size * int(field.size), validated
+
+        return size, validated
+
+
+
+    def __place_fields( self ) -> typing.List[dict]:
+        """
+        Returns the serialized fields with their size (None if it varies),
+        the position of their start and of their end as ( anchor, offset ),
+        and the anchor which is set at their start (if any).
+        """
+
+        fields : typing.List[dict] = []
+        open_ends : typing.List[dict] = [] # fields of variable size, which end where the next anchor starts
+        anchor, offset = "mBegin", 0
+
+        for field in self.__class_decl.struct.fields:
+            if field.disposition in ( "const", "struct_type" ):
+                continue
+
+            placed = { "field": field, "size": self.__field_info( field, self.__infos )[0], "anchor": None }
+
+            if anchor is None:
+                anchor, offset   = CppFieldGenerator.convert_to_field_name( field.name or field.type ), 0
+                placed["anchor"] = anchor
+
+                for open_end in open_ends:
+                    open_end["end"] = ( anchor, 0 )
+
+                open_ends = []
+
+            placed["begin"] = ( anchor, offset )
+
+            if placed["size"] is None:
+                open_ends.append( placed )
+                anchor = None
+            else:
+                offset       += placed["size"]
+                placed["end"] = ( anchor, offset )
+
+            fields.append( placed )
+
+        for open_end in open_ends:
+            open_end["end"] = ( "mEnd", 0 )
+
+        return fields
+
+
+
+    @staticmethod
+    def __at( position: typing.Tuple[str, int] ) -> str:
+        anchor, offset = position
+        return f'{anchor} + {offset}' if offset else anchor
+
+
+
+    # class declaration
+    # /////////////////////////////////////////////////////////////////
+    def __generate_declaration( self ) -> str:
+        class_name = self.__class_decl.class_name
+        code       = CodeEmitter()
+
+        code.line( "/**" )
+        code.line( f" * Read-only view of a serialized '{class_name}', which reads its fields from the" )
+        code.line( " * serialized bytes when they are accessed (see 'View.h')." )
+        code.line( " */" )
+        code.line( f'class {self.view_name}' )
+        code.line( "{" )
+
+        for placed in self.__fields:
+            if "array_sized" == placed["field"].disposition:
+                code.line( "private:" )
+                code.line( f"\t// Returns the start of the element of '{placed['field'].name}' after the one at 'ptr'" )
+                code.line( f'\tstatic const uint8_t* Next{self.__accessor_name( placed["field"] )}( const uint8_t* ptr, const uint8_t* const end );' )
+                code.line()
+
+        code.line( "public:" )
+        code.line( "\tbool Parse         ( RawBuffer& buffer                              ){ return ParseView( *this, buffer ); }" )
+        code.line( "\tbool Parse         ( const uint8_t*& ptr, const uint8_t* const end );" )
+        code.line( "\tvoid ParseUnchecked( const uint8_t*& ptr, const uint8_t* const end );" )
+        code.line()
+        code.line( "\tconst uint8_t* Data( ) const { return mBegin; }" )
+        code.line( "\tsize_t         Size( ) const { return size_t(mEnd - mBegin); }" )
+        code.line()
+
+        constants = self.__generate_constants()
+        if constants:
+            code.write( constants, "\n" )
+
+        for placed in self.__fields:
+            self.__generate_accessors( code, placed )
+
+        code.line()
+        code.line( "private:" )
+
+        for anchor in [ "mBegin", "mEnd" ] + [ placed["anchor"] for placed in self.__fields if placed["anchor"] ]:
+            code.line( f'\tconst uint8_t* {anchor} = nullptr;' )
+
+        code.line( "};" )
+        code.write( "\n\n" )
+
+        return code.getvalue()
+
+
+
+    def __generate_constants( self ) -> str:
+        """ The 'const' and 'struct_type' fields, as static constants of the view. """
+
+        code = CodeEmitter()
+
+        for field in self.__class_decl.struct.fields:
+            if "const" == field.disposition:
+                code.write( self.__constant( field.type, field.name, field.value ) )
+
+            elif "struct_type" == field.disposition:
+                code.write( self.__constant( field.type, "TRANSACTION_TYPE",    self.__class_decl.struct.group_id      ) )
+                code.write( self.__constant( "uint8_t",  "TRANSACTION_VERSION", self.__class_decl.struct.group_version ) )
+
+        return code.getvalue()
+
+
+
+    @staticmethod
+    def __constant( var_type: str, name: str, value: typing.Any ) -> str:
+        value = f'{var_type}::{value}' if var_type not in CppFieldGenerator.builtin_types else value
+        return f'\tstatic constexpr {var_type} {name} = {value};\n'
+
+
+
+    @staticmethod
+    def __accessor_name( field: FieldDef ) -> str:
+        return CppFieldGenerator.convert_to_field_name( field.name or field.type )[1:]
+
+
+
+    @staticmethod
+    def __accessor_path( member_path: str ) -> str:
+        """ Converts a path of fields like 'EntityBody.mVersion' to a path of accessors like 'GetEntityBody().GetVersion()'. """
+        return ".".join( f'Get{member[1:]}()' for member in CppFieldGenerator.convert_to_field_name( member_path ).split( "." ) )
+
+
+
+    def __generate_accessors( self, code: CodeEmitter, placed: dict ) -> None:
+        field       = placed["field"]
+        name        = self.__accessor_name( field )
+        begin       = self.__at( placed["begin"] )
+        end         = self.__at( placed["end"] )
+        comment     = f' // {field.comments}' if field.comments else ""
+        disposition = field.disposition
+        present     = field.condition is not None and field.condition != field.name # only read if the condition holds
+
+        if "reserved" == disposition:
+            return
+
+        if field.condition is not None:
+            code.line( f'\tbool Has{name}( ) const {{ return {end} != {begin}; }}' )
+
+        if "array" == disposition or "array_fill" == disposition:
+            if field.type in self.__class_name_to_class_decl:
+                view = f'StructArrayView<{self.__view_of( field.type )}>'
+            else:
+                view = f'ArrayView<{field.type}>'
+
+            code.line( f'\t{view} Get{name}( ) const {{ return {view}( {begin}, {end} ); }}{comment}' )
+
+        elif "array_sized" == disposition:
+            view = f'SizedArrayView<{self.__view_of( field.type )}, &{self.view_name}::Next{name}>'
+            self.__includes.add( '#include "views.h"' )
+            code.line( f'\t{view} Get{name}( ) const {{ return {view}( {begin}, {end} ); }}{comment}' )
+
+        elif "varint" == field.type:
+            self.__includes.add( '#include "Varint.h"' )
+            code.line( f'\tuint64_t Get{name}( ) const {{ uint64_t value = 0; const uint8_t* ptr = {begin}; readVarint( ptr, {end}, value ); return value; }}{comment}' )
+
+        elif field.type in self.__class_name_to_class_decl:
+            view = self.__view_of( field.type )
+            read = f'ViewAt<{view}>( {begin}, {end} )'
+            code.line( f'\t{view} Get{name}( ) const {{ return {f"Has{name}() ? {read} : {view}()" if present else read}; }}{comment}' )
+
+        else:
+            read = f'ReadField<{field.type}>( {begin} )'
+            code.line( f'\t{field.type} Get{name}( ) const {{ return {f"Has{name}() ? {read} : {field.type}()" if present else read}; }}{comment}' )
+
+
+
+    def __view_of( self, class_name: str ) -> str:
+        """ Returns the view of struct 'class_name', whose header is included. """
+        view = CppViewGenerator.view_name( class_name )
+
+        if class_name != self.__class_decl.class_name:
+            self.__includes.add( f'#include "{view}.h"' )
+
+        return view
+
+
+
+    # Parse() and ParseUnchecked()
+    # /////////////////////////////////////////////////////////////////
+    def __generate_parse( self, checked: bool ) -> str:
+        self.__code       = CodeEmitter()
+        self.__run_size   = 0
+        self.__run_checks = []
+
+        uses_varint = False
+
+        self.__code.line( "\tmBegin = ptr;" )
+
+        for placed in self.__fields:
+            field             = placed["field"]
+            self.__joined_run = False
+
+            if placed["anchor"]:
+                self.__end_run( checked )
+                self.__code.line( f'\t{placed["anchor"]} = ptr;' )
+
+            if field.condition is None:
+                self.__field( placed, checked, "\t" )
+
+            elif field.condition == field.name:
+                # the value is read even if the field is not present, like by 'Deserialize()'
+                self.__end_run( checked )
+                if checked:
+                    self.__code.line( f'\tif( size_t(end - ptr) < {self.__types.size_and_alignment( field.type )[0]} ){{ return false; }}' )
+
+                self.__code.line( f'\tif( {self.__condition( field )} )' )
+                self.__code.line( "\t{" )
+                self.__code.line( f'\t\tptr += {self.__types.size_and_alignment( field.type )[0]};' )
+                self.__code.line( "\t}" )
+
+            else:
+                self.__end_run( checked )
+                self.__code.line( f'\tif( {self.__condition( field )} )' )
+                self.__code.line( "\t{" )
+                self.__field( placed, checked, "\t\t" )
+                self.__code.line( "\t}" )
+
+            if not self.__joined_run:
+                self.__code.line()
+
+            uses_varint = uses_varint or "varint" == field.type
+
+        self.__end_run( checked )
+        self.__code.line( "\tmEnd = ptr;" )
+
+        body = self.__code.getvalue()
+        code = CodeEmitter()
+
+        if checked:
+            code.line( f'inline bool {self.view_name}::Parse( const uint8_t*& ptr, const uint8_t* const end )' )
+        else:
+            code.line( f'inline void {self.view_name}::ParseUnchecked( const uint8_t*& ptr, const uint8_t* const end )' )
+
+        code.line( "{" )
+
+        if not re.search( r'\bend\b', body ):
+            code.line( "\t(void) end;" )
+
+        if uses_varint:
+            code.line( "\tuint64_t varint;" )
+
+        code.write( body )
+
+        if checked:
+            code.line( "\treturn true;" )
+
+        code.write( "}\n\n\n" )
+
+        return code.getvalue()
+
+
+
+    def __end_run( self, checked: bool ) -> None:
+        """ Writes the bounds check of the current run of fixed size fields, followed by the checks of its fields. """
+        if not self.__run_size:
+            return
+
+        self.__bytes( self.__run_size, self.__run_checks, checked, "\t" )
+        self.__code.line()
+
+        self.__run_size   = 0
+        self.__run_checks = []
+
+
+
+    def __bytes( self, size: int, checks: typing.List[str], checked: bool, tab: str ) -> None:
+        """ Moves the cursor past 'size' bytes, after checking them if 'checked'. """
+        if checked:
+            self.__code.line( f'{tab}if( size_t(end - ptr) < {size} ){{ return false; }}' )
+
+            for check in checks:
+                self.__code.line( f'{tab}{check}' )
+
+        self.__code.line( f'{tab}ptr += {size};' )
+
+
+
+    def __field( self, placed: dict, checked: bool, tab: str ) -> None:
+        field       = placed["field"]
+        size        = self.__field_info( field, self.__infos, present=True )[0]
+        disposition = field.disposition
+        in_run      = "\t" == tab # otherwise in a condition
+
+        if "array" == disposition:
+            self.__array( placed, checked, tab )
+
+        elif "array_fill" == disposition:
+            self.__end_run( checked )
+            view = self.__view_of( field.type )
+
+            if checked:
+                self.__code.line( f'{tab}while( ptr != end )' )
+                self.__code.line( f'{tab}{{' )
+                self.__code.line( f'{tab}\tif( !{view}().Parse( ptr, end ) ){{ return false; }}' )
+                self.__code.line( f'{tab}}}' )
+            else:
+                self.__code.line( f'{tab}ptr = end; // the elements fill the rest of the buffer' )
+
+        elif "array_sized" == disposition:
+            self.__end_run( checked )
+            self.__array_sized( placed, checked, tab )
+
+        elif "varint" == field.type:
+            self.__end_run( checked )
+            if checked:
+                self.__code.line( f'{tab}if( !readVarint( ptr, end, varint ) ){{ return false; }}' )
+            else:
+                self.__code.line( f'{tab}readVarint( ptr, end, varint );' )
+
+        elif field.type in self.__class_name_to_class_decl and ( size is None or ( checked and self.__infos[field.type][1] ) ):
+            self.__end_run( checked )
+            if checked:
+                self.__code.line( f'{tab}if( !{self.__view_of( field.type )}().Parse( ptr, end ) ){{ return false; }}' )
+            else:
+                self.__code.line( f'{tab}{self.__view_of( field.type )}().ParseUnchecked( ptr, end );' )
+
+        else:
+            checks = []
+            values = str(field.value).split()
+
+            if "reserved" == disposition and 1 == len(values): # reserved fields with the size of another field are not checked
+                checks.append( f'if( {values[0]} != ReadField<{field.type}>( {self.__at( placed["begin"] )} ) ){{ return false; }}' )
+
+            if in_run:
+                self.__run_size   += size
+                self.__run_checks += checks
+                self.__joined_run  = True
+            else:
+                self.__bytes( size, checks, checked, tab )
+
+
+
+    def __array( self, placed: dict, checked: bool, tab: str ) -> None:
+        field   = placed["field"]
+        in_run  = "\t" == tab
+        is_view = field.type in self.__class_name_to_class_decl
+
+        element, validated = self.__infos[field.type] if is_view else ( self.__types.size_and_alignment( field.type )[0], False )
+
+        if placed["size"] is not None and in_run and ( not checked or not validated ):
+            self.__run_size  += placed["size"]
+            self.__joined_run = True
+            return
+
+        self.__end_run( checked )
+
+        count = field.size if str(field.size).isdigit() else f'{self.__accessor_path( field.size )}'
+
+        if element is not None and ( not checked or not validated ):
+            if checked:
+                self.__code.line( f'{tab}if( size_t(end - ptr){f" / {element}" if element != 1 else ""} < {count} ){{ return false; }}' )
+
+            self.__code.line( f'{tab}ptr += {count}{f" * {element}" if element != 1 else ""};' )
+            return
+
+        view = self.__view_of( field.type )
+
+        if checked and self.__min_sizes.get( field.type ):
+            self.__code.line( f'{tab}if( size_t(end - ptr) / {self.__min_sizes[field.type]} < {count} ){{ return false; }}' )
+
+        self.__code.line( f'{tab}for( size_t i=0, count={count}; i<count; ++i )' )
+        self.__code.line( f'{tab}{{' )
+
+        if checked:
+            self.__code.line( f'{tab}\tif( !{view}().Parse( ptr, end ) ){{ return false; }}' )
+        else:
+            self.__code.line( f'{tab}\t{view}().ParseUnchecked( ptr, end );' )
+
+        self.__code.line( f'{tab}}}' )
+
+
+
+    def __array_sized( self, placed: dict, checked: bool, tab: str ) -> None:
+        field = placed["field"]
+        count = self.__accessor_path( field.size )
+
+        self.__code.line( f'{tab}for( size_t read_size = 0; read_size < {count}; )' )
+        self.__code.line( f'{tab}{{' )
+
+        with self.__code.indented( tab + "\t" ):
+            if checked:
+                header, enum_type = self.__view_of( field.type ), self.__header_enum( field )
+
+                self.__code.line( f'{header} header;' )
+                self.__code.line( f'const uint8_t* header_end = ptr;' )
+                self.__code.line( f'if( !header.Parse( header_end, end ) ){{ return false; }}' )
+                self.__code.line()
+                self.__code.line( f'const uint8_t* const element = ptr;' )
+                self.__code.line( f'if( !parse_view_{enum_type}( header.{self.__accessor_path( field.header_type_field )}, {self.__header_version( field )}, ptr, end ) ){{ return false; }}' )
+                self.__code.line( f'read_size += size_t(ptr - element);' )
+
+                if field.align:
+                    self.__code.line()
+                    self.__code.line( f'const size_t padding = ({field.align} - uintptr_t(ptr)%{field.align}) % {field.align};' )
+                    self.__code.line( f'if( size_t(end - ptr) < padding ){{ return false; }}' )
+                    self.__code.line( f'ptr       += padding;' )
+                    self.__code.line( f'read_size += padding;' )
+            else:
+                self.__code.line( f'const uint8_t* const element = ptr;' )
+                self.__code.line( f'ptr = Next{self.__accessor_name( field )}( ptr, end );' )
+                self.__code.line( f'read_size += size_t(ptr - element);' )
+
+        self.__code.line( f'{tab}}}' )
+
+
+
+    def __generate_next_functions( self ) -> str:
+        """ The functions which return the next element of the 'array_sized' fields, for iterating over them. """
+
+        code = CodeEmitter()
+
+        for placed in self.__fields:
+            field = placed["field"]
+
+            if "array_sized" != field.disposition:
+                continue
+
+            code.line( f'inline const uint8_t* {self.view_name}::Next{self.__accessor_name( field )}( const uint8_t* ptr, const uint8_t* const end )' )
+            code.line( "{" )
+
+            with code.indented():
+                code.line( f'const {self.__view_of( field.type )} header = ViewAt<{self.__view_of( field.type )}>( ptr, end );' )
+                code.line( f'parse_view_unchecked_{self.__header_enum( field )}( header.{self.__accessor_path( field.header_type_field )}, {self.__header_version( field )}, ptr, end );' )
+
+                if field.align:
+                    code.line( f'return ptr + ({field.align} - uintptr_t(ptr)%{field.align}) % {field.align};' )
+                else:
+                    code.line( "return ptr;" )
+
+            code.write( "}\n\n\n" )
+
+        return code.getvalue()
+
+
+
+    def __header_enum( self, field: FieldDef ) -> str:
+        """ Returns the enum type of the header field which tells the type of the elements of 'array_sized' 'field'. """
+        member_vars = self.__class_name_to_class_decl[ field.type ].struct.member_vars
+
+        if field.header_type_field not in member_vars:
+            print(f'Error: Variable "{field.header_type_field}" not found in class "{field.type}"\n')
+            exit(1)
+
+        return member_vars[ field.header_type_field ][1]
+
+
+
+    def __header_version( self, field: FieldDef ) -> str:
+        return f'header.{self.__accessor_path( field.header_version_field )}' if field.header_version_field else "1"
+
+
+
+    def __condition( self, field: FieldDef ) -> str:
+        """ The condition of 'field', with the accessor of the condition field. """
+
+        op = "!=" if "not equals" == field.condition_operation else "=="
+
+        condition_value = field.condition_value
+
+        # if condition variable is an enum change to enum value
+        _, cond_type = self.__class_decl.struct.member_vars[ field.condition ]
+        if cond_type in self.__types.name_to_enum:
+            condition_value = f'{cond_type}::{condition_value}'
+
+        return f'{self.__accessor_path( field.condition )} {op} {condition_value}'
@@ -0,0 +1,117 @@
+import os
+import typing
+import filecmp
+import shutil
+import contextlib
+from pathlib import Path
+
+
+
+class FileWriter():
+    """
+    Helpers for writing generated and static files to the output folder.
+
+    Files are only replaced when their content actually changed, so that
+    files which are regenerated with identical content keep their mtime
+    and are not recompiled by the C++ build system.
+    """
+
+    @staticmethod
+    @contextlib.contextmanager
+    def open( file_path: str ):
+        """
+        Opens 'file_path' for writing. The content is written to a temporary
+        file, which replaces 'file_path' when closed, but only if the content
+        differs from the content already in 'file_path'.
+
+        Usage:
+
+            ---------------------------------------
+            with FileWriter.open( "types.h" ) as f:
+                f.write( code )
+            ---------------------------------------
+        """
+
+        tmp_path = file_path + ".tmp"
+
+        try:
+            with open( tmp_path, "w" ) as f:
+                yield f
+
+        except BaseException:
+            Path( tmp_path ).unlink( missing_ok=True )
+            raise
+
+        FileWriter.__replace_if_changed( tmp_path, file_path )
+
+
+
+    @staticmethod
+    def write_if_changed( file_path: str, content: typing.Union[str, bytes] ) -> bool:
+        """
+        Writes 'content' to 'file_path' unless the file already contains
+        exactly 'content'. Returns true if the file was written. If 'content'
+        is bytes, the file is written in binary mode.
+        """
+
+        path = Path( file_path )
+
+        if isinstance( content, bytes ):
+            if path.is_file() and path.read_bytes() == content:
+                return False
+
+            path.write_bytes( content )
+            return True
+
+        if path.is_file() and path.read_text() == content:
+            return False
+
+        path.write_text( content )
+        return True
+
+
+
+    @staticmethod
+    def copy_if_changed( src_path: str, dst_path: str ) -> bool:
+        """
+        Copies 'src_path' to 'dst_path' unless 'dst_path' already has the
+        same content. Returns true if the file was copied.
+        """
+
+        if Path( dst_path ).is_file() and filecmp.cmp( src_path, dst_path, shallow=False ):
+            return False
+
+        shutil.copyfile( src_path, dst_path )
+        return True
+
+
+
+    @staticmethod
+    def write_depfile( file_path: str, targets: typing.List[str], dependencies: typing.List[str] ) -> None:
+        """
+        Writes a Make/Ninja style depfile, stating that 'targets' depend on 'dependencies':
+
+            -----------------------------------------
+            target_1 target_2: dependency_1 \
+              dependency_2
+            -----------------------------------------
+        """
+
+        def escape( path: str ) -> str:
+            return str(path).replace( "$", "$$" ).replace( "#", "\\#" ).replace( " ", "\\ " )
+
+        content  = " ".join( escape(target) for target in targets ) + ":"
+        content += "".join( f" \\\n  {escape(dependency)}" for dependency in dependencies )
+        content += "\n"
+
+        FileWriter.write_if_changed( file_path, content )
+
+
+
+    @staticmethod
+    def __replace_if_changed( tmp_path: str, file_path: str ):
+
+        if Path( file_path ).is_file() and filecmp.cmp( tmp_path, file_path, shallow=False ):
+            os.remove( tmp_path )
+        else:
+            os.replace( tmp_path, file_path )
@@ -0,0 +1,270 @@
+import json
+import typing
+import hashlib
+import functools
+from pathlib import Path
+
+from .FileWriter import FileWriter
+
+
+
+class IncrementalCache():
+    """
+    Keeps track of which generated struct files are up to date, so that only
+    the files whose inputs changed are generated and written again.
+
+    For every struct a hash is computed over its normalized YAML entry, the
+    entries of all the types it depends on (enums, aliases and, transitively,
+    nested structs), the '--generate-print', '--fast-build', '--arena' and
+    '--variant' flags and the source code of the generator itself. The hashes are stored
+    in a manifest file in the output folder and compared against on the next
+    run.
+
+    Additionally a hash of the whole input (input files, generator and
+    options) is stored after each successful run, so that a run with
+    unchanged inputs can skip loading the schema altogether (see
+    'is_output_up_to_date()').
+    """
+
+    MANIFEST_NAME = ".catbuffer_manifest.json"
+    INPUTS_NAME   = ".catbuffer_inputs.json"
+
+
+
+    def __init__( self, input_data: list, gen_output_folder: str, generate_print_methods: bool = False, fast_build: bool = False, arena: bool = False, variant: bool = False ) -> None:
+        self.__gen_output_folder = gen_output_folder
+        self.__manifest_path     = Path( gen_output_folder ) / IncrementalCache.MANIFEST_NAME
+
+        self.__name_to_entry  : typing.Dict[str, dict] = { elem["name"]: elem for elem in input_data if "name" in elem }
+        self.__name_to_digest : typing.Dict[str, str]  = {}                                                               # digest of each normalized YAML entry
+        self.__name_to_hash   : typing.Dict[str, str]  = {}                                                               # hash of each struct, including its dependencies
+
+        self.__salt = f'{IncrementalCache.generator_fingerprint()}|print={generate_print_methods}|fast_build={fast_build}|arena={arena}|variant={variant}'
+
+        for elem in input_data:
+            if "struct" == elem.get("type"):
+                self.__name_to_hash[elem["name"]] = self.__struct_hash( elem["name"], self.__salt )
+
+        self.__types_hash = self.__compute_types_hash()
+
+        self.__old_structs : typing.Dict[str, dict] = self.__load_manifest()
+        self.__new_structs : typing.Dict[str, dict] = {}
+
+
+
+    def is_up_to_date( self, struct_name: str, file_names: typing.List[str] ) -> bool:
+        """
+        Returns true if the files of 'struct_name' were generated from the
+        same inputs during the last run and still exist.
+        """
+
+        old = self.__old_structs.get( struct_name )
+
+        if old is None or old["hash"] != self.__name_to_hash[struct_name]:
+            return False
+
+        for file_name in file_names:
+            if not ( Path( self.__gen_output_folder ) / file_name ).is_file():
+                return False
+
+        return True
+
+
+
+    def struct_hash( self, struct_name: str ) -> str:
+        """
+        Returns the hash of the inputs of 'struct_name'.
+        """
+
+        return self.__name_to_hash[struct_name]
+
+
+
+    def types_hash( self ) -> str:
+        """
+        Returns a hash of all enum and alias types, i.e. of the inputs of 'types.h'.
+        """
+
+        return self.__types_hash
+
+
+
+    def add( self, struct_name: str, file_names: typing.List[str] ) -> None:
+        """
+        Records that 'file_names' were generated for 'struct_name'.
+        """
+
+        self.__new_structs[struct_name] = { "hash": self.__name_to_hash[struct_name], "files": file_names }
+
+
+
+    def save( self ) -> None:
+        """
+        Removes files of structs that no longer exist and writes the manifest.
+        """
+
+        for struct_name, old in self.__old_structs.items():
+            if struct_name in self.__new_structs:
+                continue
+
+            for file_name in old["files"]:
+                ( Path( self.__gen_output_folder ) / file_name ).unlink( missing_ok=True )
+
+        FileWriter.write_if_changed( str(self.__manifest_path), json.dumps( { "structs": self.__new_structs }, indent=1, sort_keys=True ) )
+
+
+
+    @staticmethod
+    def inputs_hash( input_file_names: typing.List[str], generate_print_methods: bool = False, options: typing.Optional[dict] = None ) -> str:
+        """
+        Hash of the content of the input files, the generator and the options
+        that change the generated files. 'options' are any further options
+        (e.g. '--roots'), which must be json serializable.
+        """
+
+        sha = hashlib.sha256( f'{IncrementalCache.generator_fingerprint()}|print={generate_print_methods}'.encode() )
+
+        if options:
+            sha.update( json.dumps( options, sort_keys=True ).encode() )
+
+        for file_name in input_file_names:
+            sha.update( Path( file_name ).read_bytes() )
+            sha.update( b'\0' )
+
+        return sha.hexdigest()
+
+
+
+    @staticmethod
+    def is_output_up_to_date( gen_output_folder: str, inputs_hash: str ) -> bool:
+        """
+        Returns true if the last run which generated 'gen_output_folder'
+        succeeded with the same 'inputs_hash' and its files still exist.
+        """
+
+        try:
+            with open( Path( gen_output_folder ) / IncrementalCache.INPUTS_NAME, "r" ) as f:
+                inputs = json.load( f )
+
+            if inputs["hash"] != inputs_hash:
+                return False
+
+            return all( ( Path( gen_output_folder ) / file_name ).is_file() for file_name in inputs["files"] )
+
+        except ( OSError, ValueError, KeyError, TypeError ):
+            return False
+
+
+
+    @staticmethod
+    def save_inputs_hash( gen_output_folder: str, inputs_hash: typing.Optional[str] ) -> None:
+        """
+        Records that the files in 'gen_output_folder' were generated from
+        'inputs_hash', or removes the record if 'inputs_hash' is None (to be
+        done before generating, in case the generator fails half way).
+        """
+
+        path = Path( gen_output_folder ) / IncrementalCache.INPUTS_NAME
+
+        if inputs_hash is None:
+            path.unlink( missing_ok=True )
+            return
+
+        files = sorted( file.name for file in Path( gen_output_folder ).iterdir() if not file.name.startswith(".") )
+        FileWriter.write_if_changed( str(path), json.dumps( { "hash": inputs_hash, "files": files }, indent=1 ) )
+
+
+
+    @staticmethod
+    @functools.lru_cache( maxsize=None )
+    def generator_fingerprint() -> str:
+        """
+        Hash of the generator source code, so that generated files are
+        regenerated whenever the generator itself changes.
+        """
+
+        sha = hashlib.sha256()
+
+        for path in sorted( Path( __file__ ).parent.glob( "*.py" ) ):
+            sha.update( path.name.encode() )
+            sha.update( path.read_bytes() )
+
+        return sha.hexdigest()
+
+
+
+    def __load_manifest( self ) -> typing.Dict[str, dict]:
+
+        if not self.__manifest_path.is_file():
+            return {}
+
+        try:
+            with open( self.__manifest_path, "r" ) as f:
+                return json.load( f )["structs"]
+        except ( ValueError, KeyError ):
+            return {} # corrupt manifest, regenerate everything
+
+
+
+    def __compute_types_hash( self ) -> str:
+
+        sha = hashlib.sha256( self.__salt.encode() )
+
+        for name, entry in sorted( self.__name_to_entry.items() ):
+            if "struct" != entry.get( "type" ):
+                sha.update( f'|{name}={self.__entry_digest( name )}'.encode() )
+
+        return sha.hexdigest()
+
+
+
+    def __struct_hash( self, struct_name: str, salt: str ) -> str:
+
+        sha = hashlib.sha256( salt.encode() )
+
+        for name in sorted( self.__dependencies( struct_name ) ):
+            sha.update( f'|{name}={self.__entry_digest( name )}'.encode() )
+
+        return sha.hexdigest()
+
+
+
+    def __entry_digest( self, name: str ) -> str:
+
+        if name not in self.__name_to_digest:
+            entry = self.__name_to_entry.get( name )
+            data  = json.dumps( entry, sort_keys=True, default=str ).encode()
+            self.__name_to_digest[name] = hashlib.sha256( data ).hexdigest()
+
+        return self.__name_to_digest[name]
+
+
+
+    def __dependencies( self, struct_name: str ) -> typing.Set[str]:
+        """
+        Returns the names of the struct itself and of all the types it
+        depends on, directly or through nested structs.
+        """
+
+        visited = set()
+        pending = [ struct_name ]
+
+        while pending:
+            name = pending.pop()
+            if name in visited:
+                continue
+
+            visited.add( name )
+
+            entry = self.__name_to_entry.get( name )
+            if entry is None or "struct" != entry.get( "type" ):
+                continue
+
+            for field in entry.get( "layout", [] ):
+                if "type" in field:
+                    pending.append( str( field["type"] ).split()[-1] )
+
+                if "header" in field:
+                    pending.append( field["header"] )
+
+        return visited
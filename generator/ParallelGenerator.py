@@ -0,0 +1,159 @@
+import typing
+
+from .CppClassDefinitionGenerator import CppClassDefinitionGenerator
+from .CppViewGenerator import CppViewGenerator
+from .CppClassDeclarationGenerator import CppClassDeclarationGenerator
+from .YamlFieldChecker import YamlFieldCheckResult
+from .CppTypesGenerator import CppTypesGenerator
+from .Profiler import Profiler
+
+
+
+class ParallelGenerator():
+    """
+    Generates the class declarations (*.h), class definitions (*.cpp) and
+    views (*View.h) of structs. Each struct is generated independently of
+    the others, once the enum/alias types and the class declarations they
+    depend on are known.
+
+    'declare_struct()' and 'define_struct()' generate a single struct, while
+    'declare()' and 'define()' run them for many structs on a process pool.
+    Workers write the generated files themselves, as soon as they are ready.
+    Results are returned in the same order as the structs were given.
+    """
+
+    def __init__( self, jobs: int, types_generator: CppTypesGenerator, gen_output_folder: str, generate_print_methods: bool = False, fast_build: bool = False, arena: bool = False, variant: bool = False ) -> None:
+        self.__jobs                   = jobs
+        self.__types_generator        = types_generator
+        self.__gen_output_folder      = gen_output_folder
+        self.__generate_print_methods = generate_print_methods
+        self.__fast_build             = fast_build
+        self.__arena                  = arena
+        self.__variant                = variant
+
+
+
+    def declare( self, elems: typing.List[dict], write: typing.List[bool], class_names: typing.Optional[typing.Iterable[str]] = None ) -> typing.Iterator[ typing.Tuple[YamlFieldCheckResult, str, CppClassDeclarationGenerator] ]:
+        """
+        Runs 'declare_struct()' for all struct 'elems'. The header of 'elems[i]'
+        is only written if 'write[i]' is true. 'class_names' are the names of
+        all structs the 'elems' may refer to (default: the names of 'elems').
+        Note that the returned declarations have to be bound to the types and
+        class declarations of this process by calling 'bind()' on them.
+        """
+
+        import concurrent.futures # not imported at module level, since it is slow to import and not needed with '--jobs 1'
+
+        # only the names of the classes are needed when declaring a class
+        class_names = { name: None for name in ( class_names if class_names is not None else ( elem["name"] for elem in elems ) ) }
+        initargs    = ( self.__types_generator, class_names, self.__gen_output_folder, self.__generate_print_methods, self.__fast_build, self.__arena, self.__variant )
+
+        with concurrent.futures.ProcessPoolExecutor( self.__jobs, initializer=_init_worker, initargs=initargs ) as pool:
+            yield from pool.map( _declare_struct, elems, write, chunksize=self.__chunksize( len(elems) ) )
+
+
+
+    def define( self, class_decls: typing.Dict[str, CppClassDeclarationGenerator], class_names: typing.List[str] ) -> typing.Iterator[str]:
+        """
+        Runs 'define_struct()' for the declarations in 'class_decls' named in 'class_names'.
+        """
+
+        import concurrent.futures
+
+        initargs = ( self.__types_generator, class_decls, self.__gen_output_folder, self.__generate_print_methods, self.__fast_build, self.__arena, self.__variant )
+
+        with concurrent.futures.ProcessPoolExecutor( self.__jobs, initializer=_init_worker, initargs=initargs ) as pool:
+            yield from pool.map( _define_struct, class_names, chunksize=self.__chunksize( len(class_names) ) )
+
+
+
+    @staticmethod
+    def declare_struct( elem:                   dict,
+                        types_generator:        CppTypesGenerator,
+                        class_decls:            dict,
+                        gen_output_folder:      str,
+                        generate_print_methods: bool = False,
+                        fast_build:             bool = False,
+                        arena:                  bool = False,
+                        variant:                bool = False,
+                        write:                  bool = True,
+                        profiler:               Profiler = Profiler.disabled()
+                        ) -> typing.Tuple[YamlFieldCheckResult, str, CppClassDeclarationGenerator]:
+        """
+        Generates the class declaration of struct 'elem' and writes it to
+        '{gen_output_folder}/{name}.h' if 'write' is true. The class
+        definition is generated with the same 'fast_build', 'arena' and
+        'variant' settings.
+        """
+
+        comments           = elem['comments'] if "comments" in elem else ""
+        class_name         = elem['name']
+        class_dec_gen      = CppClassDeclarationGenerator()
+
+        with profiler.struct( "declarations", class_name ):
+            result, result_str = class_dec_gen.init(class_name, elem['layout'], types_generator, class_decls, comments, generate_print_methods, fast_build, arena, variant)
+
+        if result != YamlFieldCheckResult.OK:
+            return result, result_str, None
+
+        if write:
+            with profiler.measure( "write_file" ):
+                class_dec_gen.write_file( gen_output_folder+f'/{class_name}.h' )
+
+        return result, result_str, class_dec_gen
+
+
+
+    @staticmethod
+    def define_struct( class_decl:             CppClassDeclarationGenerator,
+                       class_decls:            typing.Dict[str, CppClassDeclarationGenerator],
+                       types_generator:        CppTypesGenerator,
+                       gen_output_folder:      str,
+                       generate_print_methods: bool = False,
+                       profiler:               Profiler = Profiler.disabled() ) -> str:
+        """
+        Generates the class definition of 'class_decl' and writes it to
+        '{gen_output_folder}/{class_name}.cpp', and its read-only view to
+        '{gen_output_folder}/{class_name}View.h'.
+        """
+
+        class_def_gen = CppClassDefinitionGenerator()
+
+        with profiler.struct( "definitions", class_decl.class_name ):
+            class_def_gen.init( class_decl, class_decls, types_generator, generate_print_methods )
+            view_gen = CppViewGenerator( class_decl, class_decls, types_generator, class_def_gen.min_sizes )
+
+        with profiler.measure( "write_file" ):
+            class_def_gen.write_file( gen_output_folder+f'/{class_decl.class_name}.cpp' )
+            view_gen.write_file( gen_output_folder+f'/{view_gen.view_name}.h' )
+
+        return class_decl.class_name
+
+
+
+    def __chunksize( self, count: int ) -> int:
+        return max( 1, count // (self.__jobs*4) )
+
+
+
+# State shared by all tasks of a worker process, set once per worker by '_init_worker()'
+_worker : dict = {}
+
+
+def _init_worker( types_generator, class_decls, gen_output_folder, generate_print_methods, fast_build, arena, variant ):
+    _worker["types_generator"]        = types_generator
+    _worker["class_decls"]            = class_decls
+    _worker["gen_output_folder"]      = gen_output_folder
+    _worker["generate_print_methods"] = generate_print_methods
+    _worker["fast_build"]             = fast_build
+    _worker["arena"]                  = arena
+    _worker["variant"]                = variant
+
+
+def _declare_struct( elem: dict, write: bool ):
+    return ParallelGenerator.declare_struct( elem, _worker["types_generator"], _worker["class_decls"], _worker["gen_output_folder"], _worker["generate_print_methods"], _worker["fast_build"], _worker["arena"], _worker["variant"], write )
+
+
+def _define_struct( class_name: str ):
+    class_decls = _worker["class_decls"]
+    return ParallelGenerator.define_struct( class_decls[class_name], class_decls, _worker["types_generator"], _worker["gen_output_folder"], _worker["generate_print_methods"] )
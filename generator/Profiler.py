@@ -0,0 +1,206 @@
+import json
+import time
+import typing
+import functools
+import contextlib
+import tracemalloc
+from dataclasses import dataclass, asdict
+
+
+
+@dataclass
+class ProfileEntry:
+    name        : str
+    seconds     : float = 0.0
+    peak_bytes  : int   = 0   # peak of memory allocated by python (tracemalloc) while running
+    calls       : int   = 0   # only counted for accumulated entries
+    phase       : str   = ""  # for struct entries, the phase the struct was generated in
+
+
+
+class Profiler():
+    """
+    Records the wall time and peak memory of the generator phases (yaml loading,
+    declarations, definitions, etc.) and of each struct within a phase.
+
+    Phases and structs are recorded by wrapping code in 'phase()' and 'struct()'.
+    Time spent in often called functions can be accumulated with 'measure()'
+    or 'instrument()'. A disabled profiler records nothing, so that code can
+    be profiled unconditionally:
+
+        ----------------------------------------------
+        with profiler.phase( "declarations" ):
+            for elem in structs:
+                with profiler.struct( "declarations", elem["name"] ):
+                    ...
+        ----------------------------------------------
+
+    Note that peak memory is measured with 'tracemalloc', which slows down the
+    generator, so the recorded times are only meaningful relative to each other.
+    """
+
+    def __init__( self, enabled: bool = True ) -> None:
+        self.enabled = enabled
+
+        self.__phases   : typing.List[ProfileEntry]      = []
+        self.__structs  : typing.List[ProfileEntry]      = []
+        self.__counters : typing.Dict[str, ProfileEntry] = {}
+
+        self.__peak_stack : typing.List[int] = [] # peak memory of the enclosing scopes, before the inner scope reset the peak
+        self.__start      = time.perf_counter()
+
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+    @staticmethod
+    def disabled() -> "Profiler":
+        return _disabled_profiler
+
+
+    @contextlib.contextmanager
+    def phase( self, name: str ):
+        if not self.enabled:
+            yield
+            return
+
+        entry = ProfileEntry( name )
+        self.__phases.append( entry )
+
+        with self.__scope( entry ):
+            yield
+
+
+    @contextlib.contextmanager
+    def struct( self, phase: str, name: str ):
+        if not self.enabled:
+            yield
+            return
+
+        entry = ProfileEntry( name, phase=phase )
+        self.__structs.append( entry )
+
+        with self.__scope( entry ):
+            yield
+
+
+    @contextlib.contextmanager
+    def measure( self, name: str ):
+        """
+        Accumulates the time spent in the wrapped code over all calls.
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        entry = self.__counters.setdefault( name, ProfileEntry( name ) )
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            entry.seconds += time.perf_counter() - start
+            entry.calls   += 1
+
+
+    @contextlib.contextmanager
+    def instrument( self, cls: type, name: str ):
+        """
+        Accumulates the time spent in all static methods of 'cls' under 'name'.
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        originals = { attr: value for attr, value in vars(cls).items() if isinstance( value, staticmethod ) }
+
+        for attr, method in originals.items():
+            setattr( cls, attr, staticmethod( self.__measured( method.__func__, name ) ) )
+
+        try:
+            yield
+        finally:
+            for attr, method in originals.items():
+                setattr( cls, attr, method )
+
+
+    def report( self, top_n: int = 10 ) -> str:
+        total  = time.perf_counter() - self.__start
+        output = "\nProfile:\n\n"
+        output += f'\t{"phase":<30} {"time [ms]":>12} {"peak mem [KiB]":>16}\n'
+
+        for entry in self.__phases:
+            output += f'\t{entry.name:<30} {entry.seconds*1e3:>12.1f} {entry.peak_bytes/1024:>16.0f}\n'
+
+        output += f'\t{"total":<30} {total*1e3:>12.1f}\n'
+
+        if self.__counters:
+            output += "\n"
+            output += f'\t{"accumulated":<30} {"time [ms]":>12} {"calls":>16}\n'
+            for entry in self.__counters.values():
+                output += f'\t{entry.name:<30} {entry.seconds*1e3:>12.1f} {entry.calls:>16}\n'
+
+        if self.__structs:
+            slowest = sorted( self.__structs, key=lambda entry: entry.seconds, reverse=True )[:top_n]
+
+            width   = max( len(entry.name) for entry in slowest )
+
+            output += f'\nTop {len(slowest)} slowest structs:\n\n'
+            output += f'\t{"struct":<{width}} {"phase":<16} {"time [ms]":>12} {"peak mem [KiB]":>16}\n'
+            for entry in slowest:
+                output += f'\t{entry.name:<{width}} {entry.phase:<16} {entry.seconds*1e3:>12.2f} {entry.peak_bytes/1024:>16.0f}\n'
+
+        return output
+
+
+    def write_json( self, file_path: str ) -> None:
+        report = {
+            "total_seconds" : time.perf_counter() - self.__start,
+            "phases"        : [ asdict(entry) for entry in self.__phases ],
+            "accumulated"   : [ asdict(entry) for entry in self.__counters.values() ],
+            "structs"       : [ asdict(entry) for entry in self.__structs ],
+        }
+
+        with open( file_path, "w" ) as f:
+            json.dump( report, f, indent=1 )
+
+
+    @contextlib.contextmanager
+    def __scope( self, entry: ProfileEntry ):
+        # tracemalloc only has a single peak, so the peak of each enclosing scope
+        # is saved on a stack before the peak is reset for the inner scope
+        if self.__peak_stack:
+            self.__peak_stack[-1] = max( self.__peak_stack[-1], tracemalloc.get_traced_memory()[1] )
+
+        self.__peak_stack.append( 0 )
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            peak = max( self.__peak_stack.pop(), tracemalloc.get_traced_memory()[1] )
+
+            entry.seconds   += time.perf_counter() - start
+            entry.peak_bytes = max( entry.peak_bytes, peak )
+
+            if self.__peak_stack:
+                self.__peak_stack[-1] = max( self.__peak_stack[-1], peak )
+
+            tracemalloc.reset_peak()
+
+
+    def __measured( self, func: typing.Callable, name: str ) -> typing.Callable:
+
+        @functools.wraps( func )
+        def wrapper( *args, **kwargs ):
+            with self.measure( name ):
+                return func( *args, **kwargs )
+
+        return wrapper
+
+
+
+_disabled_profiler = Profiler( enabled=False )
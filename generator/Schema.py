@@ -0,0 +1,161 @@
+import typing
+
+
+
+class FrozenDef():
+    """
+    Base class of the schema definitions below. Definitions store their
+    attributes in '__slots__' instead of a '__dict__' and are read-only once
+    created, so that a single definition can be shared by all generators
+    (and sent to worker processes) without being copied or modified:
+
+        ---------------------------------------------------------
+        field = FieldDef( name="amount", type="Amount" )
+        field.type            # 'Amount'
+        field.type = "uint8"  # raises AttributeError
+        ---------------------------------------------------------
+    """
+
+    __slots__ = ()
+
+    def __init__( self, **attributes ) -> None:
+        for name in self.__slots__:
+            object.__setattr__( self, name, attributes[name] )
+
+
+    def __setattr__( self, name: str, value: typing.Any ) -> None:
+        raise AttributeError( f"'{type(self).__name__}' is read-only, can't set '{name}'" )
+
+
+    def __delattr__( self, name: str ) -> None:
+        raise AttributeError( f"'{type(self).__name__}' is read-only, can't delete '{name}'" )
+
+
+    def __getstate__( self ) -> tuple:
+        return tuple( getattr( self, name ) for name in self.__slots__ )
+
+
+    def __setstate__( self, state: tuple ) -> None:
+        for name, value in zip( self.__slots__, state ):
+            object.__setattr__( self, name, value )
+
+
+    def __repr__( self ) -> str:
+        attributes = ", ".join( f'{name}={getattr( self, name )!r}' for name in self.__slots__ )
+        return f'{type(self).__name__}( {attributes} )'
+
+
+
+class EnumValueDef( FrozenDef ):
+    """
+    A value of an enum, e.g. '- name: TRANSFER, value: 16724'. 'comments'
+    is None if the value has no comments.
+    """
+
+    __slots__ = ( "name", "value", "comments" )
+
+    def __init__( self, name: str, value: int, comments: str = None ) -> None:
+        super().__init__( name=name, value=value, comments=comments )
+
+
+
+class EnumDef( FrozenDef ):
+    """
+    An enum, e.g. 'type: enum uint16'. 'type' is the C++ type of the enum
+    ('uint16_t') and 'value_names' the set of the names of its 'values'.
+    'comments' is None if the enum has no comments.
+    """
+
+    __slots__ = ( "name", "type", "values", "value_names", "comments" )
+
+    def __init__( self, name: str, type: str, values: typing.Iterable[EnumValueDef] = (), comments: str = None ) -> None:
+        values = tuple( values )
+        super().__init__( name=name, type=type, values=values, value_names=frozenset( value.name for value in values ), comments=comments )
+
+
+
+class AliasDef( FrozenDef ): # aka type alias
+    """
+    An alias type, e.g. 'type: alias uint64' or 'type: alias array uint8'.
+    If 'array' is true the alias is a struct with an array of 'size'
+    elements of type 'type'. 'hint' tells how the alias should be printed
+    by the Print() method (hex, ascii, etc). 'comments' is None if the
+    alias has no comments.
+    """
+
+    __slots__ = ( "name", "type", "size", "hint", "comments", "array" )
+
+    def __init__( self, name: str, type: str, size: int = 1, hint: str = "", comments: str = None, array: bool = False ) -> None:
+        super().__init__( name=name, type=type, size=size, hint=hint, comments=comments, array=array )
+
+
+
+class FieldDef( FrozenDef ):
+    """
+    A field of a struct. 'type' is the C++ type of the field (e.g. 'uint8_t'
+    for 'type: array uint8') and 'disposition' what kind of field it is
+    ('', 'const', 'inline', 'reserved', 'array', 'array_sized', 'array_fill'
+    or 'struct_type'). Keys missing in the .yaml file are None, except for
+    the optional keys with a default value.
+    """
+
+    __slots__ = ( "name", "type", "disposition", "comments", "size", "value",
+                  "condition", "condition_operation", "condition_value",
+                  "header", "type_field", "version_field", "header_type_field", "header_version_field",
+                  "align", "print_hint" )
+
+    def __init__( self,
+                  name:                 str = "",
+                  type:                 str = None,
+                  disposition:          str = "",
+                  comments:             str = "",
+                  size:                 typing.Any = None,
+                  value:                typing.Any = None,
+                  condition:            str = None,
+                  condition_operation:  str = None,
+                  condition_value:      typing.Any = None,
+                  header:               str = None,
+                  type_field:           str = None,
+                  version_field:        str = "",
+                  header_type_field:    str = None,
+                  header_version_field: str = "",
+                  align:                typing.Any = "",
+                  print_hint:           str = "" ) -> None:
+
+        super().__init__( name=name, type=type, disposition=disposition, comments=comments, size=size, value=value,
+                          condition=condition, condition_operation=condition_operation, condition_value=condition_value,
+                          header=header, type_field=type_field, version_field=version_field,
+                          header_type_field=header_type_field, header_version_field=header_version_field,
+                          align=align, print_hint=print_hint )
+
+
+
+class StructDef( FrozenDef ):
+    """
+    A struct and its fields. 'member_vars' maps the name of each named field
+    to its index and type, and must not be modified. The 'group_*' and
+    'header_*' attributes are set by the 'struct_type' field of a struct
+    belonging to an enum group (e.g. a transaction), and are empty otherwise.
+    """
+
+    __slots__ = ( "name", "comments", "fields", "member_vars",
+                  "group_type", "group_id", "group_version", "group_header",
+                  "header_type_field", "header_version_field" )
+
+    def __init__( self,
+                  name:                 str,
+                  fields:               typing.Iterable[FieldDef],
+                  comments:             str = "",
+                  group_type:           str = "",
+                  group_id:             str = "",
+                  group_version:        str = "",
+                  group_header:         str = "",
+                  header_type_field:    str = "",
+                  header_version_field: str = "" ) -> None:
+
+        fields      = tuple( fields )
+        member_vars = { field.name: ( idx, field.type ) for idx, field in enumerate(fields) if field.name }
+
+        super().__init__( name=name, comments=comments, fields=fields, member_vars=member_vars,
+                          group_type=group_type, group_id=group_id, group_version=group_version, group_header=group_header,
+                          header_type_field=header_type_field, header_version_field=header_version_field )
@@ -0,0 +1,155 @@
+import typing
+
+from .Schema            import EnumValueDef, EnumDef, AliasDef, FieldDef, StructDef
+from .YamlFieldChecker  import YamlFieldChecker, YamlFieldCheckResult
+from .CppFieldGenerator import CppFieldGenerator, TypeConverter
+from .CppTypesGenerator import CppTypesGenerator
+
+
+
+class SchemaBuilder():
+    """
+    Converts the enums, aliases and structs of the .yaml input to the
+    read-only definitions in 'Schema.py', which are then shared by all
+    generators. Structs are validated while they are built, so that the
+    generators don't have to check the input again. The .yaml input is not
+    modified.
+
+        ---------------------------------------------------------
+        enum_def                   = SchemaBuilder.enum( elem )
+        alias_def                  = SchemaBuilder.alias( elem )
+        result, result_str, struct = SchemaBuilder.struct( elem["name"], elem["layout"], user_types, class_names )
+        ---------------------------------------------------------
+    """
+
+    @staticmethod
+    def enum( enum: dict ) -> EnumDef:
+        values = [ EnumValueDef( value["name"], value["value"], value["comments"] if "comments" in value else None ) for value in enum["values"] ]
+
+        return EnumDef( enum["name"], TypeConverter.convert( enum["type"].split()[1] ), values, enum["comments"] if "comments" in enum else None )
+
+
+    @staticmethod
+    def alias( alias: dict ) -> AliasDef:
+        alias_types = alias["type"].split()
+        comments    = alias["comments"] if "comments" in alias else None
+
+        if alias_types[1] != "array":
+            return AliasDef( alias["name"], TypeConverter.convert( alias_types[1] ), 1, comments=comments )
+
+        print_hint = alias["print"] if "print" in alias else ""
+        return AliasDef( alias["name"], TypeConverter.convert( alias_types[2] ), alias["size"], print_hint, comments, array=True )
+
+
+    @staticmethod
+    def field( field: dict ) -> FieldDef:
+        """
+        Converts a field of a struct layout. The type of the field is split in
+        its disposition and C++ type, e.g. 'array uint8' -> 'array', 'uint8_t'.
+        """
+
+        field_type  = None
+        disposition = field["disposition"] if "disposition" in field else ""
+
+        if "type" in field:
+            types = field["type"].split()
+
+            if len(types) > 1:
+                disposition = types[0]
+                field_type  = TypeConverter.convert(types[1])
+            else:
+                field_type  = TypeConverter.convert(types[0])
+
+        return FieldDef( **{ key: field[key] for key in FieldDef.__slots__ if key in field and key not in ( "type", "disposition", "print_hint" ) },
+                         type        = field_type,
+                         disposition = disposition,
+                         print_hint  = field["print"] if "print" in field else "" )
+
+
+    @staticmethod
+    def struct( class_name:  str,
+                layout:      typing.List[dict],
+                user_types:  CppTypesGenerator,
+                class_names: typing.Container[str],
+                comments:    str = ""
+                ) -> typing.Tuple[YamlFieldCheckResult, str, typing.Optional[StructDef]]:
+        """
+        Converts and checks the fields of struct 'class_name'. 'class_names'
+        are the names of all structs, which fields may refer to.
+
+        returns : (YamlFieldCheckResult.OK, "", StructDef) if all fields are
+            valid, otherwise the result of the first failing check, an error
+            message and None.
+        """
+
+        fields      : typing.List[FieldDef]                    = []
+        member_vars : typing.Dict[str, typing.Tuple[int, str]] = {}
+        group       : typing.Dict[str, str]                    = {} # set by the 'struct_type' field
+
+        for idx, raw_field in enumerate(layout):
+            field = SchemaBuilder.field( raw_field )
+
+            result, result_str = YamlFieldChecker.check_type(class_name, field)
+            if result != YamlFieldCheckResult.OK:
+                return result, result_str, None
+
+            field_type = field.type
+
+            if field_type not in CppFieldGenerator.builtin_types and \
+               field_type not in user_types.name_to_enum and \
+               field_type not in user_types.name_to_alias and \
+               field_type not in class_names and \
+               field_type != "varint":
+                return YamlFieldCheckResult.TYPE_UNKNOWN, f"\n\nError: Type '{field_type}' in struct '{class_name}' not defined or incomplete!\n\n", None
+
+            name = field.name
+
+            # check if name already declared
+            if name in member_vars:
+                return YamlFieldCheckResult.NAME_REDEFINED, f"\n\nError: Same field name '{name}' declared multiple times in struct '{class_name}'!\n\n", None
+            elif name: # save as member var
+                member_vars[name] = (idx, field_type)
+
+            disposition = field.disposition
+
+            if "const" == disposition:
+                result, result_str = YamlFieldChecker.const( class_name, field, user_types.name_to_enum )
+
+            elif "struct_type" == disposition:
+                group["group_type"]           = field_type
+                group["group_id"]             = field.value.split()[0]
+                group["group_version"]        = field.value.split()[1][1:]
+                group["group_header"]         = field.header
+                group["header_type_field"]    = field.type_field
+                group["header_version_field"] = field.version_field
+
+            elif "inline" == disposition:
+                result, result_str = YamlFieldChecker.inline( class_name, field, class_names )
+
+            elif "reserved" == disposition:
+                result, result_str = YamlFieldChecker.reserved( class_name, field )
+
+            elif "array" == disposition:
+                result, result_str = YamlFieldChecker.array( class_name, field, idx, member_vars )
+
+            elif "array_sized" == disposition:
+                result, result_str = YamlFieldChecker.array_sized( class_name, field ) # checked again by 'YamlDependencyChecker' when all structs are declared
+
+            elif "array_fill" == disposition:
+                result, result_str = YamlFieldChecker.array_fill( class_name, field, class_names )
+
+            elif disposition:
+                return YamlFieldCheckResult.DISPOSITION_INVALID, f"\n\nERROR: Invalid disposition '{disposition}' in struct '{class_name}'!\n\n", None
+
+            elif not name:
+                return YamlFieldCheckResult.NAME_MISSING, f"\n\nError: Missing 'name' key for field in struct '{class_name}'!\n\n", None
+
+            elif field.condition is not None: # check that condition variable is a class member variable
+                result, result_str = YamlFieldChecker.condition( class_name, field, member_vars, user_types )
+
+            if YamlFieldCheckResult.OK != result:
+                return result, result_str, None
+
+            fields.append( field )
+
+        return YamlFieldCheckResult.OK, "", StructDef( class_name, fields, comments, **group )
@@ -0,0 +1,112 @@
+import os
+import pickle
+import typing
+from pathlib import Path
+
+from .IncrementalCache import IncrementalCache
+
+
+
+class SchemaCache():
+    """
+    Caches the parsed input schema in the output folder, so that the
+    input does not have to be parsed again when it did not change.
+
+    The cache is keyed by a hash of the content of the input files and of
+    the generator source code, so it is invalidated automatically when
+    either of them changes. Only one schema is cached per output folder.
+
+    Usage:
+
+        ----------------------------------------------------------------
+        cache = SchemaCache( output_folder )
+        data  = cache.load_yaml( "symbol.yaml" )
+
+        # any other parser, e.g. catparser + 'ast_to_native()'
+        data  = cache.load( cats_files, lambda: ast_to_native( parse( cats_files ) ) )
+        ----------------------------------------------------------------
+
+    Note that the cache is a pickle file, so it must only be read from an
+    output folder that is as trusted as the generator itself.
+    """
+
+    CACHE_NAME = ".catbuffer_schema_cache.pickle"
+
+
+
+    def __init__( self, output_folder: str, enabled: bool = True ) -> None:
+        self.enabled    = enabled
+        self.hit        = False # true if the last 'load()' was served from the cache
+        self.__path     = Path( output_folder ) / SchemaCache.CACHE_NAME
+
+
+
+    def load_yaml( self, input_file_name: str ) -> typing.Any:
+        """
+        Returns the content of the .yaml file 'input_file_name', as returned by 'parse_yaml()'.
+        """
+
+        return self.load( [ input_file_name ], lambda: SchemaCache.parse_yaml( input_file_name ) )
+
+
+
+    def load( self, input_file_names: typing.List[str], parse: typing.Callable[[], typing.Any] ) -> typing.Any:
+        """
+        Returns the schema parsed from 'input_file_names' from the cache, or
+        calls 'parse()' and caches its result if the cache is out of date.
+        """
+
+        self.hit = False
+
+        if not self.enabled:
+            return parse()
+
+        key  = IncrementalCache.inputs_hash( input_file_names )
+        data = self.__read( key )
+
+        if data is not None:
+            self.hit = True
+            return data
+
+        data = parse()
+        self.__write( key, data )
+
+        return data
+
+
+
+    @staticmethod
+    def parse_yaml( input_file_name: str ) -> typing.Any:
+        """
+        Same as 'yaml.safe_load()', but uses the libyaml based loader if available.
+        """
+
+        import yaml # only imported when parsing, which is not needed if the schema is cached
+
+        loader = getattr( yaml, "CSafeLoader", yaml.SafeLoader )
+
+        with open( input_file_name, 'r' ) as stream:
+            return yaml.load( stream, Loader=loader )
+
+
+
+    def __read( self, key: str ) -> typing.Any:
+
+        try:
+            with open( self.__path, "rb" ) as f:
+                cached_key, data = pickle.load( f )
+        except Exception:
+            return None # no, corrupt or incompatible cache, parse again
+
+        return data if cached_key == key else None
+
+
+
+    def __write( self, key: str, data: typing.Any ) -> None:
+
+        tmp_path = str( self.__path ) + ".tmp"
+
+        with open( tmp_path, "wb" ) as f:
+            pickle.dump( ( key, data ), f, protocol=pickle.HIGHEST_PROTOCOL )
+
+        os.replace( tmp_path, self.__path )
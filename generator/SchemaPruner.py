@@ -0,0 +1,111 @@
+import typing
+
+from .SchemaBuilder import SchemaBuilder
+
+
+
+class SchemaPruner():
+    """
+    Removes the types of a schema which are not needed by a set of root
+    types ('--roots'), so that only the structs, enums and aliases that are
+    actually used are generated. A root is the name of a struct, enum or
+    alias, or the name of an enum group (e.g. 'TransactionType'), which
+    stands for all structs of the group:
+
+        ---------------------------------------------------------
+        input_data = SchemaPruner.prune( input_data, [ "TransactionType", "BlockHeader" ] )
+        ---------------------------------------------------------
+
+    A type is needed if it is reachable from a root through:
+
+        - the type of a field (inline, array, array_fill, const, etc.)
+        - the header of a 'struct_type' field and its group enum
+        - the header of an 'array_sized' field, and all structs of the group
+          of the header's type field, since any of them can be created by
+          the converters while deserializing the array
+
+    The entries of the schema are returned in their original order and are
+    not modified.
+    """
+
+    @staticmethod
+    def prune( input_data: list, roots: typing.Iterable[str] ) -> list:
+
+        name_to_elem = { elem["name"]: elem for elem in input_data if "name" in elem }
+        groups       = SchemaPruner.groups( input_data )
+
+        pending : typing.List[str] = []
+        needed  : typing.Set[str]  = set()
+
+        def need( name: str ):
+            if name in name_to_elem and name not in needed:
+                needed.add( name )
+                pending.append( name )
+
+        for root in roots:
+            if root not in name_to_elem:
+                print(f"Error: Root type '{root}' not defined!\n")
+                exit(1)
+
+            need( root )
+            for struct_name in groups.get( root, [] ):
+                need( struct_name )
+
+        while pending:
+            elem = name_to_elem[ pending.pop() ]
+
+            if 'struct' != elem['type']:
+                continue
+
+            for raw_field in elem['layout']:
+                field = SchemaBuilder.field( raw_field )
+                need( field.type )
+
+                if "struct_type" == field.disposition and field.header:
+                    need( field.header )
+
+                elif "array_sized" == field.disposition:
+                    group_type = SchemaPruner.__field_type( name_to_elem.get( field.type ), field.header_type_field )
+
+                    need( group_type )
+                    for struct_name in groups.get( group_type, [] ):
+                        need( struct_name )
+
+        return [ elem for elem in input_data if elem.get("name") in needed ]
+
+
+
+    @staticmethod
+    def groups( input_data: list ) -> typing.Dict[str, typing.List[str]]:
+        """
+        Returns the names of the structs of each enum group, i.e. of the
+        structs with a 'struct_type' field of the enum.
+        """
+
+        groups : typing.Dict[str, typing.List[str]] = {}
+
+        for elem in input_data:
+            if 'struct' != elem['type']:
+                continue
+
+            for raw_field in elem['layout']:
+                field = SchemaBuilder.field( raw_field )
+
+                if "struct_type" == field.disposition:
+                    groups.setdefault( field.type, [] ).append( elem['name'] )
+
+        return groups
+
+
+
+    @staticmethod
+    def __field_type( struct_elem: typing.Optional[dict], field_name: str ) -> typing.Optional[str]:
+
+        if struct_elem is None or 'struct' != struct_elem['type']:
+            return None # reported by 'YamlDependencyChecker'
+
+        for raw_field in struct_elem['layout']:
+            if raw_field.get("name") == field_name:
+                return SchemaBuilder.field( raw_field ).type
+
+        return None
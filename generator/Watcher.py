@@ -0,0 +1,121 @@
+import os
+import time
+import typing
+
+
+
+class WarmState():
+    """
+    State of the generator kept in memory between runs of 'generate()' in
+    watch mode. Enum/alias types and struct declarations whose inputs did
+    not change since the previous run (see 'IncrementalCache') are reused
+    instead of being generated again.
+    """
+
+    def __init__( self ) -> None:
+        self.types_hash      : str                          = ""
+        self.types_generator : "CppTypesGenerator"          = None
+        self.decls           : typing.Dict[str, tuple]      = {}  # struct name -> (struct hash, CppClassDeclarationGenerator)
+
+
+
+class Watcher():
+    """
+    Polls files for changes and runs a function whenever one of them
+    changed, reporting how long each run took:
+
+        ------------------------------------------------------------
+        Watcher( ["symbol.yaml"] ).run( regenerate )
+        ------------------------------------------------------------
+
+    'regenerate()' returns a short summary of what it did, which is printed
+    with the latency of the run. If it fails (raises an exception or calls
+    'exit()'), the error is reported and the files are watched again, so
+    that a typo in a watched file does not stop the watcher.
+    """
+
+    def __init__( self, file_names: typing.List[str], poll_interval: float = 0.5 ) -> None:
+        self.__file_names    = file_names
+        self.__poll_interval = poll_interval
+        self.__signatures    = self.__current_signatures()
+
+
+
+    def changed( self ) -> bool:
+        """
+        Returns true if any of the watched files was modified since the last
+        call (or since the watcher was created).
+        """
+
+        signatures = self.__current_signatures()
+        if signatures == self.__signatures:
+            return False
+
+        self.__signatures = signatures
+        return True
+
+
+
+    def run( self, regenerate: typing.Callable[[], str], max_runs: typing.Optional[int] = None ) -> None:
+        """
+        Runs 'regenerate()' once, then again every time a watched file changed,
+        until interrupted with Ctrl-C (or until 'max_runs' runs were done).
+        """
+
+        runs = 0
+
+        try:
+            self.__run_once( regenerate, None )
+            runs += 1
+
+            print( f'\nWatching {", ".join(self.__file_names)} for changes (Ctrl-C to stop)...' )
+
+            while max_runs is None or runs < max_runs:
+                time.sleep( self.__poll_interval )
+
+                if self.changed():
+                    self.__run_once( regenerate, self.__latest_mtime() )
+                    runs += 1
+
+        except KeyboardInterrupt:
+            print( "\nStopped watching." )
+
+
+
+    def __run_once( self, regenerate: typing.Callable[[], str], modified_time: typing.Optional[float] ) -> None:
+
+        start = time.perf_counter()
+
+        try:
+            summary = regenerate()
+        except SystemExit:
+            print( f'[{time.strftime("%H:%M:%S")}] Generation failed, waiting for changes...' ) # the error was printed before exiting
+            return
+        except Exception as error:
+            print( f'[{time.strftime("%H:%M:%S")}] Generation failed: {error}\nWaiting for changes...' )
+            return
+
+        elapsed_ms = ( time.perf_counter() - start ) * 1e3
+        detected   = f', change detected after {( time.time() - modified_time )*1e3 - elapsed_ms:.0f} ms' if modified_time is not None else ""
+
+        print( f'[{time.strftime("%H:%M:%S")}] {summary} in {elapsed_ms:.0f} ms{detected}' )
+
+
+
+    def __current_signatures( self ) -> typing.List[tuple]:
+
+        signatures = []
+
+        for file_name in self.__file_names:
+            try:
+                stat = os.stat( file_name )
+                signatures.append( ( stat.st_mtime_ns, stat.st_size ) )
+            except OSError:
+                signatures.append( None ) # deleted, or being replaced by an editor
+
+        return signatures
+
+
+
+    def __latest_mtime( self ) -> float:
+        return max( ( signature[0] / 1e9 for signature in self.__signatures if signature is not None ), default=time.time() )
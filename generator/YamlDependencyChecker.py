@@ -1,6 +1,8 @@
 import typing
 from enum import Enum, auto
 
+from .Schema import FieldDef
+
 
 class YamlDependencyCheckerResult(Enum):
     OK                                  = auto()  # Everything went well
@@ -11,17 +13,17 @@ class YamlDependencyCheckerResult(Enum):
 class YamlDependencyChecker():
        
     @staticmethod
-    def array_sized( class_name, field: dict, class_decl: dict ) -> typing.Tuple[ YamlDependencyCheckerResult, str ]:
+    def array_sized( class_name, field: FieldDef, class_decl: dict ) -> typing.Tuple[ YamlDependencyCheckerResult, str ]:
 
-        header = field["type"]
+        header = field.type
         if header not in class_decl:
-            return YamlDependencyCheckerResult.ARRAY_SIZED_HEADER_NOT_DECLARED, f"\n\nError: The header '{header}' in array_sized '{field['name']}' not declared (error detected for array_sized field '{field['name']}' in struct '{class_name}')!\n\n"
+            return YamlDependencyCheckerResult.ARRAY_SIZED_HEADER_NOT_DECLARED, f"\n\nError: The header '{header}' in array_sized '{field.name}' not declared (error detected for array_sized field '{field.name}' in struct '{class_name}')!\n\n"
 
         decl = class_decl[header]
 
-        header_field = field["header_type_field"]
-        if header_field not in decl.member_vars:
-            return YamlDependencyCheckerResult.ARRAY_SIZED_TYPE_FIELD_NOT_DECLARED, f"\n\nError: The field '{header_field}' in '{header}' not declared (error detected for array_sized field '{field['name']}' in struct '{class_name}')!\n\n"
+        header_field = field.header_type_field
+        if header_field not in decl.struct.member_vars:
+            return YamlDependencyCheckerResult.ARRAY_SIZED_TYPE_FIELD_NOT_DECLARED, f"\n\nError: The field '{header_field}' in '{header}' not declared (error detected for array_sized field '{field.name}' in struct '{class_name}')!\n\n"
 
         return YamlDependencyCheckerResult.OK, ""
 
@@ -1,87 +1,547 @@
 import typing
-import yaml
 import shutil
+import argparse
 from pathlib import Path
-import sys
-from distutils.dir_util import copy_tree
 
-from .CppClassDefinitionGenerator import CppClassDefinitionGenerator
-from .CppClassDeclarationGenerator import CppClassDeclarationGenerator 
-from .YamlFieldChecker import YamlFieldCheckResult
-from .CppTypesGenerator import CppTypesGenerator
-from .CppConvertersGenerator import CppConvertersGenerator
+from .IncrementalCache import IncrementalCache
+from .FileWriter import FileWriter
 
+# The code generators, the yaml parser and the profiler are imported by the
+# functions which use them, so that runs which do not generate any code
+# (e.g. '--incremental' with unchanged inputs) start as fast as possible.
 
-def generate( input_data: list, gen_output_folder: str, generate_print_methods: bool = False):
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent # folder containing 'generator', 'cpp_source' and 'cpp_build_files'
+
+# static sources copied by older versions of the generator, which are removed from existing output folders
+REMOVED_STATIC_FILES = [ "RawBuffer.cpp", "Varint.cpp" ] # now defined inline in their headers
+
+
+def generate( input_data:             list,
+              gen_output_folder:      str,
+              generate_print_methods: bool = False,
+              incremental:            bool = False,
+              jobs:                   int = 1,
+              profiler:               "Profiler" = None,
+              warm_state:             "WarmState" = None,
+              types_generator:        "CppTypesGenerator" = None,
+              fast_build:             bool = False,
+              amalgamate:             bool = False,
+              arena:                  bool = False,
+              variant:                bool = False ) -> typing.List[str]:
+    """
+    Generates the C++ code of 'input_data' into 'gen_output_folder' and returns
+    the names of the structs whose files were generated.
+
+    With a 'warm_state' (only used with 'incremental') the types and the
+    struct declarations whose inputs did not change since the previous call
+    with the same 'warm_state' are reused instead of generated again.
+
+    If 'types_generator' is given, it must hold the types of 'input_data' (see
+    'generate_types()'), e.g. when they are shared by the jobs of a batch.
+
+    With 'fast_build' the generated files only include the headers they need
+    (see '--fast-build').
+
+    With 'arena' the generated classes allocate from a caller-supplied
+    arena (see '--arena').
+
+    With 'variant' the elements of the 'array_sized' fields are stored in
+    place, in a 'std::variant' (see '--variant').
+
+    With 'amalgamate' the files are generated into a temporary folder, and
+    merged with the static sources into 'catbuffer.h' and 'catbuffer.cpp'
+    (see 'Amalgamator'). 'incremental' and 'warm_state' are then ignored.
+    """
+
+    if amalgamate:
+        import tempfile
+        from .Amalgamator import Amalgamator
+        from .Profiler import Profiler
+
+        with tempfile.TemporaryDirectory() as parts_folder:
+            class_names = generate( input_data, parts_folder, generate_print_methods, False, jobs, profiler, None, types_generator, fast_build, arena=arena, variant=variant )
+            files       = static_files( generate_print_methods, with_cmd=False )
+
+            if not arena:
+                del files["Arena.h"] # only included with '--arena', and would add <memory_resource> to 'catbuffer.h'
+
+            if not variant:
+                del files["Variant.h"] # only included with '--variant', and would add <variant> to 'catbuffer.h'
+
+            with ( profiler or Profiler.disabled() ).phase( "amalgamate" ):
+                Amalgamator.write_files( parts_folder, files, gen_output_folder )
+
+        return class_names
+
+    from .CppClassDeclarationGenerator import CppClassDeclarationGenerator
+    from .YamlFieldChecker import YamlFieldChecker, YamlFieldCheckResult
+    from .CppConvertersGenerator import CppConvertersGenerator
+    from .CppViewGenerator import CppViewGenerator
+    from .ParallelGenerator import ParallelGenerator
+    from .Profiler import Profiler
+
+    profiler = profiler if profiler is not None else Profiler.disabled()
+
+    # Hash inputs of each struct, so that only structs whose inputs changed
+    # since the last run are regenerated
+    cache = None
+    if incremental:
+        with profiler.phase( "incremental_hashing" ):
+            cache = IncrementalCache( input_data, gen_output_folder, generate_print_methods, fast_build, arena, variant )
+
+    if cache is None:
+        warm_state = None
+
+    class_decls : typing.Dict[str, CppClassDeclarationGenerator] = { elem['name']: CppClassDeclarationGenerator() for elem in input_data if 'struct' == elem['type'] }
+
+    with profiler.phase( "types" ):
+        if warm_state is not None and warm_state.types_hash == cache.types_hash():
+            print("Reusing enum and alias types")
+            types_generator = warm_state.types_generator
+        elif types_generator is not None:
+            print("Using shared enum and alias types")
+        else:
+            types_generator = generate_types( input_data )
+
+        with profiler.measure( "write_file" ):
+            types_generator.write_file(gen_output_folder+"/types.h")
+
+
+    # Generate class declarations (*.h)
+    print("\nGenerating class declarations:")
+    struct_elems = [ elem for elem in input_data if 'struct' == elem['type'] ]
+    up_to_date   : typing.Set[str] = set()
+
+    for elem in struct_elems:
+        file_names = [ f'{elem["name"]}.h', f'{elem["name"]}.cpp', f'{CppViewGenerator.view_name( elem["name"] )}.h' ]
+
+        if cache is not None:
+            if cache.is_up_to_date( elem['name'], file_names ):
+                up_to_date.add( elem['name'] )
+
+            cache.add( elem['name'], file_names )
+
+    # Declarations of structs with unchanged inputs are reused from the previous call
+    warm_decls : typing.Dict[str, CppClassDeclarationGenerator] = {}
+    if warm_state is not None:
+        warm_decls = { name: decl for name, (struct_hash, decl) in warm_state.decls.items() if name in class_decls and struct_hash == cache.struct_hash( name ) }
+
+    # Declarations are also needed for up to date structs, since other structs depend on them
+    declare_elems = [ elem for elem in struct_elems if elem['name'] not in warm_decls ]
+    write         = [ elem['name'] not in up_to_date for elem in declare_elems ]
+    pool          = ParallelGenerator( jobs, types_generator, gen_output_folder, generate_print_methods, fast_build, arena, variant ) if jobs > 1 else None
+
+    with profiler.phase( "declarations" ), profiler.instrument( YamlFieldChecker, "yaml_field_checks" ):
+        if pool is not None:
+            results = pool.declare( declare_elems, write, class_decls.keys() )
+        else:
+            results = ( ParallelGenerator.declare_struct( elem, types_generator, class_decls, gen_output_folder, generate_print_methods, fast_build, arena, variant, w, profiler ) for elem, w in zip(declare_elems, write) )
+
+        for elem, (result, result_str, class_dec_gen) in zip( declare_elems, results ):
+            print("\t"+elem["name"]+( "" if elem["name"] not in up_to_date else " (up to date)" ))
+
+            if result != YamlFieldCheckResult.OK:
+                print(result_str)
+                exit(1)
+
+            class_dec_gen.bind( types_generator, class_decls )
+            class_decls[elem['name']] = class_dec_gen
+
+        for name, class_dec_gen in warm_decls.items():
+            if name not in up_to_date:
+                class_dec_gen.write_file( gen_output_folder+f'/{name}.h' )
+
+            class_dec_gen.bind( types_generator, class_decls )
+            class_decls[name] = class_dec_gen
+
+
+    with profiler.phase( "dependency_checks" ):
+        for class_name, decl in class_decls.items():
+            if class_name not in warm_decls:
+                decl.check_dependency()
+
+    # Generate class definitions (*.cpp)
+    print("\nGenerating class definitions:")
+    class_names = [ elem['name'] for elem in struct_elems if elem['name'] not in up_to_date ]
+
+    with profiler.phase( "definitions" ):
+        if pool is not None:
+            defined = pool.define( class_decls, class_names )
+        else:
+            defined = ( ParallelGenerator.define_struct( class_decls[name], class_decls, types_generator, gen_output_folder, generate_print_methods, profiler ) for name in class_names )
+
+        for class_name in defined:
+            print("\t"+class_name)
+
+
+    # Generate enum to class converters
+    with profiler.phase( "converters" ):
+        converter = CppConvertersGenerator( class_decls, types_generator, generate_print_methods, arena, variant )
+
+        with profiler.measure( "write_file" ):
+            converter.write_file( gen_output_folder )
+
+    if cache is not None:
+        cache.save()
+
+    if warm_state is not None:
+        warm_state.types_hash      = cache.types_hash()
+        warm_state.types_generator = types_generator
+        warm_state.decls           = { name: ( cache.struct_hash( name ), decl ) for name, decl in class_decls.items() }
+
+    print("\nDone!")
+
+    return class_names
+
+
+
+
+
+
+def prune_schema( input_data: list, roots: typing.Optional[typing.Sequence[str]] ) -> list:
+    """
+    Returns the types of 'input_data' needed by the types 'roots' (see
+    'SchemaPruner'), or 'input_data' itself if no roots are given.
+    """
+
+    if not roots:
+        return input_data
+
+    from .SchemaPruner import SchemaPruner
+
+    return SchemaPruner.prune( input_data, roots )
+
+
+
+def generate_types( input_data: list ) -> "CppTypesGenerator":
+    """
+    Generates the enum and alias types of 'input_data'. The types only depend
+    on 'input_data', so they can be shared by all output folders generated
+    from the same schema.
+    """
+
+    from .CppTypesGenerator import CppTypesGenerator
+    from .SchemaBuilder import SchemaBuilder
 
     # Generate enum types
     print("Generating enum types:")
-    class_decls : typing.Dict[str, CppClassDeclarationGenerator] = {}
     types_generator = CppTypesGenerator()
     for elem in input_data:
         elem_type = elem['type'].split()
         if 'enum' == elem_type[0]: 
-            types_generator.add_enum_type( elem )
+            types_generator.add_enum_type( SchemaBuilder.enum( elem ) )
             print("\t"+elem["name"])
-        elif 'struct' == elem['type']:
-            class_decls[elem['name']] = CppClassDeclarationGenerator()
 
     # Generate alias types
     print("\nGenerating alias types:")
     for elem in input_data:
         elem_type = elem['type'].split()
         if 'alias' == elem_type[0]:
-            types_generator.add_alias_type( elem )
+            types_generator.add_alias_type( SchemaBuilder.alias( elem ) )
             print("\t"+elem["name"])
 
-    types_generator.write_file(gen_output_folder+"/types.h")
+    return types_generator
 
 
-    # Generate class declarations (*.h)
-    print("\nGenerating class declarations:")
-    for elem in input_data:
-        if 'struct'== elem['type']:
-            print("\t"+elem["name"])
 
-            # Generate class declaration
-            comments           = elem['comments'] if "comments" in elem else ""
-            class_name         = elem['name']
-            class_dec_gen      = class_decls[class_name]
-            result, result_str = class_dec_gen.init(class_name, elem['layout'], types_generator, class_decls, comments, generate_print_methods)
+def static_files( generate_print_methods: bool, with_cmd: bool = True ) -> typing.Dict[str, Path]:
+    """
+    Returns the static C++ sources of the output folder (destination file
+    name -> file in 'cpp_source'), including the 'cmd' tool if 'with_cmd'.
+    """
 
-            if result != YamlFieldCheckResult.OK:
-                print(result_str)
-                exit(1)
+    files = { src.name: src for src in (ROOT_FOLDER / "cpp_source").iterdir() if src.is_file() }
+    del files["ICatbufferPrint.h"]
 
-            class_dec_gen.write_file( gen_output_folder+f'/{class_name}.h' )
+    if generate_print_methods:
+        files["ICatbuffer.h"] = ROOT_FOLDER / "cpp_source/ICatbufferPrint.h"
+    else:
+        del files["cmd.cpp"]
+        del files["IPrettyPrinter.h"]
 
-            class_decls[elem['name']] = class_dec_gen
+    if not with_cmd:
+        files.pop( "cmd.cpp", None )
 
+    return dict( sorted( files.items() ) )
 
-    for class_name, decl in class_decls.items():
-        decl.check_dependency()
 
-    # Generate class definitions (*.cpp)
-    print("\nGenerating class definitions:")
-    for elem in input_data:
-        if 'struct' == elem['type']:
-            print("\t"+elem["name"])
 
-            class_decl         = class_decls[elem['name']]
-            class_def_gen      = CppClassDefinitionGenerator()
-            class_def_gen.init( class_decl, class_decls, types_generator, generate_print_methods )
+def copy_static_files( output_folder: str, generate_print_methods: bool, static_contents: typing.Optional[typing.Dict[Path, bytes]] = None, amalgamate: bool = False ):
+    """
+    Copies the static C++ sources and the CMake build file to the output
+    folder. Files are only copied if their content changed, so that the
+    static sources are not recompiled on every run.
 
-            class_def_gen.write_file( gen_output_folder+f'/{class_decl.class_name}.cpp' )
+    If 'static_contents' is given, the content of each static file is read
+    only once and kept in 'static_contents', which can be shared by many
+    calls (e.g. for all output folders of a batch).
 
+    With 'amalgamate' the static sources are part of 'catbuffer.h/.cpp', so
+    only the 'cmd' tool is copied.
+    """
 
-    # Generate enum to class converters
-    converter = CppConvertersGenerator( class_decls, types_generator, generate_print_methods )
-    converter.write_file( gen_output_folder )
+    def read( src: Path ) -> bytes:
+        if static_contents is None:
+            return src.read_bytes()
+
+        if src not in static_contents:
+            static_contents[src] = src.read_bytes()
+
+        return static_contents[src]
+
+    def copy( src: Path, dst: str ):
+        if static_contents is None:
+            FileWriter.copy_if_changed( str(src), dst )
+        else:
+            FileWriter.write_if_changed( dst, read( src ) )
+
+    static_folder = Path( output_folder+"/static_src" )
+    static_folder.mkdir( parents=True, exist_ok=True )
+
+    # destination file name -> static source file
+    files = static_files( generate_print_methods )
+
+    if amalgamate:
+        files = { name: src for name, src in files.items() if name == "cmd.cpp" }
+
+    # remove files left over from a previous run with other options, or by an older generator
+    for name in [ src.name for src in (ROOT_FOLDER / "cpp_source").iterdir() ] + REMOVED_STATIC_FILES:
+        if name not in files:
+            (static_folder / name).unlink( missing_ok=True )
+
+    for name, src in files.items():
+        if amalgamate:
+            # the 'cmd' tool includes the amalgamated header instead of the converters
+            FileWriter.write_if_changed( str(static_folder / name), read( src ).replace( b'"../generated_src/converters.h"', b'"../generated_src/catbuffer.h"' ) )
+        else:
+            copy( src, str(static_folder / name) )
+
+
+    # Copy build file
+    if amalgamate:
+        copy( ROOT_FOLDER / "cpp_build_files/CMakeLists_amalgamated.txt", output_folder+"/CMakeLists.txt" )
+    elif not generate_print_methods:
+        copy( ROOT_FOLDER / "cpp_build_files/CMakeLists.txt", output_folder+"/CMakeLists.txt" )
+    else:
+        copy( ROOT_FOLDER / "cpp_build_files/CMakeLists_with_cmd.txt", output_folder+"/CMakeLists.txt" )
+
+
+
+def prepare_output_folder( output_folder: str, generate_print_methods: bool, incremental: bool, static_contents: typing.Optional[typing.Dict[Path, bytes]] = None, amalgamate: bool = False ) -> str:
+    """
+    Creates the output folder and copies the static files to it (see
+    'copy_static_files()'). The folder of the generated files is cleared,
+    unless 'incremental', in which case only the files of the other layout
+    ('amalgamate' or not) are removed. Returns the folder of the generated
+    files.
+    """
+
+    from .Amalgamator import Amalgamator
+
+    print(f"Creating output folder:{output_folder}\n")
+    Path( output_folder ).mkdir( parents=True, exist_ok=True )
+
+    gen_output_folder = output_folder+"/generated_src"
+    dirpath = Path(gen_output_folder)
+    
+    if dirpath.exists() and dirpath.is_dir() and not incremental:
+        shutil.rmtree( gen_output_folder )
+
+    Path( gen_output_folder ).mkdir( parents=True, exist_ok=True )
+    Amalgamator.remove_stale_files( gen_output_folder, amalgamate )
+
+    copy_static_files( output_folder, generate_print_methods, static_contents, amalgamate )
+
+    return gen_output_folder
+
+
+
+def write_depfile( depfile: str, stamp: str, input_file_name: str, output_folder: str ):
+    """
+    Writes a depfile which states that the generated files (or 'stamp' if
+    given) depend on the input file and on the generator itself. Build 
+    systems use it to only run the generator when one of them changed.
+    """
+
+    dependencies = [ Path(input_file_name) ]
+    for folder in [ "generator", "cpp_source", "cpp_build_files" ]:
+        dependencies += sorted( path for path in (ROOT_FOLDER / folder).iterdir() if path.is_file() and path.suffix != ".pyc" )
+
+    if stamp:
+        targets = [ Path(stamp) ]
+    else:
+        targets  = [ Path(output_folder) / "CMakeLists.txt" ]
+        targets += sorted( path for path in Path(output_folder, "static_src").iterdir() )
+        targets += sorted( path for path in Path(output_folder, "generated_src").iterdir() if not path.name.startswith(".") )
+
+    FileWriter.write_depfile( depfile, [ path.resolve() for path in targets ], [ path.resolve() for path in dependencies ] )
+
+
+
+def watch( input_file_name: str, output_folder: str, generate_print_methods: bool, jobs: int, poll_interval: float, use_schema_cache: bool = True, roots: typing.Optional[typing.List[str]] = None, fast_build: bool = False, arena: bool = False, variant: bool = False ):
+    """
+    Generates the C++ code of 'input_file_name' and then polls it for changes,
+    regenerating only the files of the structs affected by a change (plus
+    'types.h' and the converters, if their content changed). The types and
+    class declarations are kept in memory between runs.
+    """
+
+    import io
+    import contextlib
+
+    from .SchemaCache import SchemaCache
+    from .Watcher import Watcher, WarmState
+
+    gen_output_folder = output_folder+"/generated_src"
+    schema_cache      = SchemaCache( output_folder, enabled=use_schema_cache )
+    warm_state        = WarmState()
+
+    def regenerate() -> str:
+        inputs_hash = IncrementalCache.inputs_hash( [ input_file_name ], generate_print_methods, { "roots": roots, "fast_build": fast_build, "arena": arena, "variant": variant } )
+        output      = io.StringIO()
+
+        IncrementalCache.save_inputs_hash( gen_output_folder, None )
+
+        try:
+            # the per struct output of the generator is only shown if it fails
+            with contextlib.redirect_stdout( output ):
+                data_loaded = prune_schema( schema_cache.load_yaml( input_file_name ), roots )
+                generated   = generate( data_loaded, gen_output_folder, generate_print_methods, True, jobs, None, warm_state, fast_build=fast_build, arena=arena, variant=variant )
+        except SystemExit:
+            print( output.getvalue().strip() )
+            raise
+
+        IncrementalCache.save_inputs_hash( gen_output_folder, inputs_hash )
+
+        return f'Generated {len(generated)} of {len(warm_state.decls)} structs'
+
+    Watcher( [ input_file_name ], poll_interval ).run( regenerate )
+
+
+
+def batch( manifest_file_name: str, jobs: int ):
+    """
+    Runs the jobs of the batch manifest 'manifest_file_name' (see
+    'BatchManifest'), up to 'jobs' of them at the same time. Unlike running
+    the generator once per job, the static files are read once for all jobs,
+    and each schema is parsed and its types generated once for all jobs that
+    generate it. The output of a job is only shown if the job fails.
+    """
+
+    import io
+    import contextlib
+
+    from .BatchManifest import BatchManifest
+    from .SchemaCache import SchemaCache
+
+    batch_jobs      = BatchManifest.load( manifest_file_name )
+    static_contents : typing.Dict[Path, bytes]          = {} # static file -> content, shared by all jobs
+    parsed          : typing.Dict[Path, list]           = {} # schema file -> parsed schema, shared by the jobs generating it
+    schemas         : typing.Dict[tuple, tuple]         = {} # (schema file, roots) -> (pruned schema, types), shared by the jobs generating it
+    inputs_hashes   : typing.List[typing.Optional[str]] = []
+    pending         : typing.List[int]                  = [] # jobs whose output is not up to date
+
+    print(f"Running {len(batch_jobs)} jobs of batch manifest: {manifest_file_name}\n")
+
+    for idx, job in enumerate(batch_jobs):
+        with contextlib.redirect_stdout( io.StringIO() ):
+            gen_output_folder = prepare_output_folder( job.output, job.generate_print, job.incremental, static_contents, job.amalgamate )
+
+        inputs_hash = IncrementalCache.inputs_hash( [ job.schema ], job.generate_print, { "roots": job.roots, "fast_build": job.fast_build, "amalgamate": job.amalgamate, "arena": job.arena, "variant": job.variant } ) if job.incremental else None
+        inputs_hashes.append( inputs_hash )
+
+        if inputs_hash is not None and IncrementalCache.is_output_up_to_date( gen_output_folder, inputs_hash ):
+            continue
+
+        pending.append( idx )
+        schema_file = Path( job.schema ).resolve()
+
+        if schema_file not in parsed:
+            # the parsed schema is only cached in the output folder of the first job generating it
+            parsed[schema_file] = SchemaCache( job.output, enabled=job.schema_cache ).load_yaml( job.schema )
+
+        if _schema_key( job ) not in schemas:
+            input_data = prune_schema( parsed[schema_file], job.roots )
+
+            with contextlib.redirect_stdout( io.StringIO() ):
+                schemas[_schema_key( job )] = ( input_data, generate_types( input_data ) )
+
+    if jobs > 1 and len(pending) > 1:
+        import concurrent.futures
+
+        with concurrent.futures.ProcessPoolExecutor( min( jobs, len(pending) ), initializer=_init_batch_worker, initargs=( batch_jobs, schemas ) ) as pool:
+            results = dict( zip( pending, pool.map( _run_batch_job, pending, [ inputs_hashes[idx] for idx in pending ] ) ) )
+    else:
+        _init_batch_worker( batch_jobs, schemas )
+        results = { idx: _run_batch_job( idx, inputs_hashes[idx] ) for idx in pending }
+
+    failed = 0
+
+    for idx, job in enumerate(batch_jobs):
+        succeeded, output, generated = results.get( idx, ( True, "", None ) )
+        status                       = "up to date" if generated is None else f"generated {generated} structs" if succeeded else "failed"
+
+        print(f"[{idx+1}/{len(batch_jobs)}] {job.schema} -> {job.output}: {status}")
+
+        if not succeeded:
+            print( output + "\n" )
+            failed += 1
+            continue
+
+        if job.depfile:
+            write_depfile( job.depfile, job.stamp, job.schema, job.output )
+
+        if job.stamp:
+            Path( job.stamp ).touch()
+
+    if failed:
+        print(f"\nError: {failed} of {len(batch_jobs)} jobs failed!\n")
+        exit(1)
 
     print("\nDone!")
 
 
 
+# State shared by all batch jobs run by a process, set by '_init_batch_worker()'
+_batch : dict = {}
+
+
+def _init_batch_worker( batch_jobs, schemas ):
+    _batch["jobs"]    = batch_jobs
+    _batch["schemas"] = schemas
+
+
+def _schema_key( job: "BatchJob" ) -> tuple:
+    return Path( job.schema ).resolve(), job.roots
+
+
+def _run_batch_job( idx: int, inputs_hash: typing.Optional[str] ) -> typing.Tuple[bool, str, int]:
+    """
+    Runs job 'idx' of the batch, and returns whether it succeeded, its output
+    and the number of structs it generated.
+    """
+
+    import io
+    import contextlib
+
+    job                         = _batch["jobs"][idx]
+    input_data, types_generator = _batch["schemas"][ _schema_key( job ) ]
+    gen_output_folder           = job.output+"/generated_src"
+    output                      = io.StringIO()
+
+    try:
+        with contextlib.redirect_stdout( output ):
+            # Only record the inputs once generating succeeded, in case it fails half way
+            IncrementalCache.save_inputs_hash( gen_output_folder, None )
+            generated = generate( input_data, gen_output_folder, job.generate_print, job.incremental, 1, None, None, types_generator, job.fast_build, job.amalgamate, job.arena, job.variant )
+    except SystemExit:
+        return False, output.getvalue().strip(), 0
+
+    if inputs_hash is not None:
+        IncrementalCache.save_inputs_hash( gen_output_folder, inputs_hash )
+
+    return True, "", len(generated)
 
 
 
@@ -89,7 +549,8 @@ def main():
     """
     Takes a .yaml file and generates C++ code in an output folder.
 
-    Command line: 'python3 -m generator myYamlFile.yaml MyOutputFolder'
+    Command line: 'python3 -m generator myYamlFile.yaml MyOutputFolder [--generate-print] [--incremental] [--jobs N]'
+              or: 'python3 -m generator --batch manifest.yaml [--jobs N]'
 
     The steps taken are: 
 
@@ -97,16 +558,104 @@ def main():
         2) Generate class declarations (*.h) for struct types
         3) Generate class definitions (*.cpp) for struct types
         4) Generate 'enum to class' converters in file 'converters.h'
+
+    With '--incremental' the output folder is not cleared, and only the
+    files whose inputs changed since the last run are regenerated. Files
+    with unchanged content are not rewritten, so they keep their mtime.
+    If nothing changed since the last run, the .yaml file is not even read.
+
+    With '--jobs N' the class declarations and definitions of the structs
+    are generated by 'N' processes.
+
+    With '--profile' the time and memory used by each phase of the generator
+    and by the slowest structs are printed.
+
+    The parsed .yaml file is cached in the output folder and only parsed
+    again when the file or the generator changed, unless '--no-schema-cache'
+    is given.
+
+    With '--watch' the generator keeps running and regenerates the files
+    affected by a change whenever the .yaml file changes (implies
+    '--incremental').
+
+    With '--depfile FILE' a depfile is written, which lists the generated
+    files and the files they were generated from (see also 'cpp_build_files/
+    CatbufferGenerate.cmake').
+
+    With '--roots TYPES' only the structs, enums and aliases needed by the
+    comma separated TYPES are generated (see 'SchemaPruner').
+
+    With '--fast-build' the generated files only include the headers they
+    actually need, e.g. the streams only for the Print() methods, which
+    reduces the time needed to compile the generated code.
+
+    With '--amalgamate' the whole library (static sources, types, classes
+    and converters) is written to a single 'catbuffer.h' and 'catbuffer.cpp',
+    so that the compiler can inline the calls between classes (see
+    'Amalgamator').
+
+    With '--arena' the generated classes, their arrays and the objects
+    created by the converters can allocate from a caller-supplied
+    'std::pmr::memory_resource', e.g. an arena which is freed at once
+    after a batch of buffers was processed (see 'cpp_source/Arena.h').
+
+    With '--variant' the elements of the 'array_sized' fields are stored in
+    place, in a 'std::variant' of the structs of their group, instead of
+    behind a 'std::unique_ptr<ICatbuffer>' each, and are dispatched without
+    virtual calls (see 'cpp_source/Variant.h').
+
+    With '--batch MANIFEST' the .yaml files and output folders listed in
+    MANIFEST are generated, '--jobs' of them at the same time, each with its
+    own options (see 'BatchManifest').
     """
 
-    # Check if enough arguments
-    if len(sys.argv) < 3:
-        print( "Error: Not enough command line arguments!\n" )
+    parser = argparse.ArgumentParser( prog="python3 -m generator", description="Generates C++ code from a .yaml file." )
+    parser.add_argument( "input_file",       nargs="?", help="the .yaml input file" )
+    parser.add_argument( "output_folder",    nargs="?", help="the folder where the C++ code is generated" )
+    parser.add_argument( "--roots",          metavar="TYPES", help="comma separated list of types (structs or enum groups, e.g. 'TransactionType'); only the types they need are generated" )
+    parser.add_argument( "--batch",          metavar="MANIFEST", help="generate all jobs (.yaml file, output folder and options) listed in the .yaml file MANIFEST" )
+    parser.add_argument( "--generate-print", action="store_true", help="generate Print() methods and the 'cmd' command line tool" )
+    parser.add_argument( "--amalgamate",     action="store_true", help="write the whole library to a single catbuffer.h and catbuffer.cpp" )
+    parser.add_argument( "--fast-build",     action="store_true", help="only include the headers needed by each generated file, to reduce compile times" )
+    parser.add_argument( "--arena",          action="store_true", help="let the generated classes and converters allocate from a std::pmr::memory_resource (see cpp_source/Arena.h)" )
+    parser.add_argument( "--variant",        action="store_true", help="store the elements of array_sized fields in place, in a std::variant of the structs of their group (see cpp_source/Variant.h)" )
+    parser.add_argument( "--incremental",    action="store_true", help="only regenerate files whose inputs changed since the last run" )
+    parser.add_argument( "--jobs", "-j",     type=int, default=1, metavar="N", help="number of processes used to generate the structs, or the jobs of a --batch (default: 1)" )
+    parser.add_argument( "--watch",          action="store_true", help="keep running and regenerate whenever the .yaml file changes (implies --incremental)" )
+    parser.add_argument( "--poll-interval",  type=float, default=0.5, metavar="SECONDS", help="how often --watch checks the .yaml file for changes (default: 0.5)" )
+    parser.add_argument( "--depfile",        metavar="FILE", help="write a Make/Ninja depfile listing the inputs and outputs of the generator" )
+    parser.add_argument( "--stamp",          metavar="FILE", help="touch FILE when done, and use it as the target in the depfile" )
+    parser.add_argument( "--no-schema-cache", action="store_true", help="always parse the .yaml file, instead of reusing the parsed file cached in the output folder" )
+    parser.add_argument( "--profile",        action="store_true", help="print the time and peak memory of each phase and of the slowest structs (per struct only with --jobs 1)" )
+    parser.add_argument( "--profile-top",    type=int, default=10, metavar="N", help="number of slowest structs printed by --profile (default: 10)" )
+    parser.add_argument( "--profile-json",   metavar="FILE", help="write the --profile report to FILE in json format" )
+    args = parser.parse_args()
+
+    if args.batch:
+        # the options of the jobs are set in the manifest
+        if args.input_file or args.output_folder or args.generate_print or args.incremental or args.watch or args.depfile or args.stamp or \
+           args.no_schema_cache or args.profile or args.profile_json or args.roots or args.fast_build or args.amalgamate or args.arena or args.variant:
+            print("Error: Only '--jobs' can be combined with '--batch', the input file, output folder and options of each job are set in the manifest!\n")
+            exit(1)
+
+        batch( args.batch, args.jobs )
+        return
+
+    if not args.input_file or not args.output_folder:
+        print("Error: Missing input file or output folder!\n")
+        exit(1)
+
+    if args.watch and args.amalgamate:
+        print("Error: '--amalgamate' can't be combined with '--watch'!\n")
         exit(1)
 
+    if args.watch:
+        args.incremental = True
+
+    roots = [ root.strip() for root in args.roots.split(",") if root.strip() ] if args.roots else None
 
     # Check if .yaml input file exists
-    input_file_name = sys.argv[1]
+    input_file_name = args.input_file
 
     my_file = Path(input_file_name)
     if not my_file.is_file():
@@ -114,56 +663,62 @@ def main():
         exit(1)
 
 
-    # Create output folder
-    output_folder = sys.argv[2]
-    print(f"Creating output folder:{output_folder}\n")
-    Path( output_folder ).mkdir( parents=True, exist_ok=True )
+    # Create output folder and copy static files and build file
+    output_folder          = args.output_folder
+    generate_print_methods = args.generate_print
+    gen_output_folder      = prepare_output_folder( output_folder, generate_print_methods, args.incremental, None, args.amalgamate )
 
-    gen_output_folder = output_folder+"/generated_src"
-    dirpath = Path(gen_output_folder)
-    
-    if dirpath.exists() and dirpath.is_dir():
-        shutil.rmtree( gen_output_folder )
+    if args.watch:
+        watch( input_file_name, output_folder, generate_print_methods, args.jobs, args.poll_interval, not args.no_schema_cache, roots, args.fast_build, args.arena, args.variant )
+        return
 
-    Path( gen_output_folder ).mkdir( parents=True, exist_ok=True )
+    profiler = None
+    if args.profile or args.profile_json:
+        from .Profiler import Profiler
+        profiler = Profiler()
 
 
-    # Copy static files
-    copy_tree("cpp_source", output_folder+"/static_src")
+    # Nothing to do if the last incremental run had the same inputs
+    inputs_hash = IncrementalCache.inputs_hash( [ input_file_name ], generate_print_methods, { "roots": roots, "fast_build": args.fast_build, "amalgamate": args.amalgamate, "arena": args.arena, "variant": args.variant } ) if args.incremental else None
 
+    if inputs_hash is not None and IncrementalCache.is_output_up_to_date( gen_output_folder, inputs_hash ):
+        print("Generated files are up to date.")
 
-    # Generate pretty print or not
-    generate_print_methods = False
+    else:
+        from .SchemaCache import SchemaCache
+        from .Profiler import Profiler
 
-    if len(sys.argv) == 4:
-       if( sys.argv[3] == "--generate-print" ):
-           generate_print_methods = True
-       else:
-           print(f"Error: unknown argument '{sys.argv[3]}'")
-           exit(1)
+        # Read YAML file
+        schema_cache = SchemaCache( output_folder, enabled=not args.no_schema_cache )
 
+        with ( profiler or Profiler.disabled() ).phase( "load_yaml" ):
+            data_loaded = schema_cache.load_yaml( input_file_name )
 
-    # Copy build file
-    if not generate_print_methods:
-        file = Path(output_folder+"/static_src/cmd.cpp")
-        file.unlink()
-        file = Path(output_folder+"/static_src/ICatbufferPrint.h")
-        file.unlink()
-        file = Path(output_folder+"/static_src/IPrettyPrinter.h")
-        file.unlink()
-
-        shutil.copy("cpp_build_files/CMakeLists.txt", output_folder+"/")
-    else:
-        shutil.move(output_folder+"/static_src/ICatbufferPrint.h", output_folder+"/static_src/ICatbuffer.h")
-        shutil.copy("cpp_build_files/CMakeLists_with_cmd.txt", output_folder+"/CMakeLists.txt")
+        print(f"Reading YAML file: {input_file_name}{' (cached)' if schema_cache.hit else ''}\n")
+
+        if roots:
+            data_loaded = prune_schema( data_loaded, roots )
+            print(f"Generating only the types needed by: {', '.join(roots)}\n")
+
+        # Only record the inputs once generating succeeded, in case it fails half way
+        IncrementalCache.save_inputs_hash( gen_output_folder, None )
+
+        generate( data_loaded, gen_output_folder, generate_print_methods, args.incremental, args.jobs, profiler, fast_build=args.fast_build, amalgamate=args.amalgamate, arena=args.arena, variant=args.variant )
+
+        if inputs_hash is not None:
+            IncrementalCache.save_inputs_hash( gen_output_folder, inputs_hash )
+
+    if profiler is not None:
+        print( profiler.report( args.profile_top ) )
 
+        if args.profile_json:
+            profiler.write_json( args.profile_json )
 
-    # Read YAML file
-    print(f"Reading YAML file: {input_file_name}\n")
-    with open(input_file_name, 'r') as stream:
-        data_loaded = yaml.safe_load(stream)
+    if args.depfile:
+        write_depfile( args.depfile, args.stamp, input_file_name, output_folder )
 
-    generate( data_loaded, gen_output_folder, generate_print_methods)
+    if args.stamp:
+        Path( args.stamp ).touch()
 
 
 
@@ -0,0 +1,83 @@
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+from generator.Amalgamator import Amalgamator
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestAmalgamator( unittest.TestCase ):
+
+    def setUp( self ):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.output = Path( self.tmp.name ) / "output"
+        self.schema = str( REPO_ROOT / "yaml_test_inputs" / "bitcoin.yaml" )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def run_generator( self, *args: str ) -> None:
+        subprocess.run( [sys.executable, "-m", "generator", self.schema, str(self.output), *args], cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL )
+
+
+    def file_names( self, sub_folder: str ) -> list:
+        return sorted( path.name for path in ( self.output / sub_folder ).iterdir() if not path.name.startswith( "." ) )
+
+
+    # amalgamation
+    # /////////////////////////////////////////////////////////////////
+    def test_headers_follow_their_includes(self):
+        files = { "A.h":   '#pragma once\n#include <vector>\n#include "B.h"\n\nclass A { B b; };\n',
+                  "B.h":   '#pragma once\n#include <cstdint>\n#include "C.h"\n\nclass B { C c; };\n',
+                  "C.h":   '#pragma once\n#include <cstdint>\n\nclass C {};\n',
+                  "A.cpp": '#include "A.h"\n#include <iostream>\n\nvoid f() {}\n' }
+
+        header, source = Amalgamator.amalgamate( files )
+
+        self.assertEqual( header.splitlines()[:5], [ Amalgamator.BANNER, "#pragma once", "", "#include <cstdint>", "#include <vector>" ] )
+        self.assertLess( header.index( "class C" ), header.index( "class B" ) )
+        self.assertLess( header.index( "class B" ), header.index( "class A" ) )
+        self.assertNotIn( '#include "', header )
+
+        self.assertEqual( source.splitlines()[:4], [ Amalgamator.BANNER, '#include "catbuffer.h"', "", "#include <iostream>" ] )
+        self.assertIn( "void f() {}", source )
+
+
+    # output folder
+    # /////////////////////////////////////////////////////////////////
+    def test_amalgamated_output_folder(self):
+        self.run_generator( "--amalgamate", "--generate-print" )
+
+        self.assertEqual( self.file_names( "generated_src" ), [ "catbuffer.cpp", "catbuffer.h" ] )
+        self.assertEqual( self.file_names( "static_src" ),    [ "cmd.cpp" ] )
+        self.assertIn( '#include "../generated_src/catbuffer.h"', ( self.output / "static_src" / "cmd.cpp" ).read_text() )
+
+
+    def test_layouts_replace_each_other(self):
+        self.run_generator( "--incremental" )
+        self.run_generator( "--incremental", "--amalgamate" )
+        self.assertEqual( self.file_names( "generated_src" ), [ "catbuffer.cpp", "catbuffer.h" ] )
+
+        self.run_generator( "--incremental" )
+        self.assertNotIn( "catbuffer.cpp", self.file_names( "generated_src" ) )
+        self.assertIn( "Block.cpp", self.file_names( "generated_src" ) )
+
+
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_amalgamated_library_compiles(self):
+        self.run_generator( "--amalgamate", "--generate-print" )
+
+        for name in [ "generated_src/catbuffer.cpp", "static_src/cmd.cpp" ]:
+            subprocess.run( [ "g++", "-std=c++17", "-fsyntax-only", "-Wall", "-Werror", "-pedantic", str( self.output / name ) ], check=True )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
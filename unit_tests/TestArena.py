@@ -0,0 +1,307 @@
+import io
+import sys
+import shutil
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+from generator.__main__ import generate, copy_static_files
+from generator.SchemaCache import SchemaCache
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# counts the allocations of the heap, by replacing the global operator new
+HEAP_COUNTER = r'''
+#include <cstdlib>
+#include <new>
+
+static size_t heap_allocations = 0;
+
+void* operator new( size_t size )
+{
+  ++heap_allocations;
+  if( void* memory = malloc( size ) ){ return memory; }
+  throw std::bad_alloc();
+}
+
+// used by the default resource of std::pmr
+void* operator new( size_t size, std::align_val_t alignment )
+{
+  ++heap_allocations;
+  if( void* memory = aligned_alloc( (size_t) alignment, ( size + (size_t) alignment - 1 ) / (size_t) alignment * (size_t) alignment ) ){ return memory; }
+  throw std::bad_alloc();
+}
+
+void operator delete( void* memory ) noexcept { free( memory ); }
+void operator delete( void* memory, size_t ) noexcept { free( memory ); }
+void operator delete( void* memory, std::align_val_t ) noexcept { free( memory ); }
+void operator delete( void* memory, size_t, std::align_val_t ) noexcept { free( memory ); }
+
+#define CHECK( x ) if( !(x) ){ printf( "failed: %s\n", #x ); return 1; }
+'''
+
+SYMBOL_PROGRAM = r'''
+#include <cstdio>
+#include <cstring>
+#include <memory_resource>
+#include <string>
+#include <vector>
+#include "catbuffer.h"
+''' + HEAP_COUNTER + r'''
+static std::vector<uint8_t> HexToBytes( const std::string& hex )
+{
+  std::vector<uint8_t> bytes;
+  for( size_t i = 0; i < hex.length(); i += 2 ){ bytes.push_back( (uint8_t) strtol( hex.substr( i, 2 ).c_str(), NULL, 16 ) ); }
+  return bytes;
+}
+
+// Deserializes all 'inputs' into objects created in 'arena', without allocating from the heap
+static int DeserializeBatch( std::vector<std::vector<uint8_t>>& inputs, std::pmr::memory_resource* arena, std::vector<ArenaPtr>& objects )
+{
+  objects.reserve( inputs.size() );
+  const size_t before = heap_allocations;
+
+  for( std::vector<uint8_t>& bytes : inputs )
+  {
+    Transaction header;
+    RawBuffer   header_buffer( bytes.data(), bytes.size() );
+    CHECK( header.Deserialize( header_buffer ) );
+
+    ArenaPtr  object = create_type_TransactionType( header.mType, header.mEntityBody.mVersion, arena );
+    RawBuffer buffer( bytes.data(), bytes.size() );
+    CHECK( object && object->Deserialize( buffer ) && 0 == buffer.RemainingSize() );
+
+    objects.push_back( std::move( object ) );
+  }
+
+  CHECK( heap_allocations == before );
+  return 0;
+}
+
+int main()
+{
+  #include "payloads.h"
+
+  std::vector<std::vector<uint8_t>> inputs;
+  for( const std::string& hex : payloads ){ inputs.push_back( HexToBytes( hex ) ); }
+
+  // the arena can't fall back to the heap
+  static std::byte                    memory[1 << 20];
+  std::pmr::monotonic_buffer_resource arena( memory, sizeof(memory), std::pmr::null_memory_resource() );
+  std::vector<ArenaPtr>               objects;
+
+  if( DeserializeBatch( inputs, &arena, objects ) ){ return 1; }
+
+  size_t aggregates = 0;
+
+  for( size_t i = 0; i < inputs.size(); ++i )
+  {
+    std::vector<uint8_t> output( objects[i]->Size() );
+    RawBuffer            buffer( output.data(), output.size() );
+    CHECK( objects[i]->Serialize( buffer ) && output == inputs[i] );
+
+    if( AggregateCompleteTransaction* aggregate = dynamic_cast<AggregateCompleteTransaction*>( objects[i].get() ) )
+    {
+      const AggregateTransactionBody& body = aggregate->mAggregateTransactionBody;
+      CHECK( !body.mTransactions.empty() && body.mTransactions.get_allocator().resource() == &arena && body.mCosignatures.get_allocator().resource() == &arena );
+      CHECK( (const void*) body.mTransactions[0].get() >= memory && (const void*) body.mTransactions[0].get() < memory + sizeof(memory) );
+      ++aggregates;
+    }
+  }
+
+  CHECK( aggregates > 0 );
+
+  // the arena is freed at once, and reused for the next batch
+  objects.clear();
+  arena.release();
+
+  if( DeserializeBatch( inputs, &arena, objects ) ){ return 1; }
+
+  // the factories without an arena still allocate from the heap
+  std::unique_ptr<ICatbuffer> object = create_type_TransactionType( TransactionType::TRANSFER, 1 );
+  CHECK( object != nullptr );
+
+  return 0;
+}
+'''
+
+BITCOIN_PROGRAM = r'''
+#include <algorithm>
+#include <cstdio>
+#include <memory_resource>
+#include <vector>
+#include "Transaction.h"
+''' + HEAP_COUNTER + r'''
+static void Append( std::vector<uint8_t>& bytes, const size_t n, const uint8_t value ){ bytes.insert( bytes.end(), n, value ); }
+
+int main()
+{
+  // version, 2 inputs with a script of 10 bytes, 1 output with a script of 3 bytes, lock time
+  std::vector<uint8_t> legacy = { 1, 0, 0, 0, 2 };
+  for( int i=0; i<2; ++i ){ Append( legacy, 36, 7 ); legacy.push_back( 10 ); Append( legacy, 14, 8 ); }
+  legacy.push_back( 1 ); Append( legacy, 8, 9 ); legacy.push_back( 3 ); Append( legacy, 3, 1 );
+  Append( legacy, 4, 5 );
+
+  // version, flag, 1 input, 1 output, the witnesses of the input (of 3 and 256 bytes), lock time
+  std::vector<uint8_t> segwit = { 2, 0, 0, 0, 0, 1, 1 };
+  Append( segwit, 36, 7 ); segwit.push_back( 0 ); Append( segwit, 4, 8 );
+  segwit.push_back( 1 ); Append( segwit, 8, 9 ); segwit.push_back( 0 );
+  segwit.push_back( 2 ); segwit.push_back( 3 ); Append( segwit, 3, 4 ); segwit.push_back( 0xFD ); segwit.push_back( 0 ); segwit.push_back( 1 ); Append( segwit, 256, 6 );
+  Append( segwit, 4, 5 );
+
+  static std::byte                    memory[1 << 16];
+  std::pmr::monotonic_buffer_resource arena( memory, sizeof(memory), std::pmr::null_memory_resource() );
+  const size_t                        before = heap_allocations;
+
+  // the arrays of the nested objects are allocated from the arena too
+  Transaction legacy_transaction( &arena );
+  RawBuffer   legacy_buffer( legacy.data(), legacy.size() );
+  CHECK( legacy_transaction.Deserialize( legacy_buffer ) && 0 == legacy_buffer.RemainingSize() );
+  CHECK( 2 == legacy_transaction.mInputs.size() && 10 == legacy_transaction.mInputs[1].mScript.mScript.size() );
+  CHECK( legacy_transaction.mInputs[1].mScript.mScript.get_allocator().resource() == &arena );
+
+  Transaction segwit_transaction( &arena );
+  RawBuffer   segwit_buffer( segwit.data(), segwit.size() );
+  CHECK( segwit_transaction.DeserializeUnchecked( segwit_buffer ) && 0 == segwit_buffer.RemainingSize() );
+  CHECK( 256 == segwit_transaction.mWitnessData[0].mWitnesses[1].mStack.size() );
+  CHECK( segwit_transaction.mWitnessData[0].mWitnesses[1].mStack.get_allocator().resource() == &arena );
+
+  // moves keep the arena
+  Transaction moved( std::move( segwit_transaction ) );
+  CHECK( moved.mWitnessData[0].mWitnesses[1].mStack.get_allocator().resource() == &arena );
+  CHECK( heap_allocations == before );
+
+  // copies allocate from the default resource
+  Transaction copy( moved );
+  CHECK( copy.mWitnessData[0].mWitnesses[1].mStack.get_allocator().resource() == std::pmr::get_default_resource() );
+  CHECK( heap_allocations > before );
+
+  std::vector<uint8_t> output( copy.Size() );
+  RawBuffer            output_buffer( output.data(), output.size() );
+  CHECK( copy.Serialize( output_buffer ) && output == segwit );
+
+  return 0;
+}
+'''
+
+
+class TestArena( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.symbol = SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "symbol.yaml" ) )
+
+
+    def setUp( self ):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.output = Path( self.tmp.name )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def generate( self, schema, arena: bool = True ) -> Path:
+        gen_output_folder = self.output / "generated_src"
+        gen_output_folder.mkdir()
+
+        with contextlib.redirect_stdout( io.StringIO() ):
+            generate( schema, str(gen_output_folder), False, arena=arena )
+
+        copy_static_files( str(self.output), False )
+        return gen_output_folder
+
+
+    def run_generator( self, schema: str, *options: str ) -> None:
+        subprocess.run( [sys.executable, "-m", "generator", str( REPO_ROOT / "yaml_test_inputs" / schema ), str(self.output), *options],
+                        cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL )
+
+
+    # generated code
+    # /////////////////////////////////////////////////////////////////
+    def test_default_classes_without_arena(self):
+        folder = self.generate( self.symbol, arena=False )
+
+        for path in folder.iterdir():
+            self.assertNotIn( "pmr", path.read_text(), path.name )
+
+        self.assertIn( "\t~AggregateTransactionBody(){ };\n", ( folder / "AggregateTransactionBody.h" ).read_text() )
+
+
+    def test_arena_declarations(self):
+        folder = self.generate( self.symbol )
+        code   = ( folder / "AggregateTransactionBody.h" ).read_text()
+
+        self.assertIn( "\texplicit AggregateTransactionBody( std::pmr::memory_resource* arena ) : mTransactions( arena ), mCosignatures( arena ) { };", code )
+        self.assertIn( "\tstd::pmr::vector<ArenaPtr> mTransactions;", code )
+        self.assertIn( "\tstd::pmr::vector<Cosignature> mCosignatures;", code )
+        self.assertIn( '#include "Arena.h"', code )
+        self.assertNotIn( "~AggregateTransactionBody", code ) # so that moves keep the arena
+
+        # nested objects get the arena too
+        self.assertIn( "\texplicit AggregateCompleteTransaction( std::pmr::memory_resource* arena ) : mTransaction( arena ), mAggregateTransactionBody( arena ) { };",
+                       ( folder / "AggregateCompleteTransaction.h" ).read_text() )
+        self.assertIn( "\texplicit Mosaic( std::pmr::memory_resource* ){ };", ( folder / "Mosaic.h" ).read_text() )
+
+
+    def test_arena_deserialization(self):
+        code = ( self.generate( self.symbol ) / "AggregateTransactionBody.cpp" ).read_text()
+
+        self.assertIn( "ArenaPtr catbuf = create_type_TransactionTypeEmbedded( type, header.mEntityBody.mVersion, mTransactions.get_allocator().resource() );", code )
+        self.assertIn( "if( !buffer.Allocate( 1, sizeof(ArenaPtr) + sizeof(header) ) ){ return false; }", code )
+        self.assertIn( "Cosignature fill( mCosignatures.get_allocator().resource() );", code )
+        self.assertIn( "mCosignatures.push_back( std::move(fill) );", code )
+        self.assertIn( "for( const ArenaPtr& catbuf : mTransactions )", code )
+
+
+    def test_arena_converters(self):
+        folder = self.generate( self.symbol )
+
+        declarations = ( folder / "converters.h" ).read_text()
+        self.assertIn( "std::unique_ptr<ICatbuffer> create_type_TransactionType( TransactionType type, size_t version );", declarations )
+        self.assertIn( "ArenaPtr create_type_TransactionType( TransactionType type, size_t version, std::pmr::memory_resource* arena );", declarations )
+
+        self.assertIn( "case TransactionType::TRANSFER : { return MakeArenaObject<TransferTransaction>( arena ); }", ( folder / "converters_TransactionType_v1.cpp" ).read_text() )
+        self.assertIn( "case 1 : { return create_type_TransactionType_v1( type, arena ); }", ( folder / "converters_TransactionType.cpp" ).read_text() )
+
+
+    def test_amalgamate_only_with_arena(self):
+        self.run_generator( "symbol.yaml", "--amalgamate" )
+        self.assertNotIn( "memory_resource", ( self.output / "generated_src" / "catbuffer.h" ).read_text() )
+
+        self.run_generator( "symbol.yaml", "--amalgamate", "--arena" )
+        self.assertIn( "class ArenaDeleter", ( self.output / "generated_src" / "catbuffer.h" ).read_text() )
+
+
+    # compiled classes
+    # /////////////////////////////////////////////////////////////////
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_symbol_batch_allocates_from_arena(self):
+        self.run_generator( "symbol.yaml", "--amalgamate", "--arena" )
+
+        program = self.output / "main.cpp"
+        program.write_text( SYMBOL_PROGRAM )
+
+        subprocess.run( [ "g++", "-std=c++17", "-Wall", "-Wextra", "-Werror", "-pedantic", "-I", str( self.output / "generated_src" ), "-I", str( REPO_ROOT / "end-to-end-tests" / "src" ),
+                          str(program), str( self.output / "generated_src" / "catbuffer.cpp" ), "-o", str( self.output / "main" ) ], check=True )
+        subprocess.run( [ str( self.output / "main" ) ], check=True )
+
+
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_bitcoin_nested_arrays_allocate_from_arena(self):
+        folder  = self.generate( SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "bitcoin.yaml" ) ) )
+        program = self.output / "main.cpp"
+        program.write_text( BITCOIN_PROGRAM )
+
+        sources = [ str(path) for path in folder.glob( "*.cpp" ) ]
+        subprocess.run( [ "g++", "-std=c++17", "-Wall", "-Wextra", "-Werror", "-pedantic", "-I", str( self.output / "static_src" ), "-I", str(folder),
+                          str(program), *sources, "-o", str( self.output / "main" ) ], check=True )
+        subprocess.run( [ str( self.output / "main" ) ], check=True )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import io
+import shutil
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+from generator.__main__ import generate, copy_static_files
+from generator.SchemaCache import SchemaCache
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+TEST_PROGRAM = r'''
+#include <cstdio>
+#include <limits>
+#include <vector>
+#include "Transaction.h"
+
+#define CHECK( x ) if( !(x) ){ printf( "failed: %s\n", #x ); return 1; }
+
+static void Append( std::vector<uint8_t>& bytes, const size_t n, const uint8_t value ){ bytes.insert( bytes.end(), n, value ); }
+
+int main()
+{
+  // counts which can't fit in the remaining bytes are rejected before allocating
+  std::vector<uint8_t> huge_script = { 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0x7F, 1, 2, 3 };
+  Script script;
+  RawBuffer huge_script_buffer( huge_script.data(), huge_script.size() );
+  CHECK( !script.Deserialize( huge_script_buffer ) );
+
+  std::vector<uint8_t> huge_inputs = { 1, 0, 0, 0, 0xFE, 0xFF, 0xFF, 0xFF, 0xFF };
+  Append( huge_inputs, 100, 0 );
+  Transaction hostile;
+  RawBuffer huge_inputs_buffer( huge_inputs.data(), huge_inputs.size() );
+  CHECK( !hostile.Deserialize( huge_inputs_buffer ) );
+
+  // version, 2 inputs with a script of 10 bytes, 1 output with a script of 3 bytes, lock time
+  std::vector<uint8_t> bytes = { 1, 0, 0, 0, 2 };
+  for( int i=0; i<2; ++i ){ Append( bytes, 36, 7 ); bytes.push_back( 10 ); Append( bytes, 14, 8 ); }
+  bytes.push_back( 1 ); Append( bytes, 8, 9 ); bytes.push_back( 3 ); Append( bytes, 3, 1 );
+  Append( bytes, 4, 0 );
+
+  Transaction unlimited;
+  RawBuffer unlimited_buffer( bytes.data(), bytes.size() );
+  CHECK( unlimited.Deserialize( unlimited_buffer ) && unlimited_buffer.RemainingSize() == 0 && unlimited.mInputs[1].mScript.mScript.size() == 10 );
+
+  // the budget is shared by the arrays of the nested structs
+  const size_t allocated = std::numeric_limits<size_t>::max() - unlimited_buffer.RemainingAllocationBudget();
+  CHECK( allocated == 2*sizeof(Input) + 2*32 + 2*10 + sizeof(Output) + 3 );
+
+  Transaction limited;
+  RawBuffer limited_buffer( bytes.data(), bytes.size() );
+  limited_buffer.SetAllocationBudget( allocated );
+  CHECK( limited.Deserialize( limited_buffer ) && limited_buffer.RemainingAllocationBudget() == 0 );
+
+  Transaction exceeded;
+  RawBuffer exceeded_buffer( bytes.data(), bytes.size() );
+  exceeded_buffer.SetAllocationBudget( allocated-1 );
+  CHECK( !exceeded.Deserialize( exceeded_buffer ) );
+
+  return 0;
+}
+'''
+
+
+class TestArrayLimits( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.bitcoin = SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "bitcoin.yaml" ) )
+
+
+    def setUp( self ):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.output = Path( self.tmp.name )
+
+        gen_output_folder = self.output / "generated_src"
+        gen_output_folder.mkdir()
+
+        with contextlib.redirect_stdout( io.StringIO() ):
+            generate( self.bitcoin, str(gen_output_folder), False )
+
+        copy_static_files( str(self.output), False )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def method( self, file_name: str, method_name: str ) -> str:
+        code  = ( self.output / "generated_src" / file_name ).read_text()
+        start = code.index( f'::{method_name}( RawBuffer& buffer )' )
+        return code[ start : code.index( "\n}", start ) ]
+
+
+    # generated code
+    # /////////////////////////////////////////////////////////////////
+    def test_counts_checked_before_allocating(self):
+        code = self.method( "Transaction.cpp", "Deserialize" )
+
+        # an input has at least a 32 byte id, a 4 byte index, a 1 byte script size and a 4 byte sequence
+        count_check = code.index( "if( buffer.RemainingSize() / 41 < mNumInputs ){ return false; }" )
+        allocate    = code.index( "if( !buffer.Allocate( mNumInputs, sizeof(Input) ) ){ return false; }" )
+        self.assertLess( count_check, allocate )
+        self.assertLess( allocate, code.index( "mInputs.resize(mNumInputs);" ) )
+
+        # an output has at least an 8 byte value and a 1 byte script size
+        self.assertIn( "if( buffer.RemainingSize() / 9 < mNumOutputs ){ return false; }", code )
+
+        code = self.method( "Script.cpp", "Deserialize" )
+        self.assertLess( code.index( "if( size_t(end - ptr) / sizeof(uint8_t) < mScriptSize ){ return false; }" ), code.index( "mScript.assign(" ) )
+        self.assertIn( "if( !buffer.Allocate( mScriptSize, sizeof(uint8_t) ) ){ return false; }", code )
+
+
+    def test_unchecked_deserialization_has_no_limits(self):
+        for file_name in [ "Transaction.cpp", "Script.cpp" ]:
+            code = self.method( file_name, "DeserializeUnchecked" )
+
+            self.assertNotIn( "Allocate", code )
+            self.assertNotIn( "RemainingSize", code )
+
+
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_hostile_counts_and_budget(self):
+        program = self.output / "main.cpp"
+        program.write_text( TEST_PROGRAM )
+
+        sources = [ str(path) for path in ( self.output / "generated_src" ).glob( "*.cpp" ) ]
+        subprocess.run( [ "g++", "-std=c++17", "-Wall", "-Werror", "-pedantic", "-I", str( self.output / "static_src" ), "-I", str( self.output / "generated_src" ),
+                          str(program), *sources, "-o", str( self.output / "main" ) ], check=True )
+        subprocess.run( [ str( self.output / "main" ) ], check=True )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import io
+import unittest
+import contextlib
+
+try:
+    from lark import Token
+    from catparser import ast
+    from generator.AstToNativeConverter import ast_to_native
+except ImportError:
+    ast = None
+
+
+def integer( name ):
+    return ast.FixedSizeInteger( Token( "FIXED_SIZE_INTEGER", name ) )
+
+def user_type( name ):
+    return Token( "USER_TYPE_NAME", name )
+
+def transaction( name, kind, version ):
+    model = ast.Struct( [ None, name,
+                          ast.StructField( [ "TRANSACTION_VERSION", integer("uint8"), version ], "const" ),
+                          ast.StructField( [ "TRANSACTION_TYPE", user_type("TransactionType"), kind ], "const" ),
+                          ast.StructField( [ "size", integer("uint32") ] ),
+                          ast.StructField( [ "version", integer("uint8") ] ),
+                          ast.StructField( [ "type", user_type("TransactionType") ] ) ] )
+
+    model.factory_type = "Transaction"
+    model.attributes   = [ ast.Attribute( [ "discriminator", "type", "version" ] ),
+                           ast.Attribute( [ "initializes", "version", "TRANSACTION_VERSION" ] ),
+                           ast.Attribute( [ "initializes", "type", "TRANSACTION_TYPE" ] ) ]
+    return model
+
+
+@unittest.skipIf( ast is None, "catparser is not installed" )
+class TestAstToNativeConverter( unittest.TestCase ):
+
+    def convert( self, type_descriptors ):
+        with contextlib.redirect_stdout( io.StringIO() ):
+            return { elem["name"]: elem for elem in ast_to_native( type_descriptors ) }
+
+
+    # factory enums
+    # /////////////////////////////////////////////////////////////////
+    def test_factory_enum_has_each_type_once(self):
+        header            = ast.Struct( [ "abstract", "Transaction",
+                                          ast.StructField( [ "size", integer("uint32") ] ),
+                                          ast.StructField( [ "version", integer("uint8") ] ),
+                                          ast.StructField( [ "type", user_type("TransactionType") ] ) ] )
+        header.attributes = [ ast.Attribute( [ "discriminator", "type", "version" ] ) ]
+
+        enum = ast.Enum( [ "TransactionType", integer("uint16"), ast.EnumValue( ["TRANSFER", 0x4154] ), ast.EnumValue( ["LINK", 0x414C] ) ] )
+
+        output = self.convert( [ enum, header,
+                                 transaction( "TransferV1", "TRANSFER", 1 ),
+                                 transaction( "LinkV1",     "LINK",     1 ),
+                                 transaction( "TransferV2", "TRANSFER", 2 ) ] )
+
+        self.assertEqual( output["TransactionGroup"], { "name": "TransactionGroup", "type": "enum uint16", "values": [ { "name": "TRANSFER", "value": 0x4154 },
+                                                                                                                       { "name": "LINK",     "value": 0x414C } ] } )
+
+        self.assertEqual( output["TransferV2"]["layout"][-1], { "type": "struct_type TransactionGroup", "value": "TRANSFER @2", "type_field": "type",
+                                                                "header": "Transaction", "version_field": "version" } )
+
+        self.assertEqual( output["Transaction"]["layout"][-1]["type"], "TransactionGroup" )
+
+
+    # array_sized
+    # /////////////////////////////////////////////////////////////////
+    def test_abstract_field_becomes_array_sized(self):
+        header    = ast.Struct( [ "abstract", "Transaction", ast.StructField( [ "type", integer("uint16") ] ) ] )
+        container = ast.Struct( [ None, "Block",
+                                  ast.StructField( [ "payload_size", integer("uint32"), "transactions" ], "sizeof" ),
+                                  ast.StructField( [ "transactions", user_type("Transaction") ] ) ] )
+
+        output = self.convert( [ header, container ] )
+
+        self.assertEqual( output["Block"]["layout"], [ { "name": "payload_size", "type": " uint32" },
+                                                       { "name": "transactions", "size": "payload_size", "type": "array_sized Transaction",
+                                                         "header_type_field": "type", "header_version_field": "version" } ] )
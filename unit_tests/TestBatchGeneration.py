@@ -0,0 +1,80 @@
+import io
+import sys
+import filecmp
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+from generator.BatchManifest import BatchManifest, BatchJob
+from generator.SchemaCache import SchemaCache
+from generator.IncrementalCache import IncrementalCache
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestBatchGeneration( unittest.TestCase ):
+
+    def setUp( self ):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.folder = Path( self.tmp.name )
+        self.schema = str( REPO_ROOT / "yaml_test_inputs" / "bitcoin.yaml" )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def parse_fails( self, entries ) -> str:
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout( output ), self.assertRaises( SystemExit ):
+            BatchManifest.parse( entries, self.folder )
+
+        return output.getvalue()
+
+
+    def run_generator( self, *args: str ) -> str:
+        result = subprocess.run( [sys.executable, "-m", "generator", *args], cwd=REPO_ROOT, check=True, stdout=subprocess.PIPE, text=True )
+        return result.stdout
+
+
+    # manifest
+    # /////////////////////////////////////////////////////////////////
+    def test_paths_are_relative_to_manifest(self):
+        jobs = BatchManifest.parse( [ { "schema": self.schema, "output": "out", "generate_print": True, "stamp": "out.stamp" } ], self.folder )
+
+        self.assertEqual( jobs, [ BatchJob( self.schema, str( self.folder / "out" ), generate_print=True, stamp=str( self.folder / "out.stamp" ) ) ] )
+
+
+    def test_invalid_manifest_is_rejected(self):
+        self.assertIn( "non-empty list",             self.parse_fails( [] ) )
+        self.assertIn( "Missing 'output' key",       self.parse_fails( [ { "schema": self.schema } ] ) )
+        self.assertIn( "Unknown key 'jobs'",         self.parse_fails( [ { "schema": self.schema, "output": "out", "jobs": 2 } ] ) )
+        self.assertIn( "must be of type 'bool'",     self.parse_fails( [ { "schema": self.schema, "output": "out", "incremental": "yes" } ] ) )
+        self.assertIn( "not found",                  self.parse_fails( [ { "schema": "missing.yaml", "output": "out" } ] ) )
+        self.assertIn( "same output folder",         self.parse_fails( [ { "schema": self.schema, "output": "out" }, { "schema": self.schema, "output": "./out" } ] ) )
+
+
+    # batch runs
+    # /////////////////////////////////////////////////////////////////
+    def test_batch_generates_same_files_as_single_runs(self):
+        manifest = self.folder / "manifest.yaml"
+        manifest.write_text( f"- {{ schema: '{self.schema}', output: batch/plain }}\n"
+                             f"- {{ schema: '{self.schema}', output: batch/print, generate_print: true, incremental: true }}\n" )
+
+        self.run_generator( "--batch", str(manifest), "--jobs", "2" )
+        self.run_generator( self.schema, str( self.folder / "single/plain" ) )
+        self.run_generator( self.schema, str( self.folder / "single/print" ), "--generate-print" )
+
+        # files of the caches differ, since each schema is parsed only once in a batch
+        ignore = [ SchemaCache.CACHE_NAME, IncrementalCache.MANIFEST_NAME, IncrementalCache.INPUTS_NAME ]
+
+        for name in [ "plain", "print" ]:
+            for sub_folder in [ "", "generated_src", "static_src" ]:
+                comparison = filecmp.dircmp( self.folder / "batch" / name / sub_folder, self.folder / "single" / name / sub_folder, ignore=ignore )
+                self.assertEqual( ( comparison.diff_files, comparison.left_only, comparison.right_only ), ( [], [], [] ) )
+
+        self.assertIn( "print: up to date", self.run_generator( "--batch", str(manifest) ) )
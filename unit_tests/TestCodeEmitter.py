@@ -0,0 +1,65 @@
+import io
+import pickle
+import unittest
+
+from generator.CodeEmitter import CodeEmitter
+
+
+
+class TestCodeEmitter( unittest.TestCase ):
+
+    # collecting code
+    # /////////////////////////////////////////////////////////////////
+    def test_lines_are_indented(self):
+        code = CodeEmitter()
+        code.line( "bool Transfer::Deserialize( RawBuffer& buffer )" )
+        code.line( "{" )
+        with code.indented():
+            code.line( "if( true )" )
+            with code.indented( "  " ):
+                code.line( "return true;" )
+            code.line()
+        code.write( "}", "\n" )
+
+        self.assertEqual( code.getvalue(), "bool Transfer::Deserialize( RawBuffer& buffer )\n{\n\tif( true )\n\t  return true;\n\n}\n" )
+
+
+    def test_collected_code_is_written_to_stream(self):
+        code = CodeEmitter()
+        code.write( "a", "b" )
+        code.line( "c" )
+
+        stream = io.StringIO()
+        code.write_to( stream )
+
+        self.assertEqual( stream.getvalue(), "abc\n" )
+
+
+    # streaming code
+    # /////////////////////////////////////////////////////////////////
+    def test_code_is_streamed(self):
+        stream = io.StringIO()
+        code   = CodeEmitter( stream )
+        code.line( "{" )
+
+        self.assertEqual( stream.getvalue(), "{\n" )
+        self.assertEqual( code.getvalue(), "" )
+
+
+    def test_only_collecting_emitter_can_be_pickled(self):
+        code = CodeEmitter()
+        code.line( "enum class TransactionType : uint16_t" )
+
+        copied = pickle.loads( pickle.dumps( code ) )
+        copied.line( "{" )
+
+        self.assertEqual( copied.getvalue(), "enum class TransactionType : uint16_t\n{\n" )
+        self.assertEqual( code.getvalue(),   "enum class TransactionType : uint16_t\n" )
+
+        with self.assertRaises( TypeError ):
+            pickle.dumps( CodeEmitter( io.StringIO() ) )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
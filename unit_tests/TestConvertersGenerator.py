@@ -0,0 +1,70 @@
+import io
+import tempfile
+import unittest
+import contextlib
+from pathlib import Path
+
+from generator.__main__ import generate
+from generator.SchemaCache import SchemaCache
+from generator.SchemaPruner import SchemaPruner
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestConvertersGenerator( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.nem = SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "nem.yaml" ) )
+
+
+    def setUp( self ):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.output = Path( self.tmp.name )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def generate( self, input_data: list, generate_print_methods: bool = False ):
+        with contextlib.redirect_stdout( io.StringIO() ):
+            generate( input_data, str(self.output), generate_print_methods, incremental=True )
+
+
+    def converter_files( self ) -> list:
+        return sorted( path.name for path in self.output.glob( "converters*" ) )
+
+
+    # one translation unit per group and version
+    # /////////////////////////////////////////////////////////////////
+    def test_converters_are_split_per_group_and_version(self):
+        self.generate( self.nem )
+
+        self.assertEqual( self.converter_files(), [ "converters.cpp", "converters.h",
+                                                    "converters_NonVerifiableTransactionGroup.cpp", "converters_NonVerifiableTransactionGroup_v1.cpp", "converters_NonVerifiableTransactionGroup_v2.cpp",
+                                                    "converters_TransactionGroup.cpp", "converters_TransactionGroup_v1.cpp", "converters_TransactionGroup_v2.cpp" ] )
+
+
+    def test_version_includes_only_its_classes(self):
+        self.generate( self.nem )
+
+        code     = ( self.output / "converters_TransactionGroup_v2.cpp" ).read_text()
+        includes = [ line for line in code.splitlines() if line.startswith( '#include "' ) and line != '#include "converters.h"' ]
+        created  = { line.split( "new " )[1].split( "()" )[0] for line in code.splitlines() if "new " in line }
+
+        self.assertEqual( includes, sorted( f'#include "{name}.h"' for name in created ) )
+        self.assertEqual( ( self.output / "converters.cpp" ).read_text(), '#include "converters.h"\n\n' )
+
+
+    def test_files_of_removed_groups_are_removed(self):
+        self.generate( self.nem, True )
+        self.generate( SchemaPruner.prune( self.nem, [ "TransferTransaction" ] ), True )
+
+        self.assertEqual( self.converter_files(), [ "converters.cpp", "converters.h", "converters_TransactionGroup.cpp", "converters_TransactionGroup_v2.cpp" ] )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,228 @@
+import io
+import shutil
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+from generator.__main__ import generate, copy_static_files
+from generator.SchemaCache import SchemaCache
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+TEST_PROGRAM = r'''
+#include <cstdio>
+#include <cstring>
+#include <vector>
+#include "Varint.h"
+#include "Cosignature.h"
+
+#define CHECK( x ) if( !(x) ){ printf( "failed: %s\n", #x ); return 1; }
+
+int main()
+{
+  // varints of all sizes are read back
+  for( uint64_t value : { 0ULL, 0xFCULL, 0xFDULL, 0xFFFEULL, 0xFFFFULL, 0x12345678ULL, 0xFFFFFFFEULL, 0xFFFFFFFFULL, 1ULL<<40 } )
+  {
+    std::vector<uint8_t> bytes( sizeVarint( value ) );
+    RawBuffer out( bytes.data(), bytes.size() );
+    CHECK( writeVarint( value, out ) && out.RemainingSize() == 0 );
+
+    RawBuffer in( bytes.data(), bytes.size() );
+    CHECK( std::get<0>( readVarint( in ) ) == value );
+
+    RawBuffer truncated( bytes.data(), bytes.size()-1 );
+    CHECK( bytes.size() == 1 || !std::get<1>( readVarint( truncated ) ) );
+  }
+
+  // the offset is moved by the size of the struct, and not moved if the buffer is too small
+  std::vector<uint8_t> bytes( 200, 7 );
+  Cosignature cosignature;
+
+  RawBuffer in( bytes.data(), bytes.size() );
+  CHECK( cosignature.Deserialize( in ) && in.GetOffset() == cosignature.Size() );
+
+  RawBuffer truncated( bytes.data(), cosignature.Size()-1 );
+  CHECK( !cosignature.Deserialize( truncated ) && truncated.GetOffset() == 0 );
+
+  RawBuffer out( bytes.data(), cosignature.Size() );
+  CHECK( cosignature.Serialize( out ) && out.RemainingSize() == 0 );
+
+  // a valid buffer is read the same without bounds checks
+  Cosignature unchecked;
+  RawBuffer trusted( bytes.data(), bytes.size() );
+  CHECK( unchecked.DeserializeUnchecked( trusted ) && trusted.GetOffset() == cosignature.Size() );
+  CHECK( unchecked.mVersion == cosignature.mVersion && 0 == memcmp( unchecked.mSignature.data, cosignature.mSignature.data, sizeof(Signature) ) );
+
+  RawBuffer small( bytes.data(), cosignature.Size()-1 );
+  CHECK( !cosignature.Serialize( small ) );
+
+  return 0;
+}
+'''
+
+ARRAY_TEST_PROGRAM = r'''
+#include <cstdio>
+#include <vector>
+#include "TransferTransactionBody.h"
+
+#define CHECK( x ) if( !(x) ){ printf( "failed: %s\n", #x ); return 1; }
+
+int main()
+{
+  TransferTransactionBody transfer;
+  transfer.mMessage           = { 'h', 'e', 'l', 'l', 'o' };
+  transfer.mMosaics.resize( 3 );
+  transfer.mMosaics[2].mAmount = 42;
+  transfer.mMessage_size       = 5;
+  transfer.mMosaics_count      = 3;
+
+  std::vector<uint8_t> bytes( transfer.Size() );
+  RawBuffer out( bytes.data(), bytes.size() );
+  CHECK( transfer.Serialize( out ) && out.RemainingSize() == 0 );
+
+  RawBuffer small( bytes.data(), bytes.size()-1 );
+  CHECK( !transfer.Serialize( small ) );
+
+  TransferTransactionBody copy;
+  RawBuffer in( bytes.data(), bytes.size() );
+  CHECK( copy.Deserialize( in ) && in.RemainingSize() == 0 );
+  CHECK( copy.mMessage == transfer.mMessage && copy.mMosaics.size() == 3 && copy.mMosaics[2].mAmount == 42 );
+
+  // the arrays don't fit in the buffer
+  for( size_t size = 0; size < bytes.size(); ++size )
+  {
+    TransferTransactionBody truncated;
+    RawBuffer buffer( bytes.data(), size );
+    CHECK( !truncated.Deserialize( buffer ) );
+  }
+
+  return 0;
+}
+'''
+
+
+class TestCursorCodegen( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.symbol = SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "symbol.yaml" ) )
+
+
+    def setUp( self ):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.output = Path( self.tmp.name )
+
+        gen_output_folder = self.output / "generated_src"
+        gen_output_folder.mkdir()
+
+        with contextlib.redirect_stdout( io.StringIO() ):
+            generate( self.symbol, str(gen_output_folder), False )
+
+        copy_static_files( str(self.output), False )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def method( self, file_name: str, method_name: str ) -> str:
+        code  = ( self.output / "generated_src" / file_name ).read_text()
+        start = code.index( f'::{method_name}( RawBuffer& buffer )' )
+        return code[ start : code.index( "\n}", start ) ]
+
+
+    # generated code
+    # /////////////////////////////////////////////////////////////////
+    def test_fixed_size_fields_use_cursor(self):
+        for method_name in [ "Deserialize", "Serialize" ]:
+            code = self.method( "Cosignature.cpp", method_name )
+
+            self.assertNotIn( "GetOffsetPtrAndMove", code )
+            self.assertEqual( code.count( "buffer.GetOffsetPtr()" ), 1 )
+            self.assertEqual( code.count( "buffer.SetOffsetPtr( ptr )" ), 1 )
+            self.assertTrue( code.rstrip().endswith( "buffer.SetOffsetPtr( ptr );\n\treturn true;" ) )
+
+
+    def test_one_bounds_check_per_run(self):
+        code   = self.method( "TransferTransactionBody.cpp", "Deserialize" )
+        checks = [ line.strip() for line in code.splitlines() if "end - ptr" in line ]
+
+        # the fixed size fields before the mosaics, each mosaic and each byte of the message
+        self.assertEqual( checks[0], "if( size_t(end - ptr) < sizeof(UnresolvedAddress) + sizeof(uint16_t) + sizeof(uint8_t) + sizeof(uint32_t) + sizeof(uint8_t) ){ return false; }" )
+        self.assertEqual( len(checks), 3 )
+
+        # the reserved values are still checked, after the run was read
+        self.assertLess( code.index( "if( 0 != tmpTransfer_transaction_body_reserved_1 )" ), code.index( "mMosaics.resize" ) )
+
+
+    def test_unchecked_deserialization(self):
+        code = self.method( "TransferTransactionBody.cpp", "DeserializeUnchecked" )
+
+        self.assertNotIn( "GetEndPtr", code )
+        self.assertIn( "mEntityBody.DeserializeUnchecked( buffer )", self.method( "Transaction.cpp", "DeserializeUnchecked" ) )
+        self.assertIn( "if( 0 != tmpTransfer_transaction_body_reserved_1 ){ return false; }", code )
+        self.assertIn( "catbuf->DeserializeUnchecked( buffer )", self.method( "AggregateTransactionBody.cpp", "DeserializeUnchecked" ) )
+
+
+    def test_arrays_copied_in_bulk(self):
+        code = self.method( "TransferTransactionBody.cpp", "Deserialize" )
+
+        # one bounds check per array, before the elements are created
+        self.assertLess( code.index( "if( size_t(end - ptr) / sizeof(UnresolvedMosaicLayout) < mMosaics_count ){ return false; }" ), code.index( "mMosaics.resize(mMosaics_count);" ) )
+        self.assertLess( code.index( "if( size_t(end - ptr) / sizeof(uint8_t) < mMessage_size ){ return false; }" ), code.index( "mMessage.assign( (uint8_t*) ptr, (uint8_t*) ptr + mMessage_size );" ) )
+        self.assertNotIn( "shrink_to_fit", code )
+
+        code = self.method( "TransferTransactionBody.cpp", "Serialize" )
+        self.assertIn( "std::copy( mMessage.begin(), mMessage.end(), (uint8_t*) ptr );", code )
+        self.assertIn( "if( size_t(end - ptr) / sizeof(UnresolvedMosaicLayout) < mMosaics.size() ){ return false; }", code )
+
+
+    def test_buffer_synced_around_nested_fields(self):
+        code = self.method( "Transaction.cpp", "Deserialize" )
+
+        # the nested structs are read with the buffer, the fields after them with the cursor
+        set_offset = code.index( "buffer.SetOffsetPtr( ptr );" )
+        self.assertLess( set_offset, code.index( "mVerifiableEntity.Deserialize( buffer )" ) )
+        self.assertLess( code.index( "mEntityBody.Deserialize( buffer )" ), code.index( "\tptr = buffer.GetOffsetPtr();" ) )
+        self.assertLess( code.index( "\tptr = buffer.GetOffsetPtr();" ), code.index( "mType = " ) )
+
+        # no cursor for structs without fixed size fields
+        self.assertNotIn( "ptr", self.method( "AggregateCompleteTransaction.cpp", "Deserialize" ) )
+
+
+    def test_static_sources_are_header_only(self):
+        self.assertFalse( list( ( self.output / "static_src" ).glob( "*.cpp" ) ) )
+
+        # the sources of an older generator would define the inline functions twice
+        ( self.output / "static_src" / "RawBuffer.cpp" ).write_text( '#include "RawBuffer.h"\n' )
+        copy_static_files( str(self.output), False )
+        self.assertFalse( list( ( self.output / "static_src" ).glob( "*.cpp" ) ) )
+
+
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_generated_code_round_trips(self):
+        program = self.output / "main.cpp"
+        program.write_text( TEST_PROGRAM )
+
+        subprocess.run( [ "g++", "-std=c++17", "-Wall", "-Werror", "-pedantic", "-I", str( self.output / "static_src" ), "-I", str( self.output / "generated_src" ),
+                          str(program), str( self.output / "generated_src" / "Cosignature.cpp" ), "-o", str( self.output / "main" ) ], check=True )
+        subprocess.run( [ str( self.output / "main" ) ], check=True )
+
+
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_arrays_round_trip(self):
+        program = self.output / "arrays.cpp"
+        program.write_text( ARRAY_TEST_PROGRAM )
+
+        sources = [ str( self.output / "generated_src" / f"{name}.cpp" ) for name in [ "TransferTransactionBody", "UnresolvedMosaic" ] ]
+        subprocess.run( [ "g++", "-std=c++17", "-Wall", "-Werror", "-pedantic", "-I", str( self.output / "static_src" ), "-I", str( self.output / "generated_src" ),
+                          str(program), *sources, "-o", str( self.output / "arrays" ) ], check=True )
+        subprocess.run( [ str( self.output / "arrays" ) ], check=True )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
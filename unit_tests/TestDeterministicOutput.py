@@ -0,0 +1,56 @@
+import os
+import sys
+import filecmp
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestDeterministicOutput( unittest.TestCase ):
+
+    def generate( self, yaml_file: str, output_folder: str, hash_seed: str, *options: str ):
+        env = dict( os.environ, PYTHONHASHSEED=hash_seed )
+        subprocess.run( [sys.executable, "-m", "generator", yaml_file, output_folder, *options],
+                        cwd=REPO_ROOT, env=env, check=True, stdout=subprocess.DEVNULL )
+
+
+    def assertSameTree( self, dir_a: str, dir_b: str ):
+        cmp = filecmp.dircmp( dir_a, dir_b )
+
+        self.assertEqual( cmp.left_only,  [] )
+        self.assertEqual( cmp.right_only, [] )
+
+        _, mismatch, errors = filecmp.cmpfiles( dir_a, dir_b, cmp.common_files, shallow=False )
+        self.assertEqual( mismatch, [], f"files differ in '{dir_a}' and '{dir_b}'" )
+        self.assertEqual( errors,   [] )
+
+        for sub_dir in cmp.common_dirs:
+            self.assertSameTree( os.path.join(dir_a, sub_dir), os.path.join(dir_b, sub_dir) )
+
+
+    # Output must be byte identical between runs, independently of the hash seed
+    # /////////////////////////////////////////////////////////////////
+    def test_same_output_for_different_hash_seeds(self):
+        for yaml_file in ["yaml_test_inputs/symbol.yaml", "yaml_test_inputs/nem.yaml"]:
+            with self.subTest( yaml_file=yaml_file ), tempfile.TemporaryDirectory() as tmp:
+                self.generate( yaml_file, tmp+"/a", "1", "--generate-print" )
+                self.generate( yaml_file, tmp+"/b", "2", "--generate-print" )
+
+                self.assertSameTree( tmp+"/a", tmp+"/b" )
+
+
+    def test_same_output_for_parallel_generation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.generate( "yaml_test_inputs/symbol.yaml", tmp+"/a", "1" )
+            self.generate( "yaml_test_inputs/symbol.yaml", tmp+"/b", "2", "--jobs", "2" )
+
+            self.assertSameTree( tmp+"/a", tmp+"/b" )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
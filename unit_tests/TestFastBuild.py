@@ -0,0 +1,87 @@
+import io
+import shutil
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+from generator.__main__ import generate, copy_static_files
+from generator.SchemaCache import SchemaCache
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestFastBuild( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.symbol = SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "symbol.yaml" ) )
+
+
+    def setUp( self ):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.output = Path( self.tmp.name )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def generate( self, generate_print_methods: bool = False, fast_build: bool = False ) -> Path:
+        gen_output_folder = self.output / "generated_src"
+        gen_output_folder.mkdir( exist_ok=True )
+
+        with contextlib.redirect_stdout( io.StringIO() ):
+            generate( self.symbol, str(gen_output_folder), generate_print_methods, fast_build=fast_build )
+
+        return gen_output_folder
+
+
+    def includes( self, file_name: str ) -> list:
+        code = ( self.output / "generated_src" / file_name ).read_text()
+        return [ line for line in code.splitlines() if line.startswith( "#include" ) ]
+
+
+    # includes
+    # /////////////////////////////////////////////////////////////////
+    def test_streams_only_included_for_print(self):
+        self.generate( fast_build=True )
+        self.assertEqual( self.includes( "Cosignature.cpp" ), [ '#include "Cosignature.h"', "#include <cstring>" ] )
+
+        self.generate( generate_print_methods=True, fast_build=True )
+        self.assertEqual( self.includes( "Cosignature.cpp" ), [ '#include "Cosignature.h"', "#include <cstring>", "#include <iomanip>", "#include <iostream>", "#include <string>" ] )
+
+
+    def test_array_sized_header_only_included_by_definition(self):
+        self.generate( fast_build=True )
+
+        self.assertNotIn( '#include "EmbeddedTransaction.h"', self.includes( "AggregateTransactionBody.h" ) )
+        self.assertIn(    '#include "Cosignature.h"',         self.includes( "AggregateTransactionBody.h" ) )
+        self.assertIn(    '#include "EmbeddedTransaction.h"', self.includes( "AggregateTransactionBody.cpp" ) )
+
+
+    def test_default_includes_are_unchanged(self):
+        self.generate()
+
+        self.assertIn( "#include <iostream>",               self.includes( "Cosignature.cpp" ) )
+        self.assertIn( '#include "EmbeddedTransaction.h"', self.includes( "AggregateTransactionBody.h" ) )
+
+
+    # generated code
+    # /////////////////////////////////////////////////////////////////
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_generated_files_compile(self):
+        for generate_print_methods in [ False, True ]:
+            gen_output_folder = self.generate( generate_print_methods, fast_build=True )
+            copy_static_files( str(self.output), generate_print_methods )
+
+            # a plain struct, a struct with an 'array_sized' field and a converter
+            for name in [ "Cosignature.cpp", "AggregateTransactionBody.cpp", "converters_TransactionType.cpp" ]:
+                subprocess.run( [ "g++", "-std=c++17", "-fsyntax-only", "-Wall", "-Werror", "-pedantic", "-I", str( self.output / "static_src" ), str( gen_output_folder / name ) ], check=True )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
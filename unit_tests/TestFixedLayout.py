@@ -0,0 +1,146 @@
+import io
+import shutil
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+from generator.__main__ import generate, copy_static_files
+from generator.SchemaCache import SchemaCache
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# structs whose fields are, or are not, laid out like in a serialized buffer
+SCHEMA = [
+    { "name": "Amount",     "type": "alias uint64" },
+    { "name": "Key",        "type": "alias array uint8", "size": 32 },
+    { "name": "Aligned",    "type": "struct", "layout": [ { "name": "Key",    "type": "Key"    }, { "name": "Amount", "type": "Amount" } ] },
+    { "name": "Packed",     "type": "struct", "layout": [ { "name": "Size",   "type": "uint32" }, { "name": "Flags",  "type": "uint8"  },
+                                                          { "name": "Kind",   "type": "uint8"  }, { "name": "Count",  "type": "uint16" } ] },
+    { "name": "Padded",     "type": "struct", "layout": [ { "name": "Flags",  "type": "uint8"  }, { "name": "Size",   "type": "uint32" } ] },
+    { "name": "TailPadded", "type": "struct", "layout": [ { "name": "Amount", "type": "Amount" }, { "name": "Flags",  "type": "uint8"  } ] },
+    { "name": "Holder",     "type": "struct", "layout": [ { "name": "Count",  "type": "uint8"  }, { "name": "Aligned", "type": "Aligned" },
+                                                          { "name": "Items",  "type": "array Packed", "size": "Count" } ] },
+]
+
+TEST_PROGRAM = r'''
+#include <cstdio>
+#include <vector>
+#include "Holder.h"
+
+#define CHECK( x ) if( !(x) ){ printf( "failed: %s\n", #x ); return 1; }
+
+int main()
+{
+  // count, key, amount and two packed structs
+  std::vector<uint8_t> bytes = { 2 };
+  for( int i=0; i<32; ++i ){ bytes.push_back( i ); }
+  for( uint8_t b : { 1, 2, 0, 0, 0, 0, 0, 0 } ){ bytes.push_back( b ); }
+  for( uint8_t b : { 4, 0, 0, 0, 5, 6, 7, 0, 8, 0, 0, 0, 9, 10, 11, 1 } ){ bytes.push_back( b ); }
+
+  Holder holder;
+  RawBuffer in( bytes.data(), bytes.size() );
+  CHECK( holder.Deserialize( in ) && in.RemainingSize() == 0 && holder.Size() == bytes.size() );
+  CHECK( holder.mAligned.mKey.data[31] == 31 && holder.mAligned.mAmount == 0x201 );
+  CHECK( holder.mItems.size() == 2 && holder.mItems[0].mSize == 4 && holder.mItems[0].mKind == 6 && holder.mItems[1].mCount == 0x10B );
+
+  std::vector<uint8_t> out( bytes.size() );
+  RawBuffer out_buffer( out.data(), out.size() );
+  CHECK( holder.Serialize( out_buffer ) && out == bytes );
+
+  Holder truncated;
+  RawBuffer truncated_buffer( bytes.data(), bytes.size()-1 );
+  CHECK( !truncated.Deserialize( truncated_buffer ) );
+
+  static_assert( Packed::FixedSize() == 8, "size of the serialized fields" );
+  return 0;
+}
+'''
+
+
+class TestFixedLayout( unittest.TestCase ):
+
+    def setUp( self ):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.output = Path( self.tmp.name )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def generate( self, schema: list ) -> Path:
+        gen_output_folder = self.output / "generated_src"
+        gen_output_folder.mkdir()
+
+        with contextlib.redirect_stdout( io.StringIO() ):
+            generate( schema, str(gen_output_folder), False )
+
+        copy_static_files( str(self.output), False )
+        return gen_output_folder
+
+
+    # layout structs
+    # /////////////////////////////////////////////////////////////////
+    def test_layout_struct_only_for_fixed_layouts(self):
+        folder = self.generate( SCHEMA )
+
+        for name in [ "Aligned", "Packed" ]:
+            self.assertIn( f"class {name} : public ICatbuffer, public {name}Layout", ( folder / f"{name}.h" ).read_text() )
+
+        # padding, and fields which are not fixed size
+        for name in [ "Padded", "TailPadded", "Holder" ]:
+            self.assertNotIn( "Layout", ( folder / f"{name}.h" ).read_text() )
+
+
+    def test_offsets_are_checked_at_compile_time(self):
+        header = ( self.generate( SCHEMA ) / "Aligned.h" ).read_text()
+
+        self.assertIn( 'static_assert( offsetof(AlignedLayout, mAmount) == 32, "AlignedLayout differs from the serialized layout" );', header )
+        self.assertIn( 'static_assert( sizeof(AlignedLayout) == 40, "AlignedLayout differs from the serialized layout" );', header )
+
+
+    def test_single_memcpy(self):
+        folder = self.generate( SCHEMA )
+        code   = ( folder / "Packed.cpp" ).read_text()
+
+        self.assertEqual( code.count( "memcpy( static_cast<PackedLayout*>( this ), ptr, sizeof(PackedLayout) );" ), 2 ) # checked and unchecked
+        self.assertEqual( code.count( "memcpy( ptr, static_cast<PackedLayout*>( this ), sizeof(PackedLayout) );" ), 1 )
+        self.assertIn( "\treturn FixedSize();", code )
+
+        # nested fields and array elements with a fixed layout
+        code = ( folder / "Holder.cpp" ).read_text()
+        self.assertIn( "memcpy( static_cast<AlignedLayout*>( &mAligned ), ptr, sizeof(AlignedLayout) );", code )
+        self.assertIn( "memcpy( static_cast<PackedLayout*>( &mItems[i] ), ptr, sizeof(PackedLayout) );", code )
+        self.assertIn( "size += Packed::FixedSize()*mItems.size(); //< mItems", code )
+
+
+    def test_layout_name_taken(self):
+        schema = SCHEMA + [ { "name": "PackedLayout", "type": "alias uint32" } ]
+        self.assertNotIn( "PackedLayout", ( self.generate( schema ) / "Packed.h" ).read_text() )
+
+
+    def test_symbol_mosaic(self):
+        folder = self.generate( SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "symbol.yaml" ) ) )
+
+        self.assertIn( "public UnresolvedMosaicLayout", ( folder / "UnresolvedMosaic.h" ).read_text() )
+        self.assertIn( "size += UnresolvedMosaic::FixedSize()*mMosaics.size(); //< mMosaics", ( folder / "TransferTransactionBody.cpp" ).read_text() )
+
+
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_generated_code_round_trips(self):
+        folder  = self.generate( SCHEMA )
+        program = self.output / "main.cpp"
+        program.write_text( TEST_PROGRAM )
+
+        sources = [ str( folder / f"{name}.cpp" ) for name in [ "Aligned", "Packed", "Holder" ] ]
+        subprocess.run( [ "g++", "-std=c++17", "-Wall", "-Werror", "-pedantic", "-I", str( self.output / "static_src" ), "-I", str(folder),
+                          str(program), *sources, "-o", str( self.output / "main" ) ], check=True )
+        subprocess.run( [ str( self.output / "main" ) ], check=True )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import io
+import os
+import sys
+import copy
+import shutil
+import filecmp
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+from generator.__main__ import generate
+from generator.SchemaCache import SchemaCache
+from generator.Watcher import Watcher, WarmState
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestIncrementalGeneration( unittest.TestCase ):
+
+    def setUp( self ):
+        self.tmp       = tempfile.TemporaryDirectory()
+        self.yaml_file = Path( self.tmp.name ) / "bitcoin.yaml"
+        self.output    = Path( self.tmp.name ) / "out"
+        shutil.copyfile( REPO_ROOT / "yaml_test_inputs" / "bitcoin.yaml", self.yaml_file )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def generate( self, *options: str ) -> str:
+        result = subprocess.run( [sys.executable, "-m", "generator", str(self.yaml_file), str(self.output), "--incremental", *options],
+                                 cwd=REPO_ROOT, check=True, stdout=subprocess.PIPE, text=True )
+        return result.stdout
+
+
+    # Runs with unchanged inputs do not read the .yaml file
+    # /////////////////////////////////////////////////////////////////
+    def test_unchanged_inputs_are_up_to_date(self):
+        self.generate()
+        self.assertIn( "up to date", self.generate() )
+
+
+    def test_changed_options_are_not_up_to_date(self):
+        self.generate()
+        self.assertNotIn( "Generated files are up to date", self.generate( "--generate-print" ) )
+
+
+    def test_changed_yaml_is_not_up_to_date(self):
+        self.generate()
+        self.yaml_file.write_text( self.yaml_file.read_text() + "\n- name: NewAlias\n  type: alias uint32\n" )
+
+        self.assertNotIn( "Generated files are up to date", self.generate() )
+        self.assertIn( "NewAlias", ( self.output / "generated_src" / "types.h" ).read_text() )
+
+
+    def test_deleted_file_is_generated_again(self):
+        self.generate()
+        ( self.output / "generated_src" / "converters.cpp" ).unlink()
+
+        self.assertNotIn( "Generated files are up to date", self.generate() )
+        self.assertTrue( ( self.output / "generated_src" / "converters.cpp" ).is_file() )
+
+
+    # Watch mode reuses the types and declarations of unchanged structs
+    # /////////////////////////////////////////////////////////////////
+    def test_warm_state_generates_same_files(self):
+        data = SchemaCache.parse_yaml( REPO_ROOT / "yaml_test_inputs" / "symbol.yaml" )
+
+        changed = copy.deepcopy( data )
+        struct  = next( elem for elem in changed if elem["name"] == "Cosignature" )
+        struct["layout"][0]["name"] = "cosignature_version"
+
+        for jobs in [ 1, 2 ]:
+            with self.subTest( jobs=jobs ):
+                warm_folder  = self.output / f'warm{jobs}'
+                fresh_folder = self.output / f'fresh{jobs}'
+                warm_folder.mkdir( parents=True )
+                fresh_folder.mkdir( parents=True )
+
+                with contextlib.redirect_stdout( io.StringIO() ):
+                    warm_state = WarmState()
+                    generate( copy.deepcopy( data ), str(warm_folder), incremental=True, jobs=jobs, warm_state=warm_state )
+                    generated = generate( copy.deepcopy( changed ), str(warm_folder), incremental=True, jobs=jobs, warm_state=warm_state )
+
+                    generate( copy.deepcopy( changed ), str(fresh_folder) )
+
+                self.assertEqual( sorted( generated ), [ "AggregateBondedTransaction", "AggregateCompleteTransaction", "AggregateTransactionBody", "Cosignature", "DetachedCosignature" ] )
+
+                files = sorted( path.name for path in fresh_folder.iterdir() )
+                _, mismatch, errors = filecmp.cmpfiles( warm_folder, fresh_folder, files, shallow=False )
+                self.assertEqual( mismatch + errors, [] )
+
+
+    def test_watcher_detects_changes(self):
+        watcher = Watcher( [ str(self.yaml_file) ] )
+        self.assertFalse( watcher.changed() )
+
+        stat = self.yaml_file.stat()
+        os.utime( self.yaml_file, ns=( stat.st_atime_ns, stat.st_mtime_ns + 1000000 ) )
+
+        self.assertTrue( watcher.changed() )
+        self.assertFalse( watcher.changed() )
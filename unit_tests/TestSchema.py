@@ -0,0 +1,83 @@
+import copy
+import pickle
+import unittest
+
+from generator.Schema import FieldDef, StructDef
+from generator.SchemaBuilder import SchemaBuilder
+from generator.CppTypesGenerator import CppTypesGenerator
+from generator.YamlFieldChecker import YamlFieldCheckResult
+
+
+
+class TestSchema( unittest.TestCase ):
+
+    def build( self, layout: list ):
+        types = CppTypesGenerator()
+        types.add_enum_type( SchemaBuilder.enum( { "name": "TransactionType", "type": "enum uint16", "values": [ { "name": "TRANSFER", "value": 16724 } ] } ) )
+        types.add_alias_type( SchemaBuilder.alias( { "name": "Hash256", "type": "alias array uint8", "size": 32, "print": "hex" } ) )
+
+        return SchemaBuilder.struct( "Transfer", layout, types, { "Transfer", "Header" } )
+
+
+    # building
+    # /////////////////////////////////////////////////////////////////
+    def test_struct_is_built_without_modifying_input(self):
+        layout = [ { "name": "header",  "type": "inline Header" },
+                   { "name": "type",    "type": "TransactionType" },
+                   { "name": "count",   "type": "uint8" },
+                   { "name": "hashes",  "type": "array Hash256", "size": "count", "comments": "hashes" } ]
+        copied = copy.deepcopy( layout )
+
+        result, _, struct = self.build( layout )
+
+        self.assertEqual( result, YamlFieldCheckResult.OK )
+        self.assertEqual( layout, copied )
+        self.assertEqual( [ ( field.disposition, field.type ) for field in struct.fields ], [ ( "inline", "Header" ), ( "", "TransactionType" ), ( "", "uint8_t" ), ( "array", "Hash256" ) ] )
+        self.assertEqual( struct.member_vars["count"], ( 2, "uint8_t" ) )
+        self.assertEqual( struct.fields[3].comments, "hashes" )
+
+
+    def test_struct_type_sets_group(self):
+        result, _, struct = self.build( [ { "type": "struct_type TransactionType", "value": "TRANSFER @2", "header": "Header", "type_field": "type" } ] )
+
+        self.assertEqual( result, YamlFieldCheckResult.OK )
+        self.assertEqual( ( struct.group_type, struct.group_id, struct.group_version, struct.group_header, struct.header_type_field ),
+                          ( "TransactionType", "TRANSFER", "2", "Header", "type" ) )
+
+
+    def test_invalid_struct_is_not_built(self):
+        result, _, struct = self.build( [ { "name": "amount", "type": "Amount" } ] )
+
+        self.assertEqual( result, YamlFieldCheckResult.TYPE_UNKNOWN )
+        self.assertIsNone( struct )
+
+
+    # read-only definitions
+    # /////////////////////////////////////////////////////////////////
+    def test_definitions_are_read_only(self):
+        _, _, struct = self.build( [ { "name": "count", "type": "uint8" } ] )
+
+        with self.assertRaises( AttributeError ):
+            struct.fields[0].type = "uint16_t"
+
+        with self.assertRaises( AttributeError ):
+            struct.name = "Other"
+
+        with self.assertRaises( AttributeError ):
+            struct.fields[0].unknown = 1
+
+        self.assertFalse( hasattr( struct.fields[0], "__dict__" ) )
+
+
+    def test_definitions_can_be_pickled(self):
+        struct = StructDef( "Transfer", [ FieldDef( name="count", type="uint8_t" ), FieldDef( type="Header", disposition="inline" ) ], group_type="TransactionType" )
+
+        copied = pickle.loads( pickle.dumps( struct ) )
+
+        self.assertEqual( repr( copied ), repr( struct ) )
+        self.assertEqual( copied.member_vars, { "count": ( 0, "uint8_t" ) } )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
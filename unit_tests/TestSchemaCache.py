@@ -0,0 +1,71 @@
+import yaml
+import tempfile
+import unittest
+from pathlib import Path
+
+from generator.SchemaCache import SchemaCache
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestSchemaCache( unittest.TestCase ):
+
+    def setUp( self ):
+        self.tmp       = tempfile.TemporaryDirectory()
+        self.yaml_file = Path( self.tmp.name ) / "schema.yaml"
+        self.yaml_file.write_text( "- name: Amount\n  type: alias uint64\n" )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    # cache hits and invalidation
+    # /////////////////////////////////////////////////////////////////
+    def test_unchanged_schema_is_not_parsed_again(self):
+        first  = SchemaCache( self.tmp.name ).load_yaml( str(self.yaml_file) )
+
+        cache  = SchemaCache( self.tmp.name )
+        second = cache.load( [ str(self.yaml_file) ], lambda: self.fail( "schema parsed again" ) )
+
+        self.assertTrue( cache.hit )
+        self.assertEqual( first, second )
+
+
+    def test_changed_schema_is_parsed_again(self):
+        SchemaCache( self.tmp.name ).load_yaml( str(self.yaml_file) )
+        self.yaml_file.write_text( "- name: Amount\n  type: alias uint32\n" )
+
+        cache = SchemaCache( self.tmp.name )
+        data  = cache.load_yaml( str(self.yaml_file) )
+
+        self.assertFalse( cache.hit )
+        self.assertEqual( data, [ { "name": "Amount", "type": "alias uint32" } ] )
+
+
+    def test_corrupt_cache_is_ignored(self):
+        ( Path( self.tmp.name ) / SchemaCache.CACHE_NAME ).write_bytes( b"not a pickle" )
+
+        cache = SchemaCache( self.tmp.name )
+        data  = cache.load_yaml( str(self.yaml_file) )
+
+        self.assertFalse( cache.hit )
+        self.assertEqual( data, [ { "name": "Amount", "type": "alias uint64" } ] )
+
+
+    def test_disabled_cache_always_parses(self):
+        SchemaCache( self.tmp.name ).load_yaml( str(self.yaml_file) )
+
+        cache = SchemaCache( self.tmp.name, enabled=False )
+        cache.load_yaml( str(self.yaml_file) )
+
+        self.assertFalse( cache.hit )
+
+
+    # parsing
+    # /////////////////////////////////////////////////////////////////
+    def test_parse_yaml_same_as_safe_load(self):
+        for yaml_file in [ "symbol.yaml", "nem.yaml", "bitcoin.yaml" ]:
+            with self.subTest( yaml_file=yaml_file ), open( REPO_ROOT / "yaml_test_inputs" / yaml_file ) as stream:
+                self.assertEqual( SchemaCache.parse_yaml( REPO_ROOT / "yaml_test_inputs" / yaml_file ), yaml.safe_load( stream ) )
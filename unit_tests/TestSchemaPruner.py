@@ -0,0 +1,99 @@
+import io
+import sys
+import shutil
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+from generator.SchemaCache import SchemaCache
+from generator.SchemaPruner import SchemaPruner
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestSchemaPruner( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.symbol = SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "symbol.yaml" ) )
+
+
+    def names( self, roots ) -> list:
+        return [ elem["name"] for elem in SchemaPruner.prune( self.symbol, roots ) ]
+
+
+    # reachable types
+    # /////////////////////////////////////////////////////////////////
+    def test_struct_root_keeps_its_fields_types(self):
+        names = self.names( [ "TransferTransaction" ] )
+
+        for name in [ "TransferTransaction", "TransferTransactionBody", "Transaction", "EntityBody", "UnresolvedMosaic", "Amount", "TransactionType", "NetworkType" ]:
+            self.assertIn( name, names )
+
+        for name in [ "EmbeddedTransferTransaction", "AggregateCompleteTransaction", "MosaicDefinitionTransaction", "LinkAction" ]:
+            self.assertNotIn( name, names )
+
+
+    def test_order_of_schema_is_kept(self):
+        names = self.names( [ "TransferTransaction" ] )
+        self.assertEqual( names, [ elem["name"] for elem in self.symbol if elem["name"] in names ] )
+
+
+    def test_group_root_keeps_all_structs_of_group(self):
+        names  = self.names( [ "TransactionType" ] )
+        groups = SchemaPruner.groups( self.symbol )
+
+        self.assertTrue( set( groups["TransactionType"] ) <= set( names ) )
+        self.assertNotIn( "DetachedCosignature", names )
+
+
+    def test_array_sized_keeps_group_of_header(self):
+        names  = self.names( [ "AggregateCompleteTransaction" ] )
+        groups = SchemaPruner.groups( self.symbol )
+
+        self.assertIn( "EmbeddedTransaction", names )
+        self.assertIn( "TransactionTypeEmbedded", names )
+        self.assertTrue( set( groups["TransactionTypeEmbedded"] ) <= set( names ) )
+        self.assertNotIn( "TransferTransaction", names )
+
+
+    def test_unknown_root_is_an_error(self):
+        with contextlib.redirect_stdout( io.StringIO() ) as output, self.assertRaises( SystemExit ):
+            SchemaPruner.prune( self.symbol, [ "Unknown" ] )
+
+        self.assertIn( "Root type 'Unknown' not defined", output.getvalue() )
+
+
+    # pruned library
+    # /////////////////////////////////////////////////////////////////
+    @unittest.skipUnless( shutil.which( "cmake" ) and shutil.which( "make" ), "requires cmake and make" )
+    def test_pruned_library_round_trips_test_vectors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            library = Path( tmp ) / "output-symbol"
+            tests   = Path( tmp ) / "tests"
+
+            subprocess.run( [ sys.executable, "-m", "generator", "yaml_test_inputs/symbol.yaml", str(library), "--roots", "TransactionType" ],
+                            cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL )
+
+            generated = { path.stem for path in ( library / "generated_src" ).glob( "*.cpp" ) }
+            self.assertIn( "TransferTransaction", generated )
+            self.assertNotIn( "DetachedCosignature", generated )
+
+            # the end to end test deserializes and serializes the test vectors with 'create_type_TransactionType()'
+            shutil.copytree( REPO_ROOT / "end-to-end-tests", tests )
+
+            for source_folder, build_folder in [ ( library, library / "_build" ), ( tests, tests / "_build" ) ]:
+                build_folder.mkdir()
+                subprocess.run( [ "cmake", ".." ], cwd=build_folder, check=True, stdout=subprocess.DEVNULL )
+                subprocess.run( [ "make", "-j4" ], cwd=build_folder, check=True, stdout=subprocess.DEVNULL )
+
+            result = subprocess.run( [ str( tests / "_build" / "main" ) ], check=True, stdout=subprocess.PIPE, text=True )
+            self.assertIn( "All tests passed!", result.stdout )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,372 @@
+import io
+import sys
+import shutil
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+from generator.__main__ import generate, copy_static_files
+from generator.SchemaCache import SchemaCache
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PAYLOADS = r'''
+#include <cstdio>
+#include <cstring>
+#include <string>
+#include <variant>
+#include <vector>
+#include "catbuffer.h"
+
+#define CHECK( x ) if( !(x) ){ printf( "failed: %s\n", #x ); return 1; }
+
+static std::vector<std::vector<uint8_t>> Inputs()
+{
+  #include "payloads.h"
+
+  std::vector<std::vector<uint8_t>> inputs;
+  for( const std::string& hex : payloads )
+  {
+    std::vector<uint8_t> bytes;
+    for( size_t i = 0; i < hex.length(); i += 2 ){ bytes.push_back( (uint8_t) strtol( hex.substr( i, 2 ).c_str(), NULL, 16 ) ); }
+    inputs.push_back( bytes );
+  }
+
+  return inputs;
+}
+
+// Returns the aggregate body of 'object', or nullptr if it isn't an aggregate
+static AggregateTransactionBody* Body( ICatbuffer* object )
+{
+  if( auto* complete = dynamic_cast<AggregateCompleteTransaction*>( object ) ){ return &complete->mAggregateTransactionBody; }
+  if( auto* bonded   = dynamic_cast<AggregateBondedTransaction*>( object ) ){ return &bonded->mAggregateTransactionBody; }
+  return nullptr;
+}
+
+// Checks that each element holds the struct selected by its header
+static int CheckElements( AggregateTransactionBody& body )
+{
+  for( EmbeddedTransactionVariant& element : body.mTransactions )
+  {
+    CHECK( std::visit( []( auto& transaction ){ return transaction.mTRANSACTION_TYPE == transaction.mEmbeddedTransaction.mType; }, element ) );
+    CHECK( VariantSize( element ) == VariantObject( element ).Size() );
+  }
+
+  return 0;
+}
+'''
+
+SYMBOL_PROGRAM = PAYLOADS + r'''
+int main()
+{
+  std::vector<std::vector<uint8_t>> inputs     = Inputs();
+  size_t                            aggregates = 0;
+
+  for( std::vector<uint8_t>& bytes : inputs )
+  {
+    Transaction header;
+    RawBuffer   header_buffer( bytes.data(), bytes.size() );
+    CHECK( header.Deserialize( header_buffer ) );
+
+    for( const bool checked : { true, false } )
+    {
+      std::unique_ptr<ICatbuffer> object = create_type_TransactionType( header.mType, header.mEntityBody.mVersion );
+      RawBuffer                   buffer( bytes.data(), bytes.size() );
+      CHECK( object && ( checked ? object->Deserialize( buffer ) : object->DeserializeUnchecked( buffer ) ) && 0 == buffer.RemainingSize() );
+
+      std::vector<uint8_t> output( object->Size() );
+      RawBuffer            output_buffer( output.data(), output.size() );
+      CHECK( object->Serialize( output_buffer ) && output == bytes );
+
+      AggregateTransactionBody* body = Body( object.get() );
+      if( !body ){ continue; }
+
+      if( CheckElements( *body ) ){ return 1; }
+      aggregates += !body->mTransactions.empty();
+
+      // the elements are copied with the body
+      AggregateTransactionBody copy( *body );
+      std::vector<uint8_t>     copy_output( copy.Size() );
+      RawBuffer                copy_buffer( copy_output.data(), copy_output.size() );
+      CHECK( copy.Serialize( copy_buffer ) && 0 == memcmp( copy_output.data(), output.data() + output.size() - copy_output.size(), copy_output.size() ) );
+    }
+
+    // an unknown type of an element fails
+    std::unique_ptr<ICatbuffer> object = create_type_TransactionType( header.mType, header.mEntityBody.mVersion );
+    RawBuffer                   buffer( bytes.data(), bytes.size() );
+    if( object->Deserialize( buffer ) && Body( object.get() ) && !Body( object.get() )->mTransactions.empty() )
+    {
+      std::vector<uint8_t> corrupted = bytes;
+      const size_t         type      = header.Size() + 40 + 4 + 4 + 32 + 4 + 1 + 1; // the type of the first embedded transaction, after the hash, size and reserved of the body, and its size, reserved, signer, reserved, version and network
+      corrupted[type] = corrupted[type + 1] = 0xFF;
+
+      std::unique_ptr<ICatbuffer> corrupted_object = create_type_TransactionType( header.mType, header.mEntityBody.mVersion );
+      RawBuffer                   corrupted_buffer( corrupted.data(), corrupted.size() );
+      CHECK( !corrupted_object->Deserialize( corrupted_buffer ) );
+    }
+  }
+
+  CHECK( aggregates > 0 );
+  return 0;
+}
+'''
+
+ARENA_PROGRAM = r'''
+#include <cstdlib>
+#include <new>
+#include <memory_resource>
+
+static size_t heap_allocations = 0;
+
+void* operator new( size_t size )
+{
+  ++heap_allocations;
+  if( void* memory = malloc( size ) ){ return memory; }
+  throw std::bad_alloc();
+}
+
+void operator delete( void* memory ) noexcept { free( memory ); }
+void operator delete( void* memory, size_t ) noexcept { free( memory ); }
+''' + PAYLOADS + r'''
+int main()
+{
+  std::vector<std::vector<uint8_t>> inputs = Inputs();
+  std::vector<ArenaPtr>             objects;
+  objects.reserve( inputs.size() );
+
+  // the arena can't fall back to the heap
+  static std::byte                    memory[1 << 20];
+  std::pmr::monotonic_buffer_resource arena( memory, sizeof(memory), std::pmr::null_memory_resource() );
+  const size_t                        before     = heap_allocations;
+  size_t                              aggregates = 0;
+
+  for( std::vector<uint8_t>& bytes : inputs )
+  {
+    Transaction header;
+    RawBuffer   header_buffer( bytes.data(), bytes.size() );
+    CHECK( header.Deserialize( header_buffer ) );
+
+    ArenaPtr  object = create_type_TransactionType( header.mType, header.mEntityBody.mVersion, &arena );
+    RawBuffer buffer( bytes.data(), bytes.size() );
+    CHECK( object && object->Deserialize( buffer ) && 0 == buffer.RemainingSize() );
+
+    if( AggregateTransactionBody* body = Body( object.get() ) )
+    {
+      if( CheckElements( *body ) ){ return 1; }
+      CHECK( body->mTransactions.get_allocator().resource() == &arena );
+
+      // the arrays of the elements are allocated from the arena too
+      for( EmbeddedTransactionVariant& element : body->mTransactions )
+      {
+        if( auto* transfer = std::get_if<EmbeddedTransferTransaction>( &element ) )
+        {
+          CHECK( transfer->mTransferTransactionBody.mMosaics.get_allocator().resource() == &arena );
+        }
+      }
+
+      aggregates += !body->mTransactions.empty();
+    }
+
+    objects.push_back( std::move( object ) );
+  }
+
+  CHECK( aggregates > 0 );
+  CHECK( heap_allocations == before );
+  return 0;
+}
+'''
+
+# a group with an array_sized field of its own header, i.e. a tree
+RECURSIVE_SCHEMA = '''
+- name: NodeType
+  type: enum uint8
+  values:
+  - name: LEAF
+    value: 1
+  - name: BRANCH
+    value: 2
+
+- name: NodeHeader
+  type: struct
+  layout:
+  - name: type
+    type: NodeType
+  - name: version
+    type: uint8
+
+- name: Leaf
+  type: struct
+  layout:
+  - type: struct_type NodeType
+    value: LEAF @1
+    header: NodeHeader
+    version_field: version
+    type_field: type
+  - type: inline NodeHeader
+  - name: value
+    type: uint32
+
+- name: Branch
+  type: struct
+  layout:
+  - type: struct_type NodeType
+    value: BRANCH @1
+    header: NodeHeader
+    version_field: version
+    type_field: type
+  - type: inline NodeHeader
+  - name: children_size
+    type: uint32
+  - name: children
+    size: children_size
+    type: array_sized NodeHeader
+    header_type_field: type
+    header_version_field: version
+'''
+
+
+class TestVariant( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.symbol = SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "symbol.yaml" ) )
+
+
+    def setUp( self ):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.output = Path( self.tmp.name )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def generate( self, schema, variant: bool = True, arena: bool = False ) -> Path:
+        gen_output_folder = self.output / "generated_src"
+        gen_output_folder.mkdir()
+
+        with contextlib.redirect_stdout( io.StringIO() ):
+            generate( schema, str(gen_output_folder), False, arena=arena, variant=variant )
+
+        copy_static_files( str(self.output), False )
+        return gen_output_folder
+
+
+    def run_generator( self, schema: str, *options: str ) -> None:
+        subprocess.run( [sys.executable, "-m", "generator", str( REPO_ROOT / "yaml_test_inputs" / schema ), str(self.output), *options],
+                        cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL )
+
+
+    def compile_and_run( self, source: str ) -> None:
+        program = self.output / "main.cpp"
+        program.write_text( source )
+
+        subprocess.run( [ "g++", "-std=c++17", "-Wall", "-Wextra", "-Werror", "-pedantic", "-I", str( self.output / "generated_src" ), "-I", str( REPO_ROOT / "end-to-end-tests" / "src" ),
+                          str(program), str( self.output / "generated_src" / "catbuffer.cpp" ), "-o", str( self.output / "main" ) ], check=True )
+        subprocess.run( [ str( self.output / "main" ) ], check=True )
+
+
+    # generated code
+    # /////////////////////////////////////////////////////////////////
+    def test_default_classes_without_variant(self):
+        folder = self.generate( self.symbol, variant=False )
+
+        self.assertFalse( ( folder / "EmbeddedTransactionVariant.h" ).exists() )
+        self.assertIn( "\tstd::vector<std::unique_ptr<ICatbuffer>> mTransactions;", ( folder / "AggregateTransactionBody.h" ).read_text() )
+
+
+    def test_variant_declarations(self):
+        code = ( self.generate( self.symbol ) / "AggregateTransactionBody.h" ).read_text()
+
+        self.assertIn( "\tstd::vector<EmbeddedTransactionVariant> mTransactions;", code )
+        self.assertIn( '#include "EmbeddedTransactionVariant.h"', code )
+        self.assertNotIn( "#include <memory>", code )
+        self.assertNotIn( "~AggregateTransactionBody", code ) # so that the elements are moved when the array grows
+
+
+    def test_variant_header(self):
+        code = ( self.generate( self.symbol ) / "EmbeddedTransactionVariant.h" ).read_text()
+
+        self.assertIn( "using EmbeddedTransactionVariant = std::variant<\n\tEmbeddedAccountKeyLinkTransaction,\n", code )
+        self.assertIn( "\tEmbeddedTransferTransaction>;", code )
+        self.assertIn( '#include "EmbeddedTransferTransaction.h"', code )
+        self.assertIn( "inline EmbeddedTransactionVariant* create_variant_TransactionTypeEmbedded( TransactionTypeEmbedded type, size_t version, std::vector<EmbeddedTransactionVariant>& elements )", code )
+        self.assertIn( "case TransactionTypeEmbedded::TRANSFER : { return &elements.emplace_back( std::in_place_type<EmbeddedTransferTransaction> ); }", code )
+        self.assertNotIn( "memory_resource", code )
+
+        # the non-embedded transactions don't have elements of their own group
+        self.assertNotIn( "TransferTransactionVariant", code )
+
+
+    def test_variant_methods(self):
+        code = ( self.generate( self.symbol ) / "AggregateTransactionBody.cpp" ).read_text()
+
+        self.assertIn( "EmbeddedTransactionVariant* catbuf = create_variant_TransactionTypeEmbedded( type, header.mEntityBody.mVersion, mTransactions );", code )
+        self.assertIn( "if( nullptr == catbuf ){ return false; }", code )
+        self.assertIn( "if( !buffer.Allocate( 1, sizeof(EmbeddedTransactionVariant) ) ){ return false; }", code )
+        self.assertIn( "succ = VariantDeserialize( *catbuf, buffer ); if(!succ){ return false; }", code )
+        self.assertIn( "succ = VariantDeserializeUnchecked( *catbuf, buffer ); if(!succ){ return false; }", code )
+        self.assertIn( "for( EmbeddedTransactionVariant& catbuf : mTransactions )", code )
+        self.assertIn( "succ = VariantSerialize( catbuf, buffer ); if(!succ){ return false; }", code )
+        self.assertNotIn( "->", code ) # no virtual calls
+        self.assertNotIn( "converters.h", code )
+
+
+    def test_variant_with_arena(self):
+        folder = self.generate( self.symbol, arena=True )
+
+        self.assertIn( "\tstd::pmr::vector<EmbeddedTransactionVariant> mTransactions;", ( folder / "AggregateTransactionBody.h" ).read_text() )
+        self.assertIn( "EmbeddedTransactionVariant* catbuf = create_variant_TransactionTypeEmbedded( type, header.mEntityBody.mVersion, mTransactions );",
+                       ( folder / "AggregateTransactionBody.cpp" ).read_text() )
+
+        code = ( folder / "EmbeddedTransactionVariant.h" ).read_text()
+        self.assertIn( "inline EmbeddedTransactionVariant* create_variant_TransactionTypeEmbedded( TransactionTypeEmbedded type, size_t version, std::pmr::vector<EmbeddedTransactionVariant>& elements )", code )
+        self.assertIn( "case TransactionTypeEmbedded::TRANSFER : { return &elements.emplace_back( std::in_place_type<EmbeddedTransferTransaction>, elements.get_allocator().resource() ); }", code )
+
+
+    def test_stale_variant_removed(self):
+        self.run_generator( "symbol.yaml", "--variant" )
+        self.assertTrue( ( self.output / "generated_src" / "EmbeddedTransactionVariant.h" ).exists() )
+
+        self.run_generator( "symbol.yaml" )
+        self.assertFalse( ( self.output / "generated_src" / "EmbeddedTransactionVariant.h" ).exists() )
+        self.assertTrue( ( self.output / "generated_src" / "EmbeddedTransaction.h" ).exists() )
+
+
+    def test_recursive_group_fails(self):
+        schema = self.output / "tree.yaml"
+        schema.write_text( RECURSIVE_SCHEMA )
+        data   = SchemaCache.parse_yaml( str(schema) )
+
+        # without '--variant' the elements are pointers, so a tree is fine
+        self.generate( data, variant=False )
+        shutil.rmtree( self.output / "generated_src" )
+        ( self.output / "generated_src" ).mkdir()
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout( output ), self.assertRaises( SystemExit ):
+            generate( data, str( self.output / "generated_src" ), False, variant=True )
+
+        self.assertIn( 'Error: The struct "Branch" contains elements of the array_sized header "NodeHeader" of its own group "NodeType"', output.getvalue() )
+
+
+    # compiled classes
+    # /////////////////////////////////////////////////////////////////
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_symbol_elements_in_variants(self):
+        self.run_generator( "symbol.yaml", "--amalgamate", "--variant" )
+        self.compile_and_run( SYMBOL_PROGRAM )
+
+
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_symbol_variants_allocate_from_arena(self):
+        self.run_generator( "symbol.yaml", "--amalgamate", "--variant", "--arena" )
+        self.compile_and_run( ARENA_PROGRAM )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,343 @@
+import io
+import re
+import sys
+import shutil
+import tempfile
+import unittest
+import contextlib
+import subprocess
+from pathlib import Path
+
+from generator.__main__ import generate, copy_static_files
+from generator.SchemaCache import SchemaCache
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SYMBOL_PROGRAM = r'''
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <memory>
+#include <string>
+#include <vector>
+#include "catbuffer.h"
+
+#define CHECK( x ) if( !(x) ){ printf( "failed: %s\n", #x ); return 1; }
+
+static std::vector<uint8_t> HexToBytes( const std::string& hex )
+{
+  std::vector<uint8_t> bytes;
+  for( size_t i = 0; i < hex.length(); i += 2 ){ bytes.push_back( (uint8_t) strtol( hex.substr( i, 2 ).c_str(), NULL, 16 ) ); }
+  return bytes;
+}
+
+int main()
+{
+  #include "payloads.h"
+
+  size_t aggregates = 0, transfers = 0;
+
+  for( const std::string& hex : payloads )
+  {
+    std::vector<uint8_t> bytes = HexToBytes( hex );
+    const uint8_t* const begin = bytes.data();
+    const uint8_t* const end   = begin + bytes.size();
+
+    // the header is read in place
+    Transaction     header;
+    TransactionView header_view;
+    RawBuffer       header_buffer( bytes.data(), bytes.size() );
+    const uint8_t*  ptr = begin;
+
+    CHECK( header.Deserialize( header_buffer ) && header_view.Parse( ptr, end ) && ptr == begin + 128 );
+    CHECK( header_view.GetType() == header.mType && header_view.GetFee() == header.mFee && header_view.GetDeadline() == header.mDeadline );
+    CHECK( header_view.GetEntityBody().GetVersion() == header.mEntityBody.mVersion && header_view.GetSizePrefixedEntity().GetSize() == bytes.size() );
+    CHECK( 0 == memcmp( header_view.GetEntityBody().GetSigner_public_key().data, header.mEntityBody.mSigner_public_key.data, 32 ) );
+
+    // the whole transaction is validated like by Deserialize()
+    const TransactionType type    = header_view.GetType();
+    const uint8_t         version = header_view.GetEntityBody().GetVersion();
+
+    std::unique_ptr<ICatbuffer> object = create_type_TransactionType( type, version );
+    RawBuffer                   buffer( bytes.data(), bytes.size() );
+    CHECK( object && object->Deserialize( buffer ) && 0 == buffer.RemainingSize() );
+
+    ptr = begin;
+    CHECK( parse_view_TransactionType( type, version, ptr, end ) && ptr == end );
+
+    ptr = begin;
+    CHECK( parse_view_unchecked_TransactionType( type, version, ptr, end ) && ptr == end );
+
+    for( size_t size = 0; size < bytes.size(); ++size )
+    {
+      std::unique_ptr<ICatbuffer> truncated = create_type_TransactionType( type, version );
+      RawBuffer                   truncated_buffer( bytes.data(), size );
+      const bool                  deserialized = truncated->Deserialize( truncated_buffer );
+
+      ptr = begin;
+      CHECK( parse_view_TransactionType( type, version, ptr, begin + size ) == deserialized );
+      CHECK( !deserialized || size_t(ptr - begin) == size - truncated_buffer.RemainingSize() );
+    }
+
+    // nested arrays
+    if( const AggregateCompleteTransaction* aggregate = dynamic_cast<const AggregateCompleteTransaction*>( object.get() ) )
+    {
+      const AggregateTransactionBody& body = aggregate->mAggregateTransactionBody;
+
+      AggregateCompleteTransactionView view;
+      RawBuffer                        view_buffer( bytes.data(), bytes.size() );
+      CHECK( view.Parse( view_buffer ) && 0 == view_buffer.RemainingSize() && view.Size() == bytes.size() );
+
+      size_t i = 0;
+      for( const auto& element : view.GetAggregateTransactionBody().GetTransactions() )
+      {
+        CHECK( i < body.mTransactions.size() );
+        CHECK( element.Header().GetEmbeddedTransactionHeader().GetSizePrefixedEntity().GetSize() == body.mTransactions[i++]->Size() );
+      }
+      CHECK( i == body.mTransactions.size() );
+
+      i = 0;
+      for( const CosignatureView& cosignature : view.GetAggregateTransactionBody().GetCosignatures() )
+      {
+        CHECK( i < body.mCosignatures.size() && cosignature.GetVersion() == body.mCosignatures[i].mVersion );
+        CHECK( 0 == memcmp( cosignature.GetSigner_public_key().data, body.mCosignatures[i++].mSigner_public_key.data, 32 ) );
+      }
+      CHECK( i == body.mCosignatures.size() );
+      ++aggregates;
+    }
+
+    if( const TransferTransaction* transfer = dynamic_cast<const TransferTransaction*>( object.get() ) )
+    {
+      const TransferTransactionBody& body = transfer->mTransferTransactionBody;
+
+      TransferTransactionView view;
+      ptr = begin;
+      CHECK( view.Parse( ptr, end ) );
+
+      const TransferTransactionBodyView body_view = view.GetTransferTransactionBody();
+      CHECK( body_view.GetMosaics_count() == body.mMosaics_count && body_view.GetMessage().size() == body.mMessage.size() );
+      CHECK( std::equal( body_view.GetMessage().begin(), body_view.GetMessage().end(), body.mMessage.begin() ) );
+
+      size_t i = 0;
+      for( const UnresolvedMosaicView& mosaic : body_view.GetMosaics() )
+      {
+        CHECK( i < body.mMosaics.size() && mosaic.GetMosaic_id() == body.mMosaics[i].mMosaic_id && mosaic.GetAmount() == body.mMosaics[i++].mAmount );
+      }
+      CHECK( i == body.mMosaics.size() );
+      ++transfers;
+    }
+  }
+
+  CHECK( aggregates > 0 && transfers > 0 );
+  return 0;
+}
+'''
+
+BITCOIN_PROGRAM = r'''
+#include <cstdio>
+#include <vector>
+#include "Transaction.h"
+#include "TransactionView.h"
+
+#define CHECK( x ) if( !(x) ){ printf( "failed: %s\n", #x ); return 1; }
+
+static void Append( std::vector<uint8_t>& bytes, const size_t n, const uint8_t value ){ bytes.insert( bytes.end(), n, value ); }
+
+// Checks that 'TransactionView' accepts the same prefixes of 'bytes' as 'Transaction', and reads the same fields
+static int Check( const std::vector<uint8_t>& bytes )
+{
+  for( size_t size = 0; size <= bytes.size(); ++size )
+  {
+    Transaction    transaction;
+    RawBuffer      buffer( const_cast<uint8_t*>( bytes.data() ), size );
+    const bool     deserialized = transaction.Deserialize( buffer );
+
+    TransactionView view;
+    const uint8_t*  ptr = bytes.data();
+    CHECK( view.Parse( ptr, bytes.data() + size ) == deserialized );
+
+    if( !deserialized ){ continue; }
+
+    CHECK( size_t(ptr - bytes.data()) == size - buffer.RemainingSize() && view.Size() == size - buffer.RemainingSize() );
+    CHECK( view.GetVersion() == transaction.mVersion && view.GetLockTime() == transaction.mLockTime );
+    CHECK( view.HasFlag() == ( 256 == transaction.mFlag ) && view.HasWitnessData() == !transaction.mWitnessData.empty() );
+    CHECK( view.GetNumInputs() == transaction.mNumInputs && view.GetNumOutputs() == transaction.mNumOutputs );
+
+    size_t i = 0;
+    for( const InputView& input : view.GetInputs() )
+    {
+      const Input& expected = transaction.mInputs[i++];
+      CHECK( input.GetTxOutIdx() == expected.mTxOutIdx && input.GetSequence() == expected.mSequence );
+      CHECK( input.GetScript().GetScriptSize() == expected.mScript.mScriptSize && input.GetScript().GetScript().size() == expected.mScript.mScript.size() );
+    }
+    CHECK( i == transaction.mInputs.size() );
+
+    i = 0;
+    for( const WitnessDataView& witness_data : view.GetWitnessData() )
+    {
+      const WitnessData& expected = transaction.mWitnessData[i++];
+      size_t             j        = 0;
+
+      for( const WitnessView& witness : witness_data.GetWitnesses() )
+      {
+        CHECK( witness.GetStackSize() == expected.mWitnesses[j].mStackSize );
+        CHECK( std::equal( witness.GetStack().begin(), witness.GetStack().end(), expected.mWitnesses[j++].mStack.begin() ) );
+      }
+      CHECK( j == expected.mWitnesses.size() );
+    }
+    CHECK( i == transaction.mWitnessData.size() );
+  }
+
+  return 0;
+}
+
+int main()
+{
+  // version, 2 inputs with a script of 10 bytes, 1 output with a script of 3 bytes, lock time
+  std::vector<uint8_t> legacy = { 1, 0, 0, 0, 2 };
+  for( int i=0; i<2; ++i ){ Append( legacy, 36, 7 ); legacy.push_back( 10 ); Append( legacy, 14, 8 ); }
+  legacy.push_back( 1 ); Append( legacy, 8, 9 ); legacy.push_back( 3 ); Append( legacy, 3, 1 );
+  Append( legacy, 4, 5 );
+
+  // version, flag, 1 input, 1 output, the witnesses of the input (of 3 and 256 bytes), lock time
+  std::vector<uint8_t> segwit = { 2, 0, 0, 0, 0, 1, 1 };
+  Append( segwit, 36, 7 ); segwit.push_back( 0 ); Append( segwit, 4, 8 );
+  segwit.push_back( 1 ); Append( segwit, 8, 9 ); segwit.push_back( 0 );
+  segwit.push_back( 2 ); segwit.push_back( 3 ); Append( segwit, 3, 4 ); segwit.push_back( 0xFD ); segwit.push_back( 0 ); segwit.push_back( 1 ); Append( segwit, 256, 6 );
+  Append( segwit, 4, 5 );
+
+  if( Check( legacy ) || Check( segwit ) ){ return 1; }
+
+  TransactionView view;
+  RawBuffer       buffer( segwit.data(), segwit.size() );
+  CHECK( view.Parse( buffer ) && 0 == buffer.RemainingSize() && view.HasFlag() && 256 == view.GetFlag() );
+
+  return 0;
+}
+'''
+
+
+class TestViews( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.symbol  = SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "symbol.yaml"  ) )
+        cls.bitcoin = SchemaCache.parse_yaml( str( REPO_ROOT / "yaml_test_inputs" / "bitcoin.yaml" ) )
+
+
+    def setUp( self ):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.output = Path( self.tmp.name )
+
+
+    def tearDown( self ):
+        self.tmp.cleanup()
+
+
+    def generate( self, schema ) -> Path:
+        gen_output_folder = self.output / "generated_src"
+        gen_output_folder.mkdir()
+
+        with contextlib.redirect_stdout( io.StringIO() ):
+            generate( schema, str(gen_output_folder), False )
+
+        copy_static_files( str(self.output), False )
+        return gen_output_folder
+
+
+    def method( self, code: str, signature: str ) -> str:
+        start = code.index( signature )
+        return code[ start : code.index( "\n}", start ) ]
+
+
+    # generated code
+    # /////////////////////////////////////////////////////////////////
+    def test_view_per_class(self):
+        folder = self.generate( self.symbol )
+
+        classes = { path.stem for path in folder.glob( "*.cpp" ) if not path.stem.startswith( ( "converters", "views_" ) ) }
+        views   = { path.stem for path in folder.glob( "*View.h" ) }
+        self.assertEqual( views, { f'{name}View' for name in classes } )
+
+        self.assertTrue( ( self.output / "static_src" / "View.h" ).exists() )
+
+
+    def test_views_do_not_allocate(self):
+        folder = self.generate( self.symbol )
+
+        for path in folder.glob( "*View.h" ):
+            code = re.sub( r'/\*.*?\*/|//.*', "", path.read_text(), flags=re.S ) # without the comments
+            for allocation in [ r'\bnew\b', "std::vector", "unique_ptr", "create_type" ]:
+                self.assertNotRegex( code, allocation, path.name )
+
+
+    def test_fields_at_constant_offsets(self):
+        code = ( self.generate( self.symbol ) / "TransferTransactionBodyView.h" ).read_text()
+
+        self.assertIn( "uint16_t GetMessage_size( ) const { return ReadField<uint16_t>( mBegin + 24 ); } // size of attached message", code )
+        self.assertIn( "StructArrayView<UnresolvedMosaicView> GetMosaics( ) const { return StructArrayView<UnresolvedMosaicView>( mBegin + 32, mMessage ); }", code )
+        self.assertIn( "ArrayView<uint8_t> GetMessage( ) const { return ArrayView<uint8_t>( mMessage, mEnd ); }", code )
+
+        # one bounds check for the fixed size fields, followed by the checks of the reserved fields
+        parse = self.method( code, "::Parse( const uint8_t*& ptr, const uint8_t* const end )" )
+        self.assertEqual( len( re.findall( r'if\( size_t\(end - ptr\) < \d+ \)', parse ) ), 1 )
+        self.assertLess( parse.index( "if( size_t(end - ptr) < 32 ){ return false; }" ), parse.index( "if( 0 != ReadField<uint32_t>( mBegin + 27 ) ){ return false; }" ) )
+        self.assertIn( "if( size_t(end - ptr) / 16 < GetMosaics_count() ){ return false; }", parse )
+
+        unchecked = self.method( code, "::ParseUnchecked( const uint8_t*& ptr, const uint8_t* const end )" )
+        self.assertNotIn( "return false", unchecked )
+
+
+    def test_array_sized_dispatch(self):
+        folder = self.generate( self.symbol )
+        code   = ( folder / "AggregateTransactionBodyView.h" ).read_text()
+
+        self.assertIn( "parse_view_TransactionTypeEmbedded( header.GetType(), header.GetEntityBody().GetVersion(), ptr, end )", code )
+        self.assertIn( "SizedArrayView<EmbeddedTransactionView, &AggregateTransactionBodyView::NextTransactions> GetTransactions( )", code )
+
+        declarations = ( folder / "views.h" ).read_text()
+        self.assertIn( "bool parse_view_TransactionType( TransactionType type, size_t version, const uint8_t*& ptr, const uint8_t* const end );", declarations )
+        self.assertIn( "bool parse_view_unchecked_TransactionTypeEmbedded( TransactionTypeEmbedded type, size_t version, const uint8_t*& ptr, const uint8_t* const end );", declarations )
+
+        self.assertIn( "case TransactionType::TRANSFER : { TransferTransactionView view; return view.Parse( ptr, end ); }", ( folder / "views_TransactionType.cpp" ).read_text() )
+
+
+    def test_conditions(self):
+        code = ( self.generate( self.bitcoin ) / "TransactionView.h" ).read_text()
+
+        self.assertIn( "bool HasFlag( ) const { return mNumInputs != mBegin + 4; }", code )
+        self.assertIn( "bool HasWitnessData( ) const { return mLockTime != mWitnessData; }", code )
+        self.assertIn( '#include "Varint.h"', code )
+
+
+    # compiled views
+    # /////////////////////////////////////////////////////////////////
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_symbol_views_match_deserialization(self):
+        subprocess.run( [sys.executable, "-m", "generator", str( REPO_ROOT / "yaml_test_inputs" / "symbol.yaml" ), str(self.output), "--amalgamate"],
+                        cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL )
+
+        program = self.output / "main.cpp"
+        program.write_text( SYMBOL_PROGRAM )
+
+        subprocess.run( [ "g++", "-std=c++17", "-Wall", "-Wextra", "-Werror", "-pedantic", "-I", str( self.output / "generated_src" ), "-I", str( REPO_ROOT / "end-to-end-tests" / "src" ),
+                          str(program), str( self.output / "generated_src" / "catbuffer.cpp" ), "-o", str( self.output / "main" ) ], check=True )
+        subprocess.run( [ str( self.output / "main" ) ], check=True )
+
+
+    @unittest.skipUnless( shutil.which( "g++" ), "requires g++" )
+    def test_bitcoin_views_match_deserialization(self):
+        folder  = self.generate( self.bitcoin )
+        program = self.output / "main.cpp"
+        program.write_text( BITCOIN_PROGRAM )
+
+        sources = [ str(path) for path in folder.glob( "*.cpp" ) ]
+        subprocess.run( [ "g++", "-std=c++17", "-Wall", "-Wextra", "-Werror", "-pedantic", "-I", str( self.output / "static_src" ), "-I", str(folder),
+                          str(program), *sources, "-o", str( self.output / "main" ) ], check=True )
+        subprocess.run( [ str( self.output / "main" ) ], check=True )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from generator.CppClassDeclarationGenerator import CppClassDeclarationGenerator, YamlFieldCheckResult
 from generator.YamlFieldChecker import YamlFieldCheckResult
 from generator.CppTypesGenerator import AliasDef, CppTypesGenerator, EnumDef
+from generator.Schema import EnumValueDef
 
 
 
@@ -10,10 +11,9 @@ class TestYamlFieldErrorDetection( unittest.TestCase ):
     def check( self, fields: list, pass_result: YamlFieldCheckResult ):
 
         types = CppTypesGenerator()
-        types.name_to_enum["DummyEnum"] = EnumDef( "int8", set() )
-        types.name_to_enum["DummyEnum"].values.add("DummyEnumValue")
-        types.name_to_alias["DummyAliasReg"] = AliasDef( "int8", 1 )
-        types.name_to_alias["DummyAliasArr"] = AliasDef( "int8", 9 )
+        types.name_to_enum["DummyEnum"]      = EnumDef( "DummyEnum", "int8", [ EnumValueDef( "DummyEnumValue", 0 ) ] )
+        types.name_to_alias["DummyAliasReg"] = AliasDef( "DummyAliasReg", "int8", 1 )
+        types.name_to_alias["DummyAliasArr"] = AliasDef( "DummyAliasArr", "int8", 9, array=True )
 
         decl = CppClassDeclarationGenerator()
         result, error_str = decl.init( "TestStruct", fields, types, set({"DummyClass"}) )